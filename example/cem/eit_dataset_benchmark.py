@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from fealpy import logger
+logger.setLevel('WARNING')
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        电阻抗成像 (EIT) 数据集生成的性能测试. 对比逐样本逐边界电流求解 (spsolve),
+        逐样本多右端项求解, 复用符号分解的共享分解多右端项求解,
+        以及由进程池生成样本并分块写入磁盘.
+        """)
+
+parser.add_argument('--ext',
+        default=63, type=int,
+        help='网格每个方向的单元个数, 默认为 63.')
+
+parser.add_argument('--freq',
+        default=16, type=int,
+        help='边界电流的个数, 电流为 sin(n theta), n = 1, ..., freq, 默认为 16.')
+
+parser.add_argument('--samples',
+        default=40, type=int,
+        help='电导率样本个数, 默认为 40.')
+
+parser.add_argument('--num_workers',
+        default=[0, 2, 4], type=int, nargs='+',
+        help='进程个数, 0 表示串行, 默认为 0 2 4.')
+
+parser.add_argument('--chunk_size',
+        default=16, type=int,
+        help='每次写入磁盘的样本个数, 默认为 16.')
+
+args = parser.parse_args()
+bm.set_backend('numpy')
+
+import numpy as np
+from fealpy.mesh import TriangleMesh
+from fealpy.solver import spsolve
+from fealpy.cem import EITDataGenerator, generate_dataset
+
+FREQ = np.arange(1, args.freq + 1, dtype=np.float64)
+
+
+def neumann(p, *args):
+    theta = bm.arctan2(p[..., 1], p[..., 0])
+    return bm.sin(bm.tensordot(bm.tensor(FREQ), theta, axes=0))
+
+
+def levelset(seed):
+    """Level set of three random circles."""
+    rng = np.random.default_rng(seed)
+    ctrs = rng.random((3, 2)) * 1.2 - 0.6
+    rads = rng.random(3) * 0.2 + 0.1
+    def func(p):
+        dis = np.linalg.norm(p[..., None, :] - ctrs, axis=-1)
+        return np.min(dis - rads, axis=-1)
+    return func
+
+
+mesh = TriangleMesh.from_box([-1, 1, -1, 1], nx=args.ext, ny=args.ext)
+generator = EITDataGenerator(mesh, p=1)
+generator.set_boundary(neumann, batch_size=len(FREQ))
+seeds = list(range(args.samples))
+
+print(f"nodes: {mesh.number_of_nodes()}, currents: {len(FREQ)}, samples: {len(seeds)}")
+
+# one solve for each sample and each current
+start = time.perf_counter()
+for seed in seeds:
+    generator.set_levelset([10., 1.], levelset(seed))
+    for b in generator.b_:
+        spsolve(generator.A_n, b, solver='scipy')
+t_single = time.perf_counter() - start
+
+# one solve with all currents as the right-hand sides for each sample
+start = time.perf_counter()
+for seed in seeds:
+    generator.set_levelset([10., 1.], levelset(seed))
+    spsolve(generator.A_n, generator.b_.T, solver='scipy')
+t_multi = time.perf_counter() - start
+
+# one factorization for each sample
+t_assembly, t_solve = 0.0, 0.0
+for seed in seeds:
+    t0 = time.perf_counter()
+    generator.set_levelset([10., 1.], levelset(seed))
+    t1 = time.perf_counter()
+    generator.run()
+    t2 = time.perf_counter()
+    t_assembly += t1 - t0
+    t_solve += t2 - t1
+
+print(f"{'method':<30} {'time (s)':>9} {'samples/s':>10}")
+print(f"{'spsolve per current':<30} {t_single:>9.3f} {len(seeds)/t_single:>10.1f}")
+print(f"{'spsolve, all currents':<30} {t_multi:>9.3f} {len(seeds)/t_multi:>10.1f}")
+t_batch = t_assembly + t_solve
+print(f"{'shared factorization':<30} {t_batch:>9.3f} {len(seeds)/t_batch:>10.1f}"
+      f"   (assembly {t_assembly:.3f}, solve {t_solve:.3f})")
+
+
+def task(seed):
+    generator.set_levelset([10., 1.], levelset(seed))
+    return {'gd': generator.run()}
+
+
+folder = tempfile.mkdtemp()
+try:
+    for num_workers in args.num_workers:
+        path = os.path.join(folder, f'data{num_workers}')
+        start = time.perf_counter()
+        dataset = generate_dataset(path, task, seeds, num_workers=num_workers,
+                                   chunk_size=args.chunk_size, resume=False)
+        t = time.perf_counter() - start
+        name = f"dataset, {num_workers} workers"
+        print(f"{name:<30} {t:>9.3f} {len(seeds)/t:>10.1f}")
+    print(f"\ndataset 'gd' in shape {tuple(dataset.load('gd').shape)}")
+finally:
+    shutil.rmtree(folder)
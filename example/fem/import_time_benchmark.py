@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+import argparse
+import subprocess
+import sys
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        fealpy 导入时间的性能测试. 每条导入语句在新的 Python 进程中执行,
+        报告多次运行的最短时间, 以及是否加载了 sympy, scipy, jax 等重量级依赖.
+        """)
+
+parser.add_argument('--repeat',
+        default=5, type=int,
+        help='每条语句运行的次数, 默认为 5.')
+
+parser.add_argument('--budget',
+        default=1.0, type=float,
+        help='`import fealpy; from fealpy.fem import BilinearForm` 的时间上限 (秒), 默认为 1.0.')
+
+parser.add_argument('--top',
+        default=0, type=int,
+        help='列出 -X importtime 中累计时间最长的模块个数, 默认为 0, 不列出.')
+
+args = parser.parse_args()
+
+STATEMENTS = [
+    "import fealpy",
+    "import fealpy; from fealpy.fem import BilinearForm",
+    "from fealpy.mesh import TriangleMesh",
+    "from fealpy.functionspace import LagrangeFESpace",
+    "from fealpy.fem import LinearElasticIntegrator",
+    "from fealpy.cfd.sph import ParticleInteraction",
+]
+HEAVY = ('sympy', 'scipy', 'jax', 'torch', 'matplotlib')
+
+SCRIPT = """
+import sys, time
+start = time.perf_counter()
+{}
+t = time.perf_counter() - start
+print(t, ' '.join(m for m in {} if m in sys.modules))
+"""
+
+
+def run(statement):
+    code = SCRIPT.format(statement, HEAVY)
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                         text=True, check=True).stdout.split(maxsplit=1)
+    return float(out[0]), out[1].strip() if len(out) > 1 else '-'
+
+
+print(f"{'statement':<55} {'time (s)':>9}  heavy modules")
+for statement in STATEMENTS:
+    results = [run(statement) for _ in range(args.repeat)]
+    t = min(r[0] for r in results)
+    print(f"{statement:<55} {t:>9.3f}  {results[0][1]}")
+    if statement == STATEMENTS[1]:
+        t_budget = t
+
+if args.top > 0:
+    err = subprocess.run([sys.executable, '-X', 'importtime', '-c', STATEMENTS[1]],
+                         capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in err.splitlines()[1:]:
+        _, cumulative, name = line.split('|')
+        rows.append((int(cumulative), name.rstrip()))
+    print(f"\n{'module':<55} {'cumulative (ms)':>16}")
+    for cumulative, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"{name:<55} {cumulative/1000:>16.1f}")
+
+status = 'OK' if t_budget < args.budget else 'OVER BUDGET'
+print(f"\n{STATEMENTS[1]}: {t_budget:.3f} s, budget {args.budget:.3f} s, {status}")
+sys.exit(0 if t_budget < args.budget else 1)
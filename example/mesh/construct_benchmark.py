@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+import argparse
+import time
+import tracemalloc
+
+from fealpy import logger
+logger.setLevel('WARNING')
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        网格拓扑构造 (MeshDS.construct) 的性能测试,
+        对比按行字典序排序 (lexsort) 与 64 位打包键排序 (packed) 两种引擎.
+        """)
+
+parser.add_argument('--mesh',
+        default='tet', type=str,
+        help="网格类型, tri, quad, tet 或 hex, 默认为 tet.")
+
+parser.add_argument('--n',
+        default=[20, 40, 80], type=int, nargs='+',
+        help='每个方向的剖分段数, 默认为 20, 40, 80 (约 3M 个四面体).')
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy. 还可以选择 pytorch 等")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+from fealpy.mesh import TriangleMesh, QuadrangleMesh, TetrahedronMesh, HexahedronMesh
+
+MESH = {
+    'tri': (TriangleMesh, 2),
+    'quad': (QuadrangleMesh, 2),
+    'tet': (TetrahedronMesh, 3),
+    'hex': (HexahedronMesh, 3),
+}
+Mesh, TD = MESH[args.mesh]
+
+
+def timed(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    out = func()
+    t = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return t, peak / 2**20, out
+
+
+print(f"{'NC':>10} {'NF':>10} {'method':>8} {'time':>8} {'peak(MB)':>9}")
+
+for n in args.n:
+    mesh = Mesh.from_box(nx=n, ny=n, nz=n) if TD == 3 else Mesh.from_box(nx=n, ny=n)
+    NC = mesh.number_of_cells()
+    results = {}
+
+    for method in ['lexsort', 'packed']:
+        t, peak, _ = timed(lambda: mesh.construct(method))
+        results[method] = t
+        print(f"{NC:>10d} {mesh.number_of_faces():>10d} {method:>8} {t:>8.2f} {peak:>9.1f}")
+
+    print(f"{'':>10} {'':>10} {'speedup':>8} {results['lexsort'] / results['packed']:>8.2f}")
@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+from fealpy import logger
+logger.setLevel('WARNING')
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        拓扑优化密度滤波 (DensityFilter) 的性能测试, 网格为 UniformMesh3d.
+        对比逐单元循环构造滤波矩阵, 由模板偏移向量化构造矩阵, 以及不形成矩阵的
+        模板求和与 FFT 卷积.
+        """)
+
+parser.add_argument('--shape',
+        default=[300, 100, 100], type=int, nargs=3,
+        help='每个方向的单元个数, 默认为 300 100 100.')
+
+parser.add_argument('--radius',
+        default=[1.5, 2.5, 4.0], type=float, nargs='+',
+        help='滤波半径 (以单元尺寸为单位), 默认为 1.5 2.5 4.0.')
+
+parser.add_argument('--loops',
+        default=20000, type=int,
+        help='逐单元循环构造的最大单元数, 更大的网格按单元数外推时间, 默认为 20000.')
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy. 还可以选择 pytorch 等")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+from math import ceil, sqrt
+import numpy as np
+from fealpy.mesh import UniformMesh3d, DensityFilter
+
+
+def loops_filter(nx, ny, nz, rmin):
+    """The filter matrix by the loops over the cells and their neighbors."""
+    r = int(ceil(rmin))
+    iH, jH, sH = [], [], []
+    for i in range(nx):
+        for j in range(ny):
+            for k in range(nz):
+                row = k + j * nz + i * ny * nz
+                for ii in range(max(i - (r - 1), 0), min(i + r, nx)):
+                    for jj in range(max(j - (r - 1), 0), min(j + r, ny)):
+                        for kk in range(max(k - (r - 1), 0), min(k + r, nz)):
+                            fac = rmin - sqrt((i - ii)**2 + (j - jj)**2 + (k - kk)**2)
+                            if fac > 0:
+                                iH.append(row)
+                                jH.append(kk + jj * nz + ii * ny * nz)
+                                sH.append(fac)
+    return iH, jH, sH
+
+
+def timeit(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+nx, ny, nz = args.shape
+mesh = UniformMesh3d((0, nx, 0, ny, 0, nz))
+NC = mesh.number_of_cells()
+x = bm.tensor(np.random.default_rng(0).random(NC))
+
+# the loops are timed on a slab of the mesh, and extrapolated by the cells
+nx_loop = max(1, min(nx, args.loops // (ny * nz)))
+
+print(f"cells: {NC}")
+print(f"{'radius':>7} {'stencil':>8} {'loops (s)':>10} {'matrix (s)':>11} "
+      f"{'H x (s)':>8} {'stencil (s)':>12} {'fft (s)':>8}")
+for r in args.radius:
+    t_loop, _ = timeit(lambda: loops_filter(nx_loop, ny, nz, r))
+    t_loop *= nx / nx_loop
+
+    filter = DensityFilter(mesh, r, method='stencil')
+    K = filter.offset.shape[0]
+    if K * NC <= 1.5e8:
+        t_matrix, H = timeit(filter.matrix)
+        t_mv, _ = timeit(lambda: H @ x)
+        t_matrix, t_mv = f"{t_matrix:>11.3f}", f"{t_mv:>8.3f}"
+        del H
+        filter._H = None
+    else: # the matrix is too large for the memory
+        t_matrix, t_mv = f"{'-':>11}", f"{'-':>8}"
+
+    times = []
+    for method in ('stencil', 'fft'):
+        filter = DensityFilter(mesh, r, method=method)
+        filter.apply(x) # FFT of the kernel
+        times.append(timeit(lambda: filter.apply(x))[0])
+
+    extrapolated = '*' if nx_loop < nx else ' '
+    print(f"{r:>7.2f} {K:>8} {t_loop:>9.1f}{extrapolated} {t_matrix} {t_mv} "
+          f"{times[0]:>12.3f} {times[1]:>8.3f}")
+print("* extrapolated from a slab of the mesh.")
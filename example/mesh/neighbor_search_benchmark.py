@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+from fealpy import logger
+logger.setLevel('WARNING')
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        粒子邻居搜索 (NeighborSearch) 的性能测试,
+        对比 cell list 的重建, 带 skin 的增量更新与 jax_md 的 neighbor_list (若已安装).
+        """)
+
+parser.add_argument('--sizes',
+        default=[100000, 1000000], type=int, nargs='+',
+        help='粒子个数, 默认为 100000 1000000.')
+
+parser.add_argument('--dim',
+        default=2, type=int,
+        help='空间维数, 默认为 2.')
+
+parser.add_argument('--neighbors',
+        default=20, type=int,
+        help='每个粒子的平均邻居个数, 用于确定截断半径, 默认为 20.')
+
+parser.add_argument('--steps',
+        default=10, type=int,
+        help='增量更新的时间步数, 默认为 10.')
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy. 还可以选择 pytorch 等")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+import math
+import numpy as np
+from fealpy.mesh import NeighborSearch
+
+
+def timeit(func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def jax_md_search(points, box, cutoff):
+    from jax_md import space, partition
+    import jax.numpy as jnp
+
+    displacement, _ = space.periodic(box)
+    neighbor_fn = partition.neighbor_list(displacement, box, cutoff,
+                                          format=partition.Sparse)
+    position = jnp.asarray(points)
+    nbrs = neighbor_fn.allocate(position)
+    nbrs = neighbor_fn.update(position, nbrs)
+    nbrs.idx.block_until_ready()
+    return nbrs
+
+
+rng = np.random.default_rng(0)
+GD = args.dim
+unit_ball = math.pi ** (GD / 2) / math.gamma(GD / 2 + 1)
+
+print(f"{'N':>10} {'pairs':>12} {'build (s)':>10} {'update (s)':>11} {'rebuilds':>9} {'jax_md (s)':>11}")
+for N in args.sizes:
+    # the cutoff with about `neighbors` points in the ball in the unit box
+    cutoff = (args.neighbors / (N * unit_ball)) ** (1 / GD)
+    points = rng.random((N, GD))
+    search = NeighborSearch(cutoff, 1.0, skin=0.2*cutoff)
+    t_build, (indptr, index) = timeit(lambda: search.build(bm.tensor(points)))
+
+    velocity = 0.005 * cutoff * rng.standard_normal(points.shape)
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        points = np.mod(points + velocity, 1.0)
+        search.update(bm.tensor(points))
+    t_update = (time.perf_counter() - start) / args.steps
+
+    try:
+        jax_md_search(points, 1.0, cutoff) # compile
+        t_jax, _ = timeit(lambda: jax_md_search(points, 1.0, cutoff))
+        t_jax = f"{t_jax:11.3f}"
+    except ImportError:
+        t_jax = f"{'-':>11}"
+
+    print(f"{N:>10} {index.shape[0]:>12} {t_build:>10.3f} {t_update:>11.3f} "
+          f"{search.rebuilds:>9} {t_jax}")
@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+from fealpy import logger
+logger.setLevel('WARNING')
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        网格重排序 (reorder_mesh) 的性能测试,
+        对比随机编号与 Hilbert, Morton, RCM 编号下的有限元组装与 CG 求解时间.
+        """)
+
+parser.add_argument('--mesh',
+        default='tet', type=str,
+        help="网格类型, tri 或 tet, 默认为 tet.")
+
+parser.add_argument('--n',
+        default=40, type=int,
+        help='每个方向的剖分段数, 默认为 40.')
+
+parser.add_argument('--p',
+        default=1, type=int,
+        help='Lagrange 有限元空间的次数, 默认为 1.')
+
+parser.add_argument('--methods',
+        default=['hilbert', 'morton', 'rcm'], type=str, nargs='+',
+        help="重排序方法, 默认为 hilbert morton rcm.")
+
+parser.add_argument('--maxiter',
+        default=200, type=int,
+        help='CG 迭代步数, 默认为 200.')
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy. 还可以选择 pytorch 等")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+import numpy as np
+from fealpy.mesh import TriangleMesh, TetrahedronMesh, reorder_mesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator, ScalarMassIntegrator
+from fealpy.solver import cg
+
+MESH = {'tri': TriangleMesh, 'tet': TetrahedronMesh}
+Mesh = MESH[args.mesh]
+
+
+def best_of(func, repeat=3):
+    t = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = func()
+        t = min(t, time.perf_counter() - start)
+    return t, out
+
+
+def run(mesh):
+    space = LagrangeFESpace(mesh, p=args.p)
+    def assembly():
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator(q=args.p+2))
+        bform.add_integrator(ScalarMassIntegrator(q=args.p+2))
+        return bform.assembly(format='csr')
+    ta, A = best_of(assembly)
+    b = bm.ones((A.shape[0],), dtype=A.ftype)
+    # NOTE: fixed number of iterations, so that only the time of SpMV is compared
+    ts, _ = best_of(lambda: cg(A, b, atol=0., rtol=0., maxiter=args.maxiter))
+    return space.number_of_global_dofs(), ta, ts
+
+
+def bandwidth(mesh):
+    edge = bm.to_numpy(mesh.entity('edge'))
+    return int(np.abs(edge[:, 0] - edge[:, 1]).max())
+
+
+mesh = Mesh.from_box(nx=args.n, ny=args.n, nz=args.n) if Mesh is TetrahedronMesh \
+        else Mesh.from_box(nx=args.n, ny=args.n)
+# A random numbering emulates the meshes from generators or partitioners.
+rng = np.random.default_rng(0)
+node_order = bm.tensor(rng.permutation(mesh.number_of_nodes()), dtype=mesh.itype)
+cell_order = bm.tensor(rng.permutation(mesh.number_of_cells()), dtype=mesh.itype)
+mesh.renumber(node_order, cell_order)
+node, cell = mesh.entity('node'), mesh.entity('cell')
+
+print(f"{'method':>8} {'gdof':>10} {'bandwidth':>10} {'reorder':>8} "
+      f"{'assembly':>9} {'cg':>8} {'speedup':>8}")
+gdof, ta0, ts0 = run(mesh)
+print(f"{'random':>8} {gdof:>10d} {bandwidth(mesh):>10d} {'':>8} "
+      f"{ta0:>9.3f} {ts0:>8.3f} {1.:>8.2f}")
+
+for method in args.methods:
+    mesh = Mesh(bm.copy(node), bm.copy(cell))
+    start = time.perf_counter()
+    reorder_mesh(mesh, method)
+    tr = time.perf_counter() - start
+    gdof, ta, ts = run(mesh)
+    print(f"{method:>8} {gdof:>10d} {bandwidth(mesh):>10d} {tr:>8.3f} "
+          f"{ta:>9.3f} {ts:>8.3f} {(ta0 + ts0) / (ta + ts):>8.2f}")
@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+from fealpy import logger
+logger.setLevel('WARNING')
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        代数多重网格 (AMG) 在四面体网格 Poisson 方程上的性能测试,
+        对比 Jacobi 预条件共轭梯度法与 AMG 预条件共轭梯度法.
+        """)
+
+parser.add_argument('--n',
+        default=[20, 40, 100], type=int, nargs='+',
+        help='立方体每个方向的剖分段数, 默认为 20, 40, 100 (约 1M 自由度).')
+
+parser.add_argument('--method',
+        default='sa', type=str,
+        help="AMG 方法, sa (光滑聚集) 或 rs (Ruge-Stuben), 默认为 sa.")
+
+parser.add_argument('--cycle',
+        default='V', type=str,
+        help="多重网格循环类型, V, W 或 F, 默认为 V.")
+
+parser.add_argument('--rtol',
+        default=1e-8, type=float,
+        help='相对残量误差, 默认为 1e-8.')
+
+parser.add_argument('--chunk_size',
+        default=100000, type=int,
+        help='组装时每次积分的单元个数, 用于限制大网格上的内存, 默认为 100000.')
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy. 还可以选择 pytorch 等")
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+from fealpy.pde.poisson_3d import CosCosCosData
+from fealpy.mesh import TetrahedronMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator
+from fealpy.fem import LinearForm, ScalarSourceIntegrator
+from fealpy.fem import DirichletBC
+from fealpy.solver import cg, JacobiPreconditioner, AMGSolver
+
+
+def timed(func):
+    start = time.perf_counter()
+    out = func()
+    return time.perf_counter() - start, out
+
+
+pde = CosCosCosData()
+print(f"{'gdof':>9} {'assembly':>9} {'solver':>10} {'setup':>8} {'iters':>6} "
+      f"{'solve':>8} {'error':>10}")
+
+for n in args.n:
+    mesh = TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], n, n, n)
+    space = LagrangeFESpace(mesh, p=1)
+    gdof = space.number_of_global_dofs()
+
+    def assemble():
+        bform = BilinearForm(space, chunk_size=args.chunk_size)
+        bform.add_integrator(ScalarDiffusionIntegrator(method='fast'))
+        lform = LinearForm(space, chunk_size=args.chunk_size)
+        lform.add_integrator(ScalarSourceIntegrator(pde.source))
+        A = bform.assembly(format='csr')
+        F = lform.assembly()
+        return DirichletBC(space, gd=pde.solution).apply(A, F)
+
+    t_asm, (A, F) = timed(assemble)
+    rtol = args.rtol
+
+    solvers = {
+        'jacobi-cg': lambda: JacobiPreconditioner(A),
+        'amg-cg': lambda: AMGSolver(A, args.method, cycle=args.cycle),
+    }
+
+    for name, setup in solvers.items():
+        t_setup, M = timed(setup)
+        t_solve, (uh, info) = timed(
+            lambda: cg(A, F, M=M, atol=0., rtol=rtol, maxiter=5000, returninfo=True)
+        )
+        error = mesh.error(pde.solution, space.function(uh))
+        print(f"{gdof:>9d} {t_asm:>9.2f} {name:>10} {t_setup:>8.2f} {info['iters']:>6d} "
+              f"{t_solve:>8.2f} {error:>10.3e}")
+
+    # Reuse the hierarchy for a matrix with the same structure, e.g. in time-stepping.
+    t_update, _ = timed(lambda: M.update(A))
+    print(f"{'':>9} {'':>9} {'amg-update':>10} {t_update:>8.2f}")
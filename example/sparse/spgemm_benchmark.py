@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+import argparse
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from fealpy import logger
+logger.setLevel('WARNING')
+
+from fealpy.backend import backend_manager as bm
+
+## 参数解析
+parser = argparse.ArgumentParser(description=
+        """
+        稀疏矩阵乘法 (SpGEMM) 与 scipy.sparse 的性能对比. 分别计时 CSRTensor 的乘法
+        (numpy 后端调用 scipy 的 csr_matmat) 与 fealpy 的向量化 SpGEMM 核函数.
+        """)
+
+parser.add_argument('--nnz',
+        default=[100000, 1000000, 10000000], type=int, nargs='+',
+        help='矩阵的非零元个数, 默认为 1e5, 1e6, 1e7.')
+
+parser.add_argument('--row_nnz',
+        default=10, type=int,
+        help='每行的平均非零元个数, 默认为 10.')
+
+parser.add_argument('--backend',
+        default='numpy', type=str,
+        help="默认后端为 numpy. 还可以选择 pytorch 等")
+
+parser.add_argument('--repeat',
+        default=3, type=int,
+        help='重复计时的次数, 取最短时间, 默认为 3.')
+
+args = parser.parse_args()
+bm.set_backend(args.backend)
+
+from fealpy.sparse import CSRTensor
+from fealpy.sparse._spspmm import _spgemm_csr
+
+
+def best_time(func):
+    t = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        out = func()
+        t.append(time.perf_counter() - start)
+    return min(t), out
+
+
+print(f"{'nnz':>10} {'products':>12} {'scipy (s)':>10} {'matmul (s)':>11} "
+      f"{'kernel (s)':>11} {'ratio':>7} {'error':>10}")
+
+for nnz in args.nnz:
+    n = max(nnz // args.row_nnz, 1)
+    rng = np.random.default_rng(0)
+    row = np.repeat(np.arange(n), args.row_nnz)
+    col = rng.integers(0, n, size=row.shape[0])
+    A = sp.csr_matrix((rng.random(row.shape[0]), (row, col)), shape=(n, n))
+    A.sum_duplicates()
+    nprod = int(np.diff(A.indptr)[A.indices].sum())
+
+    crow = bm.from_numpy(A.indptr.astype(np.int64))
+    col = bm.from_numpy(A.indices.astype(np.int64))
+    values = bm.from_numpy(A.data)
+    M = CSRTensor(crow, col, values, A.shape)
+
+    t0, C0 = best_time(lambda: A @ A)
+    # NOTE: the matmul of CSRTensor is dispatched to the kernel of the backend
+    # if any, e.g. csr_matmat of scipy for numpy, so the vectorized kernel of
+    # fealpy is timed by itself.
+    t1, _ = best_time(lambda: M @ M)
+    t2, C2 = best_time(lambda: _spgemm_csr(crow, col, values, crow, col, values, n, n))
+
+    crow2, col2, values2 = (bm.to_numpy(a) for a in C2)
+    C2 = sp.csr_matrix((values2, col2, crow2), shape=A.shape)
+    error = abs(C2 - C0).max()
+    print(f"{A.nnz:>10d} {nprod:>12d} {t0:>10.4f} {t1:>11.4f} {t2:>11.4f} "
+          f"{t2/t0:>7.2f} {error:>10.2e}")
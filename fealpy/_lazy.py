@@ -0,0 +1,40 @@
+
+import sys
+from importlib import import_module
+from typing import Dict, Callable, List, Tuple
+
+
+def lazy_attributes(package: str, attributes: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """Module `__getattr__` and `__dir__` (PEP 562) of a package, importing the
+    submodule of an attribute on its first access.
+
+    Parameters:
+        package (str): Name of the package, i.e. `__name__` of its `__init__`.
+        attributes (Dict[str, str]): The submodule of each lazy attribute, e.g.
+            {'BernsteinFESpace': '.bernstein_fe_space'}.
+
+    Returns:
+        Callable: The `__getattr__` of the package.
+        Callable: The `__dir__` of the package.
+
+    Examples:
+        >>> __getattr__, __dir__ = lazy_attributes(__name__, {
+        ...     'NodeMesh': '.node_mesh',
+        ... })
+
+    Note:
+        The attribute is cached in the package after the import, so the later
+        accesses do not call `__getattr__`.
+    """
+    def __getattr__(name: str):
+        module = attributes.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(module, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(attributes))
+
+    return __getattr__, __dir__
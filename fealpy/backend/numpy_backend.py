@@ -8,7 +8,10 @@ from itertools import combinations_with_replacement
 import numpy as np
 from numpy.typing import NDArray
 from numpy.linalg import det
-from scipy.sparse._sparsetools import coo_matvec, csr_matvec, csr_matvecs, coo_tocsr
+from scipy.sparse._sparsetools import (
+    coo_matvec, csr_matvec, csr_matvecs, coo_tocsr,
+    csr_matmat_maxnnz, csr_matmat, csr_sort_indices
+)
 
 from .base import (
     ModuleProxy, BackendProxy,
@@ -199,6 +202,26 @@ class NumPyBackend(BackendProxy, backend_name='numpy'):
             raise NotImplementedError("Batch sparse matrix multiplication has "
                                       "not been supported yet.")
 
+    @staticmethod
+    def csr_spspmm(crow1, col1, values1, shape1, crow2, col2, values2, shape2):
+        if (values1.ndim != 1) or (values2.ndim != 1):
+            raise NotImplementedError("Batch sparse matrix multiplication has "
+                                      "not been supported yet.")
+        M, N = shape1[0], shape2[1]
+        idx_dtype = col1.dtype
+        crow1, col1, crow2, col2 = (np.asarray(a, dtype=np.int64)
+                                    for a in (crow1, col1, crow2, col2))
+        nnz = csr_matmat_maxnnz(M, N, crow1, col1, crow2, col2)
+        crow = np.empty(M+1, dtype=np.int64)
+        col = np.empty(nnz, dtype=np.int64)
+        data = np.empty(nnz, dtype=np.result_type(values1, values2))
+        csr_matmat(M, N, crow1, col1, values1, crow2, col2, values2, crow, col, data)
+        nnz = crow[-1]
+        col, data = col[:nnz], data[:nnz]
+        csr_sort_indices(M, crow, col, data)
+
+        return crow.astype(idx_dtype), col.astype(idx_dtype), data
+
     @staticmethod
     def coo_tocsr(indices, values, shape):
         M, N = shape
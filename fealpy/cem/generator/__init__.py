@@ -1,2 +1,3 @@
 
 from .eit_data_generator import EITDataGenerator
+from .dataset import DatasetWriter, generate_dataset
@@ -0,0 +1,247 @@
+
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+
+from ... import logger
+from ...backend import backend_manager as bm
+from ...backend import TensorLike as Tensor
+from ...mesh.mesh_store import _append_rows, _truncate_rows
+
+_Sample = Dict[str, Tensor]
+_WORKER_TASK = None
+
+
+class DatasetWriter():
+    """A directory of growable .npy files storing the samples of a dataset,
+    one file for each named array, in shape (number of samples, ...).
+
+    The samples are buffered in the memory and written in chunks of rows, so that
+    a dataset of any size is generated with a bounded memory, and it can be
+    memory-mapped when it is loaded for training.
+
+    Parameters:
+        path (str): The directory of the dataset.
+        mode ('w' | 'a', optional): 'w' creates a new dataset, removing the arrays
+            in the existing one, and 'a' appends to the existing dataset, e.g. to
+            resume an interrupted generation. Defaults to 'a'.
+        chunk_size (int, optional): Number of the samples written at a time.
+            Defaults to 64.
+
+    Examples:
+        >>> with DatasetWriter('eit_data', 'w') as writer:
+        ...     for sigma in samples:
+        ...         writer.append(gd=gd, label=label)
+        >>> gd = DatasetWriter('eit_data').load('gd')
+
+    Note:
+        All samples have the same names, shapes and dtypes of the arrays. The
+        headers are updated after the rows are written, so an interrupted
+        generation leaves the complete samples readable, and the arrays are
+        truncated to the same number of complete samples, removing any partial
+        chunk, when the dataset is opened.
+    """
+    def __init__(self, path: str, mode: str='a', *, chunk_size: int=64):
+        if mode not in ('w', 'a'):
+            raise ValueError(f"Unknown mode '{mode}', expected 'w' or 'a'.")
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size should be positive, but got {chunk_size}.")
+        self.path = path
+        self.chunk_size = chunk_size
+        self._buffer: List[Dict[str, np.ndarray]] = []
+        meta = os.path.join(path, 'meta.json')
+        os.makedirs(path, exist_ok=True)
+
+        if os.path.exists(meta):
+            with open(meta, 'r') as fp:
+                self.names: List[str] = json.load(fp)['names']
+            if mode == 'w':
+                for name in self.names:
+                    fname = self._file(name)
+                    if os.path.exists(fname):
+                        os.remove(fname)
+                self.names = []
+                self._write_meta()
+        else:
+            self.names = []
+            self._write_meta()
+
+        self._length = self._consistent_length()
+
+    def __len__(self) -> int:
+        return self._length + len(self._buffer)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}('{self.path}', length={len(self)}, names={self.names})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.flush()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name + '.npy')
+
+    def _write_meta(self) -> None:
+        with open(os.path.join(self.path, 'meta.json'), 'w') as fp:
+            json.dump({'names': self.names}, fp, indent=2)
+
+    def _rows(self, name: str) -> int:
+        fname = self._file(name)
+        if not os.path.exists(fname):
+            return 0
+        with open(fname, 'rb') as fp:
+            np.lib.format.read_magic(fp)
+            shape, _, _ = np.lib.format.read_array_header_1_0(fp)
+        return shape[0]
+
+    def _consistent_length(self) -> int:
+        # NOTE: an interrupted flush may have written some of the arrays only,
+        # and a partial chunk after the rows in the header of any array.
+        rows = [self._rows(name) for name in self.names]
+        length = min(rows, default=0)
+        for name, n in zip(self.names, rows):
+            if n > length:
+                logger.warning(f"(DATASET) Truncate '{name}' from {n} to {length} "
+                               "samples, which were partially written.")
+            if os.path.exists(self._file(name)):
+                _truncate_rows(self._file(name), length)
+        return length
+
+    def append(self, **arrays: Tensor) -> int:
+        """Append a sample to the dataset.
+
+        Parameters:
+            **arrays (Tensor): The named arrays of the sample.
+
+        Returns:
+            int: The number of samples in the dataset, including the buffered ones.
+        """
+        sample = {k: bm.to_numpy(v) for k, v in arrays.items()}
+        if self.names and sorted(sample) != sorted(self.names):
+            raise ValueError(f"The sample has arrays {sorted(sample)}, "
+                             f"but the dataset has {sorted(self.names)}.")
+        self._buffer.append(sample)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+        return len(self)
+
+    def flush(self) -> None:
+        """Write the buffered samples to the disk as one chunk."""
+        if not self._buffer:
+            return
+        if not self.names:
+            self.names = list(self._buffer[0])
+            self._write_meta()
+        for name in self.names:
+            rows = np.stack([sample[name] for sample in self._buffer], axis=0)
+            _append_rows(self._file(name), rows)
+        self._length += len(self._buffer)
+        self._buffer.clear()
+
+    def load(self, name: str, *, mmap: bool=True) -> Tensor:
+        """Load an array of all the written samples.
+
+        Parameters:
+            name (str): Name of the array.
+            mmap (bool, optional): Whether to memory-map the array. Defaults to True.
+
+        Returns:
+            Tensor: The array in shape (number of samples, ...).
+        """
+        if name not in self.names:
+            raise ValueError(f"'{name}' is not an array in the dataset, "
+                             f"expected one of {self.names}.")
+        self.flush()
+        array = np.load(self._file(name), mmap_mode='c' if mmap else None)
+        return bm.from_numpy(array)
+
+
+def _set_worker_task(task):
+    global _WORKER_TASK
+    _WORKER_TASK = task
+
+
+def _worker_sample(param) -> Dict[str, np.ndarray]:
+    return {k: bm.to_numpy(v) for k, v in _WORKER_TASK(param).items()}
+
+
+def generate_dataset(path: str, task: Callable[[Any], _Sample], params: Sequence[Any], *,
+                     num_workers: int=0, chunk_size: int=64,
+                     resume: bool=True) -> DatasetWriter:
+    """Generate a dataset by running the task for every parameter, in a pool of
+    processes, and stream the samples to the disk in the order of the parameters.
+
+    Parameters:
+        path (str): The directory of the dataset, see `DatasetWriter`.
+        task (Callable[[Any], Dict[str, Tensor]]): Generate a sample from a parameter,
+            e.g. the seed of a conductivity distribution or a wavenumber, returning
+            the named arrays of the sample.
+        params (Sequence): Parameters of the samples.
+        num_workers (int, optional): Number of the processes. Serial if 0.
+            Defaults to 0.
+        chunk_size (int, optional): Number of the samples written at a time.
+            Defaults to 64.
+        resume (bool, optional): Whether to keep the samples in an existing dataset
+            and skip their parameters. Otherwise the dataset is generated again.
+            Defaults to True.
+
+    Returns:
+        DatasetWriter: The dataset.
+
+    Examples:
+        >>> generator = EITDataGenerator(mesh)
+        >>> generator.set_boundary(neumann, batch_size=16)
+        >>> def task(seed):
+        ...     generator.set_levelset(sigma, random_levelset(seed))
+        ...     return {'gd': generator.run()}
+        >>> generate_dataset('eit_data', task, range(100000), num_workers=8)
+
+    Note:
+        The workers are forked, sharing the data of the task (e.g. the mesh and the
+        generator) without pickling, so the task can be a closure. Only the
+        parameters and the samples are sent between the processes, and at most
+        `2 * num_workers` samples are in flight. Only the numpy backend runs in
+        parallel.
+    """
+    writer = DatasetWriter(path, 'a' if resume else 'w', chunk_size=chunk_size)
+    start = len(writer)
+    if start > len(params):
+        raise ValueError(f"The dataset has {start} samples, more than the "
+                         f"{len(params)} parameters.")
+    if start > 0:
+        logger.info(f"(DATASET) Resume from sample {start}.")
+    params = params[start:]
+
+    if (num_workers > 0) and (bm.backend_name != 'numpy'):
+        logger.warning(f"Parallel generation is not supported by the {bm.backend_name} "
+                       "backend, running serially.")
+        num_workers = 0
+
+    if num_workers == 0:
+        with writer:
+            for param in params:
+                writer.append(**task(param))
+        return writer
+
+    import multiprocessing as mp
+
+    if 'fork' not in mp.get_all_start_methods():
+        raise RuntimeError("Process pools require the 'fork' start method, "
+                           "which is not available on this platform.")
+    with writer, ProcessPoolExecutor(num_workers, mp_context=mp.get_context('fork'),
+                                     initializer=_set_worker_task,
+                                     initargs=(task,)) as executor:
+        pending = deque()
+        for param in params:
+            pending.append(executor.submit(_worker_sample, param))
+            if len(pending) >= 2 * num_workers:
+                writer.append(**pending.popleft().result())
+        while pending:
+            writer.append(**pending.popleft().result())
+    return writer
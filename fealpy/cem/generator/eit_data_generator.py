@@ -11,13 +11,14 @@ from fealpy.fem import (
     ScalarNeumannBCIntegrator
 )
 from fealpy.sparse import COOTensor
-from fealpy.solver import cg, spsolve
+from fealpy.solver import cg, spsolve, factorize
 
 
 class EITDataGenerator():
     """Generate boundary voltage and current data for EIT.
     """
-    def __init__(self, mesh: Mesh, p: int=1, q: Optional[int]=None) -> None:
+    def __init__(self, mesh: Mesh, p: int=1, q: Optional[int]=None, *,
+                 solver: str='scipy') -> None:
         """Create a new EIT data generator.
 
         Args:
@@ -25,8 +26,13 @@ class EITDataGenerator():
             p (int, optional): Order of the Lagrange finite element space. Defaults to 1.
             q (int | None, optional): Order of the quadrature, use `q = p + 2` if None.
                 Defaults to None.
+            solver (str, optional): The direct solver factorizing the matrix,
+                see `fealpy.solver.factorize`. Defaults to 'scipy'.
         """
         q = p + 2 if q is None else q
+        self.solver = solver
+        self._lu = None
+        self._stale = False
 
         # setup function space
         kwargs = dict(dtype=mesh.itype, device=mesh.device)
@@ -82,6 +88,7 @@ class EITDataGenerator():
         A_n_values = bm.concat([self._A.values(), self.cdata, self.cdata], axis=-1)
         A_n = COOTensor(A_n_indices, A_n_values, spshape=(self.gdof+1, self.gdof+1))
         self.A_n = A_n.tocsr()
+        self._stale = True
 
     def set_boundary(self, gn_source: Union[Callable[[Tensor], Tensor], Tensor],
                      batch_size: int=0, *, zero_integral=False) -> Tensor:
@@ -126,6 +133,23 @@ class EITDataGenerator():
 
         return current
 
+    def factorization(self):
+        """Factorization of the matrix of the current levelset, which is computed
+        once and shared by all the boundary current densities.
+
+        When the levelset is changed on the same mesh, the matrix has the same
+        sparsity pattern, and its symbolic analysis is reused.
+        """
+        if self._lu is None:
+            self._lu = factorize(self.A_n, self.solver, cache=False)
+        elif self._stale:
+            try:
+                self._lu.refactorize(self.A_n)
+            except ValueError: # the mesh has changed
+                self._lu = factorize(self.A_n, self.solver, cache=False)
+        self._stale = False
+        return self._lu
+
     def run(self, return_full=False) -> Tensor:
         """Generate voltage on boundary nodes.
 
@@ -137,7 +161,9 @@ class EITDataGenerator():
                 or (Batch, Boundary nodes).
         """
         # uh = cg(self.A_n, self.b_, batch_first=True, atol=1e-12, rtol=0.)
-        uh = spsolve(self.A_n, self.b_.T, solver='scipy').T
+        # NOTE: all the boundary current densities in the batch are solved as
+        # the right-hand sides of one factorization.
+        uh = self.factorization().solve(self.b_, batch_first=True)
 
         if return_full:
             return uh[:-1]
@@ -1,3 +1,10 @@
 from .particle_kernel_function import QuinticKernel, CubicSplineKernel, QuadraticKernel, WendlandC2Kernel
-from .particle_solver import SPHSolver
-from .particle_solver import TimeLine
+from .interaction import ParticleInteraction, ParticleTimeLine
+
+# NOTE: the solver is written in jax, which is imported on the first access.
+from ..._lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'SPHSolver': '.particle_solver',
+    'TimeLine': '.particle_solver',
+})
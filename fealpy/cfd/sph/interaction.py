@@ -0,0 +1,268 @@
+
+from typing import Optional, Dict, List
+
+from ...backend import backend_manager as bm
+from ...backend import TensorLike
+from ...mesh.neighbor_search import NeighborSearch
+from ...mesh.reorder import hilbert_order
+
+EPS = 2.220446049250313e-16
+
+
+class ParticleInteraction():
+    """Pairwise interactions of the SPH particles, evaluated by a fused pass over
+    the pairs of a Verlet list, with any backend.
+
+    The kernel value and gradient are evaluated once per pair after the particles
+    move, and shared by the density summation and the right-hand sides of the
+    momentum, transport velocity and energy equations, which are summed by one
+    segment reduction of the stacked pair terms.
+
+    Parameters:
+        kernel (KernelFunctionBase): The smoothing kernel with `value_and_grad`
+            and `cutoff_radius`.
+        box_size (float | Sequence[float] | Tensor | None, optional): Size of the
+            periodic box. Defaults to None, non-periodic.
+        skin (float, optional): The extra distance of the Verlet list, see
+            `NeighborSearch`. Defaults to 0.0.
+
+    Examples:
+        >>> interaction = ParticleInteraction(QuinticKernel(h, dim=2), box_size, skin=0.1*h)
+        >>> interaction.sort(state)
+        >>> for step in range(nt):
+        ...     interaction.update(state["position"])
+        ...     state["rho"] = interaction.density(state["mass"])
+        ...     p = SPHSolver.tait_eos(state["rho"], c0, rho0)
+        ...     state.update(interaction.accelerations(state, p, pb=pb))
+
+    Note:
+        The pairs of the Verlet list are kept until it is rebuilt, the kernel being
+        zero beyond the cutoff, so the pair indices are not reallocated in the
+        steps between the rebuilds. Sorting the particles along the Hilbert curve
+        keeps the gathers of the neighbors local in memory.
+    """
+    def __init__(self, kernel, box_size=None, *, skin: float=0.0):
+        self.kernel = kernel
+        self.box_size = box_size
+        self.search = NeighborSearch(kernel.cutoff_radius, box_size, skin=skin)
+        self.i = self.j = self._pairs = None
+        self.NN = 0
+        self.w0 = float(bm.to_numpy(kernel.value_and_grad(bm.zeros((1,)))[0])[0])
+
+    def sort(self, state: Dict[str, TensorLike], key: str='position') -> TensorLike:
+        """Sort the particles along the Hilbert curve in place, permuting all
+        arrays of the state with a row for each particle.
+
+        Returns:
+            Tensor: The permutation, new particle k being the old particle order[k].
+        """
+        position = state[key]
+        NN = position.shape[0]
+        order = hilbert_order(position)
+        for k, v in state.items():
+            if isinstance(v, TensorLike) and (v.ndim > 0) and (v.shape[0] == NN):
+                state[k] = v[order]
+        self.search.reset()
+        return order
+
+    def update(self, position: TensorLike) -> None:
+        """Update the pairs and evaluate the kernel for the moved particles."""
+        pairs = self.search.verlet_pairs(position)
+        NN = position.shape[0]
+        if (pairs is not self._pairs) or (NN != self.NN):
+            i, j = pairs
+            kwargs = dict(dtype=i.dtype, device=bm.get_device(i))
+            indptr = bm.searchsorted(i, bm.arange(NN + 1, **kwargs))
+            self.count = indptr[1:] - indptr[:-1]
+            self.i, self.j = i, j
+            self._pairs, self.NN = pairs, NN
+        dr = self.search.displacement(self.gather(position) - position[self.j])
+        dist = bm.sqrt(bm.sum(dr * dr, axis=-1))
+        self.dr = dr
+        self.dist = dist
+        self.w, self.dw = self.kernel.value_and_grad(dist)
+
+    def gather(self, value: TensorLike) -> TensorLike:
+        """The values of the particles i of the pairs, i.e. `value[i]`, by
+        repeating the rows since the pairs are sorted by i."""
+        return bm.repeat(value, self.count, axis=0)
+
+    def _reduce(self, columns: List[TensorLike]) -> List[TensorLike]:
+        """Sum each column of the pair terms over the pairs of each particle."""
+        out = bm.zeros((self.NN,), **bm.context(columns[0]))
+        return [bm.index_add(bm.copy(out), self.i, c) for c in columns]
+
+    def density(self, mass: TensorLike) -> TensorLike:
+        """Density summation, rho_i = m_i (W(0) + Σ_j W_ij) as in
+        `SPHSolver.compute_rho`, the particle itself included."""
+        return mass * (self._reduce([self.w])[0] + self.w0)
+
+    def accelerations(self, state: Dict[str, TensorLike], p: TensorLike, *,
+                      pb: Optional[TensorLike]=None) -> Dict[str, TensorLike]:
+        """Right-hand sides of the equations by one pass over the pairs, in the
+        formulation of `SPHSolver.compute_mv_acceleration`,
+        `compute_tv_acceleration` and `temperature_derivative`.
+
+        Parameters:
+            state (Dict[str, Tensor]): The particles with "mass", "rho" and "mv",
+                and optionally "tv" for the transport velocity, "eta" for the
+                viscosity, and "T", "kappa" and "Cp" for the heat transfer.
+            p (Tensor): The pressure.
+            pb (Tensor | None, optional): The background pressure of the transport
+                velocity. Defaults to None.
+
+        Returns:
+            Dict[str, Tensor]: "dmvdt", and "dtvdt" if `pb` is given, and "dTdt"
+                if "T" is in the state.
+        """
+        j, dr = self.j, self.dr
+        gather = self.gather
+        m, rho, mv = state["mass"], state["rho"], state["mv"]
+        GD = dr.shape[1]
+        rho_i, rho_j = gather(rho), rho[j]
+        V2 = (m / rho)**2
+        c = (gather(V2) + V2[j]) / gather(m) * self.dw / (self.dist + EPS)
+
+        p_ij = (rho_j * gather(p) + rho_i * p[j]) / (rho_i + rho_j)
+        force = -p_ij[:, None] * dr
+        if "eta" in state:
+            eta = state["eta"]
+            eta_i, eta_j = gather(eta), eta[j]
+            eta_ij = 2 * eta_i * eta_j / (eta_i + eta_j + EPS)
+            force = force + eta_ij[:, None] * (gather(mv) - mv[j])
+        if "tv" in state:
+            # A = rho mv ⊗ (tv - mv), averaged over the pair and applied to r_ij
+            a = rho[:, None] * mv
+            dv = state["tv"] - mv
+            ar = gather(a) * bm.sum(gather(dv) * dr, axis=-1)[:, None] + \
+                 a[j] * bm.sum(dv[j] * dr, axis=-1)[:, None]
+            force = force + 0.5 * ar
+        force = c[:, None] * force
+        columns = [force[:, d] for d in range(GD)]
+        keys = [("dmvdt", GD)]
+
+        if pb is not None:
+            cpb = c * gather(pb)
+            columns.extend(cpb * dr[:, d] for d in range(GD))
+            keys.append(("dtvdt", GD))
+
+        if "T" in state:
+            T, kappa = state["T"], state["kappa"]
+            kappa_i, kappa_j = gather(kappa), kappa[j]
+            k = kappa_i * kappa_j / (kappa_i + kappa_j)
+            F = self.dw * self.dist / (self.dist**2 + EPS)
+            dTdt = 4 * m[j] * k * (gather(T) - T[j]) * F / (gather(state["Cp"]) * rho_i * rho_j)
+            columns.append(dTdt)
+            keys.append(("dTdt", 1))
+
+        out = self._reduce(columns)
+        result = {}
+        start = 0
+        for key, n in keys:
+            result[key] = out[start] if n == 1 else bm.stack(out[start:start+n], axis=1)
+            start += n
+        return result
+
+
+class ParticleTimeLine():
+    """Time stepping of the SPH particles by the semi-implicit Euler scheme of
+    `TimeLine` in `SPHSolver`, with the accelerations of `ParticleInteraction`
+    and any backend.
+
+    Each step advances the momentum velocity by the accelerations of the last
+    step and the gravity, and the transport velocity by "dtvdt" in the transport
+    velocity formulation, moves the particles, and then evaluates the density
+    summation, the pressure by the Tait equation of state and the right-hand
+    sides at the new positions.
+
+    Parameters:
+        interaction (ParticleInteraction): The pairwise interactions. The particles
+            are wrapped into its periodic box, if any.
+        c0 (float): The artificial speed of sound.
+        rho0 (float): The reference density.
+        gamma (float, optional): The exponent of the equation of state.
+            Defaults to 1.0.
+        X (float, optional): The background pressure of the equation of state.
+            Defaults to 0.0.
+        transport (bool, optional): Whether to use the transport velocity, with
+            the background pressure `tait_eos(0)` as in the SPH examples.
+            Otherwise the transport velocity is the momentum velocity.
+            Defaults to False.
+        gravity (Sequence[float] | None, optional): The external acceleration.
+            Defaults to None.
+
+    Examples:
+        >>> mesh = NodeMesh.from_tgv_domain(box_size, dx)
+        >>> interaction = ParticleInteraction(QuinticKernel(dx, dim=2), box_size, skin=0.25*dx)
+        >>> timeline = ParticleTimeLine(interaction, c0=10.0, rho0=1.0)
+        >>> state = dict(mesh.nodedata)
+        >>> interaction.sort(state)
+        >>> for step in range(nt):
+        ...     state = timeline(dt, state)
+
+    Note:
+        Particles with a nonzero "tag", e.g. the walls of the `NodeMesh` domains,
+        are fixed. They keep their velocities and temperatures, and take part in
+        the density summation and the pressure of the fluid.
+    """
+    def __init__(self, interaction: ParticleInteraction, *, c0: float, rho0: float,
+                 gamma: float=1.0, X: float=0.0, transport: bool=False,
+                 gravity=None):
+        self.interaction = interaction
+        self.c0 = c0
+        self.rho0 = rho0
+        self.gamma = gamma
+        self.X = X
+        self.transport = transport
+        self.gravity = gravity
+
+    def tait_eos(self, rho: TensorLike) -> TensorLike:
+        """The pressure by the Tait equation of state, as `SPHSolver.tait_eos`."""
+        gamma = self.gamma
+        return gamma * self.c0**2 * ((rho / self.rho0)**gamma - 1) / self.rho0 + self.X
+
+    def compute(self, state: Dict[str, TensorLike]) -> Dict[str, TensorLike]:
+        """Evaluate "rho", "p" and the right-hand sides at the current positions."""
+        interaction = self.interaction
+        interaction.update(state["position"])
+        state["rho"] = interaction.density(state["mass"])
+        state["p"] = self.tait_eos(state["rho"])
+        if self.transport:
+            pb = self.tait_eos(bm.zeros_like(state["rho"]))
+            rhs = interaction.accelerations(state, state["p"], pb=pb)
+        else:
+            # NOTE: "tv" is "mv", whose term in the momentum equation vanishes.
+            rhs = interaction.accelerations({k: v for k, v in state.items() if k != "tv"},
+                                            state["p"])
+        state.update(rhs)
+        return state
+
+    def __call__(self, dt: float, state: Dict[str, TensorLike]) -> Dict[str, TensorLike]:
+        """Advance the particles by a time step, updating the state in place."""
+        moving = None if "tag" not in state else (state["tag"] == 0)
+
+        def advance(value, rate):
+            new = value + dt * rate
+            if moving is None:
+                return new
+            mask = moving if value.ndim == 1 else moving[:, None]
+            return bm.where(mask, new, value)
+
+        dmvdt = state.get("dmvdt", 0.0)
+        if self.gravity is not None:
+            dmvdt = dmvdt + bm.tensor(self.gravity, **bm.context(state["mv"]))
+        mv = advance(state["mv"], dmvdt)
+        if self.transport and ("dtvdt" in state):
+            tv = advance(mv, state["dtvdt"])
+        else:
+            tv = mv
+        state["mv"], state["tv"] = mv, tv
+        if "dTdt" in state:
+            state["T"] = advance(state["T"], state["dTdt"])
+
+        position = advance(state["position"], tv)
+        if self.interaction.box_size is not None:
+            box = bm.tensor(self.interaction.box_size, **bm.context(position))
+            position = bm.remainder(position, box)
+        state["position"] = position
+        return self.compute(state)
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
+from math import pi
 
-import jax.numpy as jnp
-from jax import grad
+from ...backend import backend_manager as bm
 
 
 class KernelFunctionBase(ABC):
@@ -16,8 +16,15 @@ class KernelFunctionBase(ABC):
         pass
 
     def grad_value(self, r):
+        from jax import grad
         return grad(self.value)(r)
 
+    @abstractmethod
+    def value_and_grad(self, r):
+        """Values and radial derivatives of the kernel at the distances `r`,
+        computed by the backend in use, without the automatic differentiation."""
+        pass
+
 class QuinticKernel(KernelFunctionBase): 
 
     def __init__(self,h,dim=3):
@@ -28,17 +35,30 @@ class QuinticKernel(KernelFunctionBase):
         if dim == 1:
             self.alpha = 1.0/120.0 * self.h_derivative
         elif dim == 2:
-            self.alpha = 7.0/478.0/jnp.pi * self.h_derivative**2
+            self.alpha = 7.0/478.0/pi * self.h_derivative**2
         elif dim == 3:
-            self.alpha = 3.0/359.0/jnp.pi * self.h_derivative**3
+            self.alpha = 3.0/359.0/pi * self.h_derivative**3
 
     def value(self, r):
+        import jax.numpy as jnp
         q = r * self.h_derivative
         q0 = jnp.maximum(0.0,1.0-q)
         q1 = jnp.maximum(0.0,2.0-q)
         q2 = jnp.maximum(0.0,3.0-q)
         return self.alpha * (q2**5 - 6.0 * q1**5 + 15.0 * q0**5)
 
+    def value_and_grad(self, r):
+        q = r * self.h_derivative
+        q0 = bm.clip(1.0 - q, 0.0, None)
+        q1 = bm.clip(2.0 - q, 0.0, None)
+        q2 = bm.clip(3.0 - q, 0.0, None)
+        # NOTE: the powers by products, which are faster than the float powers.
+        p0, p1, p2 = q0 * q0, q1 * q1, q2 * q2
+        p0, p1, p2 = p0 * p0, p1 * p1, p2 * p2
+        w = self.alpha * (p2 * q2 - 6.0 * p1 * q1 + 15.0 * p0 * q0)
+        dw = -5.0 * self.alpha * self.h_derivative * (p2 - 6.0 * p1 + 15.0 * p0)
+        return w, dw
+
 class CubicSplineKernel(KernelFunctionBase):
 
     def __init__(self,h,dim=3):
@@ -49,17 +69,28 @@ class CubicSplineKernel(KernelFunctionBase):
         if dim == 1:
             self.alpha = 2.0/3.0 * self.h_derivative
         elif dim == 2:
-            self.alpha = 10.0/7.0/jnp.pi * self.h_derivative**2
+            self.alpha = 10.0/7.0/pi * self.h_derivative**2
         elif dim == 3:
-            self.alpha = 1.0/jnp.pi * self.h_derivative**3
+            self.alpha = 1.0/pi * self.h_derivative**3
 
     def value(self,r):
+        import jax.numpy as jnp
         q = r * self.h_derivative
         q0 = jnp.maximum(0.0,1.0-q)
         q1 = jnp.maximum(0.0,2.0-q)
         q2 = 1.0 - q + q**2
         return self.alpha * ((1.0/4.0) * q1**3 - q2 * q0)
 
+    def value_and_grad(self, r):
+        q = r * self.h_derivative
+        q0 = bm.clip(1.0 - q, 0.0, None)
+        q1 = bm.clip(2.0 - q, 0.0, None)
+        q2 = 1.0 - q + q**2
+        w = self.alpha * ((1.0/4.0) * q1**3 - q2 * q0)
+        dq0 = bm.where(q < 1.0, -1.0, 0.0)
+        dw = self.alpha * self.h_derivative * (-0.75 * q1**2 - (2.0*q - 1.0) * q0 - q2 * dq0)
+        return w, dw
+
 class QuadraticKernel(KernelFunctionBase):
 
     def __init__(self,h,dim=3):
@@ -70,15 +101,21 @@ class QuadraticKernel(KernelFunctionBase):
         if dim == 1:
             self.alpha = 2.0/3.0 * self.h_derivative
         elif dim == 2:
-            self.alpha = 2.0/jnp.pi * self.h_derivative**2
+            self.alpha = 2.0/pi * self.h_derivative**2
         elif dim == 3:
-            self.alpha = 5.0/4.0/jnp.pi * self.h_derivative**3
+            self.alpha = 5.0/4.0/pi * self.h_derivative**3
     
     def value(self,r):
+        import jax.numpy as jnp
         q = r * self.h_derivative
         q0 = jnp.maximum(0.0,2.0-q)
         return self.alpha * (3.0/16.0 * q0**2)
 
+    def value_and_grad(self, r):
+        q = r * self.h_derivative
+        q0 = bm.clip(2.0 - q, 0.0, None)
+        return self.alpha * (3.0/16.0 * q0**2), -self.alpha * self.h_derivative * (3.0/8.0 * q0)
+
 class WendlandC2Kernel(KernelFunctionBase):
     
     def __init__(self,h,dim=3):
@@ -90,11 +127,12 @@ class WendlandC2Kernel(KernelFunctionBase):
         if dim == 1:
             self.alpha = 5.0/8.0 * self.h_derivative
         elif dim == 2:
-            self.alpha = 7.0/4.0/jnp.pi * self.h_derivative**2
+            self.alpha = 7.0/4.0/pi * self.h_derivative**2
         elif dim == 3:
-            self.alpha = 21.0/16.0/jnp.pi * self.h_derivative**3
+            self.alpha = 21.0/16.0/pi * self.h_derivative**3
 
     def value(self,r):
+        import jax.numpy as jnp
         if self.dim == 1:
             q = r * self.h_derivative
             q0 = jnp.maximum(0.0,1.0-0.5*q)
@@ -105,3 +143,15 @@ class WendlandC2Kernel(KernelFunctionBase):
             q0 = jnp.maximum(0.0,1.0-0.5*q)
             q1 = 2.0 * q + 1.0
             return self.alpha * (q0**4 * q1)
+
+    def value_and_grad(self, r):
+        q = r * self.h_derivative
+        q0 = bm.clip(1.0 - 0.5*q, 0.0, None)
+        if self.dim == 1:
+            w = self.alpha * (q0**3 * (1.5 * q + 1.0))
+            dw = self.alpha * self.h_derivative * q0**2 * (1.5 * q0 - 1.5 * (1.5 * q + 1.0))
+        else:
+            q3 = q0 * q0 * q0
+            w = self.alpha * (q3 * q0 * (2.0 * q + 1.0))
+            dw = -5.0 * self.alpha * self.h_derivative * q * q3
+        return w, dw
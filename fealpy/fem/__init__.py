@@ -7,6 +7,7 @@ from .linear_form import LinearForm
 from .nonlinear_form import NonlinearForm
 from .block_form import BlockForm
 from .linear_block_form import LinearBlockForm
+from .parallel import PartitionSplitter, subdomain_assembly
 
 ### Cell Operator
 from .scalar_diffusion_integrator import ScalarDiffusionIntegrator
@@ -34,7 +35,6 @@ from .vector_source_integrator import VectorSourceIntegrator
 from .scalar_robin_bc_integrator import ScalarRobinBCIntegrator
 from .face_mass_integrator import BoundaryFaceMassIntegrator, InterFaceMassIntegrator
 from .fluid_boundary_friction_integrator import FluidBoundaryFrictionIntegrator
-from .scalar_interior_penalty_integrator import ScalarInteriorPenaltyIntegrator
 
 ### Face Source
 from .scalar_neumann_bc_integrator import ScalarNeumannBCIntegrator, ScalarRobinSourceIntegrator
@@ -44,8 +44,18 @@ from .face_source_integrator import BoundaryFaceSourceIntegrator, InterFaceSourc
 from .dirichlet_bc import DirichletBC
 from .dirichlet_bc_operator import DirichletBCOperator
 
+### Transfer between meshes
+from .transfer_operator import TransferOperator
+
 ### recovery estimate
 from .recovery_alg import RecoveryAlg
 
 ### Other
 from .nonlinear_wrapper import NonlinearWrapperInt
+
+# NOTE: the following are imported on the first access, as they import scipy.
+from .._lazy import lazy_attributes
+
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'ScalarInteriorPenaltyIntegrator': '.scalar_interior_penalty_integrator',
+})
@@ -7,10 +7,14 @@ from ..backend import backend_manager as bm
 from ..sparse import COOTensor, CSRTensor
 from .form import Form
 from .integrator import LinearInt
+from .sparsity_pattern import SparsityPattern
+from .matrix_free_operator import MatrixFreeOperator
 
 
 class BilinearForm(Form[LinearInt]):
     _M = None
+    _pattern = None
+    _keep_pattern = False
 
     def _get_sparse_shape(self):
         spaces = self._spaces
@@ -43,6 +47,19 @@ class BilinearForm(Form[LinearInt]):
                 raise ValueError("Spaces should have the same dtype, "
                                 f"but got {s0.ftype} and {s1.ftype}.")
 
+    def _local_indices(self, e2dofs_tuple):
+        ue2dof = e2dofs_tuple[0]
+        ve2dof = e2dofs_tuple[1] if (len(e2dofs_tuple) > 1) else ue2dof
+        local_shape = (ve2dof.shape[0], ve2dof.shape[1], ue2dof.shape[1]) # (NC, vldof, uldof)
+        I = bm.broadcast_to(ve2dof[:, :, None], local_shape)
+        J = bm.broadcast_to(ue2dof[:, None, :], local_shape)
+        return bm.stack([I.ravel(), J.ravel()], axis=0)
+
+    def _local_values(self, group_tensor: TensorLike):
+        if (self.batch_size > 0) and (group_tensor.ndim == 3): # Case: no batch dimension
+            group_tensor = bm.stack([group_tensor]*self.batch_size, axis=0)
+        return bm.reshape(group_tensor, self._values_ravel_shape)
+
     def _scalar_assembly(self):
         self.check_space()
         space = self._spaces
@@ -52,27 +69,110 @@ class BilinearForm(Form[LinearInt]):
         init_value_shape = (0,) if (batch_size == 0) else (batch_size, 0)
         sparse_shape = (vgdof, ugdof)
 
-        M = COOTensor(
+        pieces = [COOTensor(
             indices = bm.empty((2, 0), dtype=space[0].itype, device=bm.get_device(space[0])),
             values = bm.empty(init_value_shape, dtype=space[0].ftype, device=bm.get_device(space[0])),
             spshape = sparse_shape
-        )
+        )]
         # for group in self.integrators.keys():
             # group_tensor, e2dofs = self._assembly_group(group, retain_ints)
         for group_tensor, e2dofs_tuple in self.assembly_local_iterative():
-            ue2dof = e2dofs_tuple[0]
-            ve2dof = e2dofs_tuple[1] if (len(e2dofs_tuple) > 1) else ue2dof
-            local_shape = group_tensor.shape[-3:] # (NC, vldof, uldof)
+            indices = self._local_indices(e2dofs_tuple)
+            group_tensor = self._local_values(group_tensor)
+            pieces.append(COOTensor(indices, group_tensor, sparse_shape))
+
+        return COOTensor.accumulate(pieces, coalesce=False)
+
+    ### START: Sparsity Pattern ###
+    def keep_pattern(self, status_on=True, /):
+        """Set whether to keep the sparsity pattern of the CSR matrix between assemblies.
+
+        When on, the first CSR assembly records the structure of the global matrix
+        and a scatter map from local entries to the CSR slots (for forms with
+        a `chunk_size`, slots are searched by the sorted keys of the non-zeros
+        instead of a scatter map). Later assemblies
+        only evaluate the local tensors and add them into the values of the
+        recorded structure, skipping the sorting in `coalesce` and `tocsr`.
+        The pattern is rebuilt automatically when the mesh of any space
+        is modified (e.g. refined), when integrators are added or their regions
+        are set, when the local tensors change in size, or when any local entry
+        falls out of the recorded non-zeros.
+        """
+        self._keep_pattern = status_on
+        if not status_on:
+            self._pattern = None
+        return self
+
+    def _pattern_indices(self, e2dofs_tuple):
+        indices = self._local_indices(e2dofs_tuple)
+        if getattr(self, '_transposed', False):
+            indices = bm.flip(indices, axis=0)
+        return indices
 
-            if (batch_size > 0) and (group_tensor.ndim == 3): # Case: no batch dimension
-                group_tensor = bm.stack([group_tensor]*batch_size, axis=0)
-            I = bm.broadcast_to(ve2dof[:, :, None], local_shape)
-            J = bm.broadcast_to(ue2dof[:, None, :], local_shape)
-            indices = bm.stack([I.ravel(), J.ravel()], axis=0)
-            group_tensor = bm.reshape(group_tensor, self._values_ravel_shape)
-            M = M.add(COOTensor(indices, group_tensor, sparse_shape))
+    def _pattern_shape(self):
+        sparse_shape = self._get_sparse_shape()
+        if getattr(self, '_transposed', False):
+            sparse_shape = tuple(reversed(sparse_shape))
+        return sparse_shape
+
+    def _pattern_assembly(self):
+        self.check_space()
+        pattern = self._pattern
+        state = self._integrator_state()
+
+        if (pattern is not None) and pattern.match(self._spaces, state):
+            if self.chunk_size > 0:
+                M = self._chunked_assembly(pattern)
+            else:
+                values = pattern.scatter_values(self._local_values(gt) for gt, _ in
+                                                self.assembly_local_iterative())
+                M = None if values is None else \
+                    CSRTensor(pattern.crow, pattern.col, values, pattern.spshape)
+            if M is not None:
+                logger.debug("(ASSEMBLY PATTERN) values-only assembly.")
+                return M
+
+        if self.chunk_size > 0:
+            pattern = SparsityPattern.from_chunks(
+                (self._pattern_indices(etg) for etg in self.to_global_dof_iterative()),
+                self._pattern_shape(), self._spaces, state
+            )
+            logger.info(f"Sparsity pattern constructed, with {pattern.nnz} non-zeros.")
+            if self._keep_pattern:
+                self._pattern = pattern
+            return self._chunked_assembly(pattern)
 
-        return M
+        indices_list = []
+        values_list = []
+
+        for group_tensor, e2dofs_tuple in self.assembly_local_iterative():
+            indices_list.append(self._pattern_indices(e2dofs_tuple))
+            values_list.append(self._local_values(group_tensor))
+
+        indices = bm.concat(indices_list, axis=1)
+        pattern = SparsityPattern.from_indices(indices, self._pattern_shape(), self._spaces,
+                                               [v.shape[-1] for v in values_list], state)
+        logger.info(f"Sparsity pattern constructed, with {pattern.nnz} non-zeros.")
+        if self._keep_pattern:
+            self._pattern = pattern
+        values = pattern.scatter_values(values_list)
+
+        return CSRTensor(pattern.crow, pattern.col, values, pattern.spshape)
+
+    def _chunked_assembly(self, pattern: SparsityPattern):
+        space = self._spaces[0]
+        kwargs = {'dtype': space.ftype, 'device': bm.get_device(space)}
+        dense_shape = () if (self.batch_size == 0) else (self.batch_size,)
+        values = pattern.zeros(dense_shape, **kwargs)
+
+        for group_tensor, e2dofs_tuple in self.assembly_local_iterative():
+            indices = self._pattern_indices(e2dofs_tuple)
+            values = pattern.add_values(values, indices, self._local_values(group_tensor))
+            if values is None: # some entries are out of the pattern, to be rebuilt
+                return None
+
+        return CSRTensor(pattern.crow, pattern.col, values, pattern.spshape)
+    ### END: Sparsity Pattern ###
 
     @overload
     def assembly(self) -> CSRTensor: ...
@@ -87,9 +187,23 @@ class BilinearForm(Form[LinearInt]):
             format (str, optional): Layout of the output ('csr' | 'coo'). Defaults to 'csr'.\n
             retain_ints (bool, optional): Whether to retain the integrator cache.csr
 
+        Note:
+            Use `keep_pattern(True)` to reuse the sparsity pattern of the CSR matrix
+            in repeated assemblies, see `BilinearForm.keep_pattern`.
+            If the form has a `chunk_size`, the CSR matrix is accumulated chunk by
+            chunk, so that the local tensors are never held for all the entities.
+            If the form has `num_workers`, the local tensors are integrated in
+            parallel and merged into the CSR values through the sparsity pattern.
+
         Returns:
             global_matrix (CSRTensor | COOTensor): Global sparse matrix shaped ([batch, ]gdof, gdof).
         """
+        if (self._keep_pattern or (self.chunk_size > 0) or (self.num_workers > 0)) \
+                and (format == 'csr'):
+            self._M = self._pattern_assembly()
+            logger.info(f"Bilinear form matrix constructed, with shape {list(self._M.shape)}.")
+            return self._M
+
         M = self._scalar_assembly()
         if getattr(self, '_transposed', False):
             M = M.T
@@ -116,6 +230,22 @@ class BilinearForm(Form[LinearInt]):
         """
         raise NotImplementedError
 
+    def linear_operator(self, *, cache: bool=True) -> MatrixFreeOperator:
+        """Return the matrix-free linear operator of the form.
+
+        The operator can be passed to iterative solvers such as `cg` and `gmres`
+        in place of the assembled matrix.
+
+        Parameters:
+            cache (bool, optional): Whether to keep the local tensors in the operator.
+                If False, they are evaluated in every product, bounding the memory
+                by the splitters of the form. Defaults to True.
+
+        Returns:
+            MatrixFreeOperator: The operator, shaped (vgdof, ugdof).
+        """
+        return MatrixFreeOperator(self, cache=cache)
+
     @property
     def T(self):
         transposed = self.copy()
@@ -148,8 +278,7 @@ class BilinearForm(Form[LinearInt]):
         gt_subs = 'bcij' if (self.batch_size > 0) else 'cij'
         gu_subs = 'bcj' if (u.ndim >= 2) else 'cj'
 
-        for group in self.integrators.keys():
-            group_tensor, e2dofs = self._assembly_group(group, True)
+        for group_tensor, e2dofs in self.assembly_local_iterative():
             ue2dof = e2dofs[0]
             ve2dof = e2dofs[1] if (len(e2dofs) > 1) else ue2dof
             gu = u[..., ue2dof] # (..., NC, uldof)
@@ -1,13 +1,16 @@
 
 from typing import (
     Sequence, overload, Iterable, Dict, Tuple, Optional, Union, TypeVar, Generic,
-    Callable
+    Callable, Literal
 )
 
 from ..typing import TensorLike, Size, Index
 from ..backend import backend_manager as bm
 from ..functionspace import FunctionSpace as _FS
 from .integrator import Integrator, GroupIntegrator
+from concurrent.futures import Executor
+
+from .parallel import PartitionSplitter, WorkerPool, parallel_kernels
 
 from .. import logger
 from abc import ABC
@@ -20,6 +23,7 @@ Self = TypeVar('Self')
 # (2) slice: Slice of entities.
 _SplitterInterface = Callable[[_FS, Integrator], Iterable[_IT]]
 _Splitter = Union[_SplitterInterface[TensorLike], _SplitterInterface[slice]]
+_Pool = Union[Literal['thread', 'process'], Executor]
 
 
 class Form(Generic[_I], ABC):
@@ -28,15 +32,39 @@ class Form(Generic[_I], ABC):
     # chunk_sizes: Dict[str, int]
     splitters: Dict[str, _Splitter]
     batch_size: int
+    chunk_size: int
+    num_workers: int
     sparse_shape: Tuple[int, ...]
 
     @overload
-    def __init__(self, space: _FS, /, *, batch_size: int=0): ...
+    def __init__(self, space: _FS, /, *, batch_size: int=0, chunk_size: int=0,
+                 num_workers: int=0, pool: _Pool='thread'): ...
     @overload
-    def __init__(self, space: Tuple[_FS, ...], /, *, batch_size: int=0): ...
+    def __init__(self, space: Tuple[_FS, ...], /, *, batch_size: int=0, chunk_size: int=0,
+                 num_workers: int=0, pool: _Pool='thread'): ...
     @overload
-    def __init__(self, *space: _FS, batch_size: int=0): ...
-    def __init__(self, *space, batch_size: int=0):
+    def __init__(self, *space: _FS, batch_size: int=0, chunk_size: int=0,
+                 num_workers: int=0, pool: _Pool='thread'): ...
+    def __init__(self, *space, batch_size: int=0, chunk_size: int=0,
+                 num_workers: int=0, pool: _Pool='thread'):
+        """Initialize the form.
+
+        Parameters:
+            *space (FunctionSpace): The space(s) of the form.
+            batch_size (int, optional): Size of the batch dimension. Defaults to 0.
+            chunk_size (int, optional): Number of entities integrated at a time by the
+                groups without a splitter. Integrate all entities at once if 0.
+                Groups with integrators not accepting `indices` (see
+                `Integrator.splittable`) are integrated at once. Defaults to 0.
+            num_workers (int, optional): Number of workers integrating the chunks in
+                parallel. Groups without a splitter or a chunk size are divided into
+                `num_workers` contiguous partitions. Serial if 0. Defaults to 0.
+            pool (str | Executor, optional): Type of the worker pool, 'thread' or
+                'process', or an executor given by the caller. Process workers are
+                forked with the form and share the mesh arrays, available for the
+                numpy backend only. The workers are kept by the form and reused
+                by the assemblies until `close()`. Defaults to 'thread'.
+        """
         if len(space) == 0:
             raise ValueError("No space is given.")
         if isinstance(space[0], Sequence):
@@ -46,13 +74,20 @@ class Form(Generic[_I], ABC):
         self.splitters = {}
         # self.chunk_sizes = {}
         self._cursor = 0
+        self._version = 0
         self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.num_workers = num_workers
+        self.pool = pool
+        self._workers = WorkerPool(num_workers, pool)
 
         self._values_ravel_shape = (-1,) if self.batch_size == 0 else (self.batch_size, -1)
         self.sparse_shape = self._get_sparse_shape()
 
     def copy(self):
-        new_obj = self.__class__(self._spaces, batch_size=self.batch_size)
+        new_obj = self.__class__(self._spaces, batch_size=self.batch_size,
+                                 chunk_size=self.chunk_size,
+                                 num_workers=self.num_workers, pool=self.pool)
         new_obj.integrators.update(self.integrators)
         # new_obj.chunk_sizes.update(self.chunk_sizes)
         new_obj.splitters.update(self.splitters)
@@ -63,6 +98,12 @@ class Form(Generic[_I], ABC):
     def __len__(self) -> int:
         return len(self.integrators)
 
+    def close(self) -> None:
+        """Shut down the workers kept by the form for the parallel assembly.
+        Call it after modifying the mesh or the integrators in place when the
+        pool is 'process', as the workers are forked with a snapshot of them."""
+        self._workers.close()
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}{self._spaces}"
 
@@ -132,6 +173,7 @@ class Form(Generic[_I], ABC):
     def _add_integrator_impl(self, I: _I, group: Optional[str] = None, splitter: Optional[_Splitter] = None):
         group = f'_group_{self._cursor}' if group is None else group
         self._cursor += 1
+        self._version += 1
 
         if group in self.integrators:
             self.integrators[group] += I
@@ -143,30 +185,72 @@ class Form(Generic[_I], ABC):
 
         return self
 
+    def _integrator_state(self):
+        """Return a tuple that changes when integrators are added to the form
+        or the region of any integrator is set."""
+        return (self._version, ) + tuple(I.region_version() for I in self.integrators.values())
+
     def _assembly_kernel(self, group: str, /, indices=None):
         integrator = self.integrators[group]
         if indices is None:
             value = integrator(self.space)
-            etg = integrator.to_global_dof(self.space)
         else:
             value = integrator(self.space, indices=indices)
+        return value, self._to_global_dof_kernel(group, indices)
+
+    def _get_splitter(self, group: str, /) -> Optional[_Splitter]:
+        splitter = self.splitters[group]
+        if (splitter is not None) or (self.chunk_size <= 0 and self.num_workers <= 0):
+            return splitter
+        if not self.integrators[group].splittable():
+            # NOTE: integrators without the `indices` argument are integrated at once.
+            logger.info(f"(ASSEMBLY) {self.integrators[group]!r} in {group} does not "
+                        "support indices, integrated without splitting.")
+            return None
+        if self.chunk_size > 0:
+            return UniformSplitter(self.chunk_size)
+        return PartitionSplitter(self.num_workers)
+
+    def _to_global_dof_kernel(self, group: str, /, indices=None):
+        integrator = self.integrators[group]
+        if indices is None:
+            etg = integrator.to_global_dof(self.space)
+        else:
             etg = integrator.to_global_dof(self.space, indices=indices)
         if not isinstance(etg, (tuple, list)):
             etg = (etg, )
-        return value, etg
+        return etg
 
-    def assembly_local_iterative(self):
-        """Assembly local matrix considering chunk size.
-        Yields local matrix and to_global_dof tuple."""
+    def _iter_tasks(self):
+        """Yield the group names and entity indices to integrate, where the
+        indices are None for groups integrated at once."""
         for key, int_ in self.integrators.items():
-            splitter = self.splitters[key]
+            splitter = self._get_splitter(key)
             if splitter is None:
                 logger.debug(f"(ASSEMBLY LOCAL FULL) {key}")
-                yield self._assembly_kernel(key)
+                yield key, None
             else:
                 logger.debug(f"(ASSEMBLY LOCAL ITER) {key}")
                 for indices in splitter(self.space, int_):
-                    yield self._assembly_kernel(key, indices)
+                    yield key, indices
+
+    def assembly_local_iterative(self):
+        """Assembly local matrix considering chunk size.
+        Yields local matrix and to_global_dof tuple."""
+        if self.num_workers > 0:
+            if self._workers.num_workers != self.num_workers:
+                self._workers.close()
+                self._workers = WorkerPool(self.num_workers, self.pool)
+            yield from parallel_kernels(self, self._iter_tasks(), self._workers)
+            return
+        for key, indices in self._iter_tasks():
+            yield self._assembly_kernel(key, indices)
+
+    def to_global_dof_iterative(self):
+        """Yield the to_global_dof tuples in the same order as
+        `assembly_local_iterative`, without running the integrals."""
+        for key, indices in self._iter_tasks():
+            yield self._to_global_dof_kernel(key, indices)
 
 
 class UniformSplitter():
@@ -1,6 +1,8 @@
 
 from typing import Union, Optional, Any, TypeVar, Tuple, List, Dict, Callable
 from typing import Generic
+from functools import wraps
+import inspect
 import logging
 
 from .. import logger
@@ -88,6 +90,7 @@ def enable_cache(func: Self) -> Self:
 
     Use `Integrator.keep_data(True)` to enable the cache.
     """
+    @wraps(func)
     def wrapper(integrator_obj, space, /, indices=None) -> TensorLike:
         if (indices is None) and (integrator_obj._keep_data):
             assert hasattr(integrator_obj, '_cache')
@@ -109,6 +112,13 @@ def enable_cache(func: Self) -> Self:
     return wrapper
 
 
+def _accepts_indices(func: Callable) -> bool:
+    try:
+        return 'indices' in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
 class Integrator(metaclass=IntegratorMeta):
     """The base class for integrators.
 
@@ -159,6 +169,7 @@ class Integrator(metaclass=IntegratorMeta):
     """
     _assembly_name_map: Dict[str, str] = {}
     _region: _Region = None
+    _region_version: int = 0
     etype: str
 
     def __init__(self, method='assembly', keep_data=False, *args, **kwds) -> None:
@@ -189,6 +200,7 @@ class Integrator(metaclass=IntegratorMeta):
         """Set the region of integration, given as indices of mesh entity,
         or a callable that receives a mesh and returns the indices."""
         self._region = region
+        self._region_version += 1
         self.clear()
         return self
 
@@ -197,6 +209,10 @@ class Integrator(metaclass=IntegratorMeta):
         or a callable that receives a mesh and returns the indices."""
         return self._region
 
+    def region_version(self) -> int:
+        """Return a counter increased whenever the region of integration is set."""
+        return self._region_version
+
     def entity_selection(self, indices: _OpIndex = None, *, mesh: Optional[Mesh] = None) -> Index:
         """Make the selection of integral entities."""
         if self._region is None:
@@ -243,6 +259,11 @@ class Integrator(metaclass=IntegratorMeta):
             else:
                 raise TypeError(f"region of type '{full_region.__class__.__name__}' "
                                 "is not supported when indices is given.")
+    def splittable(self) -> bool:
+        """Whether the assembly method and `to_global_dof` accept the `indices`
+        argument, so that the region can be integrated in chunks."""
+        meth = getattr(self, self._assembly_name_map[self._method])
+        return _accepts_indices(meth) and _accepts_indices(self.to_global_dof)
     ### END: Region of Integration ###
 
     def const(self, space: _SpaceGroup, /):
@@ -408,13 +429,21 @@ class GroupIntegrator(Integrator):
             self.ints.append(other)
         else:
             return NotImplemented
+        self._region_version += 1
         return self
 
+    def splittable(self) -> bool:
+        return all(integrator.splittable() for integrator in self.ints)
+
     def set_region(self, region: TensorLike, /) -> None:
         for integrator in self.ints:
             integrator.set_region(region)
         return super().set_region(region)
 
+    def region_version(self) -> int:
+        # NOTE: also changes when any sub-integrator is added or has its region set.
+        return self._region_version + sum(i.region_version() for i in self.ints)
+
     def to_global_dof(self, space: _SpaceGroup, /, indices: _OpIndex = None):
         if indices is None:
             return self.ints[0].to_global_dof(space)
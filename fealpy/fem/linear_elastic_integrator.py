@@ -11,7 +11,6 @@ from .integrator import (
     enable_cache,
     assemblymethod
 )
-from fealpy.fem.utils import SymbolicIntegration
 
 class LinearElasticIntegrator(LinearInt, OpInt, CellInt):
     """
@@ -180,6 +179,8 @@ class LinearElasticIntegrator(LinearInt, OpInt, CellInt):
         cm = mesh.entity_measure('cell', index=index)
         glambda_x = mesh.grad_lambda()  # (NC, LDOF, GD)
         
+        # NOTE: sympy is imported only for the symbolic assembly.
+        from .utils import SymbolicIntegration
         symbolic_int = SymbolicIntegration(space)
         M = bm.tensor(symbolic_int.gphi_gphi_matrix()) # (LDOF1, LDOF1, GD+1, GD+1)
 
@@ -41,11 +41,11 @@ class LinearForm(Form[LinearInt]):
         init_value_shape = (0,) if (batch_size == 0) else (batch_size, 0)
         sparse_shape = (gdof, )
 
-        M = COOTensor(
+        pieces = [COOTensor(
             indices = bm.empty((1, 0), dtype=space.itype, device=bm.get_device(space)),
             values = bm.empty(init_value_shape, dtype=space.ftype, device=bm.get_device(space)),
             spshape = sparse_shape
-        )
+        )]
 
         for group_tensor, e2dofs_tuple in self.assembly_local_iterative():
             if (batch_size > 0) and (group_tensor.ndim == 2):
@@ -53,9 +53,27 @@ class LinearForm(Form[LinearInt]):
 
             indices = e2dofs_tuple[0].reshape(1, -1)
             group_tensor = bm.reshape(group_tensor, self._values_ravel_shape)
-            M = M.add(COOTensor(indices, group_tensor, sparse_shape))
+            pieces.append(COOTensor(indices, group_tensor, sparse_shape))
 
-        return M
+        return COOTensor.accumulate(pieces, coalesce=False)
+
+    def _dense_assembly(self):
+        self.check_space()
+        space = self._spaces[0]
+        batch_size = self.batch_size
+        gdof = space.number_of_global_dofs()
+        shape = (gdof, ) if (batch_size == 0) else (batch_size, gdof)
+        V = bm.zeros(shape, dtype=space.ftype, device=bm.get_device(space))
+
+        for group_tensor, e2dofs_tuple in self.assembly_local_iterative():
+            if (batch_size > 0) and (group_tensor.ndim == 2):
+                group_tensor = bm.stack([group_tensor]*batch_size, axis=0)
+
+            indices = e2dofs_tuple[0].reshape(-1)
+            group_tensor = bm.reshape(group_tensor, self._values_ravel_shape)
+            V = bm.index_add(V, indices, group_tensor, axis=-1)
+
+        return V
 
     @overload
     def assembly(self) -> TensorLike: ...
@@ -70,9 +88,20 @@ class LinearForm(Form[LinearInt]):
             format (str, optional): Layout of the output ('dense', 'coo'). Defaults to 'dense'.\n
             retain_ints (bool, optional): Whether to retain the integrator cache.
 
+        Note:
+            If the form has a `chunk_size`, the dense vector is accumulated chunk
+            by chunk, so that the local tensors are never held for all the entities.
+            If the form has `num_workers`, chunks are integrated in parallel and
+            accumulated in the same way.
+
         Returns:
             global_vector (COOTensor | TensorLike): Global sparse vector shaped ([batch, ]gdof).
         """
+        if ((self.chunk_size > 0) or (self.num_workers > 0)) and (format == 'dense'):
+            self._V = self._dense_assembly()
+            logger.info(f"Linear form vector constructed, with shape {list(self._V.shape)}.")
+            return self._V
+
         V = self._scalar_assembly()
 
         if format == 'dense':
@@ -0,0 +1,105 @@
+
+from typing import List, Tuple, TYPE_CHECKING
+
+from ..typing import TensorLike
+from ..backend import backend_manager as bm
+from ..solver.linear_operator import LinearOperator
+
+if TYPE_CHECKING:
+    from .bilinear_form import BilinearForm
+
+_Piece = Tuple[TensorLike, TensorLike, TensorLike]
+
+
+class MatrixFreeOperator(LinearOperator):
+    """Matrix-free linear operator of a bilinear form.
+
+    The operator applies the local (element) tensors of the form to vectors
+    by gathering, contracting and scattering, without assembling any global matrix.
+
+    Parameters:
+        form (BilinearForm): The bilinear form without batch.
+        cache (bool, optional): Whether to keep the local tensors in the operator.
+            If False, local tensors are evaluated again in every product,
+            and the peak memory is limited by the splitters of the form.
+            Defaults to True.
+
+    Note:
+        The cached local tensors are evaluated when the operator is created.
+        Call `update()` after changing the coefficients or the mesh.
+    """
+    def __init__(self, form: 'BilinearForm', *, cache: bool=True):
+        if form.batch_size > 0:
+            raise ValueError("MatrixFreeOperator does not support batched forms.")
+        self.form = form
+        self.cache = cache
+        self._pieces: List[_Piece] = []
+        self.update()
+        space = form._spaces[0]
+        super().__init__(self._shape, self._mult, dtype=space.ftype,
+                         rmatvec=self._rmult, diagonal=self._diag)
+
+    def update(self):
+        """Evaluate the local tensors again and update the shape."""
+        shape = self.form._get_sparse_shape()
+        self._transposed = getattr(self.form, '_transposed', False)
+        if self._transposed:
+            shape = tuple(reversed(shape))
+        self._shape = shape
+        self.shape = shape
+        self._pieces = list(self._iter_pieces()) if self.cache else []
+        return self
+
+    def _iter_pieces(self):
+        for group_tensor, e2dofs_tuple in self.form.assembly_local_iterative():
+            ue2dof = e2dofs_tuple[0]
+            ve2dof = e2dofs_tuple[1] if (len(e2dofs_tuple) > 1) else ue2dof
+            if self._transposed:
+                group_tensor = bm.swapaxes(group_tensor, -1, -2)
+                ue2dof, ve2dof = ve2dof, ue2dof
+            yield group_tensor, ue2dof, ve2dof
+
+    def pieces(self):
+        """Iterate over tuples of (local tensor, ue2dof, ve2dof)."""
+        if self.cache:
+            return iter(self._pieces)
+        return self._iter_pieces()
+
+    def _apply(self, x: TensorLike, nrow: int, transpose: bool) -> TensorLike:
+        out_shape = (nrow,) + tuple(x.shape[1:])
+        y = bm.zeros(out_shape, **bm.context(x))
+
+        for lt, ue2dof, ve2dof in self.pieces():
+            if transpose:
+                ue2dof, ve2dof = ve2dof, ue2dof
+                subs = 'cji'
+            else:
+                subs = 'cij'
+            gx = x[ue2dof] # (NC, uldof, ...)
+            if x.ndim == 1:
+                gy = bm.einsum(f'{subs}, cj -> ci', lt, gx)
+                y = bm.index_add(y, ve2dof.reshape(-1), gy.reshape(-1))
+            else:
+                gy = bm.einsum(f'{subs}, cjk -> cik', lt, gx)
+                y = bm.index_add(y, ve2dof.reshape(-1), gy.reshape(-1, x.shape[-1]))
+
+        return y
+
+    def _mult(self, x: TensorLike) -> TensorLike:
+        return self._apply(x, self._shape[0], False)
+
+    def _rmult(self, x: TensorLike) -> TensorLike:
+        return self._apply(x, self._shape[1], True)
+
+    def _diag(self) -> TensorLike:
+        n = min(self._shape)
+        d = None
+
+        for lt, ue2dof, ve2dof in self.pieces():
+            if d is None:
+                d = bm.zeros((n,), **bm.context(lt))
+            flag = ve2dof[:, :, None] == ue2dof[:, None, :] # (NC, vldof, uldof)
+            row = bm.broadcast_to(ve2dof[:, :, None], flag.shape)
+            d = bm.index_add(d, row[flag], lt[flag])
+
+        return d
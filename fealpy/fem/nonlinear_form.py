@@ -82,11 +82,11 @@ class NonlinearForm(Form[NonlinearInt]):
         init_value_shape = (0,) if (batch_size == 0) else (batch_size, 0)
         sparse_shape = (vgdof, ugdof)
 
-        M = COOTensor(
+        pieces = [COOTensor(
             indices = bm.empty((2, 0), dtype=space[0].itype),
             values = bm.empty(init_value_shape, dtype=space[0].ftype),
             spshape = sparse_shape
-        )
+        )]
 
         for group in self.integrators.keys():
             if isinstance(self.integrators[group][0], OpInt):
@@ -101,8 +101,9 @@ class NonlinearForm(Form[NonlinearInt]):
                 I = bm.broadcast_to(ve2dof[:, :, None], local_shape)
                 indices = bm.stack([I.ravel(), J.ravel()], axis=0)
                 group_tensor = bm.reshape(group_tensor, self._values_ravel_shape)
-                M = M.add(COOTensor(indices, group_tensor, sparse_shape))
-        return M
+                pieces.append(COOTensor(indices, group_tensor, sparse_shape))
+
+        return COOTensor.accumulate(pieces, coalesce=False)
 
     def _scalar_assembly_F(self, retain_ints: bool, batch_size: int):
 
@@ -111,11 +112,11 @@ class NonlinearForm(Form[NonlinearInt]):
         init_value_shape = (0,) if (batch_size == 0) else (batch_size, 0)
         sparse_shape = (gdof, )
 
-        M = COOTensor(
+        pieces = [COOTensor(
             indices = bm.empty((1, 0), dtype=space.itype),
             values = bm.empty(init_value_shape, dtype=space.ftype),
             spshape = sparse_shape
-        )
+        )]
 
         for group in self.integrators.keys():
             if isinstance(self.integrators[group][0], SrcInt):
@@ -128,9 +129,9 @@ class NonlinearForm(Form[NonlinearInt]):
 
             indices = e2dofs[0].reshape(1, -1)
             group_tensor = bm.reshape(group_tensor, self._values_ravel_shape)
-            M = M.add(COOTensor(indices, group_tensor, sparse_shape))
+            pieces.append(COOTensor(indices, group_tensor, sparse_shape))
 
-        return M
+        return COOTensor.accumulate(pieces, coalesce=False)
 
     def assembly(self, *, return_dense=True, coalesce=True, format='csr',retain_ints: bool=False) -> COOTensor:
 
@@ -0,0 +1,283 @@
+
+from typing import Iterable, Iterator, Literal, Optional, Tuple, Any, List, Union, Callable
+from collections import deque
+from functools import partial
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+
+from .. import logger
+from ..typing import TensorLike
+from ..backend import backend_manager as bm
+from .integrator import Integrator, GroupIntegrator
+
+_Task = Tuple[str, Any]
+_WORKER_FORM = None
+
+
+class PartitionSplitter():
+    """A splitter dividing the entities of the integrators into partitions,
+    which are integrated separately, e.g. by the workers of a parallel form.
+
+    Parameters:
+        nparts (int): Number of partitions.
+        parts (Tensor | None, optional): Partition number of every entity in the
+            region of the integrator, shaped (size,), e.g. the cell partition
+            given by `fealpy.graph.metis.part_mesh`. If None, entities are divided
+            into contiguous ranges of almost equal sizes. Defaults to None.
+    """
+    def __init__(self, nparts: int, /, parts: Optional[TensorLike]=None):
+        if nparts <= 0:
+            raise ValueError(f"nparts should be positive, but got {nparts}.")
+        self.nparts = nparts
+        self.parts = parts
+
+    def __call__(self, space, integrator: Integrator):
+        if isinstance(space, (list, tuple)):
+            space = space[0]
+        size = int(integrator.size(space.mesh))
+
+        if self.parts is None:
+            for i in range(self.nparts):
+                start = size * i // self.nparts
+                stop = size * (i + 1) // self.nparts
+                if stop > start:
+                    logger.debug(f"(FORM PARTITION) {i+1}/{self.nparts}")
+                    yield slice(start, stop, 1)
+        else:
+            if self.parts.shape[0] != size:
+                raise ValueError(f"Length of parts ({self.parts.shape[0]}) does not "
+                                 f"match the number of entities ({size}).")
+            for i in range(self.nparts):
+                indices = bm.nonzero(self.parts == i)[0]
+                if indices.shape[0] > 0:
+                    logger.debug(f"(FORM PARTITION) {i+1}/{self.nparts}")
+                    yield indices
+
+
+def _set_worker_form(form):
+    global _WORKER_FORM
+    _WORKER_FORM = form
+
+
+def _worker_kernel(task: _Task):
+    key, indices = task
+    return _WORKER_FORM._assembly_kernel(key, indices)
+
+
+def _form_kernel(form, task: _Task):
+    return form._assembly_kernel(*task)
+
+
+def _make_executor(form, num_workers: int, pool: str) -> Executor:
+    if pool == 'thread':
+        # NOTE: The backend is thread-local, so it is set again in the workers.
+        return ThreadPoolExecutor(num_workers, initializer=bm.set_backend,
+                                  initargs=(bm.backend_name,))
+    elif pool == 'process':
+        import multiprocessing as mp
+
+        if 'fork' not in mp.get_all_start_methods():
+            raise RuntimeError("Process pools require the 'fork' start method, "
+                               "which is not available on this platform.")
+        # Workers are forked with the form, so that the mesh arrays are shared
+        # copy-on-write instead of being pickled.
+        return ProcessPoolExecutor(num_workers, mp_context=mp.get_context('fork'),
+                                   initializer=_set_worker_form, initargs=(form,))
+    else:
+        raise ValueError(f"Unknown pool type '{pool}', expected 'thread' or 'process'.")
+
+
+def _form_state(form) -> List[Any]:
+    """The objects that forked workers copy from the form: the spaces, the mesh
+    entities and the integrators with their attributes. A process pool is forked
+    again when any of them has been replaced."""
+    state = []
+    for space in form._spaces:
+        mesh = space.mesh
+        state.extend((space, mesh, mesh.entity('node'), mesh.entity('cell')))
+    for key, integrator in form.integrators.items():
+        ints = list(integrator) if isinstance(integrator, GroupIntegrator) else [integrator]
+        state.append(key)
+        for int_ in ints:
+            state.append(int_)
+            state.extend(vars(int_).values())
+    return state
+
+
+class WorkerPool():
+    """The pool of workers kept by a form, reused by its assemblies.
+
+    Parameters:
+        num_workers (int): Number of workers.
+        pool (str | Executor, optional): 'thread', 'process', or an executor given
+            by the caller, e.g. a ThreadPoolExecutor shared by several forms.
+            Defaults to 'thread'.
+
+    Note:
+        Process workers are forked with a snapshot of the form. The pool is forked
+        again when the spaces, the mesh entities, the integrators or their
+        attributes have been replaced, e.g. after refining the mesh or setting a
+        new coefficient. Call `close()` after modifying them in place.
+    """
+    def __init__(self, num_workers: int, pool: Union[str, Executor]='thread'):
+        if not isinstance(pool, Executor) and (pool not in ('thread', 'process')):
+            raise ValueError(f"Unknown pool type '{pool}', expected 'thread', "
+                             "'process' or an Executor.")
+        self.num_workers = num_workers
+        self.pool = pool
+        self._executor: Optional[Executor] = None
+        self._state: List[Any] = []
+
+    def executor(self, form) -> Executor:
+        """Return the executor running the kernels of the form."""
+        if isinstance(self.pool, Executor):
+            return self.pool
+        if self.pool == 'process':
+            state = _form_state(form)
+            if (len(state) != len(self._state)) or \
+                    any(a is not b for a, b in zip(state, self._state)):
+                self.close()
+                self._state = state
+        if self._executor is None:
+            self._executor = _make_executor(form, self.num_workers, self.pool)
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down the workers kept by the pool."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._state = []
+
+    def kernel(self, form) -> Callable[[_Task], Any]:
+        if self.pool == 'process':
+            return _worker_kernel
+        return partial(_form_kernel, form)
+
+
+def parallel_kernels(form, tasks: Iterable[_Task], workers: WorkerPool) -> Iterator:
+    """Run the assembly kernels of the form in a pool of workers, and yield
+    the results in the same order as the tasks.
+
+    Parameters:
+        form (Form): The form providing `_assembly_kernel(group, indices)`.
+        tasks (Iterable[Tuple[str, Index | None]]): Group names and entity indices.
+        workers (WorkerPool): The workers kept by the form.
+
+    Note:
+        At most `2 * num_workers` tasks are in flight, so that the memory of
+        pending local tensors is bounded as in the serial iteration.
+        Only the numpy backend runs in parallel. Other backends run the tasks
+        serially, as their function transforms (e.g. `torch.func`) are not
+        thread-safe, and they have intra-op parallelism themselves.
+    """
+    if bm.backend_name != 'numpy':
+        logger.warning(f"Parallel assembly is not supported by the {bm.backend_name} "
+                       "backend, running serially.")
+        for task in tasks:
+            yield form._assembly_kernel(*task)
+        return
+
+    tasks = iter(tasks)
+    first = next(tasks, None)
+    if first is None:
+        return
+    # NOTE: The first task is run in the caller to initialize the data
+    # constructed lazily by the mesh and spaces, before the workers read them.
+    yield form._assembly_kernel(*first)
+
+    executor = workers.executor(form)
+    func = workers.kernel(form)
+    pending = deque()
+    try:
+        for task in tasks:
+            pending.append(executor.submit(func, task))
+            if len(pending) >= 2 * workers.num_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+_WORKER_SUBDOMAIN = None
+
+
+def _set_worker_subdomain(partition, space, build):
+    global _WORKER_SUBDOMAIN
+    _WORKER_SUBDOMAIN = (partition, space, build)
+
+
+def _subdomain_kernel(i: int):
+    partition, space, build = _WORKER_SUBDOMAIN
+    sub = partition.subdomain(i, overlap=0)
+    form = build(sub.mesh)
+    local = form.assembly(format='coo').coalesce()
+    l2g = partition.local_to_global_dofs(space, sub, form.space)
+    indices = l2g[local.indices()]
+    return bm.to_numpy(indices), bm.to_numpy(local.values())
+
+
+def subdomain_assembly(partition, space, build, *, num_workers: int=0,
+                       format: Literal['coo', 'csr']='csr'):
+    """Assemble a bilinear form by subdomains, each built on the mesh of the
+    subdomain and assembled in a separate process, and sum the local matrices
+    by the local-to-global maps of the DoFs.
+
+    Parameters:
+        partition (MeshPartition): The partition of the mesh of `space`.
+        space (FunctionSpace): The global space.
+        build (Callable[[Mesh], BilinearForm]): Build the form on a subdomain mesh,
+            on the same kind of space as `space`.
+        num_workers (int, optional): Number of the processes. Serial if 0.
+            Defaults to 0.
+        format (str, optional): 'coo' or 'csr'. Defaults to 'csr'.
+
+    Returns:
+        COOTensor | CSRTensor: The global matrix in shape (gdof, gdof).
+
+    Examples:
+        >>> def build(mesh):
+        ...     form = BilinearForm(LagrangeFESpace(mesh, p=2))
+        ...     return form.add_integrator(ScalarDiffusionIntegrator())
+        >>> A = subdomain_assembly(MeshPartition(mesh, 4), space, build, num_workers=4)
+
+    Note:
+        The subdomains are assembled without the ghost layers, so every cell is
+        integrated once. The workers are forked, sharing the global mesh without
+        pickling, and only the entries of the local matrices are sent back.
+        Only the numpy backend runs in parallel.
+    """
+    from ..sparse import COOTensor
+
+    if format not in ('coo', 'csr'):
+        raise ValueError(f"Unknown format '{format}', expected 'coo' or 'csr'.")
+    nparts = partition.number_of_parts()
+    # NOTE: the DoFs are constructed before forking, so that all workers share them.
+    space.cell_to_dof()
+    _set_worker_subdomain(partition, space, build)
+
+    try:
+        if (num_workers > 0) and (bm.backend_name == 'numpy'):
+            import multiprocessing as mp
+            if 'fork' not in mp.get_all_start_methods():
+                raise RuntimeError("Subdomain assembly requires the 'fork' start "
+                                   "method, which is not available on this platform.")
+            with ProcessPoolExecutor(num_workers, mp_context=mp.get_context('fork'),
+                                     initializer=_set_worker_subdomain,
+                                     initargs=(partition, space, build)) as executor:
+                results = list(executor.map(_subdomain_kernel, range(nparts)))
+        else:
+            if num_workers > 0:
+                logger.warning(f"Parallel assembly is not supported by the "
+                               f"{bm.backend_name} backend, running serially.")
+            results = [_subdomain_kernel(i) for i in range(nparts)]
+    finally:
+        _set_worker_subdomain(None, None, None)
+
+    gdof = space.number_of_global_dofs()
+    kwargs = bm.context(space.cell_to_dof())
+    indices = bm.concat([bm.tensor(idx, **kwargs) for idx, _ in results], axis=1)
+    values = bm.concat([bm.tensor(val, dtype=space.ftype) for _, val in results])
+    A = COOTensor(indices, values, (gdof, gdof)).coalesce()
+    return A if format == 'coo' else A.tocsr()
@@ -18,6 +18,7 @@ from .integrator import (
 class ScalarConvectionIntegrator(LinearInt, OpInt, CellInt):
     r"""The convection integrator for function spaces based on homogeneous meshes."""
     def __init__(self, coef: Optional[CoefLike]=None, q: Optional[int]=None, *,
+                 region: Optional[TensorLike] = None,
                  index: Index=_S,
                  batched: bool=False,
                  method: Optional[str]=None) -> None:
@@ -25,16 +26,22 @@ class ScalarConvectionIntegrator(LinearInt, OpInt, CellInt):
         super().__init__(method=method)
         self.coef = coef
         self.q = q
-        self.index = index
+        if (region is None) and not (isinstance(index, slice) and index == _S):
+            region = index # NOTE: `index` is kept for compatibility.
+        self.set_region(region)
         self.batched = batched
 
+    @property
+    def index(self) -> Index:
+        return self.entity_selection()
+
     @enable_cache
-    def to_global_dof(self, space: _FS) -> TensorLike:
-        return space.cell_to_dof()[self.index]
+    def to_global_dof(self, space: _FS, /, indices=None) -> TensorLike:
+        return space.cell_to_dof()[self.entity_selection(indices)]
 
     @enable_cache
-    def fetch(self, space: _FS):
-        index = self.index
+    def fetch(self, space: _FS, /, indices=None):
+        index = self.entity_selection(indices)
         mesh = getattr(space, 'mesh', None)
 
         if not isinstance(mesh, HomogeneousMesh):
@@ -50,10 +57,10 @@ class ScalarConvectionIntegrator(LinearInt, OpInt, CellInt):
         phi = space.basis(bcs, index=index)
         return bcs, ws, phi, gphi, cm, index
 
-    def assembly(self, space: _FS) -> TensorLike:
+    def assembly(self, space: _FS, /, indices=None) -> TensorLike:
         coef = self.coef
         mesh = getattr(space, 'mesh', None)
-        bcs, ws, phi, gphi, cm, index = self.fetch(space)
+        bcs, ws, phi, gphi, cm, index = self.fetch(space, indices)
         coef = process_coef_func(coef, bcs=bcs, mesh=mesh, etype='cell', index=index)
         if is_tensor(coef):
             gphi = bm.einsum('cqi...j, cq...j->cqi...' ,gphi, coef)
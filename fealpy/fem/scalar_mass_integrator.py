@@ -17,6 +17,7 @@ from .integrator import (
 
 class ScalarMassIntegrator(LinearInt, OpInt, CellInt):
     def __init__(self, coef: Optional[CoefLike]=None, q: Optional[int]=None, *,
+                 region: Optional[TensorLike] = None,
                  index: Index=_S,
                  batched: bool=False,
                  method: Optional[str]=None) -> None:
@@ -24,17 +25,23 @@ class ScalarMassIntegrator(LinearInt, OpInt, CellInt):
         super().__init__(method=method)
         self.coef = coef
         self.q = q
-        self.index = index
+        if (region is None) and not (isinstance(index, slice) and index == _S):
+            region = index # NOTE: `index` is kept for compatibility.
+        self.set_region(region)
         self.batched = batched
 
+    @property
+    def index(self) -> Index:
+        return self.entity_selection()
+
     @enable_cache
-    def to_global_dof(self, space: _FS) -> TensorLike:
-        return space.cell_to_dof()[self.index]
+    def to_global_dof(self, space: _FS, /, indices=None) -> TensorLike:
+        return space.cell_to_dof()[self.entity_selection(indices)]
 
     @enable_cache
-    def fetch(self, space: _FS):
+    def fetch(self, space: _FS, /, indices=None):
         q = self.q
-        index = self.index
+        index = self.entity_selection(indices)
         mesh = getattr(space, 'mesh', None)
 
         if not isinstance(mesh, HomogeneousMesh):
@@ -49,10 +56,10 @@ class ScalarMassIntegrator(LinearInt, OpInt, CellInt):
         phi = space.basis(bcs, index=index)
         return bcs, ws, phi, cm, index
 
-    def assembly(self, space: _FS) -> TensorLike:
+    def assembly(self, space: _FS, /, indices=None) -> TensorLike:
         coef = self.coef
         mesh = getattr(space, 'mesh', None)
-        bcs, ws, phi, cm, index = self.fetch(space)
+        bcs, ws, phi, cm, index = self.fetch(space, indices)
         val = process_coef_func(coef, bcs=bcs, mesh=mesh, etype='cell', index=index)
 
         return bilinear_integral(phi, phi, ws, cm, val, batched=self.batched)
@@ -0,0 +1,172 @@
+
+from typing import Hashable, Iterable, Optional, Sequence, Tuple
+
+from ..typing import TensorLike, Size
+from ..backend import backend_manager as bm
+from ..functionspace import FunctionSpace as _FS
+
+
+def _flat_keys(indices: TensorLike, ncol: int) -> TensorLike:
+    return bm.astype(indices[0], bm.int64) * ncol + bm.astype(indices[1], bm.int64)
+
+
+def _sorted_unique(keys: TensorLike) -> TensorLike:
+    # NOTE: Faster than `unique` for large int64 keys, as the latter may hash them.
+    keys = bm.sort(keys)
+    if keys.shape[0] <= 1:
+        return keys
+    flag = bm.concat([bm.ones((1,), dtype=bm.bool, device=bm.get_device(keys)),
+                      keys[1:] != keys[:-1]], axis=0)
+    return keys[flag]
+
+
+class SparsityPattern():
+    """The CSR structure of a global matrix, with tools to add local entries
+    into the slots of the CSR values.
+
+    Local entries can be located in two ways:
+    (1) by a scatter map, recording the slots of all the flattened local tensors in the
+    order that they are yielded by the form, built by `from_indices`;
+    (2) by searching the (row, col) keys in the sorted keys of the pattern,
+    which requires no memory proportional to the local entries, built by `from_chunks`.
+
+    Parameters:
+        keys (Tensor): Sorted unique flat keys `row * ncol + col` of the non-zeros.
+        spshape (Size): Shape of the global matrix.
+        spaces (Tuple[FunctionSpace, ...]): Spaces of the form, used to detect
+            changes in the mesh.
+        itype (dtype): Data type of the CSR indices.
+        scatter (Tensor | None, optional): The scatter map. Defaults to None.
+        sizes (Sequence[int] | None, optional): Number of local entries in each piece
+            of the scatter map. Defaults to None.
+        state (Hashable, optional): State of the integrators of the form when the
+            pattern is built, see `Form._integrator_state`. Defaults to None.
+    """
+    def __init__(self, keys: TensorLike, spshape: Size,
+                 spaces: Tuple[_FS, ...], itype, *,
+                 scatter: Optional[TensorLike]=None,
+                 sizes: Optional[Sequence[int]]=None,
+                 state: Hashable=None):
+        nrow, ncol = spshape
+        kwargs = {'dtype': bm.int64, 'device': bm.get_device(keys)}
+        row = keys // ncol
+
+        self.spshape = tuple(spshape)
+        self.keys = keys
+        self.col = bm.astype(keys % ncol, itype)
+        self.crow = bm.astype(
+            bm.searchsorted(row, bm.arange(nrow + 1, **kwargs)),
+            itype
+        )
+        self.scatter = scatter
+        self.sizes = None if sizes is None else tuple(int(s) for s in sizes)
+        self._cells = tuple(s.mesh.entity('cell') for s in spaces)
+        self._gdofs = tuple(s.number_of_global_dofs() for s in spaces)
+        self._state = state
+
+    @classmethod
+    def from_indices(cls, indices: TensorLike, spshape: Size,
+                     spaces: Tuple[_FS, ...], sizes: Sequence[int], state: Hashable=None):
+        """Build the pattern with a scatter map from all the local (row, col) indices
+        shaped (2, N), which are concatenated from pieces of the given sizes."""
+        flat = _flat_keys(indices, spshape[1])
+        keys, scatter = bm.unique(flat, return_inverse=True)
+        return cls(keys, spshape, spaces, indices.dtype,
+                   scatter=scatter.reshape(-1), sizes=sizes, state=state)
+
+    @classmethod
+    def from_chunks(cls, indices_iter: Iterable[TensorLike], spshape: Size,
+                    spaces: Tuple[_FS, ...], state: Hashable=None):
+        """Build the pattern without scatter map from an iterable of local
+        (row, col) indices, each shaped (2, n). Only the unique keys of each
+        chunk are kept during the construction."""
+        keys_list = []
+        itype = None
+
+        for indices in indices_iter:
+            itype = indices.dtype
+            keys_list.append(_sorted_unique(_flat_keys(indices, spshape[1])))
+
+        if len(keys_list) == 0:
+            raise RuntimeError("No local indices to build the sparsity pattern.")
+
+        keys = _sorted_unique(bm.concat(keys_list, axis=0))
+        return cls(keys, spshape, spaces, itype, state=state)
+
+    @property
+    def nnz(self) -> int:
+        return self.col.shape[0]
+
+    def match(self, spaces: Tuple[_FS, ...], state: Hashable=None) -> bool:
+        """Check whether the pattern is still valid for the spaces and integrators.
+        Returns False if the cells of any mesh have been reassigned,
+        the number of global dofs has changed, or the state of the integrators
+        differs from the one the pattern was built with."""
+        if state != self._state:
+            return False
+        if len(spaces) != len(self._cells):
+            return False
+        for space, cell, gdof in zip(spaces, self._cells, self._gdofs):
+            if space.mesh.entity('cell') is not cell:
+                return False
+            if space.number_of_global_dofs() != gdof:
+                return False
+        return True
+
+    def locate(self, indices: TensorLike) -> Optional[TensorLike]:
+        """Return the slots in the CSR values of the local (row, col) indices,
+        or None if any of them is not a non-zero of the pattern."""
+        query = _flat_keys(indices, self.spshape[1])
+        if self.nnz == 0:
+            return None if query.shape[0] > 0 else query
+        pos = bm.clip(bm.searchsorted(self.keys, query), 0, self.nnz - 1)
+        if not bool(bm.all(self.keys[pos] == query)):
+            return None
+        return pos
+
+    def zeros(self, dense_shape: Size, **kwargs) -> TensorLike:
+        """Return zero CSR values shaped (*dense_shape, nnz)."""
+        return bm.zeros(tuple(dense_shape) + (self.nnz,), **kwargs)
+
+    def add_values(self, values: TensorLike, indices: TensorLike,
+                   local_values: TensorLike) -> Optional[TensorLike]:
+        """Add the local values at the (row, col) indices into the CSR values.
+        Returns None if any of the indices is not located in the pattern."""
+        slots = self.locate(indices)
+        if slots is None:
+            return None
+        return bm.index_add(values, slots, local_values, axis=-1)
+
+    def scatter_values(self, local_values: Iterable[TensorLike]) -> Optional[TensorLike]:
+        """Add the flattened local values into the CSR values by the scatter map.
+
+        Parameters:
+            local_values (Iterable[Tensor]): Flattened local tensors shaped ([batch, ]n),
+                in the same order and sizes as those when the pattern was built.
+
+        Returns:
+            Tensor | None: CSR values shaped ([batch, ]nnz), or None if the sizes of
+            the local values do not match the pattern or there is no scatter map.
+        """
+        if self.scatter is None:
+            return None
+
+        values = None
+        n_pieces = 0
+        cursor = 0
+
+        for lv in local_values:
+            size = lv.shape[-1]
+            if (n_pieces >= len(self.sizes)) or (size != self.sizes[n_pieces]):
+                return None
+            if values is None:
+                values = self.zeros(lv.shape[:-1], **bm.context(lv))
+            index = self.scatter[cursor:cursor+size]
+            values = bm.index_add(values, index, lv, axis=-1)
+            cursor += size
+            n_pieces += 1
+
+        if (values is None) or (n_pieces != len(self.sizes)):
+            return None
+
+        return values
@@ -0,0 +1,244 @@
+
+from typing import Optional, Literal, Tuple
+
+from ..backend import backend_manager as bm
+from ..typing import TensorLike
+from ..sparse import COOTensor, CSRTensor
+from ..functionspace import LagrangeFESpace
+from ..solver import factorize
+
+
+def _clip_triangles(tri: TensorLike, grad_lambda: TensorLike,
+                    origin: TensorLike) -> Tuple[TensorLike, TensorLike]:
+    """Clip the triangles by the half planes {lambda_i >= 0} of other triangles
+    (the Sutherland-Hodgman algorithm), where lambda_i(x) is the i-th barycentric
+    coordinate as an affine function.
+
+    Parameters:
+        tri (Tensor): Vertices of the triangles to be clipped, in shape (N, 3, 2).
+        grad_lambda (Tensor): Gradients of the barycentric coordinates of the
+            clipping triangles, in shape (N, 3, 2).
+        origin (Tensor): The first vertex of the clipping triangles, in shape (N, 2).
+
+    Returns:
+        Tensor: Vertices of the convex intersections in shape (N, 6, 2).
+        Tensor: Number of the vertices in shape (N,).
+    """
+    N = tri.shape[0]
+    MAXV = 6
+    context = bm.context(tri)
+    kwargs = {'dtype': bm.int64, 'device': bm.get_device(tri)}
+    poly = bm.concat([tri, bm.zeros((N, MAXV-3, 2), **context)], axis=1)
+    nv = bm.full((N,), 3, **kwargs)
+    local = bm.arange(MAXV, **kwargs)
+    rows = bm.arange(N, **kwargs)[:, None]
+
+    for i in range(3):
+        g = grad_lambda[:, None, i]
+        d = (poly[..., 0] - origin[:, None, 0]) * g[..., 0] + \
+            (poly[..., 1] - origin[:, None, 1]) * g[..., 1]
+        if i == 0:
+            d = d + 1
+        valid = local[None, :] < nv[:, None]
+        nxt = bm.where(local[None, :] + 1 < nv[:, None], local[None, :] + 1, 0)
+        d1 = d[rows, nxt]
+        p1 = poly[rows, nxt]
+
+        keep = valid & (d >= 0)
+        cross = valid & ((d >= 0) != (d1 >= 0))
+        t = d / bm.where(cross, d - d1, 1.)
+        xpoint = poly + t[..., None] * (p1 - poly)
+        # Each vertex emits itself if kept, then the crossing point on its edge.
+        cand = bm.reshape(bm.stack([poly, xpoint], axis=2), (N, 2*MAXV, 2))
+        flag = bm.reshape(bm.stack([keep, cross], axis=2), (N, 2*MAXV))
+        pos = bm.cumsum(bm.astype(flag, bm.int64), axis=1) - 1
+        nv = pos[:, -1] + 1
+        pos = bm.where(flag, pos, MAXV) # dropped to a dummy column
+
+        new = bm.zeros((N, MAXV+1, 2), **context)
+        new = bm.set_at(new, (bm.broadcast_to(rows, pos.shape), pos), cand)
+        poly = new[:, :MAXV]
+
+    return poly, nv
+
+
+class TransferOperator():
+    """Transfer of Lagrange finite element functions between non-matching meshes,
+    e.g. before and after remeshing, represented by a sparse matrix so that
+    repeated transfers cost a single sparse matrix-vector product.
+
+    Parameters:
+        source (LagrangeFESpace): The space where the functions come from.
+        target (LagrangeFESpace): The space where the functions go to.
+        method ('interpolation' | 'projection', optional): 'interpolation' evaluates
+            the source functions at the interpolation points of the target space.
+            'projection' is the L2 projection. Defaults to 'interpolation'.
+        lumped (bool, optional): Whether to use the lumped mass matrix in the L2
+            projection, which gives a sparse transfer matrix. Only for linear
+            target spaces. Defaults to False.
+        q (int | None, optional): Index of the quadrature formula of the projection.
+            Defaults to the sum of the degrees plus one.
+        solver (str, optional): The direct solver of the mass matrix in the
+            consistent L2 projection. Defaults to 'scipy'.
+
+    Examples:
+        >>> T = TransferOperator(old_space, new_space, 'projection')
+        >>> uh_new = T(uh_old)
+
+    Note:
+        In 2-d, the projection integrates on the supermesh, the intersections of
+        the source and the target cells, so it is exact and conservative, i.e. the
+        integral of the function is preserved on the common domain. In 3-d, the
+        intersections are approximated by the quadrature on the target cells.
+        Interpolation points slightly outside the source mesh, e.g. on curved
+        boundaries, are evaluated in the nearest cells.
+
+        The matrix is `matrix` for the interpolation and the lumped projection.
+        For the consistent projection, `matrix` is the mixed mass matrix B, and
+        the transfer is M^{-1} B with the factorization of the target mass matrix M
+        kept in the operator.
+    """
+    def __init__(self, source: LagrangeFESpace, target: LagrangeFESpace,
+                 method: Literal['interpolation', 'projection']='interpolation', *,
+                 lumped: bool=False, q: Optional[int]=None, solver: str='scipy'):
+        if method not in ('interpolation', 'projection'):
+            raise ValueError(f"Unknown transfer method '{method}', expected "
+                             "'interpolation' or 'projection'.")
+        if lumped and target.p != 1:
+            raise ValueError("the lumped projection requires a linear target space.")
+        self.source = source
+        self.target = target
+        self.method = method
+        self.lumped = lumped
+        self.solver = solver
+        self.shape = (target.number_of_global_dofs(), source.number_of_global_dofs())
+
+        if method == 'interpolation':
+            self.matrix = self._assemble(*self._interpolation_entries())
+        else:
+            if q is None:
+                q = source.p + target.p + 1
+            rows, cols, val = self._mixed_mass_entries(q)
+            M = self._mass_matrix(q)
+            if lumped:
+                mass = M @ bm.ones((M.shape[1],), **bm.context(val))
+                val = val / mass[rows]
+            else:
+                self._mass = factorize(M, solver, cache=False)
+            self.matrix = self._assemble(rows, cols, val)
+
+    def __call__(self, uh: TensorLike):
+        """Transfer the function, or the dofs in shape (sgdof,) or (sgdof, ...),
+        and return a function of the target space."""
+        array = uh.array if hasattr(uh, 'space') else uh
+        return self.target.function(self @ array)
+
+    def __matmul__(self, u: TensorLike) -> TensorLike:
+        v = self.matrix @ u
+        if self.method == 'projection' and not self.lumped:
+            v = self._mass.solve(v)
+        return v
+
+    ### assembly
+
+    def _interpolation_entries(self):
+        source, target = self.source, self.target
+        points = target.interpolation_points()
+        cell, bc = source.mesh.point_locator().locate(points, nearest=True)
+        inside = cell >= 0
+        cell, bc = cell[inside], bc[inside]
+
+        val = source.mesh.shape_function(bc, source.p) # (NP, SLDOF)
+        cols = source.cell_to_dof()[cell] # (NP, SLDOF)
+        rows = bm.broadcast_to(bm.nonzero(inside)[0][:, None], cols.shape)
+        return rows, cols, val
+
+    def _mixed_mass_entries(self, q: int):
+        """Entries of the mixed mass matrix B_ij = (phi_i, psi_j), where phi_i and
+        psi_j are the basis functions of the target and the source space."""
+        tmesh = self.target.mesh
+        bcs, ws = tmesh.quadrature_formula(q).get_quadrature_points_and_weights()
+
+        if tmesh.top_dimension() == 2:
+            tcell, scell, val = self._supermesh_integral(bcs, ws)
+        else:
+            tcell, scell, val = self._target_integral(bcs, ws)
+
+        rows = self.target.cell_to_dof()[tcell]
+        cols = self.source.cell_to_dof()[scell]
+        rows = bm.broadcast_to(rows[:, :, None], val.shape)
+        cols = bm.broadcast_to(cols[:, None, :], val.shape)
+        return rows, cols, val
+
+    def _supermesh_integral(self, bcs: TensorLike, ws: TensorLike):
+        """Integrate on the intersections of the target and the source cells."""
+        source, target = self.source, self.target
+        slocator = source.mesh.point_locator()
+        tlocator = target.mesh.point_locator()
+        tcell, scell = slocator.box_candidates(tlocator.cell_min, tlocator.cell_max)
+        tri = source.mesh.entity('node')[source.mesh.entity('cell')[scell]]
+        poly, nv = _clip_triangles(tri, tlocator.grad_lambda[tcell], tlocator.origin[tcell])
+        flag = nv >= 3
+        tcell, scell, poly, nv = tcell[flag], scell[flag], poly[flag], nv[flag]
+        NP, MAXV = poly.shape[0], poly.shape[1]
+
+        # Barycentric coordinates are affine, so they are evaluated at the vertices
+        # of the intersections, and interpolated to the quadrature points.
+        points = bm.reshape(poly, (NP*MAXV, 2))
+        tlam = bm.reshape(tlocator.barycenter(points, bm.repeat(tcell, MAXV)), (NP, MAXV, 3))
+        slam = bm.reshape(slocator.barycenter(points, bm.repeat(scell, MAXV)), (NP, MAXV, 3))
+        val = 0.
+
+        # fan triangulation of the convex intersections
+        for k in range(1, MAXV-1):
+            v1 = poly[:, k] - poly[:, 0]
+            v2 = poly[:, k+1] - poly[:, 0]
+            measure = bm.abs(v1[:, 0]*v2[:, 1] - v1[:, 1]*v2[:, 0]) / 2
+            measure = bm.where(nv > k+1, measure, 0.)
+            tphi = self._fan_basis(target, tlam, k, bcs) # (NP, NQ, TLDOF)
+            sphi = self._fan_basis(source, slam, k, bcs) # (NP, NQ, SLDOF)
+            val = val + bm.einsum('q, p, pqi, pqj -> pij', ws, measure, tphi, sphi)
+
+        return tcell, scell, val
+
+    @staticmethod
+    def _fan_basis(space: LagrangeFESpace, lam: TensorLike, k: int, bcs: TensorLike):
+        NP, NQ = lam.shape[0], bcs.shape[0]
+        vertex = bm.stack([lam[:, 0], lam[:, k], lam[:, k+1]], axis=1) # (NP, 3, 3)
+        bc = bm.reshape(bm.einsum('qv, pvb -> pqb', bcs, vertex), (NP*NQ, 3))
+        phi = space.mesh.shape_function(bc, space.p)
+        return bm.reshape(phi, (NP, NQ, phi.shape[-1]))
+
+    def _target_integral(self, bcs: TensorLike, ws: TensorLike):
+        """Integrate by the quadrature on the target cells, where the source
+        functions are evaluated at the quadrature points."""
+        source, target = self.source, self.target
+        tmesh = target.mesh
+        NC, NQ = tmesh.number_of_cells(), ws.shape[0]
+        points = bm.reshape(tmesh.bc_to_point(bcs), (NC*NQ, -1))
+        scell, sbc = source.mesh.point_locator().locate(points, nearest=True)
+        inside = scell >= 0
+        scell = bm.where(inside, scell, 0)
+        sbc = bm.where(inside[:, None], sbc, 0.)
+
+        weight = bm.reshape(tmesh.entity_measure('cell')[:, None] * ws[None, :], (NC*NQ,))
+        weight = bm.where(inside, weight, 0.)
+        tphi = tmesh.shape_function(bcs, target.p) # (NQ, TLDOF)
+        sphi = source.mesh.shape_function(sbc, source.p) # (NC*NQ, SLDOF)
+        sphi = bm.reshape(sphi, (NC, NQ, -1))
+        weight = bm.reshape(weight, (NC, NQ))
+        val = bm.einsum('cq, qi, cqj -> cqij', weight, tphi, sphi)
+        val = bm.reshape(val, (NC*NQ,) + val.shape[2:])
+        tcell = bm.repeat(bm.arange(NC, **bm.context(tmesh.entity('cell'))), NQ)
+        return tcell, scell, val
+
+    def _mass_matrix(self, q: int) -> CSRTensor:
+        from .bilinear_form import BilinearForm
+        from .scalar_mass_integrator import ScalarMassIntegrator
+        bform = BilinearForm(self.target)
+        bform.add_integrator(ScalarMassIntegrator(q=q))
+        return bform.assembly(format='csr')
+
+    def _assemble(self, rows: TensorLike, cols: TensorLike, val: TensorLike) -> CSRTensor:
+        indices = bm.stack([bm.reshape(rows, (-1,)), bm.reshape(cols, (-1,))], axis=0)
+        return COOTensor(indices, bm.reshape(val, (-1,)), self.shape).coalesce().tocsr()
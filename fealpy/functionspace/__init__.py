@@ -6,24 +6,31 @@ from .dofs import LinearMeshCFEDof
 
 from .lagrange_fe_space import LagrangeFESpace
 from .tensor_space import TensorFunctionSpace
-from .cm_conforming_fe_space import CmConformingFESpace2d
-from .cm_conforming_fe_space3d import CmConformingFESpace3d
-from .bernstein_fe_space import BernsteinFESpace
 
-from .first_nedelec_fe_space_2d import FirstNedelecFiniteElementSpace2d
-from .first_nedelec_fe_space_3d import FirstNedelecFiniteElementSpace3d
+# NOTE: the other spaces are imported on the first access, as some of them
+# import scipy or build large tables at the import.
+from .._lazy import lazy_attributes
 
-from .second_nedelec_fe_space_2d import SecondNedelecFiniteElementSpace2d
-from .second_nedelec_fe_space_3d import SecondNedelecFiniteElementSpace3d
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'CmConformingFESpace2d': '.cm_conforming_fe_space',
+    'CmConformingFESpace3d': '.cm_conforming_fe_space3d',
+    'BernsteinFESpace': '.bernstein_fe_space',
 
-from .RaviartThomasFiniteElementSpace2d import RTFiniteElementSpace2d
-from .RaviartThomasFiniteElementSpace3d import RTFiniteElementSpace3d
+    'FirstNedelecFiniteElementSpace2d': '.first_nedelec_fe_space_2d',
+    'FirstNedelecFiniteElementSpace3d': '.first_nedelec_fe_space_3d',
 
-from .parametric_lagrange_fe_space import ParametricLagrangeFESpace
+    'SecondNedelecFiniteElementSpace2d': '.second_nedelec_fe_space_2d',
+    'SecondNedelecFiniteElementSpace3d': '.second_nedelec_fe_space_3d',
 
-from .huzhang_fe_space_2d import HuZhangFESpace2D
+    'RTFiniteElementSpace2d': '.RaviartThomasFiniteElementSpace2d',
+    'RTFiniteElementSpace3d': '.RaviartThomasFiniteElementSpace3d',
 
-from .BrezziDouglasMariniFiniteElementSpace2d import BDMFiniteElementSpace2d
-from .BrezziDouglasMariniFiniteElementSpace3d import BDMFiniteElementSpace3d
+    'ParametricLagrangeFESpace': '.parametric_lagrange_fe_space',
 
-from .interior_penalty_fe_space_2d import InteriorPenaltyFESpace2d
+    'HuZhangFESpace2D': '.huzhang_fe_space_2d',
+
+    'BDMFiniteElementSpace2d': '.BrezziDouglasMariniFiniteElementSpace2d',
+    'BDMFiniteElementSpace3d': '.BrezziDouglasMariniFiniteElementSpace3d',
+
+    'InteriorPenaltyFESpace2d': '.interior_penalty_fe_space_2d',
+})
@@ -188,6 +188,35 @@ class LagrangeFESpace(FunctionSpace, Generic[_MT]):
         val = bm.einsum('cql, ...cl -> ...cq', phi, uh[..., e2dof])
         return val
 
+    @cartesian
+    def point_value(self, uh: TensorLike, points: TensorLike,
+                    hint: Optional[TensorLike]=None) -> TensorLike:
+        """Evaluate the finite element function at physical points, which are
+        located in the cells by `mesh.point_to_bc`.
+
+        Parameters:
+            uh (Tensor): Degrees of freedom in shape (..., gdof).
+            points (Tensor): Points in shape (..., GD).
+            hint (Tensor | None, optional): Initial guesses of the cells
+                containing the points, see `PointLocator.locate`. Defaults to None.
+
+        Returns:
+            Tensor: Values in shape (..., *points.shape[:-1]), NaN for points
+                outside the mesh.
+        """
+        shape = points.shape[:-1]
+        points = bm.reshape(points, (-1, points.shape[-1]))
+        cell, bc = self.mesh.point_to_bc(points, hint)
+        inside = cell >= 0
+        cell = bm.where(inside, cell, 0)
+        bc = bm.where(inside[:, None], bc, 0.)
+
+        phi = self.mesh.shape_function(bc, self.p) # (NP, LDOF)
+        c2d = self.cell_to_dof()[cell] # (NP, LDOF)
+        val = bm.einsum('pl, ...pl -> ...p', phi, uh[..., c2d])
+        val = bm.where(inside, val, bm.nan)
+        return bm.reshape(val, val.shape[:-1] + shape)
+
     @barycentric
     def grad_value(self, uh: TensorLike, bc: TensorLike, index: Index=_S) -> TensorLike:
         if isinstance(bc, tuple):
@@ -1,15 +1,29 @@
 
 from .mesh_data_structure import MeshDS
 from .mesh_base import Mesh, HomogeneousMesh, SimplexMesh, TensorMesh, StructuredMesh
+from .point_locator import PointLocator
+from .reorder import morton_order, hilbert_order, rcm_order, reorder_mesh
+from .mesh_store import MeshStore
+from .mesh_partition import partition_cells, MeshPartition, Subdomain
+from .neighbor_search import NeighborSearch, neighbor_pairs
+from .density_filter import filter_stencil, DensityFilter
 
-from .interval_mesh import IntervalMesh
-from .triangle_mesh import TriangleMesh
-from .tetrahedron_mesh import TetrahedronMesh
-from .quadrangle_mesh import QuadrangleMesh
-from .hexahedron_mesh import HexahedronMesh
+# NOTE: the meshes are imported on the first access, as they import scipy,
+# and NodeMesh builds the particle domains with jax.
+from .._lazy import lazy_attributes
 
-from .uniform_mesh_2d import UniformMesh2d
-from .uniform_mesh_3d import UniformMesh3d
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    'IntervalMesh': '.interval_mesh',
+    'TriangleMesh': '.triangle_mesh',
+    'TetrahedronMesh': '.tetrahedron_mesh',
+    'QuadrangleMesh': '.quadrangle_mesh',
+    'HexahedronMesh': '.hexahedron_mesh',
 
-from .lagrange_triangle_mesh import LagrangeTriangleMesh
-from .lagrange_quadrangle_mesh import LagrangeQuadrangleMesh
+    'UniformMesh2d': '.uniform_mesh_2d',
+    'UniformMesh3d': '.uniform_mesh_3d',
+
+    'LagrangeTriangleMesh': '.lagrange_triangle_mesh',
+    'LagrangeQuadrangleMesh': '.lagrange_quadrangle_mesh',
+
+    'NodeMesh': '.node_mesh',
+})
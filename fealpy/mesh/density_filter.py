@@ -0,0 +1,204 @@
+
+from math import ceil
+from typing import Tuple, Literal, Optional
+
+import numpy as np
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import CSRTensor
+from .neighbor_search import NeighborSearch
+from .mesh_data_structure import narrowest_index_dtype
+
+
+def filter_stencil(h, radius: float) -> Tuple[TensorLike, TensorLike]:
+    """Offsets and weights of the cone filter on a uniform grid.
+
+    The weight of the cell at the offset d is max(0, radius - |d * h|), and the
+    offsets with zero weights are dropped.
+
+    Parameters:
+        h (Sequence[float]): The cell size in each axis.
+        radius (float): The filter radius.
+
+    Returns:
+        Tensor: The offsets in shape (K, GD), in the lexicographic order.
+        Tensor: The weights in shape (K,).
+    """
+    if radius <= 0:
+        raise ValueError(f"radius should be positive, but got {radius}.")
+    h = np.asarray(h, dtype=np.float64)
+    ranges = [np.arange(-(ceil(radius / s) - 1), ceil(radius / s)) for s in h]
+    offset = np.stack(np.meshgrid(*ranges, indexing='ij'), axis=-1).reshape(-1, len(h))
+    weight = radius - np.sqrt(np.sum((offset * h)**2, axis=-1))
+    flag = weight > 0
+    return bm.from_numpy(offset[flag]), bm.from_numpy(weight[flag])
+
+
+class DensityFilter():
+    """The linear density filter of the topology optimization on the cells of a
+    mesh, (H x)_i = Σ_j w_ij x_j, where w_ij = max(0, r - |c_i - c_j|) and c
+    is the barycenter of the cells.
+
+    On `UniformMesh2d` and `UniformMesh3d`, H is a convolution by the stencil of
+    `filter_stencil`, which is applied without forming the matrix. On the other
+    meshes, H is built from the neighbors of the barycenters within the radius.
+
+    Parameters:
+        mesh (Mesh): The mesh, with `entity_barycenter` and `entity_measure`.
+        radius (float): The filter radius, in the length unit of the mesh.
+        method ('auto' | 'matrix' | 'stencil' | 'fft', optional): How H is applied.
+            'matrix' builds the sparse matrix. 'stencil' sums the shifted arrays
+            of the grid for the offsets of the stencil, by the backend in use.
+            'fft' convolves the zero-padded grid by FFT in numpy, whose cost does
+            not grow with the radius. 'stencil' and 'fft' require a uniform mesh.
+            'auto' uses 'fft' on uniform meshes if the stencil has more than
+            `fft_threshold` offsets and the backend is numpy, 'stencil' on the
+            other uniform meshes, and 'matrix' otherwise. Defaults to 'auto'.
+
+    Examples:
+        >>> filter = DensityFilter(mesh, radius=1.5 * h)
+        >>> rho_phys = filter.filter(rho)
+        >>> dc = filter.filter_gradient(dc_phys)
+
+    Note:
+        The cost of 'matrix' and 'stencil' is proportional to the number of the
+        cells times the size of the stencil, about (r/h)^GD, while 'fft' takes
+        O(N log N). The filter is symmetric, so H is also its transpose.
+    """
+    fft_threshold: int = 32
+
+    def __init__(self, mesh, radius: float, *,
+                 method: Literal['auto', 'matrix', 'stencil', 'fft']='auto'):
+        from .uniform_mesh_2d import UniformMesh2d
+        from .uniform_mesh_3d import UniformMesh3d
+        if method not in ('auto', 'matrix', 'stencil', 'fft'):
+            raise ValueError(f"Unknown filter method '{method}', expected 'auto', "
+                             "'matrix', 'stencil' or 'fft'.")
+        if radius <= 0:
+            raise ValueError(f"radius should be positive, but got {radius}.")
+        self.mesh = mesh
+        self.radius = float(radius)
+        uniform = isinstance(mesh, (UniformMesh2d, UniformMesh3d))
+
+        if uniform:
+            self.shape = (mesh.nx, mesh.ny) if isinstance(mesh, UniformMesh2d) \
+                         else (mesh.nx, mesh.ny, mesh.nz)
+            self.offset, self.weight = filter_stencil(mesh.h, radius)
+            if method == 'auto':
+                K = self.offset.shape[0]
+                fft = (bm.backend_name == 'numpy') and (K > self.fft_threshold)
+                method = 'fft' if fft else 'stencil'
+        elif method in ('stencil', 'fft'):
+            raise ValueError(f"the method '{method}' requires UniformMesh2d or "
+                             f"UniformMesh3d, but got {type(mesh).__name__}.")
+        else:
+            method = 'matrix'
+        self.method = method
+        self.uniform = uniform
+        self._H: Optional[CSRTensor] = None
+        self._kernel = None
+
+        self.measure = mesh.entity_measure('cell')
+        self._hv = self.apply(self.measure)
+
+    def matrix(self) -> CSRTensor:
+        """The filter matrix in shape (NC, NC), built on the first call."""
+        if self._H is None:
+            if self.uniform:
+                self._H = self._stencil_matrix()
+            else:
+                self._H = self._neighbor_matrix()
+        return self._H
+
+    def row_sum(self) -> TensorLike:
+        """The row sums of the filter matrix, Hs = H 1, in shape (NC,)."""
+        NC = self.mesh.number_of_cells()
+        return self.apply(bm.ones((NC,), **bm.context(self.measure)))
+
+    def apply(self, x: TensorLike) -> TensorLike:
+        """The product H x of the filter matrix and x in shape (NC,)."""
+        if self.method == 'matrix':
+            return self.matrix() @ x
+        elif self.method == 'stencil':
+            return self._stencil_apply(x)
+        else:
+            return self._fft_apply(x)
+
+    __call__ = apply
+
+    def filter(self, x: TensorLike) -> TensorLike:
+        """The filtered densities H(v x) / H(v), v being the cell measure."""
+        return self.apply(self.measure * x) / self._hv
+
+    def filter_gradient(self, grad: TensorLike) -> TensorLike:
+        """The gradient with respect to the densities x, given the gradient
+        with respect to the filtered densities `filter(x)`."""
+        return self.measure * self.apply(grad / self._hv)
+
+    ### structured meshes
+    def _stencil_matrix(self) -> CSRTensor:
+        shape, GD = self.shape, len(self.shape)
+        NC = self.mesh.number_of_cells()
+        K = self.offset.shape[0]
+        itype = narrowest_index_dtype(NC * K, margin=1)
+        kwargs = dict(dtype=itype, device=bm.get_device(self.weight))
+        offset = bm.astype(self.offset, itype)
+        stride = [1] * GD
+        for d in reversed(range(GD - 1)):
+            stride[d] = stride[d + 1] * shape[d + 1]
+
+        # NOTE: the neighbors of all cells in shape (NC, K), where the cells are
+        # rows, so the masked columns are in the CSR order, sorted in each row.
+        col = bm.reshape(bm.arange(NC, **kwargs), shape + (1,))
+        valid = None
+        for d in range(GD):
+            c = bm.reshape(bm.arange(shape[d], **kwargs), [-1 if k == d else 1
+                           for k in range(GD)] + [1]) + offset[:, d]
+            flag = (c >= 0) & (c < shape[d])
+            valid = flag if valid is None else valid & flag
+            col = col + offset[:, d] * stride[d]
+        valid = bm.reshape(bm.broadcast_to(valid, shape + (K,)), (NC, K))
+        col = bm.reshape(col, (NC, K))[valid]
+        value = bm.broadcast_to(self.weight, (NC, K))[valid]
+        count = bm.sum(bm.astype(valid, itype), axis=1)
+        crow = bm.concat([bm.zeros((1,), **kwargs), bm.cumsum(count, axis=0)])
+        return CSRTensor(bm.astype(crow, itype), col, value, spshape=(NC, NC))
+
+    def _stencil_apply(self, x: TensorLike) -> TensorLike:
+        shape = self.shape
+        x = bm.reshape(x, shape)
+        out = bm.zeros(shape, **bm.context(x))
+        for d, w in zip(bm.to_numpy(self.offset).tolist(), bm.to_numpy(self.weight).tolist()):
+            src = tuple(slice(max(0, s), n + min(0, s)) for s, n in zip(d, shape))
+            dst = tuple(slice(max(0, -s), n - max(0, s)) for s, n in zip(d, shape))
+            out = bm.set_at(out, dst, out[dst] + w * x[src])
+        return bm.reshape(out, (-1,))
+
+    def _fft_apply(self, x: TensorLike) -> TensorLike:
+        shape = self.shape
+        offset = bm.to_numpy(self.offset)
+        m = np.max(np.abs(offset), axis=0)
+        size = tuple(int(n + 2 * k) for n, k in zip(shape, m))
+        axes = tuple(range(len(size)))
+        if self._kernel is None:
+            kernel = np.zeros(tuple(2 * m + 1))
+            kernel[tuple((offset + m).T)] = bm.to_numpy(self.weight)
+            self._kernel = np.fft.rfftn(kernel, s=size, axes=axes)
+        xf = np.fft.rfftn(np.reshape(bm.to_numpy(x), shape), s=size, axes=axes)
+        y = np.fft.irfftn(xf * self._kernel, s=size, axes=axes)
+        # NOTE: the stencil is symmetric, so the convolution is the correlation,
+        # shifted by the half width of the stencil.
+        y = y[tuple(slice(k, k + n) for n, k in zip(shape, m))]
+        return bm.tensor(np.ascontiguousarray(y).reshape(-1), **bm.context(x))
+
+    ### unstructured meshes
+    def _neighbor_matrix(self) -> CSRTensor:
+        bc = self.mesh.entity_barycenter('cell')
+        NC = bc.shape[0]
+        indptr, index = NeighborSearch(self.radius, include_self=True).build(bc)
+        indptr = bm.astype(indptr, bm.int64)
+        index = bm.astype(index, bm.int64)
+        i = bm.repeat(bm.arange(NC, **bm.context(indptr)), indptr[1:] - indptr[:-1])
+        dist = bm.sqrt(bm.sum((bc[i] - bc[index])**2, axis=-1))
+        return CSRTensor(indptr, index, self.radius - dist, spshape=(NC, NC))
@@ -690,8 +690,6 @@ class HexahedronMesh(TensorMesh, Plotable):
         return cls(node, cell)
 
     def to_vtk(self, fname=None, etype='cell', index:Index=_S):
-        from .vtk_extent import  write_to_vtu
-
         node = self.entity('node')
         GD = self.geo_dimension()
 
@@ -716,6 +714,7 @@ class HexahedronMesh(TensorMesh, Plotable):
             return node, cell.flatten(), cellType, NC
         else:
             print("Writting to vtk...")
+            from .vtk_extent import write_to_vtu
             write_to_vtu(fname, node, NC, cellType, cell.flatten(),
                     nodedata=self.nodedata,
                     celldata=celldata)
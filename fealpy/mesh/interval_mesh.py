@@ -281,7 +281,6 @@ class IntervalMesh(SimplexMesh,Plotable):
         -----
         把网格转化为 VTK 的格式
         """
-        from fealpy.mesh.vtk_extent import  write_to_vtu
 
         node = self.entity('node')
         GD = self.geo_dimension()
@@ -300,6 +299,7 @@ class IntervalMesh(SimplexMesh,Plotable):
             return node, cell.flatten(), cellType, NC
         else:
             print("Writting to vtk...")
+            from fealpy.mesh.vtk_extent import write_to_vtu
             write_to_vtu(fname, node, NC, cellType, cell.flatten(),
                     nodedata=self.nodedata,
                     celldata=self.celldata)
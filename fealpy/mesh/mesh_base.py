@@ -6,6 +6,7 @@ from ..typing import TensorLike, Index, _S
 from .. import logger
 from ..quadrature import Quadrature
 from .mesh_data_structure import MeshDS
+from .point_locator import PointLocator
 from .utils import (
     estr2dim, simplex_gdof, simplex_ldof, tensor_gdof, tensor_ldof
 )
@@ -363,6 +364,54 @@ class HomogeneousMesh(Mesh):
 
         return bm.bc_to_points(bcs, node, entity)
 
+    def renumber(self, node_order: Optional[TensorLike]=None,
+                 cell_order: Optional[TensorLike]=None) -> None:
+        """Renumber the nodes and the cells in place, and construct the other
+        entities again.
+
+        Parameters:
+            node_order (Tensor | None, optional): New node i is the old node
+                node_order[i]. Defaults to None, keeping the nodes.
+            cell_order (Tensor | None, optional): New cell i is the old cell
+                cell_order[i]. Defaults to None, keeping the cells.
+
+        Note:
+            The arrays in `nodedata` and `celldata` with the leading dimension of
+            the number of nodes or cells are permuted together. The local vertices
+            of the cells are kept, so the orientation of the cells is preserved.
+            See `fealpy.mesh.reorder_mesh` for the orderings.
+        """
+        node = self.entity('node')
+        cell = self.entity('cell')
+        NN, NC = node.shape[0], cell.shape[0]
+
+        if node_order is not None:
+            if node_order.shape != (NN,):
+                raise ValueError(f"node_order is expected in shape ({NN},), "
+                                 f"but got {tuple(node_order.shape)}.")
+            node_order = bm.astype(node_order, self.itype)
+            index = bm.empty_like(node_order)
+            index = bm.set_at(index, node_order, bm.arange(NN, **bm.context(index)))
+            node = node[node_order]
+            cell = index[cell]
+        if cell_order is not None:
+            if cell_order.shape != (NC,):
+                raise ValueError(f"cell_order is expected in shape ({NC},), "
+                                 f"but got {tuple(cell_order.shape)}.")
+            cell = cell[cell_order]
+
+        for name, order, N in (('nodedata', node_order, NN), ('celldata', cell_order, NC)):
+            data = getattr(self, name, None)
+            if order is None or not isinstance(data, dict):
+                continue
+            for key, value in data.items():
+                if bm.is_tensor(value) and value.ndim > 0 and value.shape[0] == N:
+                    data[key] = value[order]
+
+        self.node = node
+        self.cell = cell
+        self.construct()
+
     # ipoints
     def interpolation_points(self, p: int, index: Index=_S) -> TensorLike:
         raise NotImplementedError
@@ -467,6 +516,37 @@ class SimplexMesh(HomogeneousMesh):
         nums = [self.entity(i).shape[0] for i in range(self.TD+1)]
         return simplex_gdof(p, nums)
 
+    # point location
+    def point_locator(self, cells_per_bucket: float=1.) -> PointLocator:
+        """Return the point locator of the mesh, which is cached until the
+        mesh is changed if `cache_enabled`. See `PointLocator` for details."""
+        return PointLocator(self, cells_per_bucket=cells_per_bucket)
+
+    def location(self, points: TensorLike, hint: Optional[TensorLike]=None) -> TensorLike:
+        """Find the cells containing the points.
+
+        Parameters:
+            points (Tensor): Points in shape (NP, GD).
+            hint (Tensor | None, optional): Initial guesses of the cells in shape
+                (NP,), e.g. the cells found in the last time step. Defaults to None.
+
+        Returns:
+            Tensor: Index of the cells in shape (NP,), -1 for points outside the mesh.
+        """
+        return self.point_locator().locate(points, hint)[0]
+
+    def point_to_bc(self, points: TensorLike, hint: Optional[TensorLike]=None
+                    ) -> Tuple[TensorLike, TensorLike]:
+        """Find the cells containing the points, and the barycentric coordinates
+        of the points in the cells.
+
+        Returns:
+            Tensor: Index of the cells in shape (NP,), -1 for points outside the mesh.
+            Tensor: Barycentric coordinates in shape (NP, TD+1), NaN for points
+                outside the mesh.
+        """
+        return self.point_locator().locate(points, hint)
+
     # shape function
     def grad_lambda(self, index: Index=_S) -> TensorLike:
         raise NotImplementedError
@@ -671,6 +751,13 @@ class TensorMesh(HomogeneousMesh):
     
 
 class StructuredMesh(HomogeneousMesh):
+    # NOTE: Relations and geometric quantities of structured meshes are generated
+    # from the grid parameters directly, which is cheap.
+    cache_enabled = False
+
+    def renumber(self, node_order=None, cell_order=None) -> None:
+        raise RuntimeError("the entities of structured meshes are numbered by "
+                           "the grid, and can not be renumbered.")
 
     # shape function
     def grad_lambda(self, index: Index=_S) -> TensorLike:
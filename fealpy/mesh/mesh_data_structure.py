@@ -1,10 +1,52 @@
 
-from typing import Union, Optional, Dict, overload, Callable, Any
+from typing import Union, Optional, Dict, Tuple, overload, Callable, Any
 
 from ..backend import backend_manager as bm
 from ..typing import TensorLike, Index, EntityName, _S, _int_func
 from .. import logger
-from .utils import estr2dim, edim2entity, MeshMeta, flocc
+from .utils import estr2dim, edim2entity, MeshMeta, flocc, sort_rows, pack_sorted_rows, flocc_keys
+
+
+def _nbytes(value: Any) -> int:
+    """Number of bytes of the tensors in the value."""
+    if value is None:
+        return 0
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    if isinstance(value, TensorLike):
+        return int(value.nbytes)
+    return 0
+
+
+def _read_only(fn: Callable[..., TensorLike], *args) -> TensorLike:
+    """Evaluate a temporary tensor converted from the mesh storage, made read-only
+    where the backend supports it, so that writing into it raises an error
+    instead of being silently lost."""
+    if bm.backend_name == 'pytorch':
+        import torch
+        # NOTE: in-place updates of inference tensors raise outside the mode.
+        with torch.inference_mode():
+            return fn(*args)
+    out = fn(*args)
+    if bm.backend_name == 'numpy':
+        out.flags.writeable = False
+    return out
+
+
+def narrowest_index_dtype(n: int, *, margin: int=8):
+    """The narrowest integer type indexing n entities safely, int32 or int64.
+
+    Parameters:
+        n (int): The number of entities.
+        margin (int, optional): The factor of room left for the numbers derived
+            from the entities, e.g. the DoFs of the higher-order spaces.
+            Defaults to 8.
+
+    Note:
+        Narrower types like int16 are not used, as they are not supported by the
+        indexing of some backends and overflow easily in the index arithmetic.
+    """
+    return bm.int32 if n * margin < 2**31 else bm.int64
 
 
 ##################################################
@@ -14,6 +56,21 @@ from .utils import estr2dim, edim2entity, MeshMeta, flocc
 
 class MeshDS(metaclass=MeshMeta):
     _STORAGE_ATTR = ['cell', 'face', 'edge', 'node']
+    _TOPOLOGY_ATTR = ['face2cell', 'cell2face', 'cell2edge', 'edge2cell']
+    # Derived relations and geometric quantities memoized in the relation cache.
+    _CACHED_METHODS = ('cell_to_cell', 'cell_to_face', 'face_to_edge',
+                       'boundary_node_flag', 'boundary_edge_flag',
+                       'boundary_face_flag', 'boundary_cell_flag',
+                       'entity_measure', 'entity_barycenter', 'grad_lambda',
+                       'point_locator')
+    # NOTE: The cache is opt-in, as writing into the entities in place, e.g.
+    # `mesh.node[:] = x`, can not be detected, leaving stale results.
+    cache_enabled: bool = False
+    # The floating type the nodes are stored in, None for `ftype`, see `compact`.
+    node_storage_dtype: Any = None
+    # The engine of `construct`, see `construct` for details.
+    construct_method: str = 'packed'
+    construct_chunk_size: int = 2**18
     cell: TensorLike
     face: TensorLike
     edge: TensorLike
@@ -31,6 +88,8 @@ class MeshDS(metaclass=MeshMeta):
             k: getattr(self, self._entity_dim_method_name_map[k])
             for k in self._entity_dim_method_name_map
         }
+        self._relation_cache: Dict[tuple, Any] = {}
+        self._cache_stats = {'hits': 0, 'misses': 0}
         self.TD = TD
         self.itype = itype
         self.ftype = ftype
@@ -40,7 +99,13 @@ class MeshDS(metaclass=MeshMeta):
     def __getattr__(self, name: str):
         if name in self._STORAGE_ATTR:
             etype_dim = estr2dim(self, name)
-            return edim2entity(self._entity_storage, self._entity_factory, etype_dim)
+            entity = edim2entity(self._entity_storage, self._entity_factory, etype_dim)
+            return self._load_node(entity) if etype_dim == 0 else entity
+        elif self._is_packed_face2cell(name):
+            cells, local = self.__dict__['_face2cell_packed']
+            return _read_only(
+                lambda: bm.concat([cells, bm.astype(local, cells.dtype)], axis=-1)
+            )
         else:
             return object.__getattribute__(self, name)
 
@@ -49,19 +114,181 @@ class MeshDS(metaclass=MeshMeta):
             if not hasattr(self, '_entity_storage'):
                 raise RuntimeError('please call super().__init__() before setting attributes.')
             etype_dim = estr2dim(self, name)
+            if etype_dim == 0 and (value is not None) and self.node_storage_dtype is not None:
+                value = bm.astype(value, self.node_storage_dtype)
             self._entity_storage[etype_dim] = value
+            self.clear_cache()
         else:
+            if name in self._TOPOLOGY_ATTR:
+                self.clear_cache()
+                if name == 'face2cell':
+                    self.__dict__.pop('_face2cell_packed', None)
             super().__setattr__(name, value)
 
     def __delattr__(self, name: str) -> None:
         if name in self._STORAGE_ATTR:
             del self._entity_storage[estr2dim(self, name)]
+            self.clear_cache()
         else:
             super().__delattr__(name)
 
     def clear(self) -> None:
-        """Remove all entities from the storage."""
+        """Remove all entities from the storage, and clear the relation cache."""
         self._entity_storage.clear()
+        self.__dict__.pop('_face2cell_packed', None)
+        self.clear_cache()
+
+    ### relation cache
+    def clear_cache(self) -> None:
+        """Clear the relation cache.
+
+        When `cache_enabled` is set to True, derived relations like `cell_to_face`
+        and `boundary_node_flag`, and geometric quantities like `entity_measure`
+        and `grad_lambda` are cached on the first call. The cache is cleared
+        automatically when the entities or the topology relations are reassigned,
+        e.g. `mesh.node = new_node`. Call this method after modifying them in
+        place, e.g. `mesh.node[:] = new_node`, which is not detected.
+
+        Examples:
+            >>> mesh.cache_enabled = True # the mesh is not moved in place
+            >>> for step in range(nt):
+            ...     A = bform.assembly()
+        """
+        cache = self.__dict__.get('_relation_cache', None)
+        if cache is not None:
+            cache.clear()
+
+    def cache_info(self) -> Dict[str, int]:
+        """Return the statistics of the relation cache, with keys 'hits',
+        'misses', 'entries' and 'nbytes'."""
+        cache = self._relation_cache
+        nbytes = sum(_nbytes(v) for v in cache.values())
+        return dict(self._cache_stats, entries=len(cache), nbytes=nbytes)
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Return the memory in bytes used by the entities, the topology relations
+        and the relation cache of the mesh."""
+        usage = {}
+        counted = []
+        items = [(name, self._entity_storage.get(estr2dim(self, name), None))
+                 for name in reversed(self._STORAGE_ATTR)]
+        items += [(name, self.__dict__['_face2cell_packed'] if self._is_packed_face2cell(name)
+                   else self.__dict__.get(name, None)) for name in self._TOPOLOGY_ATTR]
+
+        for name, value in items:
+            # NOTE: some entities and relations share the same tensor in 2-d meshes.
+            if (value is not None) and not any(value is v for v in counted):
+                usage[name] = _nbytes(value)
+                counted.append(value)
+        usage['cache'] = self.cache_info()['nbytes']
+        usage['total'] = sum(usage.values())
+        return usage
+
+    def memory_report(self) -> str:
+        """Return a table of the memory used by the entities, the topology
+        relations and the relation cache of the mesh, with their shapes and dtypes."""
+        usage = self.memory_usage()
+        lines = [f"{self.__class__.__name__} memory:",
+                 f"  {'name':<10} {'shape':>16} {'dtype':>16} {'MB':>10}"]
+        for name, nbytes in usage.items():
+            if name in self._STORAGE_ATTR:
+                value = self._entity_storage.get(estr2dim(self, name))
+            elif self._is_packed_face2cell(name):
+                value = self.__dict__['_face2cell_packed']
+            else:
+                value = self.__dict__.get(name, None)
+            if isinstance(value, tuple):
+                shape = '+'.join(str(tuple(v.shape)) for v in value)
+                dtype = '+'.join(str(v.dtype).split('.')[-1] for v in value)
+            elif isinstance(value, TensorLike):
+                shape, dtype = str(tuple(value.shape)), str(value.dtype).split('.')[-1]
+            else:
+                shape, dtype = '', ''
+            lines.append(f"  {name:<10} {shape:>16} {dtype:>16} {nbytes / 2**20:>10.3f}")
+        return '\n'.join(lines)
+
+    ### compact storage
+    def compact(self, *, itype=None, pack_local: bool=False,
+                node_dtype=None) -> Dict[str, int]:
+        """Reduce the memory of the mesh storage in place.
+
+        Parameters:
+            itype (dtype | None, optional): The integer type of the entities and the
+                topology relations. Defaults to None, using the narrowest safe type
+                for the number of entities, see `narrowest_index_dtype`.
+            pack_local (bool, optional): Whether to store the local indices in
+                `face2cell` (the last two columns) in int8, apart from the cells.
+                `face2cell` is then assembled on each access. Defaults to False.
+            node_dtype (dtype | None, optional): The floating type to store the
+                node coordinates in, e.g. float32. The nodes are converted back to
+                `ftype` when accessed, so the geometry and the assembly still run in
+                `ftype`. Defaults to None, keeping the nodes in `ftype`.
+
+        Returns:
+            Dict[str, int]: The memory usage after compaction, see `memory_usage`.
+
+        Note:
+            The new entities and relations, e.g. from the refinement, are created
+            in the new `itype` and the nodes in `node_dtype`. A construction from
+            scratch unpacks `face2cell`, so call this method again to pack it.
+
+        Warning:
+            With `node_dtype`, `mesh.node` and `mesh.entity('node')` are temporary
+            copies in `ftype`, and so is `face2cell` with `pack_local`. They are
+            read-only: writing into them in place, e.g. `mesh.node[:, 0] += 1`,
+            raises an error on the numpy and pytorch backends (on pytorch,
+            the copies are inference tensors and are not tracked by autograd).
+            Move the nodes by assignment, e.g. `mesh.node = mesh.node + d`,
+            or write into the storage in `node_dtype`, `mesh.storage()[0]`.
+        """
+        if itype is None:
+            n = sum(self.count(k) for k in range(self.TD + 1))
+            itype = narrowest_index_dtype(n)
+
+        for edim, entity in self._entity_storage.items():
+            if edim > 0 and isinstance(entity, TensorLike):
+                self._entity_storage[edim] = bm.astype(entity, itype)
+        counted = []
+        for name in self._TOPOLOGY_ATTR:
+            value = self.__dict__.get(name, None)
+            if isinstance(value, TensorLike):
+                # NOTE: keep the relations shared between names shared.
+                same = [v for v in counted if v[0] is value]
+                new = same[0][1] if same else bm.astype(value, itype)
+                counted.append((value, new))
+                self.__dict__[name] = new
+        packed = self.__dict__.get('_face2cell_packed', None)
+        if packed is not None:
+            self.__dict__['_face2cell_packed'] = (bm.astype(packed[0], itype), packed[1])
+        self.itype = itype
+
+        if pack_local and ('face2cell' in self.__dict__):
+            face2cell = self.__dict__.pop('face2cell')
+            self.__dict__['_face2cell_packed'] = (bm.copy(face2cell[:, :2]),
+                                                  bm.astype(face2cell[:, 2:], bm.int8))
+            if self.TD == 2:
+                self.__dict__.pop('edge2cell', None)
+
+        if node_dtype is not None:
+            node = self._entity_storage.get(0, None)
+            self.node_storage_dtype = node_dtype
+            if node is not None:
+                self._entity_storage[0] = bm.astype(node, node_dtype)
+
+        self.clear_cache()
+        return self.memory_usage()
+
+    def _is_packed_face2cell(self, name: str) -> bool:
+        if '_face2cell_packed' not in self.__dict__:
+            return False
+        return name == 'face2cell' or (name == 'edge2cell' and self.TD == 2)
+
+    def _load_node(self, node: Optional[TensorLike]) -> Optional[TensorLike]:
+        if (node is None) or (self.node_storage_dtype is None) or isinstance(node, tuple):
+            return node
+        if node.dtype == self.ftype:
+            return node
+        return _read_only(bm.astype, node, self.ftype)
 
     ### properties
     def top_dimension(self) -> int: return self.TD
@@ -118,7 +345,8 @@ class MeshDS(metaclass=MeshMeta):
         """
         if isinstance(etype, str):
             etype = estr2dim(self, etype)
-        return edim2entity(self.storage(), self._entity_factory, etype, index)
+        entity = edim2entity(self.storage(), self._entity_factory, etype, index)
+        return self._load_node(entity) if etype == 0 else entity
 
     ### topology
     def cell_to_node(self, index: Optional[Index]=None) -> TensorLike:
@@ -259,31 +487,275 @@ class MeshDS(metaclass=MeshMeta):
         total_edge = cell[..., local_edge].reshape(-1, NVE)
         return total_edge
 
-    def construct(self):
+    def _find_lexsort(self, local_entity: TensorLike, cell: Optional[TensorLike]=None):
+        if cell is None:
+            cell = self.entity(self.TD)
+        total = cell[..., local_entity].reshape(-1, local_entity.shape[-1])
+        return flocc(bm.sort(total, axis=1))
+
+    def _find_packed(self, local_entity: TensorLike, cell: Optional[TensorLike]=None):
+        if cell is None:
+            cell = self.entity(self.TD)
+        NC = cell.shape[0]
+        NV = local_entity.shape[-1]
+        base = int(bm.max(cell)) + 1 if NC > 0 else 1
+        chunk = self.construct_chunk_size
+        chunks = []
+
+        for start in range(0, max(NC, 1), chunk):
+            total = cell[start:start+chunk][..., local_entity].reshape(-1, NV)
+            chunks.append(pack_sorted_rows(sort_rows(total), base))
+            del total
+
+        if len(chunks) == 1:
+            keys = chunks[0]
+        else:
+            keys = tuple(bm.concat(k, axis=0) for k in zip(*chunks))
+        del chunks
+        return flocc_keys(keys)
+
+    def _local_entity(self, local_entity: TensorLike, index: TensorLike) -> TensorLike:
+        """Return the local entities of cells by indices into `total_face` or `total_edge`."""
+        cell = self.entity(self.TD)
+        num = local_entity.shape[0]
+        return cell[(index // num)[:, None], local_entity[index % num]]
+
+    def _merge_position(self, entity: TensorLike, removed: TensorLike,
+                        appended: TensorLike) -> Tuple[TensorLike, TensorLike]:
+        """New positions of the old entities and the appended entities, when the
+        removed ones are dropped and the others are sorted as in the construction
+        from scratch. The removed entities are moved to the position NE, which is
+        one past the end."""
+        NO, NA = entity.shape[0], appended.shape[0]
+        kwargs = bm.context(self.cell2face)
+        base = int(bm.max(self.entity(self.TD))) + 1
+        ko = pack_sorted_rows(sort_rows(entity), base)
+        ka = pack_sorted_rows(sort_rows(appended), base)
+        NE = NO - int(bm.sum(removed)) + NA
+
+        if (len(ko) == 1) and bm.all(ko[0][1:] > ko[0][:-1]) and bm.all(ka[0][1:] > ka[0][:-1]):
+            # NOTE: the old entities are sorted, and the appended ones are sorted
+            # and not in the kept ones, so they are merged by counting the entities
+            # in front of each other.
+            pos = bm.astype(bm.searchsorted(ko[0], ka[0]), kwargs['dtype'])
+            count = bm.zeros((NO + 1,), **kwargs)
+            count = bm.index_add(count, pos, bm.ones((NA,), **kwargs))
+            zero = bm.zeros((1,), **kwargs)
+            # numbers of the removed old ones in front of each old one
+            before = bm.cumsum(bm.concat([zero, bm.astype(removed, kwargs['dtype'])]), axis=0)
+            old_pos = bm.arange(NO, **kwargs) - before[:-1] + bm.cumsum(count, axis=0)[:-1]
+            new_pos = bm.arange(NA, **kwargs) + pos - before[pos]
+            old_pos = bm.where(removed, NE, old_pos)
+            return bm.astype(old_pos, kwargs['dtype']), bm.astype(new_pos, kwargs['dtype'])
+
+        keep = bm.nonzero(~removed)[0]
+        keys = tuple(bm.concat([o[keep], n]) for o, n in zip(ko, ka))
+        order = bm.lexsort(tuple(reversed(keys)), axis=0)
+        rank = bm.empty((NE,), **kwargs)
+        rank = bm.set_at(rank, order, bm.arange(NE, **kwargs))
+        old_pos = bm.full((NO,), NE, **kwargs)
+        old_pos = bm.set_at(old_pos, keep, rank[:keep.shape[0]])
+        return old_pos, rank[keep.shape[0]:]
+
+    def _update_entity(self, find, local_entity: TensorLike, entity: TensorLike,
+                       cell2entity: TensorLike, changed: TensorLike,
+                       cell_map: Optional[TensorLike], entity2cell: Optional[TensorLike]=None):
+        """Rebuild the entities of the changed cells and their neighbors.
+
+        The entities of the old changed (or removed) cells are removed, and the
+        entities of the changed cells and the neighbors sharing the removed
+        entities are found again. The unchanged cells keep their other entities.
+
+        Returns:
+            Tensor: Entities in shape (NE, NVE).
+            Tensor: Cell to entity relation in shape (NC, NLE).
+            Tensor: New positions of the old entities, NE for the removed ones.
+            Tensor: Positions of the new entities.
+            Tuple[Tensor, Tensor, Tensor]: The cells, and the first and last
+                occurrence indices into their local entities, of the new entities.
+        """
+        cell = self.entity(self.TD)
+        NC, NCO = cell.shape[0], cell2entity.shape[0]
+        NEO, NLE = entity.shape[0], local_entity.shape[0]
+        kwargs = bm.context(cell2entity)
+        context = {'dtype': bm.bool, 'device': bm.get_device(cell2entity)}
+
+        if cell_map is None:
+            changed_old = changed[:NCO]
+        else:
+            alive = cell_map >= 0
+            changed_old = bm.copy(~alive)
+            changed_old = bm.set_at(changed_old, alive, changed[cell_map[alive]])
+        removed = bm.zeros((NEO,), **context)
+        removed = bm.set_at(removed, bm.reshape(cell2entity[changed_old], (-1,)), True)
+
+        # The neighbors sharing the removed entities, in the old numbering.
+        if entity2cell is None:
+            halo_old = bm.any(removed[cell2entity], axis=1)
+        else:
+            halo_old = bm.zeros((NCO,), **context)
+            halo_old = bm.set_at(halo_old, bm.reshape(entity2cell[removed, :2], (-1,)), True)
+        halo_old = halo_old & (~changed_old)
+
+        if cell_map is None:
+            halo = bm.concat([halo_old, bm.zeros((NC - NCO,), **context)])
+            inverse = bm.arange(NC, **kwargs)
+        else:
+            halo = bm.zeros((NC,), **context)
+            halo = bm.set_at(halo, cell_map[halo_old], True)
+            inverse = bm.full((NC,), -1, **kwargs)
+            inverse = bm.set_at(inverse, cell_map[alive],
+                                bm.astype(bm.nonzero(alive)[0], kwargs['dtype']))
+
+        sub = bm.nonzero(changed | halo)[0]
+        i0, i1, j = find(local_entity, cell[sub])
+
+        total = bm.arange(sub.shape[0] * NLE, **kwargs)
+        rows, cols = sub[total // NLE], total % NLE
+        in_halo = halo[rows]
+        old = cell2entity[bm.where(in_halo, inverse[rows], 0), cols]
+        # NOTE: entities of the neighbors are also new if they were removed,
+        # which does not happen in a conforming mesh.
+        fresh = changed[rows] | (in_halo & removed[old])
+        is_new = bm.zeros((i0.shape[0],), **context)
+        is_new = bm.set_at(is_new, j[fresh], True)
+        i0, i1 = i0[is_new], i1[is_new]
+        appended = cell[sub[i0 // NLE][:, None], local_entity[i0 % NLE]]
+
+        old_pos, new_pos = self._merge_position(entity, removed, appended)
+        NE = NEO - int(bm.sum(removed)) + appended.shape[0]
+        out = bm.empty((NE + 1, entity.shape[1]), **bm.context(entity))
+        out = bm.set_at(out, old_pos, entity)
+        out = bm.set_at(out, new_pos, appended)
+
+        # Removed entities are only in the changed cells, which are overwritten.
+        if cell_map is None:
+            c2e = bm.concat([old_pos[cell2entity], bm.zeros((NC - NCO, NLE), **kwargs)], axis=0)
+        else:
+            c2e = bm.zeros((NC, NLE), **kwargs)
+            c2e = bm.set_at(c2e, cell_map[alive], old_pos[cell2entity[alive]])
+        group_pos = bm.full((is_new.shape[0],), -1, **kwargs)
+        group_pos = bm.set_at(group_pos, is_new, new_pos)
+        value = group_pos[j]
+        flag = value >= 0
+        c2e = bm.set_at(c2e, (rows[flag], cols[flag]), value[flag])
+
+        return out[:NE], bm.astype(c2e, self.itype), old_pos, new_pos, (sub, i0, i1)
+
+    def _construct_update(self, find, changed: TensorLike,
+                          cell_map: Optional[TensorLike]=None):
+        NC = self.number_of_cells()
+        NCO = self.cell2face.shape[0]
+        kwargs = bm.context(self.cell2face)
+        device = bm.get_device(self.cell2face)
+
+        flag = bm.zeros((NC,), dtype=bm.bool, device=device)
+        if bm.is_tensor(changed) and changed.dtype == bm.bool:
+            changed = bm.set_at(flag, slice(changed.shape[0]), changed)
+        else:
+            changed = bm.set_at(flag, changed, True)
+        # NOTE: cells not mapped from the old cells are new.
+        if cell_map is None:
+            changed = bm.set_at(changed, slice(NCO, None), True)
+        else:
+            cell_map = bm.astype(cell_map, kwargs['dtype'])
+            mapped = bm.zeros((NC,), dtype=bm.bool, device=device)
+            mapped = bm.set_at(mapped, cell_map[cell_map >= 0], True)
+            changed = changed | (~mapped)
+
+        NFC = self.number_of_faces_of_cells()
+        face2cell = self.face2cell
+        face, cell2face, old_pos, new_pos, (sub, i0, i1) = self._update_entity(
+            find, self.localFace, self.face, self.cell2face, changed, cell_map, face2cell)
+        if cell_map is not None:
+            face2cell = bm.concat([cell_map[face2cell[:, :2]], face2cell[:, 2:]], axis=1)
+        appended = bm.stack([sub[i0//NFC], sub[i1//NFC], i0%NFC, i1%NFC], axis=-1)
+        NF = face.shape[0]
+        out = bm.empty((NF + 1, 4), **bm.context(face2cell))
+        out = bm.set_at(out, old_pos, face2cell)
+        out = bm.set_at(out, new_pos, bm.astype(appended, out.dtype))
+
+        if self.TD == 3:
+            edge, cell2edge, _, _, _ = self._update_entity(
+                find, self.localEdge, self.edge, self.cell2edge, changed, cell_map)
+
+        self.face = face
+        self.cell2face = cell2face
+        self.face2cell = bm.astype(out[:NF], self.itype)
+
+        if self.TD == 3:
+            self.edge = edge
+            self.cell2edge = cell2edge
+        elif self.TD == 2:
+            self.edge2cell = self.face2cell
+            self.cell2edge = self.cell2face
+
+        logger.info(f"Mesh toplogy relation updated, with {NC} cells and "
+                    f"{int(bm.sum(changed))} changed.")
+
+    def construct(self, method: Optional[str]=None, *,
+                  changed: Optional[TensorLike]=None,
+                  cell_map: Optional[TensorLike]=None):
+        """Construct the faces and edges of a homogeneous mesh, and the relations
+        face2cell, cell2face and cell2edge.
+
+        Parameters:
+            method ('packed' | 'lexsort' | None, optional): The engine finding the
+                unique faces and edges. 'packed' packs the sorted vertices of each
+                local face into 64-bit keys and sorts the keys, in chunks of
+                `construct_chunk_size` cells; 'lexsort' sorts the rows of vertices
+                lexicographically. Both give the same result. Defaults to None,
+                using the attribute `construct_method`.
+            changed (Tensor | None, optional): Flags in shape (NC,) or indices of
+                the cells changed since the last construction. When given, only the
+                entities around the changed cells are found again, and the others
+                are kept. Defaults to None, building everything from scratch.
+            cell_map (Tensor | None, optional): The new indices of the old cells in
+                shape (NCO,), -1 for the removed cells, e.g. in coarsening. The new
+                cells not mapped from old cells are taken as changed. Only works with
+                `changed`. Defaults to None, where the old cells keep their indices
+                and the new cells are appended.
+
+        Note:
+            The update with `changed` is used by the local refinement and coarsening,
+            which changes a few cells. The result is the same as the construction
+            from scratch, provided that the cells are not renumbered out of order.
+        """
         if not self.is_homogeneous():
             raise RuntimeError('Can not construct for a non-homogeneous mesh.')
 
-        totalFace = self.total_face()
-        i0, i1, j = flocc(bm.sort(totalFace, axis=1))
+        method = self.construct_method if method is None else method
+        if method == 'packed':
+            find = self._find_packed
+        elif method == 'lexsort':
+            find = self._find_lexsort
+        else:
+            raise ValueError(f"Unknown construct method '{method}', "
+                             "expected 'packed' or 'lexsort'.")
+
+        if (changed is not None) and (self.TD > 1) and hasattr(self, 'cell2face'):
+            self._construct_update(find, changed, cell_map)
+            return
+
+        i0, i1, j = find(self.localFace)
 
         if self.TD > 1: # Do not add faces for interval mesh
-            self.face = totalFace[i0, :] # this also adds the edge in 2-d meshes
+            self.face = self._local_entity(self.localFace, i0) # this also adds the edge in 2-d meshes
 
         NC = self.number_of_cells()
         NFC = self.number_of_faces_of_cells()
         self.cell2face = bm.astype(j.reshape(NC, NFC), self.itype)
-        self.face2cell = bm.astype(
-            bm.stack([i0//NFC, i1//NFC, i0%NFC, i1%NFC], axis=-1),
-            self.itype
+        self.face2cell = bm.stack(
+            [bm.astype(v, self.itype) for v in (i0//NFC, i1//NFC, i0%NFC, i1%NFC)],
+            axis=-1
         )
         # NOTE: dtype must be specified here, as these tensors are the results of unique.
 
         if self.TD == 3:
             NEC = self.number_of_edges_of_cells()
 
-            totalEdge = self.total_edge()
-            i2, _, j = flocc(bm.sort(totalEdge, axis=1))
-            self.edge = totalEdge[i2, :]
+            i2, _, j = find(self.localEdge)
+            self.edge = self._local_entity(self.localEdge, i2)
             self.cell2edge = bm.astype(j.reshape(NC, NEC), self.itype)
 
         elif self.TD == 2:
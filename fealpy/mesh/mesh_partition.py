@@ -0,0 +1,199 @@
+
+from typing import Optional, List, Literal
+
+import numpy as np
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from .. import logger
+from .reorder import hilbert_order
+
+
+def _metis_parts(mesh, nparts: int) -> TensorLike:
+    from ..graph import metis
+
+    face2cell = bm.to_numpy(mesh.face_to_cell())
+    inner = face2cell[:, 0] != face2cell[:, 1]
+    i, j = face2cell[inner, 0], face2cell[inner, 1]
+    NC = mesh.number_of_cells()
+    adjlist = [[] for _ in range(NC)]
+    for a, b in zip(i.tolist(), j.tolist()):
+        adjlist[a].append(b)
+        adjlist[b].append(a)
+    _, parts = metis.part_graph(adjlist, nparts=nparts)
+    return np.asarray(parts)
+
+
+def partition_cells(mesh, nparts: int, *,
+                    method: Literal['auto', 'metis', 'hilbert']='auto') -> TensorLike:
+    """Partition the cells of a mesh into connected parts of similar sizes.
+
+    Parameters:
+        mesh (HomogeneousMesh): The mesh.
+        nparts (int): Number of the parts.
+        method ('auto' | 'metis' | 'hilbert', optional): 'metis' partitions the
+            dual graph of the mesh by `fealpy.graph.metis`, which requires the
+            METIS library. 'hilbert' splits the cells sorted along the Hilbert
+            curve into chunks of equal sizes. 'auto' uses 'metis' if available,
+            and 'hilbert' otherwise. Defaults to 'auto'.
+
+    Returns:
+        Tensor: The part of each cell in shape (NC,).
+    """
+    if method not in ('auto', 'metis', 'hilbert'):
+        raise ValueError(f"Unknown partition method '{method}', expected "
+                         "'auto', 'metis' or 'hilbert'.")
+    NC = mesh.number_of_cells()
+    if nparts < 1 or nparts > NC:
+        raise ValueError(f"nparts should be in [1, {NC}], but got {nparts}.")
+    kwargs = bm.context(mesh.entity('cell'))
+
+    if method in ('auto', 'metis'):
+        try:
+            parts = _metis_parts(mesh, nparts)
+            return bm.tensor(parts, **kwargs)
+        except (ImportError, OSError, RuntimeError) as e:
+            if method == 'metis':
+                raise
+            logger.info(f"METIS is not available ({e}), the Hilbert curve is used.")
+
+    order = hilbert_order(mesh.entity_barycenter('cell'))
+    parts = bm.arange(NC, **kwargs) * nparts // NC
+    return bm.set_at(bm.zeros((NC,), **kwargs), order, parts)
+
+
+class Subdomain():
+    """A subdomain of a partitioned mesh, with the cells owned by the subdomain
+    first, followed by the cells in the ghost layers.
+
+    Attributes:
+        mesh (HomogeneousMesh): The mesh of the subdomain, numbered locally.
+        cell (Tensor): Global indices of the local cells in shape (NC_local,).
+        node (Tensor): Global indices of the local nodes in shape (NN_local,).
+        num_owned (int): Number of the owned cells, i.e. `cell[:num_owned]`.
+    """
+    def __init__(self, mesh, cell: TensorLike, node: TensorLike, num_owned: int):
+        self.mesh = mesh
+        self.cell = cell
+        self.node = node
+        self.num_owned = num_owned
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(cells={self.cell.shape[0]}, "
+                f"owned={self.num_owned}, nodes={self.node.shape[0]})")
+
+
+class MeshPartition():
+    """Non-overlapping partition of the cells of a mesh, and the overlapping
+    subdomains extended by the ghost layers, for domain decomposition.
+
+    Parameters:
+        mesh (HomogeneousMesh): The mesh.
+        nparts (int): Number of the subdomains.
+        overlap (int, optional): Number of the ghost layers of cells around each
+            subdomain, the cells sharing nodes with the previous layer. Defaults to 1.
+        method (str, optional): The partition method, see `partition_cells`.
+            Defaults to 'auto'.
+        parts (Tensor | None, optional): The given part of each cell in shape (NC,).
+            Defaults to None, partitioning by `method`.
+
+    Examples:
+        >>> partition = MeshPartition(mesh, 4, overlap=1)
+        >>> sub = partition.subdomain(0)
+        >>> dofs = partition.subdomain_dofs(space)
+    """
+    def __init__(self, mesh, nparts: int, *, overlap: int=1, method: str='auto',
+                 parts: Optional[TensorLike]=None):
+        if overlap < 0:
+            raise ValueError("overlap should be non-negative.")
+        self.mesh = mesh
+        self.nparts = nparts
+        self.overlap = overlap
+        if parts is None:
+            parts = partition_cells(mesh, nparts, method=method)
+        elif parts.shape != (mesh.number_of_cells(),):
+            raise ValueError("parts should be given for each cell.")
+        self.parts = parts
+
+    def number_of_parts(self) -> int:
+        return self.nparts
+
+    def cells(self, i: int, *, overlap: Optional[int]=None) -> TensorLike:
+        """Global indices of the cells of the i-th subdomain, the owned cells
+        followed by the ghost layers.
+
+        Parameters:
+            i (int): Index of the subdomain.
+            overlap (int | None, optional): Number of the ghost layers. Defaults to
+                None, using the attribute `overlap`.
+
+        Returns:
+            Tensor: The cells in shape (NC_local,).
+        """
+        overlap = self.overlap if overlap is None else overlap
+        cell = self.mesh.entity('cell')
+        NN = self.mesh.number_of_nodes()
+        inside = self.parts == i
+        owned = bm.nonzero(inside)[0]
+        layers = [owned]
+
+        for _ in range(overlap):
+            flag = bm.zeros((NN,), dtype=bm.bool, device=bm.get_device(cell))
+            flag = bm.set_at(flag, bm.reshape(cell[inside], (-1,)), True)
+            touched = bm.any(flag[cell], axis=1)
+            layers.append(bm.nonzero(touched & ~inside)[0])
+            inside = touched
+
+        return bm.astype(bm.concat(layers), self.mesh.itype)
+
+    def subdomain(self, i: int, *, overlap: Optional[int]=None) -> Subdomain:
+        """The mesh of the i-th subdomain with the ghost layers, and its maps to
+        the global numbering."""
+        cells = self.cells(i, overlap=overlap)
+        num_owned = int(bm.sum(self.parts == i))
+        cell = self.mesh.entity('cell')[cells]
+        node = bm.unique(bm.reshape(cell, (-1,)))
+        local = bm.astype(bm.searchsorted(node, cell), self.mesh.itype)
+        mesh = self.mesh.__class__(self.mesh.entity('node')[node], local)
+        return Subdomain(mesh, cells, bm.astype(node, self.mesh.itype), num_owned)
+
+    def subdomains(self, *, overlap: Optional[int]=None) -> List[Subdomain]:
+        return [self.subdomain(i, overlap=overlap) for i in range(self.nparts)]
+
+    def subdomain_dofs(self, space, *, overlap: Optional[int]=None) -> List[TensorLike]:
+        """Global DoFs of each subdomain with the ghost layers, sorted.
+
+        Parameters:
+            space (FunctionSpace): The space on the mesh, with `cell_to_dof`.
+            overlap (int | None, optional): Number of the ghost layers. Defaults to
+                None, using the attribute `overlap`.
+
+        Returns:
+            List[Tensor]: The DoFs of the subdomains.
+        """
+        cell2dof = space.cell_to_dof()
+        return [bm.unique(bm.reshape(cell2dof[self.cells(i, overlap=overlap)], (-1,)))
+                for i in range(self.nparts)]
+
+    def dof_owner(self, space) -> TensorLike:
+        """The subdomain owning each DoF in shape (gdof,), which is one of the
+        subdomains whose cells contain the DoF."""
+        cell2dof = space.cell_to_dof()
+        owner = bm.zeros((space.number_of_global_dofs(),), **bm.context(self.parts))
+        parts = bm.broadcast_to(self.parts[:, None], cell2dof.shape)
+        return bm.set_at(owner, cell2dof, parts)
+
+    def local_to_global_dofs(self, space, sub: Subdomain, local_space) -> TensorLike:
+        """Map the DoFs of a space on the subdomain mesh to the global DoFs.
+
+        Parameters:
+            space (FunctionSpace): The space on the global mesh.
+            sub (Subdomain): The subdomain.
+            local_space (FunctionSpace): The same kind of space on `sub.mesh`.
+
+        Returns:
+            Tensor: Global index of each local DoF in shape (ldof_local,).
+        """
+        local = local_space.cell_to_dof()
+        l2g = bm.zeros((local_space.number_of_global_dofs(),), **bm.context(local))
+        return bm.set_at(l2g, local, bm.astype(space.cell_to_dof()[sub.cell], local.dtype))
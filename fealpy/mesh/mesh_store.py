@@ -0,0 +1,312 @@
+
+import json
+import os
+from typing import Optional, Union, List, Dict, Any
+
+import numpy as np
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+
+
+# Size of the headers of the growable .npy files, so that the shape in the
+# header can be updated in place when the arrays grow.
+_HEADER_SIZE = 256
+_MAGIC = b'\x93NUMPY\x01\x00'
+
+
+def _write_header(fp, shape, dtype: np.dtype) -> None:
+    header = {'descr': np.lib.format.dtype_to_descr(dtype),
+              'fortran_order': False, 'shape': tuple(shape)}
+    text = repr(header).encode('latin1')
+    size = _HEADER_SIZE - len(_MAGIC) - 2
+    if len(text) + 1 > size:
+        raise ValueError(f"the shape {tuple(shape)} is too long for the header.")
+    text = text + b' ' * (size - len(text) - 1) + b'\n'
+    fp.seek(0)
+    fp.write(_MAGIC + len(text).to_bytes(2, 'little') + text)
+
+
+def _append_npy(fname: str, value: np.ndarray) -> int:
+    """Append the value as a new row of the .npy file, and return the number
+    of rows. The file is created when it does not exist."""
+    value = np.asarray(value)
+    return _append_rows(fname, value[None, ...])
+
+
+def _append_rows(fname: str, rows: np.ndarray) -> int:
+    """Append the rows, i.e. the first axis of the array, to the .npy file in
+    one write, and return the number of rows. The file is created when it
+    does not exist."""
+    rows = np.asarray(rows, order='C')
+    if not os.path.exists(fname):
+        with open(fname, 'wb') as fp:
+            _write_header(fp, (0,) + rows.shape[1:], rows.dtype)
+    with open(fname, 'r+b') as fp:
+        np.lib.format.read_magic(fp)
+        shape, _, dtype = np.lib.format.read_array_header_1_0(fp)
+        if shape[1:] != rows.shape[1:] or dtype != rows.dtype:
+            raise ValueError(f"can not append the value in shape {rows.shape[1:]} and "
+                             f"{rows.dtype} to the rows in shape {shape[1:]} and {dtype}.")
+        # NOTE: write after the last complete row, dropping any bytes left by
+        # an interrupted append, whose rows are not counted in the header.
+        row_size = int(np.prod(shape[1:], dtype=np.int64)) * dtype.itemsize
+        end = _HEADER_SIZE + shape[0] * row_size
+        fp.seek(end)
+        fp.truncate(end)
+        fp.write(rows.tobytes())
+        # NOTE: the header is updated after the data, so that an interrupted
+        # append leaves the file readable with the old rows.
+        _write_header(fp, (shape[0] + rows.shape[0],) + shape[1:], dtype)
+    return shape[0] + rows.shape[0]
+
+
+def _truncate_rows(fname: str, nrows: int) -> None:
+    """Keep the first `nrows` rows of the .npy file written by `_append_rows`,
+    removing the rest and any partially written row at the end."""
+    with open(fname, 'r+b') as fp:
+        np.lib.format.read_magic(fp)
+        shape, _, dtype = np.lib.format.read_array_header_1_0(fp)
+        if nrows > shape[0]:
+            raise ValueError(f"can not truncate {shape[0]} rows to {nrows}.")
+        row_size = int(np.prod(shape[1:], dtype=np.int64)) * dtype.itemsize
+        _write_header(fp, (nrows,) + shape[1:], dtype)
+        fp.truncate(_HEADER_SIZE + nrows * row_size)
+
+
+class MeshStore():
+    """A directory of .npy files storing a mesh, its topology relations, and time
+    series of finite element functions, which are memory-mapped when loaded.
+
+    The layout of the directory is
+        meta.json             the mesh type and the names of the arrays;
+        mesh/<name>.npy       node, cell, face, edge and the topology relations;
+        nodedata/<key>.npy    and celldata/<key>.npy, the data on the mesh;
+        fields/<name>.npy     the time series of a function, in shape (NT, ...);
+        fields/<name>.t.npy   the times of the series, in shape (NT,).
+
+    Parameters:
+        path (str): The directory of the store.
+        mode ('r' | 'w' | 'a', optional): 'r' reads an existing store, 'w' creates
+            a new store, removing the arrays in the existing one, and 'a' reads and
+            appends. Defaults to 'r'.
+
+    Examples:
+        >>> store = MeshStore('result', 'w')
+        >>> store.save_mesh(mesh)
+        >>> for t in timeline:
+        ...     store.append('uh', uh, time=t)
+        >>> mesh = MeshStore('result').load_mesh()
+        >>> uh = space.function(MeshStore('result').load('uh', step=-1))
+
+    Note:
+        Loading is lazy: the arrays are memory-mapped copy-on-write, so the pages
+        are read from the disk on the first access, and modifying the arrays does
+        not change the files. The topology relations are loaded instead of
+        constructed. Appending writes one time step at the end of the file.
+    """
+    def __init__(self, path: str, mode: str='r'):
+        if mode not in ('r', 'w', 'a'):
+            raise ValueError(f"Unknown mode '{mode}', expected 'r', 'w' or 'a'.")
+        self.path = path
+        self.mode = mode
+        meta = os.path.join(path, 'meta.json')
+
+        if mode == 'w' or (mode == 'a' and not os.path.exists(meta)):
+            os.makedirs(path, exist_ok=True)
+            if os.path.exists(meta):
+                for name in self._files(self._read_meta()):
+                    fname = os.path.join(path, name)
+                    if os.path.exists(fname):
+                        os.remove(fname)
+            self.meta = {'mesh': None, 'arrays': [], 'nodedata': [], 'celldata': [],
+                         'fields': []}
+            self._write_meta()
+        else:
+            if not os.path.exists(meta):
+                raise RuntimeError(f"'{path}' is not a mesh store.")
+            self.meta = self._read_meta()
+
+    def _read_meta(self) -> Dict[str, Any]:
+        with open(os.path.join(self.path, 'meta.json'), 'r') as fp:
+            return json.load(fp)
+
+    def _write_meta(self) -> None:
+        with open(os.path.join(self.path, 'meta.json'), 'w') as fp:
+            json.dump(self.meta, fp, indent=2)
+
+    @staticmethod
+    def _files(meta: Dict[str, Any]) -> List[str]:
+        files = [f'mesh/{k}.npy' for k in meta['arrays']]
+        files += [f'nodedata/{k}.npy' for k in meta['nodedata']]
+        files += [f'celldata/{k}.npy' for k in meta['celldata']]
+        files += [f'fields/{k}{s}.npy' for k in meta['fields'] for s in ('', '.t')]
+        return files
+
+    def _check_writable(self) -> None:
+        if self.mode == 'r':
+            raise RuntimeError("the store is opened in the read-only mode 'r'.")
+
+    def _save(self, group: str, name: str, value: TensorLike) -> None:
+        os.makedirs(os.path.join(self.path, group), exist_ok=True)
+        np.save(os.path.join(self.path, group, name + '.npy'), bm.to_numpy(value))
+
+    def _load(self, group: str, name: str, mmap: bool) -> TensorLike:
+        fname = os.path.join(self.path, group, name + '.npy')
+        array = np.load(fname, mmap_mode='c' if mmap else None)
+        return bm.from_numpy(array)
+
+    ### mesh
+    def save_mesh(self, mesh, *, topology: bool=True) -> None:
+        """Save the mesh, replacing the mesh in the store.
+
+        Parameters:
+            mesh (HomogeneousMesh): The mesh, e.g. TriangleMesh, QuadrangleMesh,
+                TetrahedronMesh or HexahedronMesh.
+            topology (bool, optional): Whether to save the faces, the edges and the
+                topology relations, so that they are not constructed when loaded.
+                Defaults to True.
+        """
+        from .mesh_base import StructuredMesh
+        self._check_writable()
+        if isinstance(mesh, StructuredMesh):
+            raise ValueError("structured meshes are defined by the grid parameters, "
+                             "and can not be saved as entities.")
+
+        arrays = {'node': mesh.entity('node'), 'cell': mesh.entity('cell')}
+        if topology:
+            TD = mesh.top_dimension()
+            names = ['edge', 'face2cell', 'cell2face']
+            if TD == 3:
+                names += ['face', 'cell2edge']
+            for name in names:
+                value = getattr(mesh, name, None)
+                if isinstance(value, TensorLike):
+                    arrays[name] = value
+
+        for name in self.meta['arrays']:
+            if name not in arrays:
+                os.remove(os.path.join(self.path, 'mesh', name + '.npy'))
+        for name, value in arrays.items():
+            self._save('mesh', name, value)
+        self.meta['mesh'] = mesh.__class__.__name__
+        self.meta['arrays'] = list(arrays)
+
+        for group in ('nodedata', 'celldata'):
+            data = getattr(mesh, group, None)
+            data = {k: v for k, v in data.items() if isinstance(v, TensorLike)} \
+                    if isinstance(data, dict) else {}
+            for name in self.meta[group]:
+                if name not in data:
+                    os.remove(os.path.join(self.path, group, name + '.npy'))
+            for name, value in data.items():
+                self._save(group, name, value)
+            self.meta[group] = list(data)
+
+        self._write_meta()
+
+    def load_mesh(self, *, mmap: bool=True):
+        """Load the mesh in the store.
+
+        Parameters:
+            mmap (bool, optional): Whether to memory-map the arrays instead of
+                reading them into memory. Defaults to True.
+
+        Returns:
+            HomogeneousMesh: The mesh of the saved type.
+        """
+        from .. import mesh as meshes
+        name = self.meta['mesh']
+        if name is None:
+            raise RuntimeError(f"no mesh is saved in '{self.path}'.")
+        Mesh = getattr(meshes, name, None)
+        if not isinstance(Mesh, type):
+            raise RuntimeError(f"Unknown mesh type '{name}'.")
+        arrays = {k: self._load('mesh', k, mmap) for k in self.meta['arrays']}
+
+        if 'face2cell' in arrays:
+            # NOTE: the topology is loaded, so the construction in the initialization
+            # is skipped by an instance attribute shadowing the method.
+            mesh = Mesh.__new__(Mesh)
+            object.__setattr__(mesh, 'construct', lambda *args, **kwargs: None)
+            Mesh.__init__(mesh, arrays['node'], arrays['cell'])
+            del mesh.construct
+            for k, v in arrays.items():
+                if k not in ('node', 'cell'):
+                    setattr(mesh, k, v)
+            if mesh.top_dimension() == 2:
+                mesh.edge2cell = mesh.face2cell
+                mesh.cell2edge = mesh.cell2face
+        else:
+            mesh = Mesh(arrays['node'], arrays['cell'])
+
+        for group in ('nodedata', 'celldata'):
+            data = getattr(mesh, group)
+            for k in self.meta[group]:
+                data[k] = self._load(group, k, mmap)
+        return mesh
+
+    ### time series
+    def append(self, name: str, value: TensorLike, time: Optional[float]=None) -> int:
+        """Append a time step of a function to the store.
+
+        Parameters:
+            name (str): Name of the series.
+            value (Function | Tensor): The function or its degrees of freedom.
+                All steps of a series have the same shape and dtype.
+            time (float | None, optional): The time of the step. Defaults to None,
+                using the number of the step.
+
+        Returns:
+            int: The number of steps in the series.
+        """
+        self._check_writable()
+        array = bm.to_numpy(value.array if hasattr(value, 'space') else value)
+        os.makedirs(os.path.join(self.path, 'fields'), exist_ok=True)
+        fname = os.path.join(self.path, 'fields', name)
+        if name not in self.meta['fields']:
+            for suffix in ('.npy', '.t.npy'):
+                if os.path.exists(fname + suffix):
+                    os.remove(fname + suffix)
+        NT = _append_npy(fname + '.npy', array)
+        time = NT - 1 if time is None else time
+        _append_npy(fname + '.t.npy', np.array(time, dtype=np.float64))
+
+        if name not in self.meta['fields']:
+            self.meta['fields'].append(name)
+            self._write_meta()
+        return NT
+
+    def fields(self) -> List[str]:
+        """Names of the time series in the store."""
+        return list(self.meta['fields'])
+
+    def times(self, name: str) -> TensorLike:
+        """Times of the steps of the series, in shape (NT,)."""
+        self._check_field(name)
+        return self._load('fields', name + '.t', mmap=False)
+
+    def load(self, name: str, step: Optional[Union[int, slice]]=None, *,
+             mmap: bool=True) -> TensorLike:
+        """Load the time series, or some of its steps.
+
+        Parameters:
+            name (str): Name of the series.
+            step (int | slice | None, optional): The steps to load, e.g. -1 for the
+                last one. Defaults to None, loading all steps in shape (NT, ...).
+            mmap (bool, optional): Whether to memory-map the series. Defaults to True.
+
+        Returns:
+            Tensor: The degrees of freedom.
+        """
+        self._check_field(name)
+        fname = os.path.join(self.path, 'fields', name + '.npy')
+        array = np.load(fname, mmap_mode='c' if mmap else None)
+        if step is not None:
+            array = array[step]
+        return bm.from_numpy(array)
+
+    def _check_field(self, name: str) -> None:
+        if name not in self.meta['fields']:
+            raise ValueError(f"'{name}' is not a series in the store, "
+                             f"expected one of {self.meta['fields']}.")
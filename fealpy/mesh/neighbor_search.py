@@ -0,0 +1,238 @@
+
+from itertools import product
+from typing import Optional, Tuple, List
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from .mesh_data_structure import narrowest_index_dtype
+
+
+class NeighborSearch():
+    """Uniform-grid cell list searching the pairs of points within a cutoff
+    distance, with a Verlet list reused while the points move less than a
+    skin distance, e.g. the neighbors of the particles in SPH.
+
+    Parameters:
+        cutoff (float): The cutoff distance. Pairs with the distance less than
+            `cutoff` are neighbors.
+        box_size (float | Sequence[float] | Tensor | None, optional): Size of the
+            periodic box [0, L_0) x [0, L_1) x ..., where the distances are measured
+            by the minimum image. Defaults to None, non-periodic.
+        skin (float, optional): The extra distance of the Verlet list. The list of
+            the pairs within `cutoff + skin` is rebuilt only when a point moves more
+            than `skin / 2`. Defaults to 0.0, rebuilding on every update.
+        include_self (bool, optional): Whether a point is a neighbor of itself.
+            Defaults to False.
+
+    Examples:
+        >>> search = NeighborSearch(h, box_size=[1.0, 1.0], skin=0.1*h)
+        >>> for step in range(nt):
+        ...     indptr, index = search.update(position)
+        ...     i = bm.repeat(bm.arange(NN), indptr[1:] - indptr[:-1])
+        ...     j = index
+
+    Note:
+        The points are sorted by cells, and the pairs are generated for the
+        neighboring cells by vectorized gathers, without loops over the points.
+        The memory is proportional to the number of the candidate pairs in the
+        neighboring cells of one offset.
+    """
+    def __init__(self, cutoff: float, box_size=None, *, skin: float=0.0,
+                 include_self: bool=False):
+        if cutoff <= 0:
+            raise ValueError(f"cutoff should be positive, but got {cutoff}.")
+        if skin < 0:
+            raise ValueError(f"skin should be non-negative, but got {skin}.")
+        self.cutoff = float(cutoff)
+        self.skin = float(skin)
+        self.box_size = box_size
+        self.include_self = include_self
+        self.rebuilds = 0
+        self._reference = None # the points when the Verlet list is built
+        self._pairs = None
+
+    def _box(self, points: TensorLike) -> Optional[TensorLike]:
+        if self.box_size is None:
+            return None
+        box = bm.tensor(self.box_size, **bm.context(points))
+        return bm.broadcast_to(box, (points.shape[1],))
+
+    def _displacement(self, dr: TensorLike, box: Optional[TensorLike]) -> TensorLike:
+        if box is None:
+            return dr
+        return dr - box * bm.floor(dr / box + 0.5)
+
+    def displacement(self, dr: TensorLike) -> TensorLike:
+        """The minimum image of the displacements in shape (..., GD) in the
+        periodic box, or themselves if non-periodic."""
+        return self._displacement(dr, self._box(dr))
+
+    def _grid(self, points: TensorLike, box: Optional[TensorLike], radius: float):
+        """Number of cells in each axis, and the cell of each point."""
+        if box is None:
+            origin = bm.min(points, axis=0)
+            extent = bm.max(points, axis=0) - origin
+        else:
+            origin = bm.zeros_like(box)
+            extent = box
+            points = bm.remainder(points, box)
+        shape = [max(int(e // radius), 1) for e in bm.to_numpy(extent).tolist()]
+        n = bm.tensor(shape, dtype=bm.int64, device=bm.get_device(points))
+        size = bm.where(extent > 0, extent / n, 1.0)
+        coord = bm.astype(bm.floor((points - origin) / size), bm.int64)
+        coord = bm.minimum(bm.clip(coord, 0, None), n - 1)
+        return shape, coord
+
+    def build(self, points: TensorLike) -> Tuple[TensorLike, TensorLike]:
+        """Build the Verlet list of the points from scratch, and return the
+        neighbors within the cutoff."""
+        self._build(points)
+        return self._neighbors(points)
+
+    def _build(self, points: TensorLike) -> None:
+        box = self._box(points)
+        radius = self.cutoff + self.skin
+        NN, GD = points.shape
+        kwargs = dict(dtype=bm.int64, device=bm.get_device(points))
+        shape, coord = self._grid(points, box, radius)
+
+        stride = [1] * GD
+        for d in reversed(range(GD - 1)):
+            stride[d] = stride[d + 1] * shape[d + 1]
+        NC = stride[0] * shape[0]
+        cell = bm.sum(coord * bm.tensor(stride, **kwargs), axis=1)
+        order = bm.argsort(cell, stable=True)
+        start = bm.searchsorted(cell[order], bm.arange(NC + 1, **kwargs))
+        start = bm.astype(start, bm.int64)
+        count = start[1:] - start[:-1]
+
+        # NOTE: the points are sorted by cells for the locality of the gathers,
+        # and the coordinates are stored by axes.
+        coord = coord[order]
+        if box is not None:
+            points = bm.remainder(points, box)
+        x = [bm.copy(points[order, d]) for d in range(GD)]
+        L = None if box is None else bm.to_numpy(box).tolist()
+        index = bm.arange(NN, **kwargs)
+        pairs_i: List[TensorLike] = []
+        pairs_j: List[TensorLike] = []
+
+        for offset in product(*[self._offsets(n, box is not None) for n in shape]):
+            ncell = bm.zeros((NN,), **kwargs)
+            valid = None
+            shifted = []
+            for d in range(GD):
+                c = coord[:, d] + offset[d]
+                if box is None:
+                    flag = (c >= 0) & (c < shape[d])
+                    valid = flag if valid is None else valid & flag
+                    c = bm.clip(c, 0, shape[d] - 1)
+                    shifted.append(x[d])
+                elif shape[d] >= 3:
+                    # the image of the neighboring cell is the minimum image
+                    wrap = bm.floor_divide(c, shape[d])
+                    c = c - wrap * shape[d]
+                    shifted.append(x[d] - L[d] * bm.astype(wrap, x[d].dtype))
+                else:
+                    c = bm.remainder(c, shape[d])
+                    shifted.append(None)
+                ncell = ncell + c * stride[d]
+
+            num = count[ncell]
+            if valid is not None:
+                num = bm.where(valid, num, 0)
+            total = int(bm.sum(num))
+            if total == 0:
+                continue
+            first = bm.cumsum(num, axis=0) - num
+            j = bm.repeat(start[ncell] - first, num) + bm.arange(total, **kwargs)
+            i = bm.repeat(index, num)
+            dist = None
+            for d in range(GD):
+                if shifted[d] is None:
+                    dx = x[d][i] - x[d][j]
+                    dx = dx - L[d] * bm.floor(dx / L[d] + 0.5)
+                else:
+                    dx = bm.repeat(shifted[d], num) - x[d][j]
+                dist = dx * dx if dist is None else dist + dx * dx
+            keep = dist < radius**2
+            if (not self.include_self) and all(o == 0 for o in offset):
+                keep = keep & (i != j)
+            pairs_i.append(order[i[keep]])
+            pairs_j.append(order[j[keep]])
+
+        if len(pairs_i) == 0:
+            i = j = bm.zeros((0,), **kwargs)
+        else:
+            i, j = bm.concat(pairs_i), bm.concat(pairs_j)
+        key = bm.argsort(i * NN + j)
+        self._pairs = (i[key], j[key])
+        self._reference = bm.copy(points)
+        self.rebuilds += 1
+
+    @staticmethod
+    def _offsets(n: int, periodic: bool) -> Tuple[int, ...]:
+        # NOTE: the neighboring cells coincide under the periodic wrapping when
+        # there are less than 3 cells.
+        if periodic and n < 3:
+            return tuple(range(n))
+        return (-1, 0, 1)
+
+    def update(self, points: TensorLike) -> Tuple[TensorLike, TensorLike]:
+        """Update the neighbors of the moved points, rebuilding the Verlet list
+        only if some point has moved more than half the skin.
+
+        Parameters:
+            points (Tensor): The points in shape (NN, GD).
+
+        Returns:
+            Tensor: The CSR pointers `indptr` in shape (NN+1,).
+            Tensor: The neighbors `index`, where the neighbors of the point k are
+                `index[indptr[k]:indptr[k+1]]`, sorted.
+        """
+        self._refresh(points)
+        return self._neighbors(points)
+
+    def _refresh(self, points: TensorLike) -> bool:
+        """Rebuild the Verlet list if necessary, and return whether it is rebuilt."""
+        ref = self._reference
+        if (ref is not None) and (ref.shape == points.shape) and (self.skin > 0):
+            dr = self._displacement(points - ref, self._box(points))
+            if float(bm.max(bm.sum(dr * dr, axis=-1))) <= (self.skin / 2)**2:
+                return False
+        self._build(points)
+        return True
+
+    def verlet_pairs(self, points: TensorLike) -> Tuple[TensorLike, TensorLike]:
+        """The pairs (i, j) of the Verlet list within `cutoff + skin`, sorted by
+        i and then j, rebuilt only if necessary as in `update`. The pairs are
+        the same tensors until the list is rebuilt."""
+        self._refresh(points)
+        return self._pairs
+
+    def reset(self) -> None:
+        """Drop the Verlet list, e.g. after the points are renumbered."""
+        self._reference = None
+        self._pairs = None
+
+    __call__ = update
+
+    def _neighbors(self, points: TensorLike) -> Tuple[TensorLike, TensorLike]:
+        i, j = self._pairs
+        NN = points.shape[0]
+        if self.skin > 0:
+            dr = self._displacement(points[i] - points[j], self._box(points))
+            keep = bm.sum(dr * dr, axis=-1) < self.cutoff**2
+            i, j = i[keep], j[keep]
+        itype = narrowest_index_dtype(max(NN, i.shape[0]), margin=1)
+        kwargs = dict(dtype=bm.int64, device=bm.get_device(points))
+        indptr = bm.searchsorted(i, bm.arange(NN + 1, **kwargs))
+        return bm.astype(indptr, itype), bm.astype(j, itype)
+
+
+def neighbor_pairs(points: TensorLike, cutoff: float, box_size=None, *,
+                   include_self: bool=False) -> Tuple[TensorLike, TensorLike]:
+    """The neighbors of the points within the cutoff distance in CSR format,
+    see `NeighborSearch.update`."""
+    search = NeighborSearch(cutoff, box_size, include_self=include_self)
+    return search.build(points)
@@ -5,19 +5,13 @@ from ..typing import TensorLike, Index, _S
 from .. import logger
 
 from .mesh_base import MeshDS 
-
-import jax.numpy as jnp
-import jax
-from jax_md import space, partition
-from jax import vmap, lax
+from .neighbor_search import NeighborSearch
 
 class NodeMesh(MeshDS):
+    # NOTE: The nodes move in place in particle simulations.
+    cache_enabled = False
     def __init__(self, node: TensorLike, nodedata: Optional[Dict] = None, itype: str = 'default_itype', ftype: str = 'default_ftype') -> None: 
         super().__init__(TD=0, itype=itype, ftype=ftype)
-        '''
-        note : Currently using jax's own jax_md, vmap, lax, vstack , ravel,
-               full, where, mgrid, column_stack, full_like, hstack.
-        '''
         self.node = node
 
         if nodedata is None:
@@ -49,35 +43,50 @@ class NodeMesh(MeshDS):
 
     def neighbors(self, box_size, h) -> TensorLike: 
         '''
-        @brief Find neighbor particles within the smoothing radius.
+        @brief Find neighbor particles within the smoothing radius in the periodic
+               box, including the particle itself.
 
-        note : Currently using jax's own jax_md, vmap, lax
-        '''
-        displacement, shift = space.periodic(box_size)
-        neighbor_fn = partition.neighbor_list(displacement, box_size, h)
-
-        nbrs = neighbor_fn.allocate(self.node)
-        nbrs = neighbor_fn.update(self.node, nbrs)
-        neighbor = nbrs.idx
-        num = self.node.shape[0]
-        index = vmap(lambda idx, row: jnp.hstack([row, jnp.array([idx])]))(bm.arange(neighbor.shape[0]), neighbor)
-        row_len = bm.sum(index != num,axis=1)
-        indptr = lax.scan(lambda carry, x: (carry + x, carry + x), 0, row_len)[1]
-        indptr = bm.concatenate((bm.tensor([0]), indptr))
-        index = index[index != num]
+        @return index, indptr : the neighbors of the particle k are
+                index[indptr[k]:indptr[k+1]], sorted.
 
+        note : Use `NeighborSearch` with a skin distance to reuse the list in
+               time steps.
+        '''
+        search = NeighborSearch(h, box_size, include_self=True)
+        indptr, index = search.build(self.node)
         return index, indptr
 
+    @staticmethod
+    def _grid_points(n) -> TensorLike:
+        '''
+        @brief The integer points (i, j), 0 <= i < n[0] and 0 <= j < n[1], in
+               shape (n[0]*n[1], 2), with i running fastest.
+        '''
+        x, y = bm.meshgrid(bm.arange(n[0], dtype=bm.float64),
+                           bm.arange(n[1], dtype=bm.float64), indexing="xy")
+        return bm.stack([x.reshape(-1), y.reshape(-1)], axis=1)
+
+    @staticmethod
+    def _mgrid(xrange, yrange) -> TensorLike:
+        '''
+        @brief The points of the grid like `numpy.mgrid[x0:x1:dx, y0:y1:dy]`, in
+               shape (NN, 2), with y running fastest.
+
+        @param xrange, yrange : (start, stop, step) of the two axes.
+        '''
+        x = bm.arange(*xrange, dtype=bm.float64)
+        y = bm.arange(*yrange, dtype=bm.float64)
+        x, y = bm.meshgrid(x, y, indexing="ij")
+        return bm.stack([x.reshape(-1), y.reshape(-1)], axis=1)
+
     @classmethod
     def from_tgv_domain(cls, box_size, dx=0.02, dy=0.02):
         rho0 = 1.0 #参考密度
         eta0 = 0.01 #参考动态粘度
-        n = bm.tensor((box_size / dx).round(), dtype=int)
-        grid = bm.meshgrid(bm.arange(n[0]), bm.arange(n[1]), indexing="xy")
-        
-        r = bm.tensor((jnp.vstack(list(map(jnp.ravel, grid))).T + 0.5) * dx)
+        n = [int(round(float(l) / dx)) for l in box_size]
+        r = (cls._grid_points(n) + 0.5) * dx
         NN = r.shape[0]
-        tag = jnp.full(NN, 0, dtype=int)
+        tag = bm.full((NN,), 0, dtype=bm.int64)
         mv = bm.zeros((NN, 2), dtype=bm.float64)
         tv = bm.zeros((NN, 2), dtype=bm.float64)
         x = r[:, 0]
@@ -123,18 +132,16 @@ class NodeMesh(MeshDS):
 
         #wall particles
         dxn1 = dx * n_walls
-        n1 = bm.tensor((bm.tensor([L, dxn1]) / dx).round(), dtype=int)
-        grid1 = bm.meshgrid(bm.arange(n1[0]), bm.arange(n1[1]), indexing="xy")
-        r1 = (jnp.vstack(list(map(jnp.ravel, grid1))).T + 0.5) * dx
-        wall_b = r1.copy()
-        wall_t = r1.copy() + bm.tensor([0.0, H + dxn1])
+        n1 = [round(L / dx), round(dxn1 / dx)]
+        r1 = (cls._grid_points(n1) + 0.5) * dx
+        wall_b = r1
+        wall_t = r1 + bm.tensor([0.0, H + dxn1], dtype=bm.float64)
         r_w = bm.concatenate([wall_b, wall_t])
 
         #fuild particles
-        n2 = bm.tensor((bm.tensor([L, H]) / dx).round(), dtype=int)
-        grid2 = bm.meshgrid(bm.arange(n2[0]), bm.arange(n2[1]), indexing="xy")
-        r2 = (jnp.vstack(list(map(jnp.ravel, grid2))).T + 0.5) * dx
-        r_f = bm.tensor([0.0, 1.0]) * n_walls * dx + r2
+        n2 = [round(L / dx), round(H / dx)]
+        r2 = (cls._grid_points(n2) + 0.5) * dx
+        r_f = bm.tensor([0.0, 1.0], dtype=bm.float64) * n_walls * dx + r2
 
         #tag
         '''
@@ -143,25 +150,25 @@ class NodeMesh(MeshDS):
         2 moving wall
         3 dirchilet wall
         '''
-        tag_f = jnp.full(len(r_f), 0, dtype=int)
-        tag_w = jnp.full(len(r_w), 1, dtype=int)
-        r = bm.tensor(bm.concatenate([r_w, r_f]))
+        tag_f = bm.full((r_f.shape[0],), 0, dtype=bm.int64)
+        tag_w = bm.full((r_w.shape[0],), 1, dtype=bm.int64)
+        r = bm.concatenate([r_w, r_f])
         tag = bm.concatenate([tag_w, tag_f])
 
         dx2n = dx * n_walls * 2
-        _box_size = bm.tensor([L, H + dx2n])
+        _box_size = [L, H + dx2n]
         mask_hot_wall = ((r[:, 1] < dx * n_walls) * (r[:, 0] < (_box_size[0] / 2) + \
                 hot_wall_half_width) * (r[:, 0] > (_box_size[0] / 2) - hot_wall_half_width))
-        tag = jnp.where(mask_hot_wall, 3, tag)
+        tag = bm.where(mask_hot_wall, 3, tag)
         
         NN_sum = r.shape[0]
         mv = bm.zeros_like(r)
-        rho = bm.ones(NN_sum) * rho0
-        mass = bm.ones(NN_sum) * dx * dy * rho0
-        eta = bm.ones(NN_sum) * eta0
-        temperature = bm.ones(NN_sum) * T0
-        kappa = bm.ones(NN_sum) * kappa0
-        Cp = bm.ones(NN_sum) * Cp0
+        rho = bm.ones(NN_sum, dtype=bm.float64) * rho0
+        mass = bm.ones(NN_sum, dtype=bm.float64) * dx * dy * rho0
+        eta = bm.ones(NN_sum, dtype=bm.float64) * eta0
+        temperature = bm.ones(NN_sum, dtype=bm.float64) * T0
+        kappa = bm.ones(NN_sum, dtype=bm.float64) * kappa0
+        Cp = bm.ones(NN_sum, dtype=bm.float64) * Cp0
 
         nodedata = {
             "position": r,
@@ -196,18 +203,16 @@ class NodeMesh(MeshDS):
 
         #wall particles
         dxn1 = dx * n_walls
-        n1 = bm.tensor((bm.tensor([L, dxn1]) / dx).round(), dtype=int)
-        grid1 = bm.meshgrid(bm.arange(n1[0]), bm.arange(n1[1]), indexing="xy")
-        r1 = (jnp.vstack(list(map(jnp.ravel, grid1))).T + 0.5) * dx
-        wall_b = r1.copy()
-        wall_t = r1.copy() + bm.tensor([0.0, H + dxn1])
+        n1 = [round(L / dx), round(dxn1 / dx)]
+        r1 = (cls._grid_points(n1) + 0.5) * dx
+        wall_b = r1
+        wall_t = r1 + bm.tensor([0.0, H + dxn1], dtype=bm.float64)
         r_w = bm.concatenate([wall_b, wall_t])
 
         #fuild particles
-        n2 = bm.array((bm.array([L, H]) / dx).round(), dtype=int)
-        grid2 = bm.meshgrid(bm.arange(n2[0]), bm.arange(n2[1]), indexing="xy")
-        r2 = (jnp.vstack(list(map(jnp.ravel, grid2))).T + 0.5) * dx
-        r_f = bm.tensor([0.0, 1.0]) * n_walls * dx + r2
+        n2 = [round(L / dx), round(H / dx)]
+        r2 = (cls._grid_points(n2) + 0.5) * dx
+        r_f = bm.tensor([0.0, 1.0], dtype=bm.float64) * n_walls * dx + r2
 
         #tag
         '''
@@ -216,28 +221,27 @@ class NodeMesh(MeshDS):
         2 moving wall
         3 velocity wall
         '''
-        r = bm.tensor(bm.concatenate([r_w, r_f])) 
-        tag_f = jnp.full(len(r_f), 0, dtype=int)
-        tag_w = jnp.full(len(r_w), 1, dtype=int)
-        r = bm.tensor(bm.concatenate([r_w, r_f]))
+        tag_f = bm.full((r_f.shape[0],), 0, dtype=bm.int64)
+        tag_w = bm.full((r_w.shape[0],), 1, dtype=bm.int64)
+        r = bm.concatenate([r_w, r_f])
         tag = bm.concatenate([tag_w, tag_f])
 
         dx2n = dx * n_walls * 2
-        _box_size = bm.tensor([L, H + dx2n])
+        _box_size = [L, H + dx2n]
         mask_hot_wall = (
         ((r[:, 1] < dx * n_walls) | (r[:, 1] > H + dx * n_walls)) &
         (((r[:, 0] > 0.3) & (r[:, 0] < 0.6)) | ((r[:, 0] > 0.9) & (r[:, 0] < 1.2)))
     )
-        tag = jnp.where(mask_hot_wall, 3, tag)
+        tag = bm.where(mask_hot_wall, 3, tag)
 
         NN_sum = r.shape[0]
         mv = bm.zeros_like(r)
-        rho = bm.ones(NN_sum) * rho0
-        mass = bm.ones(NN_sum) * dx * dy * rho0
-        eta = bm.ones(NN_sum) * eta0
-        temperature = bm.ones(NN_sum) * T0
-        kappa = bm.ones(NN_sum) * kappa0
-        Cp = bm.ones(NN_sum) * Cp0
+        rho = bm.ones(NN_sum, dtype=bm.float64) * rho0
+        mass = bm.ones(NN_sum, dtype=bm.float64) * dx * dy * rho0
+        eta = bm.ones(NN_sum, dtype=bm.float64) * eta0
+        temperature = bm.ones(NN_sum, dtype=bm.float64) * T0
+        kappa = bm.ones(NN_sum, dtype=bm.float64) * kappa0
+        Cp = bm.ones(NN_sum, dtype=bm.float64) * Cp0
 
         nodedata = {
             "position": r,
@@ -260,32 +264,30 @@ class NodeMesh(MeshDS):
         return cls(r, nodedata=nodedata)
 
     @classmethod
-    def from_long_rectangular_cavity_domain(cls, init_domain=bm.tensor([0.0,0.005,0,0.005]), domain=bm.tensor([0,0.05,0,0.005]), uin=bm.tensor([5.0, 0.0]), dx=1.25e-4):
+    def from_long_rectangular_cavity_domain(cls, init_domain=(0.0, 0.005, 0.0, 0.005), domain=(0.0, 0.05, 0.0, 0.005), uin=(5.0, 0.0), dx=1.25e-4):
         H = 1.5 * dx
         dy = dx
         rho0 = 737.54
+        x0, x1, y0, y1 = [float(x) for x in domain]
+        ix0, ix1, iy0, iy1 = [float(x) for x in init_domain]
 
         #fluid particles
-        fp = jnp.mgrid[init_domain[0]:init_domain[1]:dx, \
-            init_domain[2]+dx:init_domain[3]:dx].reshape(2,-1).T
+        fp = cls._mgrid((ix0, ix1, dx), (iy0 + dx, iy1, dx))
 
         #wall particles
-        x0 = bm.arange(domain[0],domain[1],dx)
+        x = bm.arange(x0, x1, dx, dtype=bm.float64)
 
-        bwp = jnp.column_stack((x0,jnp.full_like(x0,domain[2])))
-        uwp = jnp.column_stack((x0,jnp.full_like(x0,domain[3])))
-        wp = jnp.vstack((bwp,uwp))
+        bwp = bm.stack([x, bm.full_like(x, y0)], axis=1)
+        uwp = bm.stack([x, bm.full_like(x, y1)], axis=1)
+        wp = bm.concatenate([bwp, uwp])
 
         #dummy particles
-        bdp = jnp.mgrid[domain[0]:domain[1]:dx, \
-                domain[2]-dx:domain[2]-dx*4:-dx].reshape(2,-1).T
-        udp = jnp.mgrid[domain[0]:domain[1]:dx, \
-                domain[3]+dx:domain[3]+dx*3:dx].reshape(2,-1).T
-        dp = jnp.vstack((bdp,udp))
+        bdp = cls._mgrid((x0, x1, dx), (y0 - dx, y0 - dx*4, -dx))
+        udp = cls._mgrid((x0, x1, dx), (y1 + dx, y1 + dx*3, dx))
+        dp = bm.concatenate([bdp, udp])
 
         #gate particles
-        gp = jnp.mgrid[-dx:-dx-4*H:-dx, \
-                domain[2]+dx:domain[3]:dx].reshape(2,-1).T
+        gp = cls._mgrid((-dx, -dx - 4*H, -dx), (y0 + dx, y1, dx))
 
         #tag
         '''
@@ -294,19 +296,20 @@ class NodeMesh(MeshDS):
         dummy particles: 2
         gate particles: 3
         '''
-        tag_f = jnp.full((fp.shape[0],), 0, dtype=int)
-        tag_w = jnp.full((wp.shape[0],), 1, dtype=int)
-        tag_d = jnp.full((dp.shape[0],), 2,dtype=int)
-        tag_g = jnp.full((gp.shape[0],), 3,dtype=int)
+        tag_f = bm.full((fp.shape[0],), 0, dtype=bm.int64)
+        tag_w = bm.full((wp.shape[0],), 1, dtype=bm.int64)
+        tag_d = bm.full((dp.shape[0],), 2, dtype=bm.int64)
+        tag_g = bm.full((gp.shape[0],), 3, dtype=bm.int64)
 
-        r = jnp.vstack((fp, gp, wp, dp))
+        r = bm.concatenate([fp, gp, wp, dp])
         NN = r.shape[0]
-        tag = jnp.hstack((tag_f, tag_g, tag_w, tag_d))
-        fg_v =  bm.ones_like(jnp.vstack((fp, gp))) * uin
-        wd_v =  bm.zeros_like(jnp.vstack((wp, dp)))
-        v = jnp.vstack((fg_v, wd_v))
-        rho = bm.ones(NN) * rho0
-        mass = bm.ones(NN) * dx * dy * rho0
+        tag = bm.concatenate([tag_f, tag_g, tag_w, tag_d])
+        fg_v = bm.ones((fp.shape[0] + gp.shape[0], 2), dtype=bm.float64) * \
+                bm.tensor([float(u) for u in uin], dtype=bm.float64)
+        wd_v = bm.zeros((wp.shape[0] + dp.shape[0], 2), dtype=bm.float64)
+        v = bm.concatenate([fg_v, wd_v])
+        rho = bm.ones(NN, dtype=bm.float64) * rho0
+        mass = bm.ones(NN, dtype=bm.float64) * dx * dy * rho0
 
         nodedata = {
             "position": r,
@@ -322,24 +325,24 @@ class NodeMesh(MeshDS):
 
     @classmethod
     def from_dam_break_domain(cls, dx=0.02, dy=0.02):
-        pp = jnp.mgrid[dx:1+dx:dx, dy:2+dy:dy].reshape(2, -1).T
+        pp = cls._mgrid((dx, 1+dx, dx), (dy, 2+dy, dy))
 
         #down
-        bp0 = jnp.mgrid[0:4+dx:dx, 0:dy:dy].reshape(2, -1).T
-        bp1 = jnp.mgrid[-dx/2:4+dx/2:dx, -dy/2:dy/2:dy].reshape(2, -1).T
-        bp = jnp.vstack((bp0, bp1))
+        bp0 = cls._mgrid((0, 4+dx, dx), (0, dy, dy))
+        bp1 = cls._mgrid((-dx/2, 4+dx/2, dx), (-dy/2, dy/2, dy))
+        bp = bm.concatenate([bp0, bp1])
 
         #left
-        lp0 = jnp.mgrid[0:dx:dx, dy:4+dy:dy].reshape(2, -1).T
-        lp1 = jnp.mgrid[-dx/2:dx/2:dx, dy-dy/2:4+dy/2:dy].reshape(2, -1).T
-        lp = jnp.vstack((lp0, lp1))
+        lp0 = cls._mgrid((0, dx, dx), (dy, 4+dy, dy))
+        lp1 = cls._mgrid((-dx/2, dx/2, dx), (dy-dy/2, 4+dy/2, dy))
+        lp = bm.concatenate([lp0, lp1])
 
         #right
-        rp0 = jnp.mgrid[4:4+dx/2:dx, dy:4+dy:dy].reshape(2, -1).T
-        rp1 = jnp.mgrid[4+dx/2:4+dx:dx, dy-dy/2:4+dy/2:dy].reshape(2, -1).T
-        rp = jnp.vstack((rp0, rp1))
+        rp0 = cls._mgrid((4, 4+dx/2, dx), (dy, 4+dy, dy))
+        rp1 = cls._mgrid((4+dx/2, 4+dx, dx), (dy-dy/2, 4+dy/2, dy))
+        rp = bm.concatenate([rp0, rp1])
 
-        boundaryp = jnp.vstack((bp, lp, rp))
-        node = jnp.vstack((pp, boundaryp))
+        boundaryp = bm.concatenate([bp, lp, rp])
+        node = bm.concatenate([pp, boundaryp])
 
         return cls(node)
@@ -0,0 +1,264 @@
+
+from typing import Optional, Tuple
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+
+
+class PointLocator():
+    """Locate points in the cells of a simplex mesh, e.g. TriangleMesh in 2-d
+    and TetrahedronMesh in 3-d.
+
+    The cells are registered in a uniform grid of buckets by their bounding
+    boxes. A point is tested against the cells in its bucket by the barycentric
+    coordinates, so the search is exact for any domain, convex or not. When
+    initial guesses of the cells are given, e.g. the previous cells of moving
+    particles, the points first walk across the faces from the guesses, and the
+    points where the walk fails (e.g. leaving a non-convex domain) fall back to
+    the buckets.
+
+    Parameters:
+        mesh (SimplexMesh): The mesh whose geometric and topological dimensions
+            are equal.
+        cells_per_bucket (float, optional): The expected number of cells
+            registered in a bucket, controlling the resolution of the buckets.
+            Defaults to 1.
+
+    Examples:
+        >>> locator = PointLocator(mesh)
+        >>> cell, bc = locator.locate(points)
+        >>> cell, bc = locator.locate(new_points, hint=cell)
+
+    Note:
+        The locator holds the geometry of the mesh when created. Use a new
+        locator after the nodes or the cells are changed, which is done
+        automatically by `mesh.point_locator()`.
+    """
+    # Number of points handled at once, bounding the memory of the candidates.
+    chunk_size: int = 2**16
+
+    def __init__(self, mesh, *, cells_per_bucket: float=1.):
+        TD = mesh.top_dimension()
+        GD = mesh.geo_dimension()
+        if TD != GD:
+            raise ValueError("point location requires the geometric dimension "
+                             f"to be equal to the topological dimension, but got "
+                             f"GD = {GD} and TD = {TD}.")
+        self.mesh = mesh
+        self.TD = TD
+        self.itype = mesh.itype
+        node = mesh.entity('node')
+        cell = mesh.entity('cell')
+        NC = cell.shape[0]
+        kwargs = bm.context(cell)
+
+        self.origin = node[cell[:, 0]] # (NC, GD)
+        self.grad_lambda = mesh.grad_lambda() # (NC, TD+1, GD)
+
+        # buckets
+        cnode = node[cell] # (NC, TD+1, GD)
+        self.cell_min = cmin = bm.min(cnode, axis=1)
+        self.cell_max = cmax = bm.max(cnode, axis=1)
+        self.box_min = bm.min(cmin, axis=0)
+        box_max = bm.max(cmax, axis=0)
+        extent = bm.clip(box_max - self.box_min, 1e-12, None)
+        # The resolution is chosen such that the buckets have the shape of the
+        # bounding box and about NC/cells_per_bucket buckets in total.
+        size = bm.mean(cmax - cmin, axis=0)
+        scale = (NC / cells_per_bucket / bm.prod(extent / size)) ** (1/TD)
+        shape = bm.clip(bm.ceil(extent / size * scale), 1, None)
+        self.shape = tuple(int(s) for s in shape)
+        self.h = extent / bm.astype(shape, extent.dtype)
+
+        self.cell_lo = self._bucket_index(cmin)
+        cell_rep, bucket = self._box_buckets(cmin, cmax)
+        order = bm.argsort(bucket, stable=True)
+        self.bucket2cell = cell_rep[order]
+        NB = 1
+        for s in self.shape:
+            NB *= s
+        self.bucket_ptr = bm.searchsorted(bucket[order], bm.arange(NB + 1, **kwargs))
+
+    def number_of_buckets(self) -> int:
+        return self.bucket_ptr.shape[0] - 1
+
+    def _box_buckets(self, box_min: TensorLike, box_max: TensorLike
+                     ) -> Tuple[TensorLike, TensorLike]:
+        """Pairs of the boxes and the buckets overlapping them."""
+        kwargs = {'dtype': self.itype, 'device': bm.get_device(box_min)}
+        lo = self._bucket_index(box_min)
+        hi = self._bucket_index(box_max)
+        span = hi - lo + 1
+        count = bm.prod(span, axis=1)
+        box_rep = bm.repeat(bm.arange(box_min.shape[0], **kwargs), count)
+        offset = bm.cumsum(count, axis=0) - count
+        local = bm.arange(box_rep.shape[0], **kwargs) - offset[box_rep]
+
+        bucket = bm.zeros_like(local)
+        for d in range(self.TD):
+            digit = local % span[box_rep, d]
+            local = local // span[box_rep, d]
+            bucket = bucket * self.shape[d] + lo[box_rep, d] + digit
+
+        return box_rep, bucket
+
+    def _bucket_index(self, points: TensorLike) -> TensorLike:
+        """Multi-index of the buckets containing the points, in shape (NP, TD)."""
+        idx = bm.floor((points - self.box_min) / self.h)
+        idx = bm.astype(idx, self.itype)
+        upper = bm.tensor(self.shape, dtype=idx.dtype, device=bm.get_device(idx)) - 1
+        return bm.minimum(bm.clip(idx, 0, None), upper)
+
+    def barycenter(self, points: TensorLike, cell: TensorLike) -> TensorLike:
+        """Barycentric coordinates of the points in the given cells.
+
+        Parameters:
+            points (Tensor): Points in shape (NP, GD).
+            cell (Tensor): Index of the cells in shape (NP,).
+
+        Returns:
+            Tensor: Barycentric coordinates in shape (NP, TD+1).
+        """
+        v = points - self.origin[cell]
+        bc = bm.einsum('pbd, pd -> pb', self.grad_lambda[cell], v)
+        # NOTE: lambda_0 is 1 at the origin node of the cell.
+        bc0 = 1 + bc[:, 0:1]
+        return bm.concat([bc0, bc[:, 1:]], axis=1)
+
+    def locate(self, points: TensorLike, hint: Optional[TensorLike]=None, *,
+               tol: float=1e-12, max_steps: int=64,
+               nearest: bool=False) -> Tuple[TensorLike, TensorLike]:
+        """Find the cells containing the points.
+
+        Parameters:
+            points (Tensor): Points in shape (NP, GD).
+            hint (Tensor | None, optional): Initial guesses of the cells in shape
+                (NP,), to start walking from. Negative values are ignored.
+                Defaults to None.
+            tol (float, optional): Tolerance of the barycentric coordinates for
+                points on the boundaries of cells. Defaults to 1e-12.
+            max_steps (int, optional): Maximum number of steps in walking.
+                Defaults to 64.
+            nearest (bool, optional): Whether to assign the points slightly outside
+                the mesh, e.g. on curved boundaries, to the nearby cell in their
+                buckets with the largest minimal barycentric coordinate. The
+                barycentric coordinates are then clipped into the cell.
+                Defaults to False.
+
+        Returns:
+            Tensor: Index of the cells in shape (NP,), -1 for points outside the mesh.
+            Tensor: Barycentric coordinates in shape (NP, TD+1), NaN for points
+                outside the mesh.
+        """
+        NP = points.shape[0]
+        kwargs = bm.context(self.bucket2cell)
+        cell = bm.full((NP,), -1, **kwargs)
+
+        if hint is not None:
+            pidx = bm.nonzero(hint >= 0)[0]
+            found, where = self._walk(points[pidx], bm.astype(hint[pidx], cell.dtype),
+                                      tol, max_steps)
+            cell = bm.set_at(cell, pidx[found], where[found])
+
+        rest = bm.nonzero(cell < 0)[0]
+        for start in range(0, rest.shape[0], self.chunk_size):
+            pidx = rest[start:start+self.chunk_size]
+            cell = bm.set_at(cell, pidx, self._search(points[pidx], tol, nearest))
+
+        inside = cell >= 0
+        bc = self.barycenter(points, bm.where(inside, cell, 0))
+        if nearest:
+            bc = bm.clip(bc, 0., None)
+            bc = bc / bm.sum(bc, axis=1, keepdims=True)
+        bc = bm.where(inside[:, None], bc, bm.nan)
+        return cell, bc
+
+    def box_candidates(self, box_min: TensorLike, box_max: TensorLike
+                       ) -> Tuple[TensorLike, TensorLike]:
+        """Find the cells whose bounding boxes overlap the given boxes.
+
+        Parameters:
+            box_min (Tensor): Lower corners of the boxes in shape (NB, GD).
+            box_max (Tensor): Upper corners of the boxes in shape (NB, GD).
+
+        Returns:
+            Tensor: Index of the boxes of the pairs, in shape (NPAIR,).
+            Tensor: Index of the cells of the pairs, in shape (NPAIR,).
+        """
+        box_rep, bucket = self._box_buckets(box_min, box_max)
+        start = self.bucket_ptr[bucket]
+        count = self.bucket_ptr[bucket + 1] - start
+        pair_rep = bm.repeat(bm.arange(box_rep.shape[0], **bm.context(box_rep)), count)
+        offset = bm.cumsum(count, axis=0) - count
+        local = bm.arange(pair_rep.shape[0], **bm.context(box_rep)) - offset[pair_rep]
+        box = box_rep[pair_rep]
+        cell = self.bucket2cell[start[pair_rep] + local]
+
+        # NOTE: a pair is found once for each bucket shared by the box and the cell,
+        # and only the one in the lowest shared bucket is kept.
+        lowest = bm.maximum(self._bucket_index(box_min)[box], self.cell_lo[cell])
+        bucket = bucket[pair_rep]
+        first = bm.ones(box.shape, dtype=bm.bool, device=bm.get_device(box))
+        for d in reversed(range(self.TD)):
+            first = first & (bucket % self.shape[d] == lowest[:, d])
+            bucket = bucket // self.shape[d]
+        box, cell = box[first], cell[first]
+        overlap = bm.all((self.cell_min[cell] <= box_max[box]) &
+                         (self.cell_max[cell] >= box_min[box]), axis=1)
+        return box[overlap], cell[overlap]
+
+    def _search(self, points: TensorLike, tol: float, nearest: bool) -> TensorLike:
+        """Search the points in the cells registered in their buckets."""
+        NP = points.shape[0]
+        kwargs = bm.context(self.bucket2cell)
+        idx = self._bucket_index(points)
+        bucket = bm.zeros((NP,), **kwargs)
+        for d in range(self.TD):
+            bucket = bucket * self.shape[d] + idx[:, d]
+
+        start = self.bucket_ptr[bucket]
+        count = self.bucket_ptr[bucket + 1] - start
+        point_rep = bm.repeat(bm.arange(NP, **kwargs), count)
+        offset = bm.cumsum(count, axis=0) - count
+        local = bm.arange(point_rep.shape[0], **kwargs) - offset[point_rep]
+        candidate = self.bucket2cell[start[point_rep] + local]
+
+        score = bm.min(self.barycenter(points[point_rep], candidate), axis=1)
+        cell = bm.full((NP,), -1, **kwargs)
+
+        if nearest and point_rep.shape[0] > 0:
+            # The candidates are grouped by points, and the one with the largest
+            # score is the last in each group after sorting by the scores.
+            order = bm.lexsort((score, point_rep))
+            last = bm.concat([point_rep[order][1:] != point_rep[order][:-1],
+                              bm.ones((1,), dtype=bm.bool, device=bm.get_device(score))])
+            best = order[last]
+            return bm.set_at(cell, point_rep[best], candidate[best])
+
+        inside = score >= -tol
+        # NOTE: any of the cells is acceptable for the points on shared faces.
+        return bm.set_at(cell, point_rep[inside], candidate[inside])
+
+    def _walk(self, points: TensorLike, cell: TensorLike, tol: float,
+              max_steps: int) -> Tuple[TensorLike, TensorLike]:
+        """Walk from the given cells towards the points, crossing the face opposite
+        to the most negative barycentric coordinate in each step. The walk stops
+        at the boundary of the mesh."""
+        cell2cell = self.mesh.cell_to_cell()
+        found = bm.zeros(cell.shape, dtype=bm.bool, device=bm.get_device(cell))
+        active = bm.arange(cell.shape[0], **bm.context(cell))
+
+        for _ in range(max_steps):
+            if active.shape[0] == 0:
+                break
+            c = cell[active]
+            bc = self.barycenter(points[active], c)
+            inside = bm.min(bc, axis=1) >= -tol
+            found = bm.set_at(found, active[inside], True)
+            nxt = cell2cell[c, bm.argmin(bc, axis=1)]
+            # The neighbor of a boundary face is the cell itself.
+            moving = (~inside) & (nxt != c)
+            cell = bm.set_at(cell, active[moving], nxt[moving])
+            active = active[moving]
+
+        return found, cell
@@ -441,8 +441,6 @@ class QuadrangleMesh(TensorMesh, Plotable):
 
     def to_vtk(self, fname=None, etype='cell', index: Index = _S):
 
-        from fealpy.mesh.vtk_extent import write_to_vtu
-
         node = self.entity('node')
         GD = self.GD
         if GD == 2:
@@ -460,6 +458,7 @@ class QuadrangleMesh(TensorMesh, Plotable):
             return node, cell.flatten(), cellType, NC
         else:
             print("Writting to vtk...")
+            from fealpy.mesh.vtk_extent import write_to_vtu
             write_to_vtu(fname, node, NC, cellType, cell.flatten(),
                          nodedata=self.nodedata,
                          celldata=self.celldata)
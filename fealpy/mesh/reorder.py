@@ -0,0 +1,212 @@
+
+from typing import Optional, Sequence, Tuple, Literal, Union
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import COOTensor, CSRTensor
+
+
+def _quantize(points: TensorLike, bits: int) -> Tuple[TensorLike, ...]:
+    """Integer coordinates of the points in [0, 2**bits) along each axis."""
+    pmin = bm.min(points, axis=0)
+    extent = bm.clip(bm.max(points, axis=0) - pmin, 1e-300, None)
+    scale = 2**bits - 1
+    coord = bm.floor((points - pmin) / extent * scale)
+    coord = bm.astype(bm.clip(coord, 0, scale), bm.int64)
+    return tuple(coord[:, d] for d in range(points.shape[1]))
+
+
+def _interleave(coords: Sequence[TensorLike], bits: int) -> TensorLike:
+    """Interleave the bits of the coordinates into one key, the first coordinate
+    being the most significant in each group of bits."""
+    key = bm.zeros_like(coords[0])
+    for b in reversed(range(bits)):
+        for x in coords:
+            key = (key << 1) | ((x >> b) & 1)
+    return key
+
+
+def _default_bits(dim: int, bits: Optional[int]) -> int:
+    if bits is None:
+        return min(63 // dim, 16)
+    if bits * dim > 63:
+        raise ValueError(f"{bits} bits in {dim} dimensions exceed a 64-bit key.")
+    return bits
+
+
+def morton_order(points: TensorLike, *, bits: Optional[int]=None) -> TensorLike:
+    """Order of the points along the Morton (Z-order) curve.
+
+    Parameters:
+        points (Tensor): Points in shape (NP, GD).
+        bits (int | None, optional): Resolution of the curve in bits per axis.
+            Defaults to None, using min(63 // GD, 16).
+
+    Returns:
+        Tensor: The permutation in shape (NP,), such that points[order] are
+            sorted along the curve.
+    """
+    bits = _default_bits(points.shape[1], bits)
+    key = _interleave(_quantize(points, bits), bits)
+    return bm.argsort(key, stable=True)
+
+
+def hilbert_order(points: TensorLike, *, bits: Optional[int]=None) -> TensorLike:
+    """Order of the points along the Hilbert curve, which keeps the consecutive
+    points adjacent, with better locality than the Morton curve.
+
+    Parameters:
+        points (Tensor): Points in shape (NP, GD).
+        bits (int | None, optional): Resolution of the curve in bits per axis.
+            Defaults to None, using min(63 // GD, 16).
+
+    Returns:
+        Tensor: The permutation in shape (NP,), such that points[order] are
+            sorted along the curve.
+
+    Note:
+        The keys are computed by the transposition algorithm of J. Skilling,
+        Programming the Hilbert curve (2004), vectorized over the points.
+    """
+    n = points.shape[1]
+    bits = _default_bits(n, bits)
+    X = list(_quantize(points, bits))
+
+    # inverse undo
+    Q = 1 << (bits - 1)
+    while Q > 1:
+        P = Q - 1
+        for i in range(n):
+            flag = (X[i] & Q) != 0
+            # invert the low bits of X[0], or exchange them with X[i]
+            t = bm.where(flag, 0, (X[0] ^ X[i]) & P)
+            X[0] = bm.where(flag, X[0] ^ P, X[0] ^ t)
+            if i > 0:
+                X[i] = X[i] ^ t
+        Q >>= 1
+
+    # Gray encode
+    for i in range(1, n):
+        X[i] = X[i] ^ X[i-1]
+    t = bm.zeros_like(X[0])
+    Q = 1 << (bits - 1)
+    while Q > 1:
+        t = bm.where((X[n-1] & Q) != 0, t ^ (Q - 1), t)
+        Q >>= 1
+    X = [x ^ t for x in X]
+
+    key = _interleave(X, bits)
+    return bm.argsort(key, stable=True)
+
+
+def rcm_order(graph: Union[CSRTensor, COOTensor]) -> TensorLike:
+    """Reverse Cuthill-McKee order of the vertices of a sparse graph, e.g. the
+    sparsity pattern of a matrix, reducing its bandwidth.
+
+    Parameters:
+        graph (CSRTensor | COOTensor): The square adjacency matrix. The pattern
+            is symmetrized.
+
+    Returns:
+        Tensor: The permutation in shape (N,), such that A[order][:, order] has
+            a small bandwidth.
+    """
+    from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+    if graph.shape[0] != graph.shape[1]:
+        raise ValueError(f"the graph must be square, but got shape {graph.shape}.")
+    A = graph.to_scipy().tocsr()
+    A = (abs(A) + abs(A.T)).tocsr()
+    order = reverse_cuthill_mckee(A, symmetric_mode=True).copy()
+    row = graph.row() if isinstance(graph, CSRTensor) else graph.indices()[0]
+    return bm.tensor(order, dtype=bm.int64, device=bm.get_device(row))
+
+
+def node_graph(mesh) -> COOTensor:
+    """The node adjacency of the mesh by the edges, in shape (NN, NN)."""
+    NN = mesh.number_of_nodes()
+    edge = mesh.entity('edge')
+    indices = bm.concat([edge, edge[:, [1, 0]]], axis=0).T
+    values = bm.ones((indices.shape[1],), dtype=mesh.ftype, device=bm.get_device(edge))
+    return COOTensor(indices, values, spshape=(NN, NN))
+
+
+def _dof_order(space, old_cell2dof: TensorLike, cell_order: TensorLike) -> TensorLike:
+    """Old index of each new DoF of the space, matching the local DoFs of the
+    cells before and after the renumbering."""
+    cell2dof = space.cell_to_dof()
+    order = bm.zeros((space.number_of_global_dofs(),), **bm.context(cell2dof))
+    return bm.set_at(order, cell2dof, old_cell2dof[cell_order])
+
+
+def reorder_mesh(mesh, method: Literal['hilbert', 'morton', 'rcm']='hilbert', *,
+                 nodes: bool=True, cells: bool=True,
+                 functions: Sequence=()) -> Tuple[Optional[TensorLike], Optional[TensorLike]]:
+    """Renumber the nodes and the cells of a mesh in place for locality of the
+    memory access, e.g. the `cell_to_dof` gathers and the `index_add` scatters in
+    assembly, and the sparse matrix-vector products.
+
+    Parameters:
+        mesh (HomogeneousMesh): The unstructured mesh to be renumbered.
+        method ('hilbert' | 'morton' | 'rcm', optional): 'hilbert' and 'morton'
+            sort the nodes and the cell barycenters along the space-filling curves.
+            'rcm' orders the nodes by the reverse Cuthill-McKee algorithm on the
+            node graph, and the cells by their smallest new nodes. Defaults to
+            'hilbert'.
+        nodes (bool, optional): Whether to renumber the nodes. Defaults to True.
+        cells (bool, optional): Whether to renumber the cells. Defaults to True.
+        functions (Sequence[Function], optional): Finite element functions on the
+            mesh, whose values are permuted in place to the new DoF numbering.
+            Defaults to ().
+
+    Returns:
+        Tensor | None: The node order, new node i being the old node order[i].
+        Tensor | None: The cell order.
+
+    Note:
+        The spaces on the mesh derive their DoFs from the mesh, so they follow the
+        new numbering automatically. The DoFs of the Lagrange spaces are ordered
+        by the nodes, then the edges, faces and cells, so they inherit the locality.
+    """
+    if method not in ('hilbert', 'morton', 'rcm'):
+        raise ValueError(f"Unknown reordering method '{method}', expected "
+                         "'hilbert', 'morton' or 'rcm'.")
+    old_cell2dof = {}
+    for f in functions:
+        if id(f.space) not in old_cell2dof:
+            old_cell2dof[id(f.space)] = (f.space, f.space.cell_to_dof())
+
+    curve = hilbert_order if method == 'hilbert' else morton_order
+    node_order = cell_order = None
+
+    if nodes:
+        if method == 'rcm':
+            node_order = rcm_order(node_graph(mesh))
+        else:
+            node_order = curve(mesh.entity('node'))
+        node_order = bm.astype(node_order, mesh.itype)
+
+    if cells:
+        if method == 'rcm':
+            cell = mesh.entity('cell')
+            if node_order is not None:
+                index = bm.empty_like(node_order)
+                index = bm.set_at(index, node_order, bm.arange(node_order.shape[0], **bm.context(index)))
+                cell = index[cell]
+            key = bm.sort(cell, axis=1)
+            cell_order = bm.lexsort(tuple(key[:, k] for k in reversed(range(key.shape[1]))))
+        else:
+            cell_order = curve(mesh.entity_barycenter('cell'))
+        cell_order = bm.astype(cell_order, mesh.itype)
+
+    mesh.renumber(node_order, cell_order)
+
+    if cell_order is None:
+        cell_order = bm.arange(mesh.number_of_cells(), **bm.context(mesh.entity('cell')))
+    dof_orders = {k: _dof_order(space, c2d, cell_order) for k, (space, c2d) in old_cell2dof.items()}
+    for f in functions:
+        f.array = f.array[..., dof_orders[id(f.space)]]
+
+    if not cells:
+        cell_order = None
+    return node_order, cell_order
@@ -201,14 +201,14 @@ class TetrahedronMesh(SimplexMesh, Plotable):
     def grad_lambda(self, index=_S):
         localFace = self.localFace
         node = self.node
-        cell = self.cell
-        NC = self.number_of_cells() if index == _S else len(index)
+        cell = self.entity('cell', index=index)
+        NC = cell.shape[0]
         Dlambda = bm.zeros((NC, 4, 3), device=self.device, dtype=self.ftype)
         volume = self.entity_measure('cell', index=index)
         for i in range(4):
             j,k,m = localFace[i]
-            vjk = node[cell[index, k],:] - node[cell[index, j],:]
-            vjm = node[cell[index, m],:] - node[cell[index, j],:]
+            vjk = node[cell[:, k],:] - node[cell[:, j],:]
+            vjm = node[cell[:, m],:] - node[cell[:, j],:]
             Dlambda[:, i, :] = bm.cross(vjm, vjk)/(6*volume.reshape(-1, 1))
         return Dlambda
     
@@ -327,6 +327,11 @@ class TetrahedronMesh(SimplexMesh, Plotable):
         """
         @brief 获取网格中每个三角形面与插值点的对应关系
         """
+        face = self.entity('face')
+
+        if p == 1:
+            return face[index]
+
         TD = self.top_dimension()
         fdof = (p+1)*(p+2)//2
 
@@ -338,11 +343,10 @@ class TetrahedronMesh(SimplexMesh, Plotable):
         NE = self.number_of_edges()
         NF = self.number_of_faces()
 
-        face = self.entity('face')
         edge = self.entity('edge')
         face2edge = self.face_to_edge()
         edge2ipoint = self.edge_to_ipoint(p)
-        face2ipoint = bm.zeros((NF, fdof), dtype=bm.int32)
+        face2ipoint = bm.zeros((NF, fdof), dtype=self.itype)
 
         faceIdx = self.multi_index_matrix(p, TD-1, dtype=bm.float64)
         isEdgeIPoint = (faceIdx == 0)
@@ -371,6 +375,11 @@ class TetrahedronMesh(SimplexMesh, Plotable):
         @return  cell2ipoints 数组， 形状为 (NC, ldof)
         """
 
+        cell = self.entity('cell')
+
+        if p == 1:
+            return cell[index]
+
         TD = self.top_dimension()
         edof = p+1
         fdof = (p+1)*(p+2)//2
@@ -382,7 +391,6 @@ class TetrahedronMesh(SimplexMesh, Plotable):
         NC = self.number_of_cells()
 
         face = self.entity('face')
-        cell = self.entity('cell')
         cell2face = self.cell_to_face()
 
         cell2ipoint = bm.zeros((NC, ldof), dtype=self.itype)
@@ -415,7 +423,7 @@ class TetrahedronMesh(SimplexMesh, Plotable):
             isInCellIPoint = ~(isFaceIPoint[0] | isFaceIPoint[1] | isFaceIPoint[2] | isFaceIPoint[3])
             cell2ipoint[:, isInCellIPoint] = base + bm.arange(NC*idof,dtype=self.itype).reshape(NC, idof)
 
-        return cell2ipoint
+        return cell2ipoint[index]
 
     def direction(self,i):
         """
@@ -575,33 +583,17 @@ class TetrahedronMesh(SimplexMesh, Plotable):
         localEdge = self.localEdge
         totalEdge = cell[cellidx][:, localEdge].reshape(
                 -1, localEdge.shape[1])
-        NE = totalEdge.shape[0]
         length = bm.sum(
                 (node[totalEdge[:, 1]] - node[totalEdge[:, 0]])**2,
                 axis = -1)
-        #length += 0.1*bm.random.rand(NE)*length
         cellEdgeLength = length.reshape(NC, 6)
         lidx = bm.argmax(cellEdgeLength, axis=-1)
 
-        flag = (lidx == 1)
-        if  sum(flag) > 0:
-            cell = bm.set_at(cell, cellidx[flag], cell[cellidx[flag]][:, [2, 0, 1, 3]])
-
-        flag = (lidx == 2)
-        if sum(flag) > 0:
-            cell = bm.set_at(cell, cellidx[flag], cell[cellidx[flag]][:, [0, 3, 1, 2]])
-
-        flag = (lidx == 3)
-        if sum(flag) > 0:
-            cell = bm.set_at(cell, cellidx[flag], cell[cellidx[flag]][:, [1, 2, 0, 3]])
-
-        flag = (lidx == 4)
-        if sum(flag) > 0:
-            cell = bm.set_at(cell, cellidx[flag], cell[cellidx[flag]][:, [1, 3, 2, 0]])
-
-        flag = (lidx == 5)
-        if sum(flag) > 0:
-            cell = bm.set_at(cell, cellidx[flag], cell[cellidx[flag]][:, [3, 2, 1, 0]])
+        # The even permutations moving the i-th local edge to (0, 1).
+        perm = bm.tensor([[0, 1, 2, 3], [2, 0, 1, 3], [0, 3, 1, 2],
+                          [1, 2, 0, 3], [1, 3, 2, 0], [3, 2, 1, 0]], **bm.context(cell))
+        rows = bm.arange(NC, **bm.context(cell))[:, None]
+        cell = bm.set_at(cell, cellidx, cell[cellidx][rows, perm[lidx]])
 
         if rflag == True:
             self.construct()
@@ -615,13 +607,35 @@ class TetrahedronMesh(SimplexMesh, Plotable):
         return options
            
     def bisect(self, isMarkedCell=None, data=None, returnim=False, options={'disp': True}):
-
+        """Refine the marked cells by the longest edge bisection, and the
+        neighbors until the mesh is conforming.
+
+        Parameters:
+            isMarkedCell (Tensor | None, optional): Flags of the marked cells in
+                shape (NC,). Defaults to None, refining all the cells.
+            returnim (bool, optional): Whether to return the interpolation matrix
+                from the old nodes to the new nodes. Defaults to False.
+            options (dict, optional): See `bisect_options`. The 'HB' is replaced by
+                the indices of the cells and their parents in the old mesh, and the
+                'data' is interpolated to the new mesh by `interpolation_with_HB`.
+
+        Returns:
+            CSRTensor | None: The interpolation matrix in shape (NN_new, NN_old).
+
+        Note:
+            The cut edges are kept as sorted 64-bit keys of their vertices, so that
+            the midpoints and the non-conforming cells are found by binary search.
+            The refined cells keep their indices and the new cells are appended,
+            so the topology is updated around the refined cells only.
+        """
         if options['disp']:
             print('Bisection begining.......')
 
         NN = self.number_of_nodes()
         NC = self.number_of_cells()
         NE = self.number_of_edges()
+        kwargs = bm.context(self.cell)
+        device = self.device
 
         if options['disp']:
             print('Current number of nodes:', NN)
@@ -631,40 +645,39 @@ class TetrahedronMesh(SimplexMesh, Plotable):
         if ('data' in options) and (options['data'] is not None):
             oldnode = self.entity('node')
             oldcell = self.entity('cell')
-        
-        if ('HB' in options) and (options['HB'] is not None):
-            HB = bm.tile(bm.arange(NC*4)[:, None], (1, 2))
-            options["HB"] = HB
-   
+
         if isMarkedCell is None: # 加密所有的单元
-            markedCell = bm.arange(NC, dtype=self.itype)
+            markedCell = bm.arange(NC, **kwargs)
         else:
             markedCell, = bm.nonzero(isMarkedCell)
 
-        # allocate new memory for node and cell
-        node = bm.zeros((9*NN, 3), dtype=self.ftype)
-        cell = bm.zeros((4*NC, 4), dtype=self.itype)
-
-        node = bm.set_at(node, slice(NN), self.entity('node'))
-        cell = bm.set_at(cell, slice(NC), self.entity('cell'))
-
-        for key in self.celldata:
-            data = bm.zeros(4*NC, dtype=self.ftype)
-            data = bm.set_at(data, slice(NC), self.celldata[key])
-            data = bm.set_at(self.celldata , key, data.copy())
-
-        # 用于存储网格节点的代数，初始所有节点都为第 0 代
-        generation = bm.zeros(NN + 6*NC, dtype=bm.uint8)
-
-        # 用于记录被二分的边及其中点编号
-        cutEdge = bm.zeros((8*NN, 3), dtype=self.itype)
+        node = self.entity('node')
+        cell = bm.copy(self.entity('cell'))
+        parent = bm.arange(NC, **kwargs)
+        isChangedCell = bm.zeros((NC,), dtype=bm.bool, device=device)
+
+        # 被二分的边的打包键 (按生成顺序), 中点编号及非协调标记
+        base = 2**31
+        cutKey = bm.zeros((0,), dtype=bm.int64, device=device)
+        cutEdge = bm.zeros((0, 3), **kwargs)
+        nonConforming = bm.zeros((0,), dtype=bm.bool, device=device)
+
+        def pack(i, j):
+            i, j = bm.astype(i, bm.int64), bm.astype(j, bm.int64)
+            return bm.minimum(i, j) * base + bm.maximum(i, j)
+
+        def lookup(keys, query):
+            """Positions of the query keys in the keys, -1 if not found."""
+            if keys.shape[0] == 0:
+                return bm.full(query.shape, -1, dtype=bm.int64, device=device)
+            order = bm.argsort(keys, stable=True)
+            pos = bm.clip(bm.searchsorted(keys[order], query), 0, keys.shape[0] - 1)
+            pos = order[pos]
+            return bm.where(keys[pos] == query, pos, -1)
 
-        # 当前的二分边的数目
-        nCut = 0
+        if returnim is True:
+            IM = self._identity_matrix(NN)
 
-        # 非协调边的标记数组
-        nonConforming = bm.ones(8*NN, dtype=bm.bool)
-        IM = eye(NN)
         while len(markedCell) != 0:
             # 标记最长边
             self.label(node, cell, markedCell)
@@ -675,141 +688,97 @@ class TetrahedronMesh(SimplexMesh, Plotable):
             p2 = cell[markedCell, 2]
             p3 = cell[markedCell, 3]
 
-            # 找到新的二分边和新的中点
-            nMarked = len(markedCell)
-            p4 = bm.zeros(nMarked, dtype=self.itype)
-
-            if nCut == 0: # 如果是第一次循环
-                idx = bm.arange(nMarked) # cells introduce new cut edges
-            else:
-                # all non-conforming edges
-                ncEdge = bm.nonzero(nonConforming[:nCut])
-                NE = len(ncEdge)
-                I = cutEdge[ncEdge][:, [2, 2]].reshape(-1)
-                J = cutEdge[ncEdge][:, [0, 1]].reshape(-1)
-                val = bm.ones(len(I), dtype=bm.bool)
-                nv2v = csr_matrix(
-                        (val, (I, J)),
-                        shape=(NN, NN))
-                i, j =  (nv2v[:, p0].multiply(nv2v[:, p1])).nonzero()
-                p4 = bm.set_at(p4, bm.array(j,dtype=self.itype), bm.array(i,dtype=self.itype))
-                idx, = bm.nonzero(p4 == 0)
+            # 在非协调的二分边中找到中点
+            markedKey = pack(p0, p1)
+            # NOTE: the position -1 of the missing keys refers to the sentinels.
+            pos = lookup(cutKey, markedKey)
+            found = bm.concatenate((nonConforming, bm.zeros((1,), dtype=bm.bool, device=device)))[pos]
+            p4 = bm.concatenate((cutEdge[:, 2], bm.full((1,), -1, **kwargs)))[pos]
+            idx, = bm.nonzero(~found)
 
             if len(idx) != 0:
-                # 把需要二分的边唯一化
-                NE = len(idx)
-                cellCutEdge = bm.stack([p0[idx], p1[idx]])
-                cellCutEdge = bm.sort(cellCutEdge,axis=0)
-                s = csr_matrix(
-                    (
-                        bm.ones(NE, dtype=bm.bool),
-                        (
-                            cellCutEdge[0, ...],
-                            cellCutEdge[1, ...]
-                        )
-                    ), shape=(NN, NN))
-                # 获得唯一的边
-                i, j = s.nonzero()
-                i = bm.tensor(i,dtype=self.itype)
-                j = bm.tensor(j,dtype=self.itype)
-                nNew = len(i)
-                newCutEdge = bm.arange(nCut, nCut+nNew)
-                cutEdge = bm.set_at(cutEdge, (newCutEdge,0), i)
-                cutEdge = bm.set_at(cutEdge, (newCutEdge,1), j)
-                cutEdge = bm.set_at(cutEdge, (newCutEdge,2), bm.arange(NN, NN+nNew,dtype=self.itype))
-                node = bm.set_at(node, slice(NN, NN+nNew), (node[i, :] + node[j, :])/2.0)
+                # 把需要二分的边唯一化, 按顶点的字典序编号
+                newKey = bm.unique(markedKey[idx])
+                nNew = newKey.shape[0]
+                i = bm.astype(newKey // base, kwargs['dtype'])
+                j = bm.astype(newKey % base, kwargs['dtype'])
+                mid = bm.arange(NN, NN + nNew, **kwargs)
+                node = bm.concatenate((node, (node[i, :] + node[j, :])/2.0), axis=0)
 
                 if returnim is True:
-                    val = bm.full(nNew, 0.5)
-                    I = coo_matrix(
-                            (val, (range(nNew), i)), shape=(nNew, NN),
-                            dtype=self.ftype)
-                    I += coo_matrix(
-                            (val, (range(nNew), j)), shape=(nNew, NN),
-                            dtype=self.ftype)
-                    I = bmat([[eye(NN)], [I]], format='csr')
-                    IM = I@IM
-
-                nCut += nNew
+                    IM = self._midpoint_matrix(NN, i, j) @ IM
+
+                cutKey = bm.concatenate((cutKey, newKey))
+                cutEdge = bm.concatenate((cutEdge, bm.stack((i, j, mid), axis=1)), axis=0)
+                nonConforming = bm.concatenate(
+                        (nonConforming, bm.ones((nNew,), dtype=bm.bool, device=device)))
                 NN += nNew
 
-                # 新点和旧点的邻接矩阵
-                I = cutEdge[newCutEdge][:, [2, 2]].reshape(-1)
-                J = cutEdge[newCutEdge][:, [0, 1]].reshape(-1)
-                val = bm.ones(len(I), dtype=bm.bool)
-                nv2v = csr_matrix(
-                        (val, (I, J)),
-                        shape=(NN, NN))
-                i, j =  (nv2v[:, p0].multiply(nv2v[:, p1])).nonzero()
-                p4 = bm.set_at(p4, bm.array(j,dtype=self.itype), bm.array(i,dtype=self.itype))
-
-            # 如果新点的代数仍然为 0
-            idx = (generation[p4] == 0)
-            cellGeneration = bm.max(
-                    generation[cell[markedCell[idx]]],
-                    axis=-1)
-            # 第几代点
-            generation = bm.set_at(generation, p4[idx], cellGeneration + 1)
-            cell = bm.set_at(cell, (markedCell,0), p3)
-            cell = bm.set_at(cell, (markedCell,1), p0)
-            cell = bm.set_at(cell, (markedCell,2), p2)
-            cell = bm.set_at(cell, (markedCell,3), p4)
-            cell = bm.set_at(cell, (slice(NC, NC+nMarked),0), p2)
-            cell = bm.set_at(cell, (slice(NC, NC+nMarked),1), p1)
-            cell = bm.set_at(cell, (slice(NC, NC+nMarked),2), p3)
-            cell = bm.set_at(cell, (slice(NC, NC+nMarked),3), p4)
+                pos = bm.searchsorted(newKey, markedKey[idx])
+                p4 = bm.set_at(p4, idx, mid[pos])
+
+            nMarked = len(markedCell)
+            cell = bm.set_at(cell, (markedCell, 0), p3)
+            cell = bm.set_at(cell, (markedCell, 1), p0)
+            cell = bm.set_at(cell, (markedCell, 2), p2)
+            cell = bm.set_at(cell, (markedCell, 3), p4)
+            cell = bm.concatenate((cell, bm.stack((p2, p1, p3, p4), axis=1)), axis=0)
 
             for key in self.celldata:
-                data = self.celldata[key]
-                data = bm.set_at(data, slice(NC, NC+nMarked), data[markedCell])
+                value = self.celldata[key]
+                self.celldata[key] = bm.concatenate((value, value[markedCell]))
 
-            if("HB" in options) and (options["HB"] is not None):
-                HB = options['HB']
-                HB = bm.set_at(HB, (slice(NC, NC+nMarked),1), HB[markedCell,1])
-            
+            parent = bm.concatenate((parent, parent[markedCell]))
+            isChangedCell = bm.set_at(isChangedCell, markedCell[markedCell < len(isChangedCell)], True)
             NC = NC + nMarked
-            del cellGeneration, p0, p1, p2, p3, p4
-
-            # 找到非协调的单元
-            checkEdge, = bm.nonzero(nonConforming[:nCut])
-            isCheckNode = bm.zeros(NN, dtype=bm.bool)
-            isCheckNode = bm.set_at(isCheckNode, cutEdge[checkEdge], True)
-            isCheckCell = bm.sum(
-                    isCheckNode[cell[:NC]],
-                    axis= -1) > 0
-            # 找到所有包含检查节点的单元编号
-            checkCell, = bm.nonzero(isCheckCell)
-            I = bm.repeat(checkCell, 4)
-            J = cell[checkCell].reshape(-1)
-            val = bm.ones(len(I), dtype=bm.bool)
-            cell2node = csr_matrix((val, (I, J)), shape=(NC, NN))
-            i, j =  (cell2node[:, cutEdge[checkEdge, 0]].multiply(
-                        cell2node[:, cutEdge[checkEdge, 1]]
-                        )).nonzero()
-            markedCell = bm.unique(bm.array(i))
+            del p0, p1, p2, p3, p4
+
+            # 找到非协调的单元: 包含非协调二分边两个端点的单元
+            checkEdge, = bm.nonzero(nonConforming)
+            isCheckNode = bm.zeros((NN,), dtype=bm.bool, device=device)
+            isCheckNode = bm.set_at(isCheckNode, cutEdge[checkEdge, :2].reshape(-1), True)
+            checkCell, = bm.nonzero(bm.any(isCheckNode[cell], axis=-1))
+            localEdge = self.localEdge
+            edgeKey = pack(cell[checkCell][:, localEdge[:, 0]],
+                           cell[checkCell][:, localEdge[:, 1]])
+            pos = lookup(cutKey[checkEdge], edgeKey)
+            hit = pos >= 0
+            markedCell = checkCell[bm.any(hit, axis=-1)]
             nonConforming = bm.set_at(nonConforming, checkEdge, False)
-            nonConforming = bm.set_at(nonConforming, checkEdge[j], True)
+            nonConforming = bm.set_at(nonConforming, checkEdge[pos[hit]], True)
 
+        self.node = node
+        self.cell = cell
+        self.construct(changed=isChangedCell)
 
-        self.node = node[:NN]
-        self.cell = cell[:NC]
-        self.construct()
-        
-
-        for key in self.celldata:
-            self.celldata = bm.set_at(self.celldata, key, self.celldata[key][:NC])
-            
-
-        if("HB" in options) and (options["HB"] is not None):
-            options['HB'] = options['HB'][:NC]
+        if ("HB" in options) and (options["HB"] is not None):
+            options['HB'] = bm.stack((bm.arange(NC, **kwargs), parent), axis=1)
 
         if ('data' in options) and (options['data'] is not None):
             options['data'] = self.interpolation_with_HB(oldnode, oldcell, options['HB'], options['data'])
-            
 
         if returnim is True:
             return IM
 
+    def _identity_matrix(self, n: int):
+        from ..sparse import CSRTensor
+        kwargs = bm.context(self.cell)
+        crow = bm.arange(n + 1, **kwargs)
+        return CSRTensor(crow, crow[:-1], bm.ones((n,), dtype=self.ftype, device=self.device),
+                         spshape=(n, n))
+
+    def _midpoint_matrix(self, n: int, i: TensorLike, j: TensorLike):
+        """Interpolation from n nodes to the nodes with the midpoints of (i, j)
+        appended."""
+        from ..sparse import CSRTensor
+        kwargs = bm.context(self.cell)
+        m = i.shape[0]
+        crow = bm.concatenate((bm.arange(n, **kwargs), n + 2*bm.arange(m + 1, **kwargs)))
+        col = bm.concatenate((bm.arange(n, **kwargs), bm.stack((i, j), axis=1).reshape(-1)))
+        val = bm.concatenate((bm.ones((n,), dtype=self.ftype, device=self.device),
+                              bm.full((2*m,), 0.5, dtype=self.ftype, device=self.device)))
+        return CSRTensor(crow, col, val, spshape=(n + m, n))
+
     def interpolation_with_HB(self, oldnode, oldcell, HB, data={}):
 
         node = self.entity('node')
@@ -1105,8 +1074,6 @@ class TetrahedronMesh(SimplexMesh, Plotable):
         return mesh
 
     def to_vtk(self, fname=None, etype='cell', index:Index=_S):
-        from .vtk_extent import  write_to_vtu
-
         node = self.entity('node')
         GD = self.geo_dimension()
 
@@ -1131,6 +1098,7 @@ class TetrahedronMesh(SimplexMesh, Plotable):
             return node, cell.flatten(), cellType, NC
         else:
             print("Writting to vtk...")
+            from .vtk_extent import write_to_vtu
             write_to_vtu(fname, node, NC, cellType, cell.flatten(),
                     nodedata=self.nodedata,
                     celldata=celldata)
@@ -352,18 +352,6 @@ class TriangleMesh(SimplexMesh, Plotable):
         """
         pass
     
-    def location(self, points):
-        """
-        @breif  给定一组点 p , 找到这些点所在的单元
-
-        这里假设：
-
-        1. 所有点在网格内部，
-        2. 网格中没有洞
-        3. 区域还要是凸的
-        """
-        pass
-
     def circumcenter(self, index: Index=_S, returnradius=False):
         """
         @brief 计算三角形外接圆的圆心和半径
@@ -476,17 +464,24 @@ class TriangleMesh(SimplexMesh, Plotable):
         edge = self.entity('edge')
 
         cell2edge = self.cell_to_edge()
-        cell2cell = self.cell_to_cell()
+        edge2cell = self.edge_to_cell()
         #cell2ipoint = self.cell_to_ipoint(self.p)
         isCutEdge = bm.zeros((NE,), dtype=bm.bool, device=self.device)
 
         if options['disp']:
             print('The initial number of marked elements:', isMarkedCell.sum())
 
+        # NOTE: the closure propagates a frontier of cells, whose refinement
+        # edges are cut, to the neighbors across the refinement edges, found by
+        # the stored edge2cell instead of building cell_to_cell. Each pass is
+        # vectorized over the frontier, and the number of passes is the length
+        # of the longest chain of refinement edges, not the number of cells.
         markedCell, = bm.nonzero(isMarkedCell)
-        while len(markedCell) > 0:
-            isCutEdge = bm.set_at(isCutEdge, cell2edge[markedCell, 0], True)
-            refineNeighbor = cell2cell[markedCell, 0]
+        while markedCell.shape[0] > 0:
+            refineEdge = cell2edge[markedCell, 0]
+            isCutEdge = bm.set_at(isCutEdge, refineEdge, True)
+            e2c = edge2cell[refineEdge]
+            refineNeighbor = bm.where(e2c[:, 0] == markedCell, e2c[:, 1], e2c[:, 0])
             markedCell = refineNeighbor[~isCutEdge[cell2edge[refineNeighbor, 0]]]
 
         if options['disp']:
@@ -505,39 +500,22 @@ class TriangleMesh(SimplexMesh, Plotable):
 
         if 'IM' in options:
             nn = len(newNode)
-            IM = COOTensor( indices=bm.stack((bm.arange(NN), bm.arange(NN)), axis=0),
-                            values=bm.ones(NN), 
-                            shape=(NN + nn, NN))
-            # IM = coo_matrix((bm.ones(NN), (bm.arange(NN), bm.arange(NN))),
-            #                 shape=(NN + nn, NN))
-            val = bm.full((nn,), 0.5)
-            IM += COOTensor(indices=bm.stack((NN + bm.arange(nn), edge[isCutEdge, 0]), axis=0),
-                            values=val,
-                            shape=(NN + nn, NN))
-            # IM += coo_matrix(
-            #     (
-            #         val,
-            #         (
-            #             NN + bm.arange(nn),
-            #             edge[isCutEdge, 0]
-            #         )
-            #     ), shape=(NN + nn, NN))
-            IM += COOTensor(indices=bm.stack((NN + bm.arange(nn), edge[isCutEdge, 1]), axis=0),
-                            values=val,
-                            shape=(NN + nn, NN))
-            # IM += coo_matrix(
-            #     (
-            #         val,
-            #         (
-            #             NN + bm.arange(nn),
-            #             edge[isCutEdge, 1]
-            #         )
-            #     ), shape=(NN + nn, NN))
-            options['IM'] = IM.tocsr()
+            kwargs = {'dtype': self.itype, 'device': self.device}
+            newIdx = bm.arange(NN, NN + nn, **kwargs)
+            I = bm.concatenate((bm.arange(NN, **kwargs), newIdx, newIdx))
+            J = bm.concatenate((bm.arange(NN, **kwargs), edge[isCutEdge, 0], edge[isCutEdge, 1]))
+            val = bm.concatenate((bm.ones((NN,), dtype=self.ftype, device=self.device),
+                                  bm.full((2*nn,), 0.5, dtype=self.ftype, device=self.device)))
+            IM = COOTensor(bm.stack((I, J), axis=0), val, spshape=(NN + nn, NN))
+            options['IM'] = IM.coalesce().tocsr()
 
         if 'HB' in options:
             options['HB'] = bm.arange(NC)
 
+        # The bisected cells keep their indices and the others are appended,
+        # so the topology is updated around them only.
+        isChangedCell = bm.zeros((NC,), dtype=bm.bool, device=self.device)
+
         for k in range(2):
             idx, = bm.nonzero(edge2newNode[cell2edge0] > 0)
             nc = len(idx)
@@ -550,6 +528,7 @@ class TriangleMesh(SimplexMesh, Plotable):
 
             L = idx
             R = bm.arange(NC, NC + nc)
+            isChangedCell = bm.set_at(isChangedCell, L[L < len(isChangedCell)], True)
             if ('data' in options) and (options['data'] is not None):
                 for key, value in options['data'].items():
                     if value.shape == (NC,):  # 分片常数
@@ -609,7 +588,7 @@ class TriangleMesh(SimplexMesh, Plotable):
 
         self.NN = self.node.shape[0]
         self.cell = cell
-        self.construct()
+        self.construct(changed=isChangedCell)
 
     def coarsen(self, isMarkedCell=None, options={}):
         """
@@ -720,11 +699,20 @@ class TriangleMesh(SimplexMesh, Plotable):
         self.node = node[~isGoodNode]
 
         NN = self.node.shape[0]
-        idxMap = bm.set_at(idxMap , ~isGoodNode , bm.arange(NN))
+        idxMap = bm.set_at(idxMap , ~isGoodNode , bm.arange(NN, dtype=self.itype, device=self.device))
         cell = idxMap[cell]
 
+        # The merged cells are changed and the others are removed or kept, so
+        # the topology is updated around them only. The renumbering keeps the
+        # order of the nodes and the cells.
+        NCO = isKeepCell.shape[0]
+        cellMap = bm.cumsum(bm.astype(isKeepCell, self.itype), axis=0) - 1
+        cellMap = bm.where(isKeepCell, cellMap, -1)
+        isChangedCell = bm.zeros((NCO,), dtype=bm.bool, device=self.device)
+        isChangedCell = bm.set_at(isChangedCell, bm.concatenate((t0, t2, t4)), True)
+        self.edge = idxMap[self.entity('edge')]
         self.cell = cell
-        self.construct()
+        self.construct(changed=isChangedCell[isKeepCell], cell_map=cellMap)
 
     def label(self, node=None, cell=None, cellidx=None):
         """
@@ -1066,12 +1054,6 @@ class TriangleMesh(SimplexMesh, Plotable):
 
         return J
 
-    def point_to_bc(self, point):
-        """
-        @brief 找到定点 point 所在的单元，并计算其重心坐标 
-        """
-        pass
-
     def mark_interface_cell(self, phi):
         """
         @brief 标记穿过界面的单元
@@ -1411,7 +1393,6 @@ class TriangleMesh(SimplexMesh, Plotable):
         """
         @brief 把网格转化为 vtk 的数据格式
         """
-        from .vtk_extent import  write_to_vtu
 
         node = self.entity('node')
         GD = self.geo_dimension()
@@ -1430,6 +1411,7 @@ class TriangleMesh(SimplexMesh, Plotable):
             return node, cell.flatten(), cellType, NC
         else:
             print("Writting to vtk...")
+            from .vtk_extent import write_to_vtu
             write_to_vtu(fname, node, NC, cellType, cell.flatten(),
                          nodedata=self.nodedata,
                          celldata=self.celldata)
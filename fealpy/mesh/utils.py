@@ -1,6 +1,8 @@
 
 from typing import Dict, Callable, TypeVar, Tuple, Any
 from math import comb
+import functools
+import inspect
 
 from ..backend import backend_manager as bm
 from ..backend import TensorLike
@@ -110,6 +112,88 @@ def flocc(array: TensorLike, /):
     return i0, i1, j
 
 
+_SORTING_NETWORKS = {
+    2: [(0, 1)],
+    3: [(0, 1), (1, 2), (0, 1)],
+    4: [(0, 1), (2, 3), (0, 2), (1, 3), (1, 2)],
+}
+
+
+def sort_rows(array: TensorLike, /) -> TensorLike:
+    """Sort each row of a 2D array. Rows of 2 to 4 entries are sorted by the
+    sorting networks on columns, which is much faster than sorting along the
+    short axis."""
+    width = array.shape[-1]
+    if width not in _SORTING_NETWORKS:
+        return bm.sort(array, axis=1)
+
+    cols = [array[:, k] for k in range(width)]
+    for a, b in _SORTING_NETWORKS[width]:
+        cols[a], cols[b] = bm.minimum(cols[a], cols[b]), bm.maximum(cols[a], cols[b])
+    return bm.stack(cols, axis=1)
+
+
+def pack_sorted_rows(array: TensorLike, base: int, /) -> Tuple[TensorLike, ...]:
+    """Pack the rows of a 2D integer array with entries in [0, base) into as few
+    int64 keys as possible, in the mixed radix of `base`. The lexicographic order
+    of the rows is kept by the keys, with the first key the most significant.
+
+    Returns:
+        Tuple[TensorLike, ...]: The keys, each shaped (array.shape[0],).
+    """
+    if array.ndim != 2:
+        raise ValueError("array must be a 2D array.")
+    base = max(int(base), 2)
+    width = 1 # number of columns packed in a key
+    while (width < array.shape[1]) and (base ** (width + 1) <= 2**63):
+        width += 1
+
+    keys = []
+    for start in range(0, array.shape[1], width):
+        key = bm.astype(array[:, start], bm.int64)
+        for k in range(start + 1, min(start + width, array.shape[1])):
+            key = key * base + bm.astype(array[:, k], bm.int64)
+        keys.append(key)
+
+    return tuple(keys)
+
+
+def flocc_keys(keys: Tuple[TensorLike, ...], /):
+    """Find the first and last occurrence of each unique row of packed keys,
+    see `pack_sorted_rows`. This works as `flocc` but compares one or a few
+    integer keys instead of the rows.
+
+    Returns:
+        out (TensorLike, TensorLike, TensorLike):
+        - The first occurrence index of each unique row.
+        - The last occurrence index of each unique row.
+        - The indices of the rows that result in the unique rows.
+    """
+    if len(keys) == 1:
+        indices = bm.argsort(keys[0], stable=True)
+    else:
+        indices = bm.lexsort(tuple(reversed(keys)), axis=0)
+
+    diff_flag = None
+    for key in keys:
+        sorted_key = key[indices]
+        flag = sorted_key[1:] != sorted_key[:-1]
+        diff_flag = flag if diff_flag is None else (diff_flag | flag)
+        del sorted_key
+
+    TRUE = bm.ones((1,), dtype=bm.bool, device=bm.get_device(indices))
+    diff_flag = bm.concat([TRUE, diff_flag, TRUE])
+    group_index = bm.cumsum(diff_flag[:-1], axis=0) - 1
+
+    i0 = indices[diff_flag[:-1]]
+    i1 = indices[diff_flag[1:]]
+    del diff_flag
+    j = bm.empty_like(indices)
+    j = bm.set_at(j, indices, group_index) # original >> unique
+
+    return i0, i1, j
+
+
 # NOTE: this meta class is used to register the entity factory method.
 # The entity factory methods can works in Structured meshes such as
 # UniformMesh2d to construct entities like `cell`.
@@ -122,6 +206,78 @@ def flocc(array: TensorLike, /):
 # TODO: This feature does not hinder the unstructured mesh, but wee still need
 # to see if it is an over-design or if there is a better way to do this.
 
+def _is_full_index(index, default) -> bool:
+    if index is None or index is default:
+        return True
+    return isinstance(index, slice) and index == slice(None)
+
+
+def cachedmethod(meth: _Meth) -> _Meth:
+    """A decorator memoizing the results of a mesh method in the relation cache
+    of the mesh, see `MeshDS.clear_cache`.
+
+    The result on all entities is cached for each combination of the arguments
+    except `index`, and `index` is applied to the cached result. Calls with
+    unhashable arguments, e.g. tensors, are not cached. Cached tensors are
+    returned as copies, so they are safe to be modified in place.
+
+    Requires that the metaclass is MeshMeta or derived from it. Methods named in
+    the class attribute `_CACHED_METHODS` are decorated automatically.
+    """
+    sig = inspect.signature(meth)
+    params = list(sig.parameters.values())
+    if any(p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in params):
+        return meth
+    self_name = params[0].name
+    index_param = sig.parameters.get('index', None)
+    full_index = None if index_param is None else index_param.default
+    name = meth.__name__
+
+    @functools.wraps(meth)
+    def wrapper(self, *args, **kwargs):
+        cache = self.__dict__.get('_relation_cache', None)
+        if (cache is None) or (not self.cache_enabled):
+            return meth(self, *args, **kwargs)
+
+        bound = sig.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        del arguments[self_name]
+        index = arguments.pop('index', full_index)
+        if isinstance(arguments.get('etype', None), str):
+            arguments['etype'] = estr2dim(self, arguments['etype'])
+        key = (name,) + tuple(arguments.items())
+
+        try:
+            value = cache.get(key, None)
+        except TypeError: # unhashable arguments
+            return meth(self, *args, **kwargs)
+
+        if value is None:
+            self._cache_stats['misses'] += 1
+            if index_param is not None:
+                arguments['index'] = full_index
+            value = meth(self, **arguments)
+            cache[key] = value
+        else:
+            self._cache_stats['hits'] += 1
+
+        if not isinstance(value, TensorLike):
+            return value
+        if _is_full_index(index, full_index):
+            return bm.copy(value)
+        try:
+            value = value[index]
+        except IndexError: # results not indexed by entities
+            return meth(self, *args, **kwargs)
+        if isinstance(index, (slice, int)): # views
+            value = bm.copy(value)
+        return value
+
+    wrapper.__cached__ = True
+    return wrapper
+
+
 class MeshMeta(type):
     def __init__(self, name: str, bases: Tuple[type, ...], dict: Dict[str, Any], /, **kwds: Any):
         if '_entity_dim_method_name_map' in dict:
@@ -138,6 +294,13 @@ class MeshMeta(type):
                     assert isinstance(dim, int)
                     self._entity_dim_method_name_map[dim] = item.__name__
 
+        # NOTE: Decorate the methods overridden in this class by `cachedmethod`,
+        # if they are named in `_CACHED_METHODS`.
+        for meth_name in getattr(self, '_CACHED_METHODS', ()):
+            item = dict.get(meth_name, None)
+            if callable(item) and not getattr(item, '__cached__', False):
+                setattr(self, meth_name, cachedmethod(item))
+
         return type.__init__(self, name, bases, dict, **kwds)
 
 
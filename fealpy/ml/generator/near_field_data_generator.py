@@ -3,7 +3,7 @@ import os
 import matplotlib.pyplot as plt
 from numpy.typing import NDArray
 import numpy as np
-from typing import Sequence, Callable
+from typing import Sequence, Callable, Optional
 
 from fealpy.backend import backend_manager as bm
 from fealpy.mesh import TriangleMesh, QuadrangleMesh, UniformMesh2d
@@ -18,7 +18,7 @@ from fealpy.fem import (
     LinearForm,
     DirichletBC
 )
-from fealpy.solver import spsolve
+from fealpy.solver import factorize
 
 
 class NearFieldDataFEMGenerator2d:
@@ -64,57 +64,84 @@ class NearFieldDataFEMGenerator2d:
         self.d = d
         self.k = k
         self.reciever_points = reciever_points
+        self._space = None
         qf = self.mesh.quadrature_formula(self.q, 'cell')
         self.bc, _ = qf.get_quadrature_points_and_weights()
 
-    def get_nearfield_data(self, k: float, d: Sequence[float]):
+    def pde_model(self, k: float, d: Sequence[float]) -> PMLPDEModel2d:
         """
-        获取近场数据。
-
-        参数:
-        - k: 波数
-        - d: 波矢量方向
-
-        返回:
-        - uh: 近场数据
+        构造波数 k 与入射方向 d 的 PML 模型。
         """
-        k_index = self.k.index(k)
-        d_index = self.d.index(d)
-        pde = PMLPDEModel2d(
+        return PMLPDEModel2d(
             levelset=self.levelset, 
             domain=self.domain,  
             u_inc=self.u_inc,
             A=1,
-            k=self.k[k_index],
-            d=self.d[d_index],
-            refractive_index=[1, 1 + 1 / self.k[k_index]**2],
+            k=k,
+            d=d,
+            refractive_index=[1, 1 + 1 / k**2],
             absortion_constant=1.79,
             lx=1.0,
             ly=1.0
         )
 
-        space = LagrangeFESpace(self.mesh, p=self.p)
+    @property
+    def space(self) -> LagrangeFESpace:
+        if self._space is None:
+            self._space = LagrangeFESpace(self.mesh, p=self.p)
+        return self._space
+
+    def get_nearfield_data_batch(self, k: float, d: Optional[Sequence[Sequence[float]]]=None):
+        """
+        获取同一波数下多个入射方向的近场数据。
+
+        矩阵只与波数有关, 因此对每个波数只组装与分解一次, 所有入射方向的右端项
+        作为多右端项一次求解。
+
+        参数:
+        - k: 波数
+        - d: 波矢量方向的列表, 默认为 self.d
+
+        返回:
+        - uh: 近场数据的自由度, 形状为 (len(d), gdof)
+        """
+        d = self.d if d is None else d
+        pdes = [self.pde_model(k, di) for di in d]
+        space = self.space
 
-        # 定义积分子
+        # 定义积分子, 扩散, 对流与反应系数与入射方向无关
+        pde = pdes[0]
         D = ScalarDiffusionIntegrator(pde.diffusion_coefficient, q=self.q)
         C = ScalarConvectionIntegrator(pde.convection_coefficient, q=self.q)
         M = ScalarMassIntegrator(pde.reaction_coefficient, q=self.q)
-        f = ScalarSourceIntegrator(pde.source, q=self.q)
 
-        # 组装双线性形式和线性形式
         b = BilinearForm(space)
         b.add_integrator([D, C, M])
+        A = b.assembly()
 
-        l = LinearForm(space)
-        l.add_integrator(f)
+        bc = DirichletBC(space, pde.dirichlet)
+        F = []
+        for pde in pdes:
+            l = LinearForm(space)
+            l.add_integrator(ScalarSourceIntegrator(pde.source, q=self.q))
+            F.append(bc.apply_vector(l.assembly(), A))
+        A = bc.apply_matrix(A)
 
-        A = b.assembly()
-        F = l.assembly()
+        return factorize(A, 'scipy', cache=False).solve(bm.stack(F, axis=0), batch_first=True)
 
-        bc = DirichletBC(space, pde.dirichlet) 
-        uh = space.function(dtype=bm.complex128)
-        A, F = bc.apply(A, F)
-        uh[:] = spsolve(A, F, solver='scipy')
+    def get_nearfield_data(self, k: float, d: Sequence[float]):
+        """
+        获取近场数据。
+
+        参数:
+        - k: 波数
+        - d: 波矢量方向
+
+        返回:
+        - uh: 近场数据
+        """
+        uh = self.space.function(dtype=bm.complex128)
+        uh[:] = self.get_nearfield_data_batch(k, [d])[0]
         return uh
 
     def points_location_and_bc(self, p: NDArray, domain: Sequence[float], nx: int, ny: int):
@@ -146,21 +173,19 @@ class NearFieldDataFEMGenerator2d:
         bc = (bc_x, bc_y)
         return location, bc
 
-    def data_for_dsm(self, k: float, d: Sequence[float]):
+    def receiver_data(self, uh):
         """
-        获取用于DSM的数据。
+        计算近场数据在接收点上的值。
 
         参数:
-        - k: 波数
-        - d: 波矢量方向
+        - uh: 近场数据
 
         返回:
-        - data: DSM数据
+        - data: 接收点上的值
         """
         reciever_points = self.reciever_points
         data_length = reciever_points.shape[0]
         data = bm.zeros((data_length,), dtype=bm.complex128)
-        uh = self.get_nearfield_data(k=k, d=d)
 
         if self.meshtype == 'InterfaceMesh':
             b = self.mesh.point_to_bc(reciever_points)
@@ -183,6 +208,35 @@ class NearFieldDataFEMGenerator2d:
                 data[i] = u[location]
         return data
 
+    def data_for_dsm(self, k: float, d: Sequence[float]):
+        """
+        获取用于DSM的数据。
+
+        参数:
+        - k: 波数
+        - d: 波矢量方向
+
+        返回:
+        - data: DSM数据
+        """
+        uh = self.get_nearfield_data(k=k, d=d)
+        return self.receiver_data(uh)
+
+    def data_for_dsm_batch(self, k: float, d: Optional[Sequence[Sequence[float]]]=None):
+        """
+        获取同一波数下多个入射方向用于DSM的数据, 只分解一次矩阵。
+
+        参数:
+        - k: 波数
+        - d: 波矢量方向的列表, 默认为 self.d
+
+        返回:
+        - data: DSM数据, 形状为 (len(d), 接收点个数)
+        """
+        uh = self.get_nearfield_data_batch(k, d)
+        data = [self.receiver_data(self.space.function(u)) for u in uh]
+        return bm.stack(data, axis=0)
+
     def save(self, save_path: str, scatterer_index: int):
         """
         保存数据。
@@ -195,11 +249,12 @@ class NearFieldDataFEMGenerator2d:
         d_values = self.d
         data_dict = {}
         for i in range(len(k_values)):
+            data = self.data_for_dsm_batch(k=k_values[i])
             for j in range(len(d_values)):
                 k_name = f'k={k_values[i]}'
                 d_name = d_values[j]
                 name = f"{k_name}, d={d_name}"
-                data_dict[name] = self.data_for_dsm(k=k_values[i], d=d_values[j])
+                data_dict[name] = data[j]
         filename = os.path.join(save_path, f"data_for_dsm_{scatterer_index}.npz")
         np.savez(filename, **data_dict)
 
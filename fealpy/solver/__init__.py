@@ -1,4 +1,19 @@
 
 from .conjugate_gradient import cg
-from .direct_solver import spsolve
+from .direct_solver import spsolve, factorize, Factorization, FactorizationCache
 from .gmres_solver import gmres
+from .linear_operator import LinearOperator
+from .minres_solver import minres
+from .bicgstab_solver import bicgstab
+from .preconditioner import (
+    Preconditioner,
+    JacobiPreconditioner,
+    BlockJacobiPreconditioner,
+    SSORPreconditioner,
+    ILU0Preconditioner,
+    IC0Preconditioner,
+    AdditiveSchwarzPreconditioner
+)
+from .multigrid import Multigrid, JacobiSmoother, ChebyshevSmoother
+from .amg_solver import AMGSolver
+from .gmg_solver import GeometricMultigrid, StructuredLaplaceOperator, mesh_hierarchy
@@ -0,0 +1,48 @@
+
+from typing import Optional, Dict, Any, List
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+
+
+def prepare_rhs(b: TensorLike, x0: Optional[TensorLike], batch_first: bool):
+    """Check b and x0, and return them shaped (n,) or (n, k), with the batch
+    dimension moved to the last."""
+    if not isinstance(b, TensorLike):
+        raise TypeError("b must be a Tensor")
+    if b.ndim not in {1, 2}:
+        raise ValueError("b must be a 1D or 2D dense tensor")
+    if x0 is None:
+        x0 = bm.zeros_like(b)
+    elif x0.shape != b.shape:
+        raise ValueError("x0 and b must have the same shape")
+
+    if (b.ndim == 2) and batch_first:
+        return bm.swapaxes(b, 0, 1), bm.swapaxes(x0, 0, 1)
+    return b, x0
+
+
+def restore_shape(x: TensorLike, batch_first: bool):
+    if (x.ndim == 2) and batch_first:
+        return bm.swapaxes(x, 0, 1)
+    return x
+
+
+def norm(x: TensorLike) -> float:
+    """The norm of all the entries."""
+    return float(bm.sqrt(bm.sum(x**2)))
+
+
+def dot(x: TensorLike, y: TensorLike) -> TensorLike:
+    """Column-wise inner products of (n,) or (n, k) tensors, shaped () or (k,)."""
+    return bm.sum(x * y, axis=0)
+
+
+def safe_div(x: TensorLike, y: TensorLike) -> TensorLike:
+    """Division returning 0 where y is 0, used for converged columns."""
+    zero = (y == 0)
+    return bm.where(zero, 0., x / bm.where(zero, 1., y))
+
+
+def make_info(n_iter: int, residuals: List[float], converged: bool) -> Dict[str, Any]:
+    return {'iters': n_iter, 'residuals': residuals, 'converged': converged}
@@ -0,0 +1,272 @@
+
+from typing import Optional, Union, Literal
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import COOTensor, CSRTensor
+from ._krylov_utils import safe_div
+from .preconditioner import _diagonal
+from .multigrid import Multigrid, _Cycle, csr_from_entries, spectral_radius
+
+
+### Strength of connection ###
+
+def _segment_max(row: TensorLike, crow: TensorLike, values: TensorLike, fill: float) -> TensorLike:
+    """Maximum of the values in each row, where the entries are grouped by rows
+    and `crow` is the row pointer. Rows without entries are filled by `fill`.
+    The maximum is computed by a segmented scan in log2(max row length) steps."""
+    n = crow.shape[0] - 1
+    out = bm.full((n,), fill, **bm.context(values))
+    if values.shape[0] == 0:
+        return out
+    length = crow[1:] - crow[:-1]
+    max_length = int(bm.max(length))
+    shift = 1
+
+    while shift < max_length:
+        same = row[shift:] == row[:-shift]
+        tail = bm.where(same, bm.maximum(values[shift:], values[:-shift]), values[shift:])
+        values = bm.concat([values[:shift], tail], axis=0)
+        shift *= 2
+
+    nonempty = bm.nonzero(length > 0)[0]
+    return bm.set_at(out, nonempty, values[crow[nonempty + 1] - 1])
+
+
+def classical_strength(A: CSRTensor, theta: float) -> TensorLike:
+    """Classical strength of connection of the Ruge-Stuben method, where i
+    strongly depends on j if -a_ij >= theta * max_{k != i} (-a_ik).
+
+    Returns:
+        Tensor: A boolean mask of the non-zeros of A, shaped (nnz,).
+    """
+    row, col, val = A.row(), A.col(), A.values()
+    off = (row != col)
+    neg = bm.where(off, -val, 0.)
+    threshold = theta * _segment_max(row, A.crow(), neg, 0.)
+    return off & (neg > 0) & (neg >= threshold[row])
+
+
+def symmetric_strength(A: CSRTensor, theta: float) -> TensorLike:
+    """Symmetric strength of connection of the smoothed aggregation method,
+    where i and j are strongly connected if |a_ij| >= theta * sqrt(|a_ii a_jj|).
+
+    Returns:
+        Tensor: A boolean mask of the non-zeros of A, shaped (nnz,).
+    """
+    row, col, val = A.row(), A.col(), A.values()
+    diag = bm.abs(_diagonal(row, col, val, A.shape[0]))
+    off = (row != col)
+    return off & (val**2 >= theta**2 * diag[row] * diag[col]) & (val != 0)
+
+
+### Coarsening ###
+
+def _count(index: TensorLike, flag: TensorLike, n: int) -> TensorLike:
+    """Number of True in flag for each index."""
+    out = bm.zeros((n,), dtype=bm.int64, device=bm.get_device(index))
+    return bm.index_add(out, index[flag], bm.ones_like(index[flag], dtype=bm.int64))
+
+
+def _independent_set(row: TensorLike, col: TensorLike, weights: TensorLike,
+                     undecided: TensorLike) -> TensorLike:
+    """Select the undecided nodes whose weights are greater than those of all their
+    undecided neighbors in the graph of the edges (row, col)."""
+    flag = undecided[row] & undecided[col] & (weights[col] > weights[row])
+    return undecided & (_count(row, flag, weights.shape[0]) == 0)
+
+
+def pmis_coarsen(row: TensorLike, col: TensorLike, n: int) -> TensorLike:
+    """Split the nodes into C/F points by the parallel modified independent set
+    (PMIS) algorithm, where an edge (i, j) means i strongly depends on j.
+
+    Returns:
+        Tensor: A boolean tensor shaped (n,), True for the C points.
+    """
+    kwargs = {'dtype': bm.bool, 'device': bm.get_device(row)}
+    influence = _count(col, bm.ones((col.shape[0],), **kwargs), n)
+    weights = bm.astype(influence, bm.float64) + bm.astype(bm.random.rand(n), bm.float64)
+    # The graph of S + S^T for the independence.
+    grow = bm.concat([row, col], axis=0)
+    gcol = bm.concat([col, row], axis=0)
+    is_c = bm.zeros((n,), **kwargs)
+    # Points influencing no others are F points.
+    undecided = influence > 0
+
+    while bm.any(undecided):
+        new_c = _independent_set(grow, gcol, weights, undecided)
+        is_c = is_c | new_c
+        new_f = (_count(row, new_c[col], n) > 0) & (~new_c)
+        undecided = undecided & (~new_c) & (~new_f)
+
+    return is_c
+
+
+def direct_interpolation(A: CSRTensor, strength: TensorLike, is_c: TensorLike) -> CSRTensor:
+    """Direct interpolation of the classical AMG, interpolating the F points from
+    their strongly connected C points. Positive and negative off-diagonal entries
+    are treated separately.
+
+    Parameters:
+        A (CSRTensor): The matrix with sorted unique entries.
+        strength (Tensor): Strength mask of the non-zeros of A.
+        is_c (Tensor): C points.
+
+    Returns:
+        CSRTensor: The prolongation matrix shaped (n, nc).
+    """
+    n = A.shape[0]
+    row, col, val = A.row(), A.col(), A.values()
+    context = bm.context(val)
+    kwargs = bm.context(row)
+    coarse_index = bm.cumsum(bm.astype(is_c, row.dtype), axis=0) - 1
+    nc = int(bm.sum(is_c))
+
+    off = (row != col)
+    neg = off & (val < 0)
+    pos = off & (val > 0)
+    interp = strength & is_c[col] & (~is_c[row])
+
+    def row_sum(flag):
+        return bm.index_add(bm.zeros((n,), **context), row[flag], val[flag])
+
+    neg_all, neg_c = row_sum(neg), row_sum(neg & interp)
+    pos_all, pos_c = row_sum(pos), row_sum(pos & interp)
+    alpha = safe_div(neg_all, neg_c)
+    beta = safe_div(pos_all, pos_c)
+    # Positive entries are lumped into the diagonal if no C point to interpolate.
+    diag = _diagonal(row, col, val, n) + bm.where(pos_c == 0, pos_all, 0.)
+    weight = -bm.where(val < 0, alpha[row], beta[row]) * val
+    weight = safe_div(weight, diag[row])
+
+    c_points = bm.nonzero(is_c)[0]
+    prow = bm.concat([c_points, row[interp]], axis=0)
+    pcol = bm.concat([coarse_index[c_points], coarse_index[col[interp]]], axis=0)
+    pval = bm.concat([bm.ones((nc,), **context), weight[interp]], axis=0)
+    return csr_from_entries(prow, bm.astype(pcol, row.dtype), pval, (n, nc))
+
+
+def mis2_aggregation(row: TensorLike, col: TensorLike, n: int) -> TensorLike:
+    """Aggregate the nodes in a symmetric graph of edges (row, col) grouped by rows.
+    The roots form a maximal distance-2 independent set, and every other node joins
+    the aggregate of a root within distance 2.
+
+    Returns:
+        Tensor: Aggregate of each node shaped (n,), -1 for isolated nodes.
+    """
+    kwargs = bm.context(row)
+    crow = bm.searchsorted(row, bm.arange(n + 1, **kwargs))
+    has_edge = _count(row, bm.ones((row.shape[0],), dtype=bm.bool,
+                                   device=bm.get_device(row)), n) > 0
+    # Keys: 2 for roots, random numbers in [0, 1) for the undecided and -1 for the others.
+    weights = bm.astype(bm.random.rand(n), bm.float64)
+    key = bm.where(has_edge, weights, -1.)
+
+    def closed_max(v):
+        return bm.maximum(v, _segment_max(row, crow, v[col], -1.))
+
+    while True:
+        undecided = (key >= 0) & (key < 2)
+        if not bm.any(undecided):
+            break
+        key_max = closed_max(closed_max(key))
+        key = bm.where(undecided & (key_max >= 2), -1., key)
+        key = bm.where(undecided & (key_max == key), 2., key)
+
+    is_root = (key >= 2)
+    roots = bm.nonzero(is_root)[0]
+    agg = bm.full((n,), -1, **kwargs)
+    agg = bm.set_at(agg, roots, bm.arange(roots.shape[0], **kwargs))
+
+    for _ in range(2):
+        neighbor = _segment_max(row, crow, bm.astype(agg[col], bm.float64), -1.)
+        agg = bm.where(agg >= 0, agg, bm.astype(neighbor, agg.dtype))
+
+    return agg
+
+
+def smoothed_prolongation(A: CSRTensor, agg: TensorLike, omega: float=4/3) -> CSRTensor:
+    """Smooth the tentative prolongation of the aggregates by a damped Jacobi step,
+    P = (I - ω/ρ D^{-1}A) T, where T interpolates constants on the aggregates and
+    ρ is the estimated spectral radius of D^{-1}A."""
+    n = A.shape[0]
+    row, col, val = A.row(), A.col(), A.values()
+    context = bm.context(val)
+    kwargs = bm.context(row)
+    nagg = int(bm.max(agg)) + 1
+
+    nodes = bm.nonzero(agg >= 0)[0]
+    sizes = bm.index_add(bm.zeros((nagg,), **context), agg[nodes],
+                         bm.ones((nodes.shape[0],), **context))
+    T = csr_from_entries(nodes, agg[nodes], 1. / bm.sqrt(sizes[agg[nodes]]), (n, nagg))
+
+    diag = _diagonal(row, col, val, n)
+    inv_diag = bm.where(diag == 0, 0., 1. / bm.where(diag == 0, 1., diag))
+    rho = spectral_radius(A, inv_diag)
+    DA = CSRTensor(A.crow(), col, inv_diag[row] * val, A.shape)
+    return T.add(DA @ T, alpha=-omega / rho)
+
+
+### Solver ###
+
+class AMGSolver(Multigrid):
+    """Algebraic multigrid solver and preconditioner, building the hierarchy from
+    the matrix only. The setup can be reused for matrices with the same structure
+    by `update`, e.g. in time-stepping.
+
+    Parameters:
+        A (CSRTensor | COOTensor): The matrix, e.g. of a Poisson problem.
+        method ('rs' | 'sa', optional): 'rs' for the classical Ruge-Stuben AMG with
+            PMIS coarsening and direct interpolation; 'sa' for the smoothed aggregation
+            AMG. Defaults to 'sa'.
+        theta (float | None, optional): Strength threshold. Defaults to 0.25 for 'rs'
+            and 0.08 for 'sa'.
+        cycle ('V' | 'W' | 'F', optional): The cycle type. Defaults to 'V'.
+        smoother ('jacobi' | 'chebyshev', optional): The smoother. Defaults to 'jacobi'.
+        presmooth (int, optional): Number of pre-smoothing steps. Defaults to 1.
+        postsmooth (int, optional): Number of post-smoothing steps. Defaults to 1.
+        max_levels (int, optional): Maximum number of levels. Defaults to 10.
+        coarse_size (int, optional): Size of the matrix to stop coarsening. Defaults to 500.
+
+    Examples:
+        >>> amg = AMGSolver(A)
+        >>> x = cg(A, b, M=amg)    # as a preconditioner
+        >>> x = amg.solve(b)       # as a standalone solver
+        >>> amg.update(A_new)      # reuse the setup for new values
+
+    Note:
+        The coarsening is randomized, and runs without sequential loops over the
+        nodes, so it works on all backends.
+    """
+    def __init__(self, A: Union[CSRTensor, COOTensor], /, method: Literal['rs', 'sa']='sa', *,
+                 theta: Optional[float]=None,
+                 cycle: _Cycle='V',
+                 smoother: Literal['jacobi', 'chebyshev']='jacobi',
+                 presmooth: int=1, postsmooth: int=1,
+                 max_levels: int=10, coarse_size: int=500):
+        if method not in ('rs', 'sa'):
+            raise ValueError(f"Unknown AMG method '{method}', expected 'rs' or 'sa'.")
+        super().__init__(cycle=cycle, smoother=smoother, presmooth=presmooth,
+                         postsmooth=postsmooth, max_levels=max_levels,
+                         coarse_size=coarse_size)
+        self.method = method
+        if theta is None:
+            theta = 0.25 if method == 'rs' else 0.08
+        self.theta = theta
+        self.setup(A)
+
+    def _coarsen(self, A: CSRTensor, level: int) -> Optional[CSRTensor]:
+        row, col = A.row(), A.col()
+
+        if self.method == 'rs':
+            strength = classical_strength(A, self.theta)
+            is_c = pmis_coarsen(row[strength], col[strength], A.shape[0])
+            if not bm.any(is_c):
+                return None
+            return direct_interpolation(A, strength, is_c)
+        else:
+            strength = symmetric_strength(A, self.theta)
+            agg = mis2_aggregation(row[strength], col[strength], A.shape[0])
+            if not bm.any(agg >= 0):
+                return None
+            return smoothed_prolongation(A, agg)
@@ -0,0 +1,100 @@
+from typing import Optional
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+
+from .. import logger
+from .conjugate_gradient import SupportsMatmul, _Precond
+from .preconditioner import as_preconditioner
+from ._krylov_utils import prepare_rhs, restore_shape, norm, dot, safe_div, make_info
+
+
+def bicgstab(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
+             batch_first: bool=False,
+             atol: float=1e-12, rtol: float=1e-8,
+             maxiter: Optional[int]=10000,
+             M: Optional[_Precond]=None,
+             returninfo: bool=False):
+    """Solve a non-symmetric linear system Ax = b using the right-preconditioned
+    Biconjugate Gradient Stabilized (BiCGStab) method.
+
+    Parameters:
+        A (SupportsMatmul): The coefficient matrix of the linear system.
+        b (TensorLike): The right-hand side vector of the linear system, can be a 1D or 2D tensor.
+        x0 (TensorLike): Initial guess for the solution, a 1D or 2D tensor.\\
+        Must have the same shape as b when reshaped appropriately.
+        batch_first (bool, optional): Whether the batch dimension of `b` and `x0`\\
+        is the first dimension. Ignored if `b` is an 1-d tensor. Default is False.
+        atol (float, optional): Absolute tolerance for convergence. Default is 1e-12.
+        rtol (float, optional): Relative tolerance for convergence. Default is 1e-8.
+        maxiter (int, optional): Maximum number of iterations allowed. Default is 10000.
+        M (Preconditioner | SupportsMatmul | Callable | None, optional): The preconditioner\\
+        approximating the inverse of A, e.g. `ILU0Preconditioner`. Default is None.
+        returninfo (bool, optional): Whether to return the iteration info. Default is False.
+
+    Returns:
+        Tensor: The approximate solution to the system Ax = b.
+        dict: The info with keys 'iters', 'residuals' and 'converged'.\\
+        Returned only if `returninfo` is True.
+    """
+    b, x0 = prepare_rhs(b, x0, batch_first)
+    sol, info = _bicgstab_impl(A, b, x0, as_preconditioner(M), atol, rtol, maxiter)
+    sol = restore_shape(sol, batch_first)
+
+    if returninfo:
+        return sol, info
+    return sol
+
+
+def _bicgstab_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, M, atol, rtol, maxiter):
+    x = x0
+    r = b - A @ x
+    r_hat = r
+    rho = alpha = omega = dot(r, r) * 0. + 1.
+    v = p = bm.zeros_like(r)
+    n_iter = 0
+    b_norm = norm(b)
+    residuals = [norm(r)]
+    converged = residuals[0] < max(atol, rtol * b_norm)
+
+    while not converged:
+        if (maxiter is not None) and (n_iter >= maxiter):
+            logger.info(f"BiCGStab: failed, stopped by maxiter ({maxiter}).")
+            break
+
+        rho_new = dot(r_hat, r)
+        if not bm.any(rho_new != 0):
+            logger.warning(f"BiCGStab: breakdown after {n_iter} iterations.")
+            break
+        beta = safe_div(rho_new, rho) * safe_div(alpha, omega)
+        p = r + beta * (p - omega * v)
+        p_hat = M(p)
+        v = A @ p_hat
+        alpha = safe_div(rho_new, dot(r_hat, v))
+        s = r - alpha * v
+        x = x + alpha * p_hat
+
+        s_hat = M(s)
+        t = A @ s_hat
+        omega = safe_div(dot(t, s), dot(t, t))
+        x = x + omega * s_hat
+        r = s - omega * t
+        rho = rho_new
+
+        r_norm_new = norm(r)
+        residuals.append(r_norm_new)
+        n_iter += 1
+
+        if r_norm_new < atol:
+            logger.info(f"BiCGStab: converged in {n_iter} iterations, "
+                        "stopped by absolute tolerance.")
+            converged = True
+            break
+
+        if r_norm_new < rtol * b_norm:
+            logger.info(f"BiCGStab: converged in {n_iter} iterations, "
+                        "stopped by relative tolerance.")
+            converged = True
+            break
+
+    return x, make_info(n_iter, residuals, converged)
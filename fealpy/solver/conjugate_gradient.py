@@ -1,21 +1,27 @@
 
-from typing import Optional, Protocol
+from typing import Optional, Protocol, Callable, Union
 
 from ..backend import backend_manager as bm
 from ..backend import TensorLike
 
 from .. import logger
+from .preconditioner import as_preconditioner
+from ._krylov_utils import prepare_rhs, restore_shape, norm, dot, safe_div, make_info
 
 
 class SupportsMatmul(Protocol):
     def __matmul__(self, other: TensorLike) -> TensorLike: ...
 
+_Precond = Union[SupportsMatmul, Callable[[TensorLike], TensorLike]]
+
 
 def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
        batch_first: bool=False,
        atol: float=1e-12, rtol: float=1e-8,
-       maxiter: Optional[int]=10000) -> TensorLike:
-    """Solve a linear system Ax = b using the Conjugate Gradient (CG) method.
+       maxiter: Optional[int]=10000,
+       M: Optional[_Precond]=None,
+       returninfo: bool=False):
+    """Solve a linear system Ax = b using the (Preconditioned) Conjugate Gradient (CG) method.
 
     Parameters:
         A (SupportsMatmul): The coefficient matrix of the linear system.
@@ -28,9 +34,15 @@ def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
         rtol (float, optional): Relative tolerance for convergence. Default is 1e-8.
         maxiter (int, optional): Maximum number of iterations allowed. Default is 10000.\
         If not provided, the method will continue until convergence based on the given tolerances.
+        M (Preconditioner | SupportsMatmul | Callable | None, optional): The preconditioner\
+        approximating the inverse of A, applied by `M @ r` or `M(r)`. It should be symmetric\
+        positive-definite, e.g. `JacobiPreconditioner` or `IC0Preconditioner`. Default is None.
+        returninfo (bool, optional): Whether to return the iteration info. Default is False.
 
     Returns:
         Tensor: The approximate solution to the system Ax = b.
+        dict: The info with keys 'iters', 'residuals' (history of the residual norm,\
+        starting from the initial one) and 'converged'. Returned only if `returninfo` is True.
 
     Raises:
         ValueError: If inputs do not meet the specified conditions (e.g., A is not sparse, dimensions mismatch).
@@ -42,70 +54,61 @@ def cg(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
     assert isinstance(b, TensorLike), "b must be a Tensor"
     if x0 is not None:
         assert isinstance(x0, TensorLike), "x0 must be a Tensor if not None"
-    single_vector = b.ndim == 1
-
-    if b.ndim not in {1, 2}:
-        raise ValueError("b must be a 1D or 2D dense tensor")
-
-    if x0 is None:
-        x0 = bm.zeros_like(b)
-    else:
-        if x0.shape != b.shape:
-            raise ValueError("x0 and b must have the same shape")
-
-    if (not single_vector) and batch_first:
-        b = bm.swapaxes(b, 0, 1)
-        x0 = bm.swapaxes(x0, 0, 1)
 
-    sol = _cg_impl(A, b, x0, atol, rtol, maxiter)
-
-    if (not single_vector) and batch_first:
-        sol = bm.swapaxes(sol, 0, 1)
+    b, x0 = prepare_rhs(b, x0, batch_first)
+    sol, info = _cg_impl(A, b, x0, as_preconditioner(M), atol, rtol, maxiter)
+    sol = restore_shape(sol, batch_first)
 
+    if returninfo:
+        return sol, info
     return sol
 
 
-def _cg_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, atol, rtol, maxiter):
+def _cg_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, M, atol, rtol, maxiter):
     # initialize
     x = x0              # (dof, batch)
     r = b - A @ x       # (dof, batch)
-    p = r               # (dof, batch)
+    z = M(r)            # (dof, batch)
+    p = z               # (dof, batch)
+    rz = dot(r, z)      # (batch,)
     n_iter = 0
-    b_norm = bm.linalg.norm(b)
-    sum_func = bm.sum
-    sqrt_func = bm.sqrt
+    b_norm = norm(b)
+    residuals = [norm(r)]
+    converged = residuals[0] < max(atol, rtol * b_norm)
 
     # iterate
-    while True:
-        Ap = A @ p      # (dof, batch)
-        rTr = sum_func(r**2, axis=0)
-        alpha = rTr / sum_func(p*Ap, axis=0)  # r @ r / (p @ Ap) # (batch,)
-        x = x + alpha[None, ...] * p  # (dof, batch)
-        r_new = r - alpha[None, ...] * Ap
-        rTr_new = sum_func(r_new**2, axis=0)  # (batch,)
-        r_norm_new = sqrt_func(sum_func(rTr_new))
+    while not converged:
+        if (maxiter is not None) and (n_iter >= maxiter):
+            logger.info(f"CG: failed, stopped by maxiter ({maxiter}).")
+            break
 
+        Ap = A @ p      # (dof, batch)
+        alpha = safe_div(rz, dot(p, Ap))  # r @ z / (p @ Ap) # (batch,)
+        x = x + alpha * p  # (dof, batch)
+        r = r - alpha * Ap
+        r_norm_new = norm(r)
+        residuals.append(r_norm_new)
         n_iter += 1
 
         if r_norm_new < atol:
             logger.info(f"CG: converged in {n_iter} iterations, "
                         "stopped by absolute tolerance.")
+            converged = True
             break
 
         if r_norm_new < rtol * b_norm:
             logger.info(f"CG: converged in {n_iter} iterations, "
                         "stopped by relative tolerance.")
+            converged = True
             break
 
-        if (maxiter is not None) and (n_iter >= maxiter):
-            logger.info(f"CG: failed, stopped by maxiter ({maxiter}).")
-            break
-
-        beta = rTr_new / rTr # (batch,)
-        p = r_new + beta[None, ...] * p
-        r = r_new
+        z = M(r)
+        rz_new = dot(r, z)  # (batch,)
+        beta = safe_div(rz_new, rz) # (batch,)
+        p = z + beta * p
+        rz = rz_new
 
-    return x
+    return x, make_info(n_iter, residuals, converged)
 
     # @staticmethod
     # def setup_context(ctx, inputs, output):
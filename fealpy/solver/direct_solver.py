@@ -1,4 +1,9 @@
 
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple
+import hashlib
+import weakref
+
 from ..backend import backend_manager as bm
 from ..sparse import COOTensor, CSRTensor
 import numpy as np
@@ -104,17 +109,22 @@ def _cupy_solve(A, b):
         x = cp.asnumpy(x)
     return x
 
-def spsolve(A:[COOTensor, CSRTensor], b, solver:str="mumps"):
+def spsolve(A:[COOTensor, CSRTensor], b, solver:str="mumps", *, cache:bool=False):
     """Solve a linear system using a direct solver.
 
     Parameters:
         A(COOTensor | CSRTensor): The matrix of the linear system.
         b(Tensor): The right-hand side.
         solver(str): The solver to use. It can be "mumps", "scipy", or "cupy".
+        cache(bool, optional): Whether to reuse the factorization of `A` from the
+            factorization cache, see `factorize`. Default is False.
 
     Returns:
         Tensor: The solution of the linear system.
     """
+    if cache:
+        return factorize(A, solver).solve(b)
+
     if solver == "mumps":
         return bm.tensor(_mumps_solve(A, b))
     elif solver == "scipy":
@@ -126,4 +136,308 @@ def spsolve(A:[COOTensor, CSRTensor], b, solver:str="mumps"):
         raise ValueError(f"Unknown solver: {solver}")
 
 
+### Factorization reuse ###
+
+def _canonical_scipy(A):
+    """Convert the matrix to a scipy csr_matrix with sorted unique indices."""
+    from scipy.sparse import issparse
+
+    if not issparse(A):
+        A = A.to_scipy()
+    A = A.tocsr(copy=False)
+    if not A.has_canonical_format:
+        A = A.copy()
+        A.sum_duplicates()
+    return A
+
+
+def _digest(*arrays) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for a in arrays:
+        h.update(np.ascontiguousarray(a).tobytes())
+    return h.hexdigest()
+
+
+def _pattern_hash(A) -> str:
+    """Hash of the shape and the sparsity pattern of a canonical csr_matrix."""
+    return _digest(np.array(A.shape, dtype=np.int64),
+                   A.indptr.astype(np.int64, copy=False),
+                   A.indices.astype(np.int64, copy=False))
+
+
+class Factorization():
+    """Handle of the LU factorization of a sparse matrix, solving the linear
+    systems with the same matrix for many right-hand sides.
+
+    Parameters:
+        A(COOTensor | CSRTensor): The square matrix to factorize.
+        solver(str): The solver to use. It can be "mumps", "scipy", or "cupy".
+        symbolic(Factorization | None, optional): A "scipy" factorization of a matrix
+            with the same sparsity pattern, whose symbolic analysis is reused.
+            Default is None.
+
+    Examples:
+        >>> lu = Factorization(A, "scipy")
+        >>> x = lu.solve(b)            # b shaped (n,) or (n, k)
+        >>> lu.refactorize(A_new)      # same sparsity pattern, new values
+
+    Note:
+        The symbolic analysis is reused by `refactorize`, which is the full
+        analysis step of MUMPS, and the column ordering of SuperLU for "scipy".
+        For "cupy", the matrix is factorized from scratch.
+    """
+    def __init__(self, A, solver: str="mumps", *, symbolic: Optional["Factorization"]=None):
+        if solver not in ("mumps", "scipy", "cupy"):
+            raise ValueError(f"Unknown solver: {solver}")
+        A = _canonical_scipy(A)
+        if A.shape[0] != A.shape[1]:
+            raise ValueError(f"Factorization requires a square matrix, but got shape {A.shape}.")
+        self.solver = solver
+        self.shape = A.shape
+        self.pattern = _pattern_hash(A)
+        self._ctx = None
+        self._perm_c = None
+
+        if (symbolic is not None) and (symbolic.solver == solver == "scipy") \
+                and (symbolic.pattern == self.pattern):
+            self._lu, self._perm_c = symbolic._lu, symbolic._perm_c
+            self._factorize(A, analysis=False)
+        else:
+            self._factorize(A, analysis=True)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(shape={self.shape}, solver='{self.solver}')"
+
+    def __del__(self):
+        if getattr(self, '_ctx', None) is not None:
+            self._ctx.destroy()
+            self._ctx = None
+
+    def _factorize(self, A, analysis: bool):
+        if self.solver == "scipy":
+            from scipy.sparse.linalg import splu
+            if analysis:
+                self._lu = splu(A.tocsc())
+                self._perm_c = None
+            else:
+                # Reuse the column ordering of the first factorization. It is applied
+                # to the rows as well to keep the diagonal for the pivoting.
+                if self._perm_c is None:
+                    self._perm_c = np.argsort(self._lu.perm_c)
+                p = self._perm_c
+                self._lu = splu(A[p, :][:, p].tocsc(), permc_spec="NATURAL")
+
+        elif self.solver == "mumps":
+            if analysis:
+                from mumps import DMumpsContext
+                if self._ctx is not None:
+                    self._ctx.destroy()
+                self._ctx = DMumpsContext()
+                self._ctx.set_silent()
+                self._ctx.set_centralized_sparse(A)
+                self._ctx.run(job=4) # analysis and factorization
+            else:
+                self._ctx.set_centralized_assembled_values(A.tocoo().data)
+                self._ctx.run(job=2) # factorization
+
+        else:
+            import cupy as cp
+            from cupyx.scipy.sparse.linalg import splu
+            self._lu = splu(cp.sparse.csr_matrix(A.astype(np.float64)))
+
+    def refactorize(self, A):
+        """Factorize a new matrix with the same sparsity pattern in place,
+        reusing the symbolic analysis.
+
+        Parameters:
+            A(COOTensor | CSRTensor): The new matrix.
+
+        Returns:
+            Factorization: self.
+        """
+        A = _canonical_scipy(A)
+        if _pattern_hash(A) != self.pattern:
+            raise ValueError("The sparsity pattern of the new matrix differs from "
+                             "that of the factorization.")
+        self._factorize(A, analysis=False)
+        return self
+
+    def _solve_numpy(self, b):
+        if self.solver == "scipy":
+            if self._perm_c is None:
+                return self._lu.solve(b)
+            x = np.empty_like(b, dtype=np.result_type(b, np.float64))
+            x[self._perm_c] = self._lu.solve(b[self._perm_c])
+            return x
+
+        elif self.solver == "mumps":
+            x = np.array(b, dtype=np.float64, copy=True)
+            columns = x.reshape(x.shape[0], -1).T.copy()
+            for col in columns:
+                self._ctx.set_rhs(col)
+                self._ctx.run(job=3) # solve
+            return columns.T.reshape(x.shape)
+
+        else:
+            import cupy as cp
+            return cp.asnumpy(self._lu.solve(cp.asarray(b)))
+
+    def solve(self, b, *, batch_first: bool=False):
+        """Solve the linear system with the factorized matrix.
+
+        Parameters:
+            b(Tensor): The right-hand side shaped (n,), or (n, k) for k right-hand sides.
+            batch_first(bool, optional): Whether the batch dimension of `b` is the
+                first dimension, i.e. `b` is shaped (k, n). Default is False.
+
+        Returns:
+            Tensor: The solution shaped as `b`.
+        """
+        b = bm.to_numpy(b)
+        if batch_first and b.ndim == 2:
+            b = b.T
+        if b.shape[0] != self.shape[0]:
+            raise ValueError(f"Incompatible shapes {self.shape} and {b.shape} "
+                             "of the matrix and the right-hand side.")
+        x = self._solve_numpy(b)
+        if batch_first and x.ndim == 2:
+            x = x.T
+        return bm.tensor(np.ascontiguousarray(x))
 
+    def __matmul__(self, b):
+        return self.solve(b)
+
+
+class FactorizationCache():
+    """Bounded LRU cache of factorizations, looked up by the identity of the
+    matrix first, and then by the hashes of its sparsity pattern and values.
+
+    A matrix with a cached pattern but new values is factorized for "scipy" by
+    reusing the column ordering (perm_c) of the cached one, see `Factorization`.
+    This is not a reuse of the symbolic factorization, which SuperLU does again
+    with the numeric one, and the other solvers factorize from scratch.
+
+    Parameters:
+        maxsize(int, optional): Maximum number of cached factorizations, and of
+            the matrices remembered by identity. Default is 8.
+
+    Note:
+        The identity lookup assumes that the values of a matrix are not modified
+        in place. Call `clear()` after doing so. A matrix is forgotten when it is
+        garbage collected or its factorization is evicted.
+    """
+    def __init__(self, maxsize: int=8):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._identity: OrderedDict[int, Tuple[weakref.ref, weakref.ref, tuple]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(size={len(self)}, maxsize={self.maxsize}, "
+                f"hits={self.hits}, misses={self.misses})")
+
+    def clear(self):
+        """Remove all cached factorizations."""
+        self._entries.clear()
+        self._identity.clear()
+
+    def _forget(self, ident: int, ref: weakref.ref) -> None:
+        """Remove the matrix collected by the garbage collector."""
+        item = self._identity.get(ident, None)
+        if (item is not None) and (item[0] is ref):
+            del self._identity[ident]
+
+    def _remember(self, A, key: tuple) -> None:
+        ident = id(A)
+        ref = weakref.ref(A, lambda r: self._forget(ident, r))
+        self._identity[ident] = (ref, weakref.ref(A.values()), key)
+        self._identity.move_to_end(ident)
+        while len(self._identity) > self.maxsize:
+            self._identity.popitem(last=False)
+
+    def _evict(self) -> None:
+        """Remove the least recently used factorizations beyond the size, and
+        the matrices mapped to them."""
+        evicted = set()
+        while len(self._entries) > self.maxsize:
+            evicted.add(self._entries.popitem(last=False)[0])
+        for ident in [i for i, item in self._identity.items() if item[2] in evicted]:
+            del self._identity[ident]
+
+    def _lookup_identity(self, A) -> Optional[tuple]:
+        item = self._identity.get(id(A), None)
+        if item is None:
+            return None
+        ref, values_ref, key = item
+        if (ref() is not A) or (values_ref() is not A.values()) or (key not in self._entries):
+            del self._identity[id(A)]
+            return None
+        return key
+
+    def get(self, A, solver: str="mumps") -> Factorization:
+        """Return the factorization of the matrix, factorizing it if not cached.
+
+        Parameters:
+            A(COOTensor | CSRTensor): The matrix.
+            solver(str): The solver to use. It can be "mumps", "scipy", or "cupy".
+
+        Returns:
+            Factorization: The factorization handle.
+        """
+        key = self._lookup_identity(A)
+
+        if key is None or key[0] != solver:
+            mat = _canonical_scipy(A)
+            pattern = _pattern_hash(mat)
+            key = (solver, pattern, _digest(mat.data))
+            if key not in self._entries:
+                self.misses += 1
+                self._entries[key] = self._new_factorization(mat, solver, pattern)
+                self._evict()
+            else:
+                self.hits += 1
+            self._remember(A, key)
+        else:
+            self.hits += 1
+            self._identity.move_to_end(id(A))
+
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def _new_factorization(self, mat, solver: str, pattern: str) -> Factorization:
+        symbolic = None
+        for (s, p, _), lu in reversed(self._entries.items()):
+            if (s == solver) and (p == pattern):
+                symbolic = lu
+                break
+        return Factorization(mat, solver, symbolic=symbolic)
+
+
+factorization_cache = FactorizationCache()
+
+
+def factorize(A:[COOTensor, CSRTensor], solver:str="mumps", *, cache:bool=True) -> Factorization:
+    """Factorize a sparse matrix for solving the linear systems repeatedly,
+    e.g. in implicit time-stepping.
+
+    Parameters:
+        A(COOTensor | CSRTensor): The square matrix.
+        solver(str): The solver to use. It can be "mumps", "scipy", or "cupy".
+        cache(bool, optional): Whether to look up and store the factorization in
+            `factorization_cache`. Default is True.
+
+    Returns:
+        Factorization: The handle with the method `solve(b)`.
+
+    Examples:
+        >>> lu = factorize(A, "scipy")
+        >>> for step in range(nt):
+        ...     x = lu.solve(M @ x + F)
+    """
+    if cache:
+        return factorization_cache.get(A, solver)
+    return Factorization(A, solver)
@@ -0,0 +1,341 @@
+
+from typing import Optional, Union, List, Tuple, Sequence, Callable, Literal
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import COOTensor, CSRTensor
+from .. import logger
+from .linear_operator import LinearOperator
+from .preconditioner import _expand
+from .multigrid import Multigrid, _Cycle, _Operator, csr_from_entries, canonical_csr, transpose
+
+
+### Transfer operators ###
+
+def _interval_prolongation(n: int, **kwargs):
+    """Entries of the linear interpolation from n cells to 2n cells of an interval."""
+    coarse = bm.arange(n + 1, **kwargs)
+    odd = 2 * bm.arange(n, **kwargs) + 1
+    row = bm.concat([2 * coarse, odd, odd], axis=0)
+    col = bm.concat([coarse, coarse[:-1], coarse[1:]], axis=0)
+    return row, col
+
+
+def structured_prolongation(shape: Sequence[int], *, dtype=None, device=None) -> CSRTensor:
+    """Prolongation of the bilinear (trilinear) interpolation on a structured grid
+    of `shape` cells to the grid refined once, where the nodes are numbered
+    lexicographically with the last axis running fastest.
+
+    Parameters:
+        shape (Sequence[int]): Number of cells along each axis of the coarse grid.
+
+    Returns:
+        CSRTensor: The prolongation matrix shaped (NN_fine, NN_coarse).
+    """
+    kwargs = {'dtype': bm.int64, 'device': device}
+    dtype = bm.float64 if dtype is None else dtype
+    row = bm.zeros((1,), **kwargs)
+    col = bm.zeros((1,), **kwargs)
+    val = bm.ones((1,), dtype=dtype, device=device)
+
+    for n in shape:
+        r, c = _interval_prolongation(n, **kwargs)
+        v = bm.concat([bm.ones((n + 1,), dtype=dtype, device=device),
+                       bm.full((2 * n,), 0.5, dtype=dtype, device=device)], axis=0)
+        row = (row[:, None] * (2 * n + 1) + r[None, :]).reshape(-1)
+        col = (col[:, None] * (n + 1) + c[None, :]).reshape(-1)
+        val = (val[:, None] * v[None, :]).reshape(-1)
+
+    NNf, NNc = 1, 1
+    for n in shape:
+        NNf *= 2 * n + 1
+        NNc *= n + 1
+    return csr_from_entries(row, col, val, (NNf, NNc))
+
+
+def nodal_prolongation(mesh) -> CSRTensor:
+    """Prolongation of the linear (bilinear) interpolation on the mesh to the mesh
+    uniformly refined once, where the new nodes are numbered after the old ones,
+    by edges and then by cells. This is the ordering of `uniform_refine` of
+    TriangleMesh, TetrahedronMesh and QuadrangleMesh.
+
+    Parameters:
+        mesh (TriangleMesh | TetrahedronMesh | QuadrangleMesh): The coarse mesh.
+
+    Returns:
+        CSRTensor: The prolongation matrix shaped (NN_fine, NN_coarse).
+    """
+    from ..mesh import QuadrangleMesh
+
+    NN = mesh.number_of_nodes()
+    NE = mesh.number_of_edges()
+    edge = bm.astype(mesh.entity('edge'), bm.int64)
+    kwargs = bm.context(edge)
+    context = {'dtype': mesh.ftype, 'device': bm.get_device(edge)}
+    new_edge_node = bm.arange(NN, NN + NE, **kwargs)
+
+    rows = [bm.arange(NN, **kwargs), new_edge_node, new_edge_node]
+    cols = [bm.arange(NN, **kwargs), edge[:, 0], edge[:, 1]]
+    vals = [bm.ones((NN,), **context), bm.full((2 * NE,), 0.5, **context)]
+    NNf = NN + NE
+
+    if isinstance(mesh, QuadrangleMesh):
+        NC = mesh.number_of_cells()
+        cell = bm.astype(mesh.entity('cell'), bm.int64)
+        rows.append(bm.repeat(bm.arange(NNf, NNf + NC, **kwargs), 4))
+        cols.append(cell.reshape(-1))
+        vals.append(bm.full((4 * NC,), 0.25, **context))
+        NNf += NC
+
+    return csr_from_entries(bm.concat(rows, axis=0), bm.concat(cols, axis=0),
+                            bm.concat(vals, axis=0), (NNf, NN))
+
+
+def mesh_hierarchy(mesh, n: int) -> Tuple[List, List[CSRTensor]]:
+    """Build a hierarchy of meshes by n uniform refinements, together with the
+    prolongations of the nodal (P1/Q1) functions between them. The input mesh
+    is not modified.
+
+    Parameters:
+        mesh (TriangleMesh | TetrahedronMesh | QuadrangleMesh | UniformMesh2d | UniformMesh3d):
+            The coarsest mesh.
+        n (int): Number of refinements.
+
+    Returns:
+        List[Mesh]: The n+1 meshes ordered from coarse to fine.
+        List[CSRTensor]: The n prolongations ordered from coarse to fine, where the
+        k-th one interpolates from the k-th mesh to the (k+1)-th mesh.
+    """
+    from ..mesh import (TriangleMesh, TetrahedronMesh, QuadrangleMesh,
+                        UniformMesh2d, UniformMesh3d)
+
+    meshes, prolongations = [mesh], []
+
+    for _ in range(n):
+        if isinstance(mesh, (UniformMesh2d, UniformMesh3d)):
+            shape = [mesh.nx, mesh.ny] if isinstance(mesh, UniformMesh2d) \
+                    else [mesh.nx, mesh.ny, mesh.nz]
+            P = structured_prolongation(shape, dtype=mesh.ftype, device=mesh.device)
+            mesh = mesh.__class__(
+                extent=[2 * e for e in mesh.extent], h=[h / 2 for h in mesh.h],
+                origin=mesh.origin, ipoints_ordering=mesh.ipoints_ordering,
+                flip_direction=mesh.flip_direction,
+                itype=mesh.itype, ftype=mesh.ftype, device=mesh.device
+            )
+        elif isinstance(mesh, (TriangleMesh, TetrahedronMesh, QuadrangleMesh)):
+            P = nodal_prolongation(mesh)
+            mesh = mesh.__class__(mesh.node, mesh.cell)
+            mesh.uniform_refine()
+        else:
+            raise TypeError(f"Geometric multigrid does not support {type(mesh).__name__}.")
+        meshes.append(mesh)
+        prolongations.append(P)
+
+    return meshes, prolongations
+
+
+### Matrix-free operators ###
+
+def _tridiag_apply(x: TensorLike, axis: int, diag: TensorLike, off: float) -> TensorLike:
+    """Apply a symmetric tridiagonal matrix with the diagonal `diag` and the
+    constant off-diagonal `off` along an axis of x."""
+    x = bm.moveaxis(x, axis, 0)
+    zero = bm.zeros_like(x[:1])
+    y = _expand(diag, x) * x + off * (bm.concat([zero, x[:-1]], axis=0) +
+                                      bm.concat([x[1:], zero], axis=0))
+    return bm.moveaxis(y, 0, axis)
+
+
+class StructuredLaplaceOperator(LinearOperator):
+    """Matrix-free stiffness matrix of the Laplacian discretized by the bilinear
+    (trilinear) elements on a UniformMesh2d (UniformMesh3d).
+
+    The stiffness matrix is the sum of Kronecker products of the 1-D stiffness
+    and mass matrices, e.g. K ⊗ M + M ⊗ K in 2-D, so it is applied by a few
+    tridiagonal products along the axes in O(N) time and memory.
+
+    Parameters:
+        mesh (UniformMesh2d | UniformMesh3d): The structured mesh.
+        dirichlet (bool, optional): Whether to apply the Dirichlet boundary
+            condition on the whole boundary in the same way as `DirichletBC`,
+            i.e. replacing the boundary rows and columns by those of the identity.
+            Defaults to True.
+
+    Examples:
+        >>> A = StructuredLaplaceOperator(mesh)
+        >>> x = cg(A, b, M=GeometricMultigrid.from_mesh(mesh0, 4, StructuredLaplaceOperator))
+    """
+    def __init__(self, mesh, *, dirichlet: bool=True):
+        if mesh.TD == 2:
+            cells, h = [mesh.nx, mesh.ny], mesh.h[:2]
+        else:
+            cells, h = [mesh.nx, mesh.ny, mesh.nz], mesh.h[:3]
+        kwargs = {'dtype': mesh.ftype, 'device': mesh.device}
+        self.grid = tuple(n + 1 for n in cells)
+        self.dirichlet = dirichlet
+        self.stiff, self.mass = [], []
+
+        for n, hi in zip(cells, h):
+            ends = bm.set_at(bm.zeros((n + 1,), **kwargs), [0, n], 1.)
+            # diagonals and off-diagonals of the 1-D stiffness and mass matrices
+            self.stiff.append(((2. - ends) / hi, -1. / hi))
+            self.mass.append(((4. - 2. * ends) * hi / 6., hi / 6.))
+
+        NN = 1
+        for m in self.grid:
+            NN *= m
+        if dirichlet:
+            interior = bm.zeros(self.grid, dtype=bm.bool, device=mesh.device)
+            index = tuple(slice(1, -1) for _ in self.grid)
+            self.interior = bm.set_at(interior, index, True).reshape(-1)
+        super().__init__((NN, NN), self._matvec_impl, dtype=mesh.ftype,
+                         rmatvec=self._matvec_impl, diagonal=self._diagonal_impl)
+
+    @property
+    def nnz(self) -> int:
+        """Number of non-zeros of the assembled matrix."""
+        if self.dirichlet:
+            inner = [m - 2 for m in self.grid]
+        else:
+            inner = list(self.grid)
+        nnz, nin = 1, 1
+        for m in inner:
+            nnz *= max(3 * m - 2, 0)
+            nin *= m
+        return nnz + self.shape[0] - (nin if self.dirichlet else self.shape[0])
+
+    def _apply(self, x: TensorLike) -> TensorLike:
+        GD = len(self.grid)
+        x = x.reshape(self.grid + tuple(x.shape[1:]))
+        y = bm.zeros_like(x)
+
+        for d in range(GD):
+            z = x
+            for axis in range(GD):
+                diag, off = self.stiff[axis] if axis == d else self.mass[axis]
+                z = _tridiag_apply(z, axis, diag, off)
+            y = y + z
+
+        return y.reshape((-1,) + tuple(x.shape[GD:]))
+
+    def _matvec_impl(self, x: TensorLike) -> TensorLike:
+        if not self.dirichlet:
+            return self._apply(x)
+        interior = _expand(self.interior, x)
+        y = self._apply(bm.where(interior, x, 0.))
+        return bm.where(interior, y, x)
+
+    def _diagonal_impl(self) -> TensorLike:
+        GD = len(self.grid)
+        diag = 0.
+        for d in range(GD):
+            z = self.stiff[0][0] if d == 0 else self.mass[0][0]
+            for axis in range(1, GD):
+                v = self.stiff[axis][0] if axis == d else self.mass[axis][0]
+                z = z[..., None] * v
+            diag = diag + z
+        diag = diag.reshape(-1)
+        if self.dirichlet:
+            diag = bm.where(self.interior, diag, 1.)
+        return diag
+
+
+### Solver ###
+
+class GeometricMultigrid(Multigrid):
+    """Geometric multigrid solver and preconditioner on a hierarchy of uniformly
+    refined meshes, where the transfer operators are the nodal interpolations
+    between the meshes.
+
+    The operators of the coarse levels are either the Galerkin products R A P of
+    the finest matrix, or given for every level, e.g. rediscretized on each mesh
+    or matrix-free like `StructuredLaplaceOperator`.
+
+    Parameters:
+        A (CSRTensor | COOTensor | Sequence): The matrix on the finest mesh, or the
+            operators of all levels ordered from coarse to fine. Operators given
+            as LinearOperators must provide `diagonal()`.
+        P (Sequence[CSRTensor]): The prolongations ordered from coarse to fine,
+            e.g. returned by `mesh_hierarchy`.
+        cycle ('V' | 'W' | 'F', optional): The cycle type. Defaults to 'V'.
+        smoother ('jacobi' | 'chebyshev', optional): The smoother. Defaults to 'jacobi'.
+        presmooth (int, optional): Number of pre-smoothing steps. Defaults to 1.
+        postsmooth (int, optional): Number of post-smoothing steps. Defaults to 1.
+
+    Examples:
+        >>> meshes, P = mesh_hierarchy(mesh, 4)
+        >>> gmg = GeometricMultigrid(A, P)   # A assembled on meshes[-1]
+        >>> x = cg(A, b, M=gmg)
+        >>> gmg = GeometricMultigrid.from_mesh(mesh, 4, StructuredLaplaceOperator)
+        >>> x = gmg.solve(b)
+
+    Note:
+        The levels are stored from fine to coarse in `A`, `P` and `R`, as in
+        other multigrid solvers.
+    """
+    def __init__(self, A: Union[CSRTensor, COOTensor, Sequence[_Operator]],
+                 P: Sequence[CSRTensor], *,
+                 cycle: _Cycle='V',
+                 smoother: Literal['jacobi', 'chebyshev']='jacobi',
+                 presmooth: int=1, postsmooth: int=1):
+        super().__init__(cycle=cycle, smoother=smoother, presmooth=presmooth,
+                         postsmooth=postsmooth, max_levels=len(P) + 1, coarse_size=0)
+        self.P = list(P)[::-1]
+        self.R = [transpose(P) for P in self.P]
+        self.meshes = None
+        self.update(A)
+
+    @classmethod
+    def from_mesh(cls, mesh, n: int, operator: Callable[..., _Operator], *,
+                  galerkin: bool=False, **kwargs) -> 'GeometricMultigrid':
+        """Build the geometric multigrid by n uniform refinements of the mesh.
+
+        Parameters:
+            mesh (Mesh): The coarsest mesh, see `mesh_hierarchy` for the supported types.
+            n (int): Number of refinements.
+            operator (Callable): A function returning the operator on a mesh.
+            galerkin (bool, optional): Whether to build the coarse operators by the
+                Galerkin products instead of calling `operator` on each mesh.
+                Defaults to False.
+            **kwargs: Other arguments of `GeometricMultigrid`.
+
+        Returns:
+            GeometricMultigrid: The solver, where the meshes ordered from coarse
+            to fine are stored in the attribute `meshes`.
+        """
+        meshes, P = mesh_hierarchy(mesh, n)
+        if galerkin:
+            A = operator(meshes[-1])
+        else:
+            A = [operator(m) for m in meshes]
+        gmg = cls(A, P, **kwargs)
+        gmg.meshes = meshes
+        return gmg
+
+    def setup(self, A: Union[CSRTensor, COOTensor]):
+        return self.update(A)
+
+    def update(self, A: Union[CSRTensor, COOTensor, Sequence[_Operator]]):
+        """Update the operators of all levels, reusing the transfer operators.
+        The argument is the same as `A` of the constructor."""
+        if isinstance(A, (list, tuple)):
+            if len(A) != len(self.P) + 1:
+                raise ValueError(f"Expected {len(self.P) + 1} level operators, "
+                                 f"but got {len(A)}.")
+            self.A = list(A)[::-1]
+        else:
+            A = canonical_csr(A)
+            self.A = [A]
+            for P, R in zip(self.P, self.R):
+                A = R @ (A @ P)
+                self.A.append(A)
+
+        for level, P in enumerate(self.P):
+            if (self.A[level].shape[0] != P.shape[0]) or (self.A[level + 1].shape[0] != P.shape[1]):
+                raise ValueError(f"Shape of the prolongation {P.shape} does not match the "
+                                 f"operators of the levels {level} and {level + 1}.")
+
+        self._setup_solvers()
+        if all(hasattr(A, 'nnz') for A in self.A):
+            logger.info(f"{self!r}: operator complexity {self.operator_complexity():.3f}.")
+        return self
@@ -1,5 +1,8 @@
 from ..backend import backend_manager as bm
 from ..sparse import COOTensor, CSRTensor
+from .. import logger
+from .preconditioner import as_preconditioner
+from ._krylov_utils import prepare_rhs, norm, dot, safe_div, make_info
 import numpy as np
 def _to_cupy_data(A, b, x0):
     """Convert the input tensors to cupy tensors.
@@ -59,34 +62,127 @@ def _cupy_solve(A, b, tol, x0, maxiter ,atol):
         x = cp.asnumpy(x)
     return x
 
-def _scipy_solve(A, b, tol, x0, maxiter, atol):
-    from scipy.sparse.linalg import gmres 
+def _scipy_solve(A, b, tol, x0, maxiter, atol, restart=None, M=None):
+    from scipy.sparse.linalg import gmres, LinearOperator as _SciPyOp
     from scipy.sparse import csr_matrix
 
     A = A.to_scipy()
     b = bm.to_numpy(b)
-    return gmres(A, b, x0=x0, maxiter=maxiter, atol=atol, rtol=tol)[0]
+    if M is not None:
+        prec = as_preconditioner(M)
+        M = _SciPyOp(A.shape, matvec=lambda r: bm.to_numpy(prec(bm.tensor(r))),
+                     dtype=A.dtype)
+    return gmres(A, b, x0=x0, maxiter=maxiter, atol=atol, rtol=tol,
+                 restart=restart, M=M)[0]
+
+
+def _fealpy_solve(A, b, tol, x0, maxiter, atol, restart, M):
+    """Restarted GMRES with right preconditioning, by the Arnoldi process with
+    modified Gram-Schmidt and Givens rotations. Scalars are shaped (batch,)
+    for the columns of b."""
+    b, x = prepare_rhs(b, x0, False)
+    M = as_preconditioner(M)
+    n_iter = 0
+    b_norm = norm(b)
+    threshold = max(atol, tol * b_norm)
+    r = b - A @ x
+    residuals = [norm(r)]
+    converged = residuals[0] < threshold
+
+    while not converged:
+        if (maxiter is not None) and (n_iter >= maxiter):
+            logger.info(f"GMRES: failed, stopped by maxiter ({maxiter}).")
+            break
+
+        beta = bm.sqrt(dot(r, r))
+        V = [safe_div(1., beta) * r]
+        g = [beta]
+        cs, sn, R = [], [], []
+
+        for j in range(restart):
+            w = A @ M(V[j])
+            h = []
+            for i in range(j + 1):
+                h.append(dot(V[i], w))
+                w = w - h[i] * V[i]
+            h_next = bm.sqrt(dot(w, w))
+            V.append(safe_div(1., h_next) * w)
+
+            for i in range(j):
+                h[i], h[i+1] = cs[i] * h[i] + sn[i] * h[i+1], -sn[i] * h[i] + cs[i] * h[i+1]
+            denom = bm.sqrt(h[j]**2 + h_next**2)
+            cs.append(safe_div(h[j], denom))
+            sn.append(safe_div(h_next, denom))
+            h[j] = cs[j] * h[j] + sn[j] * h_next
+            g.append(-sn[j] * g[j])
+            g[j] = cs[j] * g[j]
+            R.append(h)
+
+            n_iter += 1
+            residuals.append(norm(g[j+1]))
+            if residuals[-1] < threshold:
+                converged = True
+                break
+            if (maxiter is not None) and (n_iter >= maxiter):
+                break
+
+        # back substitution of the upper triangular system
+        m = len(R)
+        y = [None] * m
+        for i in range(m - 1, -1, -1):
+            acc = g[i]
+            for l in range(i + 1, m):
+                acc = acc - R[l][i] * y[l]
+            y[i] = safe_div(acc, R[i][i])
+        update = y[0] * V[0]
+        for i in range(1, m):
+            update = update + y[i] * V[i]
+        x = x + M(update)
+        r = b - A @ x
+
+    if converged:
+        logger.info(f"GMRES: converged in {n_iter} iterations.")
+
+    return x, make_info(n_iter, residuals, converged)
 
 
 def gmres(A:[COOTensor, CSRTensor], b, solver:str="scipy", 
-          tol=1e-5, x0=None, maxiter=None, atol=0.0):
+          tol=1e-5, x0=None, maxiter=None, atol=0.0, *,
+          restart: int=20, M=None, returninfo: bool=False):
     """Solve a linear system using a gmres solver.
 
     Parameters:
-        A(COOTensor | CSRTensor): The matrix of the linear system.
-        b(Tensor): The right-hand side.
-        solver(str): The solver to use. It can be "mumps", "scipy", or "cupy".
+        A(COOTensor | CSRTensor | LinearOperator): The matrix of the linear system.
+            LinearOperator is supported by the "scipy" and "fealpy" solvers.
+        b(Tensor): The right-hand side. The "fealpy" solver also accepts
+            a 2D tensor shaped (n, batch) for multiple right-hand sides.
+        solver(str): The solver to use. It can be "scipy", "cupy", or "fealpy",
+            the backend-agnostic implementation.
+        restart(int): Number of iterations between restarts. Defaults to 20.
+        M(Preconditioner | SupportsMatmul | Callable | None): The preconditioner
+            approximating the inverse of A. Not supported by the "cupy" solver.
+            Defaults to None.
+        returninfo(bool): Whether to return the iteration info, only supported by
+            the "fealpy" solver. Defaults to False.
 
     Returns:
         Tensor: The solution of the linear system.
+        dict: The info with keys 'iters', 'residuals' (estimated by the Givens
+            rotations) and 'converged'. Returned only if `returninfo` is True.
     """
+    if solver == "fealpy":
+        x, info = _fealpy_solve(A, b, tol=tol, x0=x0, maxiter=maxiter, atol=atol,
+                                restart=restart, M=M)
+        return (x, info) if returninfo else x
+    if returninfo:
+        raise ValueError(f"returninfo is not supported by the {solver} solver.")
     if solver == "scipy":
-        return bm.tensor(_scipy_solve(A, b, tol=tol, x0=x0, maxiter=maxiter, atol=atol))
+        return bm.tensor(_scipy_solve(A, b, tol=tol, x0=x0, maxiter=maxiter, atol=atol,
+                                      restart=restart, M=M))
     elif solver == "cupy":
+        if M is not None:
+            raise ValueError("Preconditioner is not supported by the cupy solver.")
         A = A.tocoo()
         return bm.tensor(_cupy_solve(A, b, tol=tol, x0=x0, maxiter=maxiter, atol=atol))
     else:
         raise ValueError(f"Unknown solver: {solver}")
-
-
-
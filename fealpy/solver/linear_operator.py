@@ -0,0 +1,91 @@
+
+from typing import Callable, Optional, Tuple
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+
+
+class LinearOperator():
+    """A linear operator defined by its action on vectors.
+
+    Linear operators can be used in the place of sparse matrices in iterative
+    solvers like `cg` and `gmres`, without constructing any global matrix.
+
+    Parameters:
+        shape (Tuple[int, int]): Shape of the operator.
+        matvec (Callable): The function computing `A @ x`, where `x` is shaped (n,)
+            or (n, k).
+        dtype (dtype | None, optional): Data type of the operator. Defaults to None.
+        rmatvec (Callable | None, optional): The function computing `A.T @ x`.
+            Defaults to None.
+        diagonal (Callable | None, optional): The function returning the diagonal
+            of the operator. Defaults to None.
+    """
+    def __init__(self, shape: Tuple[int, int], matvec: Callable[[TensorLike], TensorLike], *,
+                 dtype=None,
+                 rmatvec: Optional[Callable[[TensorLike], TensorLike]]=None,
+                 diagonal: Optional[Callable[[], TensorLike]]=None):
+        if len(shape) != 2:
+            raise ValueError(f"shape of linear operators must be 2-D, but got {shape}.")
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self._matvec = matvec
+        self._rmatvec = rmatvec
+        self._diagonal = diagonal
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(shape={self.shape})"
+
+    def matvec(self, x: TensorLike) -> TensorLike:
+        if x.shape[0] != self.shape[1]:
+            raise ValueError(f"Incompatible shapes {self.shape} and {tuple(x.shape)} "
+                             "in the linear operator multiplication.")
+        return self._matvec(x)
+
+    def rmatvec(self, x: TensorLike) -> TensorLike:
+        if self._rmatvec is None:
+            raise NotImplementedError(f"rmatvec is not defined for {self!r}.")
+        if x.shape[0] != self.shape[0]:
+            raise ValueError(f"Incompatible shapes {self.shape} and {tuple(x.shape)} "
+                             "in the transposed linear operator multiplication.")
+        return self._rmatvec(x)
+
+    def diagonal(self) -> TensorLike:
+        """Return the diagonal of the operator."""
+        if self._diagonal is None:
+            raise NotImplementedError(f"diagonal is not defined for {self!r}.")
+        return self._diagonal()
+
+    def __matmul__(self, x: TensorLike) -> TensorLike:
+        return self.matvec(x)
+
+    @property
+    def T(self) -> 'LinearOperator':
+        if self._rmatvec is None:
+            raise NotImplementedError(f"rmatvec is not defined for {self!r}.")
+        return LinearOperator(tuple(reversed(self.shape)), self._rmatvec,
+                              dtype=self.dtype, rmatvec=self._matvec,
+                              diagonal=self._diagonal)
+
+    def to_scipy(self):
+        """Wrap as a scipy LinearOperator, working on numpy arrays."""
+        import numpy as np
+        from scipy.sparse.linalg import LinearOperator as _LinearOperator
+
+        if self.dtype is None:
+            dtype = np.float64
+        else:
+            dtype = bm.to_numpy(bm.zeros((1,), dtype=self.dtype)).dtype
+
+        def matvec(x):
+            x = bm.from_numpy(np.ascontiguousarray(x, dtype=dtype))
+            return bm.to_numpy(self.matvec(x))
+
+        def rmatvec(x):
+            x = bm.from_numpy(np.ascontiguousarray(x, dtype=dtype))
+            return bm.to_numpy(self.rmatvec(x))
+
+        return _LinearOperator(
+            self.shape, matvec=matvec, matmat=matvec, dtype=dtype,
+            rmatvec=None if self._rmatvec is None else rmatvec
+        )
@@ -0,0 +1,131 @@
+from typing import Optional
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+
+from .. import logger
+from .conjugate_gradient import SupportsMatmul, _Precond
+from .preconditioner import as_preconditioner
+from ._krylov_utils import prepare_rhs, restore_shape, norm, dot, safe_div, make_info
+
+
+def minres(A: SupportsMatmul, b: TensorLike, x0: Optional[TensorLike]=None, *,
+           batch_first: bool=False,
+           atol: float=1e-12, rtol: float=1e-8,
+           maxiter: Optional[int]=10000,
+           M: Optional[_Precond]=None,
+           returninfo: bool=False):
+    """Solve a symmetric (possibly indefinite) linear system Ax = b using the
+    (Preconditioned) Minimal Residual (MINRES) method.
+
+    Parameters:
+        A (SupportsMatmul): The symmetric coefficient matrix of the linear system.
+        b (TensorLike): The right-hand side vector of the linear system, can be a 1D or 2D tensor.
+        x0 (TensorLike): Initial guess for the solution, a 1D or 2D tensor.\\
+        Must have the same shape as b when reshaped appropriately.
+        batch_first (bool, optional): Whether the batch dimension of `b` and `x0`\\
+        is the first dimension. Ignored if `b` is an 1-d tensor. Default is False.
+        atol (float, optional): Absolute tolerance for convergence. Default is 1e-12.
+        rtol (float, optional): Relative tolerance for convergence. Default is 1e-8.
+        maxiter (int, optional): Maximum number of iterations allowed. Default is 10000.
+        M (Preconditioner | SupportsMatmul | Callable | None, optional): The symmetric\\
+        positive-definite preconditioner approximating the inverse of A. Default is None.
+        returninfo (bool, optional): Whether to return the iteration info. Default is False.
+
+    Returns:
+        Tensor: The approximate solution to the system Ax = b.
+        dict: The info with keys 'iters', 'residuals' and 'converged'.\\
+        Returned only if `returninfo` is True.
+
+    Note:
+        The residual norms are the estimates from the Lanczos recurrence, measured in
+        the norm induced by M (the Euclidean norm if M is None). The relative tolerance
+        is measured against the right-hand side in the same norm.
+    """
+    b, x0 = prepare_rhs(b, x0, batch_first)
+    sol, info = _minres_impl(A, b, x0, as_preconditioner(M), atol, rtol, maxiter)
+    sol = restore_shape(sol, batch_first)
+
+    if returninfo:
+        return sol, info
+    return sol
+
+
+def _precond_norm(r: TensorLike, y: TensorLike) -> TensorLike:
+    beta2 = dot(r, y)
+    if bm.any(beta2 < 0):
+        raise ValueError("MINRES: the preconditioner is not positive-definite.")
+    return bm.sqrt(beta2)
+
+
+def _minres_impl(A: SupportsMatmul, b: TensorLike, x0: TensorLike, M, atol, rtol, maxiter):
+    # Paige-Saunders MINRES, with scalars shaped (batch,) for the columns.
+    x = x0
+    r1 = b - A @ x
+    y = M(r1)
+    beta = _precond_norm(r1, y)
+    b_norm = norm(_precond_norm(b, M(b)))
+    zero = beta * 0.
+
+    oldb, dbar, epsln, phibar = zero, zero, zero, beta
+    cs, sn = zero - 1., zero
+    w = bm.zeros_like(x)
+    w2 = w
+    r2 = r1
+    n_iter = 0
+    residuals = [norm(phibar)]
+    converged = residuals[0] < max(atol, rtol * b_norm)
+
+    while not converged:
+        if (maxiter is not None) and (n_iter >= maxiter):
+            logger.info(f"MINRES: failed, stopped by maxiter ({maxiter}).")
+            break
+
+        # Lanczos step
+        v = safe_div(1., beta) * y
+        y = A @ v
+        if n_iter >= 1:
+            y = y - safe_div(beta, oldb) * r1
+        alfa = dot(v, y)
+        y = y - safe_div(alfa, beta) * r2
+        r1 = r2
+        r2 = y
+        y = M(r2)
+        oldb = beta
+        beta = _precond_norm(r2, y)
+
+        # QR factorization of the tridiagonal matrix by plane rotations
+        oldeps = epsln
+        delta = cs * dbar + sn * alfa
+        gbar = sn * dbar - cs * alfa
+        epsln = sn * beta
+        dbar = -cs * beta
+        gamma = bm.sqrt(gbar**2 + beta**2)
+        cs = safe_div(gbar, gamma)
+        sn = safe_div(beta, gamma)
+        phi = cs * phibar
+        phibar = sn * phibar
+
+        # update the solution
+        w1 = w2
+        w2 = w
+        w = safe_div(1., gamma) * (v - oldeps * w1 - delta * w2)
+        x = x + phi * w
+
+        r_norm_new = norm(phibar)
+        residuals.append(r_norm_new)
+        n_iter += 1
+
+        if r_norm_new < atol:
+            logger.info(f"MINRES: converged in {n_iter} iterations, "
+                        "stopped by absolute tolerance.")
+            converged = True
+            break
+
+        if r_norm_new < rtol * b_norm:
+            logger.info(f"MINRES: converged in {n_iter} iterations, "
+                        "stopped by relative tolerance.")
+            converged = True
+            break
+
+    return x, make_info(n_iter, residuals, converged)
@@ -0,0 +1,337 @@
+
+from typing import Optional, Union, List, Literal
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import COOTensor, CSRTensor
+from .. import logger
+from .preconditioner import Preconditioner, _csr_entries, _diagonal, _expand
+from .linear_operator import LinearOperator
+from ._krylov_utils import prepare_rhs, restore_shape, norm, make_info
+
+_Cycle = Literal['V', 'W', 'F']
+_Operator = Union[CSRTensor, LinearOperator]
+
+
+### Sparse utilities ###
+
+def csr_from_entries(row: TensorLike, col: TensorLike, val: TensorLike,
+                     shape: tuple) -> CSRTensor:
+    """Build a CSRTensor from entries with unique (row, col) pairs,
+    sorting them by rows and columns."""
+    nrow, ncol = shape
+    keys = bm.astype(row, bm.int64) * ncol + bm.astype(col, bm.int64)
+    order = bm.argsort(keys)
+    row, col, val = row[order], col[order], val[order]
+    kwargs = bm.context(row)
+    crow = bm.searchsorted(row, bm.arange(nrow + 1, **kwargs))
+    return CSRTensor(bm.astype(crow, row.dtype), col, val, (nrow, ncol))
+
+
+def canonical_csr(A: Union[CSRTensor, COOTensor]) -> CSRTensor:
+    """Return the square matrix A as a CSRTensor with sorted unique entries."""
+    row, col, val, _ = _csr_entries(A)
+    n = A.shape[0]
+    kwargs = bm.context(row)
+    crow = bm.searchsorted(row, bm.arange(n + 1, **kwargs))
+    return CSRTensor(bm.astype(crow, row.dtype), col, val, (n, n))
+
+
+def transpose(A: CSRTensor) -> CSRTensor:
+    """Transpose of a CSRTensor."""
+    nrow, ncol = A.shape
+    return csr_from_entries(A.col(), A.row(), A.values(), (ncol, nrow))
+
+
+def inverse_diagonal(A: _Operator) -> TensorLike:
+    """Inverse of the diagonal of a CSRTensor, or of a LinearOperator providing
+    `diagonal()`. Zeros on the diagonal are mapped to zeros."""
+    if isinstance(A, CSRTensor):
+        diag = _diagonal(A.row(), A.col(), A.values(), A.shape[0])
+    else:
+        diag = A.diagonal()
+    return bm.where(diag == 0, 0., 1. / bm.where(diag == 0, 1., diag))
+
+
+def operator_dtype(A: _Operator):
+    """Data type of a CSRTensor or a LinearOperator."""
+    if isinstance(A, CSRTensor):
+        return A.values().dtype
+    return A.dtype
+
+
+def to_dense(A: _Operator) -> TensorLike:
+    """Dense matrix of a CSRTensor, or of a LinearOperator by applying it to
+    the identity matrix."""
+    if isinstance(A, CSRTensor):
+        return A.to_dense()
+    return A @ bm.eye(A.shape[1], dtype=A.dtype)
+
+
+def spectral_radius(A: _Operator, inv_diag: TensorLike, maxit: int=15) -> float:
+    """Estimate the spectral radius of D^{-1}A by power iterations."""
+    n = A.shape[0]
+    x = bm.astype(bm.random.rand(n), inv_diag.dtype)
+    x = x / bm.sqrt(bm.sum(x**2))
+    rho = 1.0
+
+    for _ in range(maxit):
+        y = inv_diag * (A @ x)
+        rho = float(bm.sqrt(bm.sum(y**2)))
+        if rho == 0.0:
+            return 1.0
+        x = y / rho
+
+    return rho
+
+
+### Smoothers ###
+
+class JacobiSmoother():
+    """Damped Jacobi smoother x <- x + ω D^{-1}(b - Ax).
+
+    Parameters:
+        A (CSRTensor | LinearOperator): The matrix of the level. Linear operators
+            must provide `diagonal()`.
+        omega (float | None, optional): The damping factor. If None, it is set to
+            4/(3ρ) with ρ the estimated spectral radius of D^{-1}A. Defaults to None.
+    """
+    def __init__(self, A: _Operator, omega: Optional[float]=None):
+        self.A = A
+        self.inv_diag = inverse_diagonal(A)
+        if omega is None:
+            omega = 4.0 / (3.0 * spectral_radius(A, self.inv_diag))
+        self.omega = omega
+
+    def smooth(self, x: Optional[TensorLike], b: TensorLike, steps: int) -> TensorLike:
+        scale = self.omega * _expand(self.inv_diag, b)
+        for _ in range(steps):
+            if x is None:
+                x = scale * b
+            else:
+                x = x + scale * (b - self.A @ x)
+        return bm.zeros_like(b) if x is None else x
+
+
+class ChebyshevSmoother():
+    """Chebyshev polynomial smoother on D^{-1}A, damping the eigenvalues
+    in [ρ/ratio, 1.1ρ], where ρ is the estimated spectral radius of D^{-1}A.
+
+    Parameters:
+        A (CSRTensor | LinearOperator): The matrix of the level. Linear operators
+            must provide `diagonal()`.
+        degree (int, optional): Degree of the polynomial. Defaults to 3.
+        ratio (float, optional): Ratio of the upper and lower bounds. Defaults to 30.
+    """
+    def __init__(self, A: _Operator, degree: int=3, ratio: float=30.0):
+        self.A = A
+        self.inv_diag = inverse_diagonal(A)
+        upper = 1.1 * spectral_radius(A, self.inv_diag)
+        self.bounds = (upper / ratio, upper)
+        self.degree = degree
+
+    def smooth(self, x: Optional[TensorLike], b: TensorLike, steps: int) -> TensorLike:
+        lower, upper = self.bounds
+        theta = (upper + lower) / 2
+        delta = (upper - lower) / 2
+        sigma = theta / delta
+        inv_diag = _expand(self.inv_diag, b)
+        if x is None:
+            x = bm.zeros_like(b)
+
+        for _ in range(steps):
+            r = inv_diag * (b - self.A @ x)
+            d = r / theta
+            rho = 1.0 / sigma
+            for _ in range(self.degree):
+                x = x + d
+                r = r - inv_diag * (self.A @ d)
+                rho_new = 1.0 / (2.0 * sigma - rho)
+                d = (rho_new * rho) * d + (2.0 * rho_new / delta) * r
+                rho = rho_new
+
+        return x
+
+
+_SMOOTHERS = {
+    'jacobi': JacobiSmoother,
+    'chebyshev': ChebyshevSmoother
+}
+
+
+### Multigrid ###
+
+class Multigrid(Preconditioner):
+    """Base class of multigrid methods on a hierarchy of CSR matrices, with the
+    coarse matrices built by the Galerkin products R A P, where R = P^T.
+
+    A multigrid object can be used as a standalone solver by `solve`, or as a
+    preconditioner for Krylov solvers such as `cg(A, b, M=mg)`, which applies
+    one cycle with the zero initial guess.
+
+    Subclasses implement `_coarsen(A, level)`, returning the prolongation
+    matrix from the next level, or None to stop coarsening.
+
+    Parameters:
+        cycle ('V' | 'W' | 'F', optional): The cycle type. Defaults to 'V'.
+        smoother ('jacobi' | 'chebyshev', optional): The smoother. Defaults to 'jacobi'.
+        presmooth (int, optional): Number of pre-smoothing steps. Defaults to 1.
+        postsmooth (int, optional): Number of post-smoothing steps. Defaults to 1.
+        max_levels (int, optional): Maximum number of levels. Defaults to 10.
+        coarse_size (int, optional): Stop coarsening when the size of the matrix
+            is not greater than this. The coarsest level is solved directly.
+            Defaults to 500.
+
+    Note:
+        The V-cycle and W-cycle are symmetric if the pre- and post-smoothing steps
+        are equal, and are therefore suitable for preconditioning `cg`.
+    """
+    def __init__(self, *, cycle: _Cycle='V',
+                 smoother: Literal['jacobi', 'chebyshev']='jacobi',
+                 presmooth: int=1, postsmooth: int=1,
+                 max_levels: int=10, coarse_size: int=500):
+        if cycle not in ('V', 'W', 'F'):
+            raise ValueError(f"Unknown cycle type '{cycle}', expected 'V', 'W' or 'F'.")
+        if smoother not in _SMOOTHERS:
+            raise ValueError(f"Unknown smoother '{smoother}', "
+                             f"expected one of {tuple(_SMOOTHERS)}.")
+        self.cycle = cycle
+        self.smoother = smoother
+        self.presmooth = presmooth
+        self.postsmooth = postsmooth
+        self.max_levels = max_levels
+        self.coarse_size = coarse_size
+        self.A: List[_Operator] = []
+        self.P: List[CSRTensor] = []
+        self.R: List[CSRTensor] = []
+
+    def _coarsen(self, A: CSRTensor, level: int) -> Optional[CSRTensor]:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        return len(self.A)
+
+    def __repr__(self) -> str:
+        sizes = ', '.join(str(A.shape[0]) for A in self.A)
+        return f"{self.__class__.__name__}(levels=[{sizes}], cycle='{self.cycle}')"
+
+    def setup(self, A: Union[CSRTensor, COOTensor]):
+        """Build the whole hierarchy for the matrix A."""
+        A = canonical_csr(A)
+        self.A, self.P, self.R = [A], [], []
+
+        while (len(self.A) < self.max_levels) and (A.shape[0] > self.coarse_size):
+            P = self._coarsen(A, len(self.A) - 1)
+            if (P is None) or (P.shape[1] == 0) or (P.shape[1] >= A.shape[0]):
+                break
+            R = transpose(P)
+            A = R @ (A @ P)
+            self.P.append(P)
+            self.R.append(R)
+            self.A.append(A)
+
+        self._setup_solvers()
+        logger.info(f"{self!r}: operator complexity {self.operator_complexity():.3f}.")
+        return self
+
+    def update(self, A: Union[CSRTensor, COOTensor]):
+        """Update the matrices of the hierarchy for a new matrix A, reusing the
+        prolongations, e.g. in time-stepping where the matrix changes its values
+        but keeps the structure. This is much cheaper than `setup`."""
+        A = canonical_csr(A)
+        if A.shape != self.A[0].shape:
+            raise ValueError(f"Shape of the new matrix {A.shape} does not match "
+                             f"that of the hierarchy {self.A[0].shape}.")
+        self.A = [A]
+        for P, R in zip(self.P, self.R):
+            A = R @ (A @ P)
+            self.A.append(A)
+
+        self._setup_solvers()
+        return self
+
+    def _setup_solvers(self):
+        A0 = self.A[0]
+        Smoother = _SMOOTHERS[self.smoother]
+        self.smoothers = [Smoother(A) for A in self.A[:-1]]
+        # NOTE: pinv also handles the singular coarsest matrix of pure Neumann problems.
+        self.coarse_inv = bm.linalg.pinv(to_dense(self.A[-1]))
+        Preconditioner.__init__(self, A0.shape[0], dtype=operator_dtype(A0))
+
+    def operator_complexity(self) -> float:
+        """Total number of non-zeros of all levels over that of the finest level.
+        Levels given as linear operators must provide the attribute `nnz`."""
+        return sum(A.nnz for A in self.A) / self.A[0].nnz
+
+    def grid_complexity(self) -> float:
+        """Total size of all levels over that of the finest level."""
+        return sum(A.shape[0] for A in self.A) / self.A[0].shape[0]
+
+    def _cycle(self, level: int, x: Optional[TensorLike], b: TensorLike,
+               cycle: _Cycle) -> TensorLike:
+        if level == len(self.A) - 1:
+            return self.coarse_inv @ b
+
+        A, P, R = self.A[level], self.P[level], self.R[level]
+        smoother = self.smoothers[level]
+        x = smoother.smooth(x, b, self.presmooth)
+        rc = R @ (b - A @ x)
+        ec = self._cycle(level + 1, None, rc, cycle)
+        if cycle == 'W':
+            ec = self._cycle(level + 1, ec, rc, 'W')
+        elif cycle == 'F':
+            ec = self._cycle(level + 1, ec, rc, 'V')
+        x = x + P @ ec
+        return smoother.smooth(x, b, self.postsmooth)
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        """Apply one cycle to Ae = r with the zero initial guess."""
+        return self._cycle(0, None, r, self.cycle)
+
+    def solve(self, b: TensorLike, x0: Optional[TensorLike]=None, *,
+              batch_first: bool=False,
+              atol: float=1e-12, rtol: float=1e-8,
+              maxiter: Optional[int]=100,
+              returninfo: bool=False):
+        """Solve Ax = b by repeated cycles.
+
+        Parameters:
+            b (TensorLike): The right-hand side, a 1D or 2D tensor.
+            x0 (TensorLike | None, optional): Initial guess. Defaults to None.
+            batch_first (bool, optional): Whether the batch dimension of `b` and `x0`
+                is the first dimension. Defaults to False.
+            atol (float, optional): Absolute tolerance of the residual norm. Defaults to 1e-12.
+            rtol (float, optional): Relative tolerance of the residual norm. Defaults to 1e-8.
+            maxiter (int, optional): Maximum number of cycles. Defaults to 100.
+            returninfo (bool, optional): Whether to return the iteration info. Defaults to False.
+
+        Returns:
+            Tensor: The approximate solution.
+            dict: The info with keys 'iters', 'residuals' and 'converged'.
+            Returned only if `returninfo` is True.
+        """
+        b, x = prepare_rhs(b, x0, batch_first)
+        A = self.A[0]
+        b_norm = norm(b)
+        r = b - A @ x
+        residuals = [norm(r)]
+        converged = residuals[0] < max(atol, rtol * b_norm)
+        n_iter = 0
+
+        while not converged:
+            if (maxiter is not None) and (n_iter >= maxiter):
+                logger.info(f"{self.__class__.__name__}: failed, "
+                            f"stopped by maxiter ({maxiter}).")
+                break
+            x = self._cycle(0, x, b, self.cycle)
+            r = b - A @ x
+            residuals.append(norm(r))
+            n_iter += 1
+            if residuals[-1] < max(atol, rtol * b_norm):
+                logger.info(f"{self.__class__.__name__}: converged in {n_iter} cycles.")
+                converged = True
+
+        x = restore_shape(x, batch_first)
+        if returninfo:
+            return x, make_info(n_iter, residuals, converged)
+        return x
@@ -0,0 +1,483 @@
+
+from typing import Optional, Callable, Union, List, Tuple
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+from ..sparse import COOTensor, CSRTensor
+from .. import logger
+from .linear_operator import LinearOperator
+
+_Level = Tuple[TensorLike, TensorLike, TensorLike, TensorLike]
+
+
+### Utilities ###
+
+def _expand(v: TensorLike, x: TensorLike) -> TensorLike:
+    """Reshape v shaped (n,) to be broadcast with x shaped (n, ...)."""
+    return bm.reshape(v, (-1,) + (1,) * (x.ndim - 1))
+
+
+def _csr_entries(A: Union[CSRTensor, COOTensor]):
+    """Return row, col, values and keys `row * n + col` of a square sparse matrix,
+    where the keys are sorted and unique."""
+    if isinstance(A, COOTensor):
+        A = A.coalesce().tocsr()
+    if not isinstance(A, CSRTensor):
+        raise TypeError(f"Preconditioners require a CSRTensor or COOTensor, but got {type(A).__name__}.")
+    if A.values() is None:
+        raise ValueError("Preconditioners require a sparse matrix with values.")
+    if A.dense_ndim != 0:
+        raise ValueError("Preconditioners do not support batched sparse matrices.")
+    n = A.shape[0]
+    if A.shape[1] != n:
+        raise ValueError(f"Preconditioners require a square matrix, but got shape {A.shape}.")
+
+    row, col, val = A.row(), A.col(), A.values()
+    keys = bm.astype(row, bm.int64) * n + bm.astype(col, bm.int64)
+
+    if (keys.shape[0] > 1) and (not bm.all(keys[1:] > keys[:-1])):
+        coo = COOTensor(bm.stack([row, col], axis=0), val, (n, n)).coalesce()
+        row, col = coo.indices()[0], coo.indices()[1]
+        val = coo.values()
+        keys = bm.astype(row, bm.int64) * n + bm.astype(col, bm.int64)
+
+    return row, col, val, keys
+
+
+def _diagonal(row: TensorLike, col: TensorLike, val: TensorLike, n: int) -> TensorLike:
+    flag = (row == col)
+    diag = bm.zeros((n,), **bm.context(val))
+    return bm.index_add(diag, row[flag], val[flag])
+
+
+def _gather_segments(ptr: TensorLike, segs: TensorLike):
+    """Return the positions in the segments [ptr[s], ptr[s+1]) for s in segs,
+    and the local id of the segments they belong to."""
+    start = ptr[segs]
+    counts = ptr[segs + 1] - start
+    total = int(bm.sum(counts))
+    kwargs = bm.context(ptr)
+    seg_id = bm.repeat(bm.arange(segs.shape[0], **kwargs), counts)
+    offset = bm.cumsum(counts, axis=0) - counts
+    pos = bm.repeat(start - offset, counts) + bm.arange(total, **kwargs)
+    return pos, seg_id
+
+
+def _level_schedule(row: TensorLike, col: TensorLike, n: int) -> List[TensorLike]:
+    """Group the rows of a triangular matrix into levels, where an off-diagonal entry
+    (row, col) means that `row` depends on `col`. Rows in a level only depend on
+    rows in the previous levels, so they can be solved at the same time."""
+    kwargs = bm.context(row)
+    order = bm.argsort(col)
+    dep_ptr = bm.searchsorted(col[order], bm.arange(n + 1, **kwargs))
+    dependents = row[order]
+    indegree = bm.zeros((n,), **kwargs)
+    indegree = bm.index_add(indegree, row, bm.ones_like(row))
+    frontier = bm.nonzero(indegree == 0)[0]
+    levels = []
+    nrow = 0
+
+    while frontier.shape[0] > 0:
+        levels.append(frontier)
+        nrow += frontier.shape[0]
+        pos, _ = _gather_segments(dep_ptr, frontier)
+        if pos.shape[0] == 0:
+            break
+        targets = dependents[pos]
+        indegree = bm.index_add(indegree, targets, -bm.ones_like(targets))
+        targets = bm.unique(targets)
+        frontier = targets[indegree[targets] == 0]
+
+    if nrow != n:
+        raise RuntimeError("Failed to schedule the triangular solve, "
+                           "the matrix may not be triangular.")
+    return levels
+
+
+class _TriangularSolver():
+    """Level-scheduled solver of a sparse triangular system.
+
+    Parameters:
+        row, col, val (Tensor): Off-diagonal entries of the triangular matrix.
+        diag (Tensor | None): Diagonal of the matrix. None for the unit diagonal.
+        n (int): Size of the matrix.
+    """
+    def __init__(self, row: TensorLike, col: TensorLike, val: TensorLike,
+                 diag: Optional[TensorLike], n: int):
+        self.diag = diag
+        kwargs = bm.context(row)
+        order = bm.argsort(row)
+        row, col, val = row[order], col[order], val[order]
+        ptr = bm.searchsorted(row, bm.arange(n + 1, **kwargs))
+        self.levels: List[_Level] = []
+
+        for rows in _level_schedule(row, col, n):
+            pos, seg_id = _gather_segments(ptr, rows)
+            self.levels.append((rows, seg_id, col[pos], val[pos]))
+
+    def __len__(self):
+        return len(self.levels)
+
+    def solve(self, b: TensorLike) -> TensorLike:
+        x = bm.zeros_like(b)
+
+        for rows, seg_id, cols, vals in self.levels:
+            rhs = b[rows]
+            if cols.shape[0] > 0:
+                prod = _expand(vals, b) * x[cols]
+                rhs = rhs - bm.index_add(bm.zeros_like(rhs), seg_id, prod, axis=0)
+            if self.diag is not None:
+                rhs = rhs / _expand(self.diag[rows], b)
+            x = bm.set_at(x, rows, rhs)
+
+        return x
+
+
+def as_preconditioner(M) -> Callable[[TensorLike], TensorLike]:
+    """Return the function applying the preconditioner `M` to residuals.
+
+    `M` can be None (no preconditioning), any object supporting `M @ r` such as
+    `Preconditioner`, `LinearOperator` or an explicit sparse approximate inverse,
+    or a callable receiving the residual.
+    """
+    if M is None:
+        return lambda r: r
+    if hasattr(M, '__matmul__'):
+        return lambda r: M @ r
+    if callable(M):
+        return M
+    raise TypeError(f"Unsupported preconditioner type {type(M).__name__}.")
+
+
+### Preconditioners ###
+
+class Preconditioner(LinearOperator):
+    """Base class of preconditioners, applying the approximate inverse of a matrix
+    to residuals shaped (n,) or (n, k) by `M @ r`.
+
+    Subclasses implement `apply(r)`.
+    """
+    def __init__(self, n: int, dtype=None):
+        super().__init__((n, n), self.apply, dtype=dtype)
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        raise NotImplementedError
+
+
+class JacobiPreconditioner(Preconditioner):
+    """Jacobi (diagonal) preconditioner.
+
+    Parameters:
+        A (CSRTensor | COOTensor): The matrix.
+    """
+    def __init__(self, A: Union[CSRTensor, COOTensor], /):
+        row, col, val, _ = _csr_entries(A)
+        n = A.shape[0]
+        diag = _diagonal(row, col, val, n)
+        if bm.any(diag == 0):
+            raise ValueError("Jacobi preconditioner requires a non-zero diagonal.")
+        self.inv_diag = 1.0 / diag
+        super().__init__(n, dtype=val.dtype)
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        return r * _expand(self.inv_diag, r)
+
+
+class BlockJacobiPreconditioner(Preconditioner):
+    """Block-Jacobi preconditioner, inverting the diagonal blocks of the matrix.
+
+    Parameters:
+        A (CSRTensor | COOTensor): The matrix.
+        block_size (int | None, optional): Size of contiguous blocks, e.g. the number
+            of components of vector-valued dofs ordered by nodes. Defaults to None.
+        blocks (Tensor | None, optional): Dofs in each block, shaped (NB, block_size),
+            which should cover all the dofs once. Used if `block_size` is None.
+            Defaults to None.
+    """
+    def __init__(self, A: Union[CSRTensor, COOTensor], /,
+                 block_size: Optional[int]=None, *,
+                 blocks: Optional[TensorLike]=None):
+        row, col, val, _ = _csr_entries(A)
+        n = A.shape[0]
+        kwargs = bm.context(row)
+
+        if blocks is None:
+            if block_size is None:
+                raise ValueError("Either block_size or blocks should be given.")
+            if n % block_size != 0:
+                raise ValueError(f"Size of the matrix ({n}) is not divisible by "
+                                 f"the block size ({block_size}).")
+            blocks = bm.reshape(bm.arange(n, **kwargs), (-1, block_size))
+        elif blocks.shape[0] * blocks.shape[1] != n:
+            raise ValueError("blocks should cover all the dofs once.")
+
+        NB, BS = blocks.shape
+        block_id = bm.zeros((n,), **kwargs)
+        block_id = bm.set_at(block_id, blocks.reshape(-1),
+                             bm.repeat(bm.arange(NB, **kwargs), BS))
+        local_id = bm.zeros((n,), **kwargs)
+        local_id = bm.set_at(local_id, blocks.reshape(-1),
+                             bm.reshape(bm.broadcast_to(bm.arange(BS, **kwargs), (NB, BS)), (-1,)))
+
+        flag = block_id[row] == block_id[col]
+        index = (block_id[row] * BS + local_id[row]) * BS + local_id[col]
+        data = bm.zeros((NB * BS * BS,), **bm.context(val))
+        data = bm.index_add(data, index[flag], val[flag])
+
+        self.blocks = blocks
+        self.inv_blocks = bm.linalg.inv(bm.reshape(data, (NB, BS, BS)))
+        super().__init__(n, dtype=val.dtype)
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        rb = r[self.blocks] # (NB, BS, ...)
+        zb = bm.einsum('bij, bj... -> bi...', self.inv_blocks, rb)
+        return bm.set_at(bm.zeros_like(r), self.blocks, zb)
+
+
+class SSORPreconditioner(Preconditioner):
+    """Symmetric successive over-relaxation (SSOR) preconditioner,
+    M = ω/(2-ω) (D/ω + L) (D/ω)^{-1} (D/ω + U).
+
+    Parameters:
+        A (CSRTensor | COOTensor): The matrix.
+        omega (float, optional): The relaxation factor in (0, 2). Defaults to 1.0,
+            the symmetric Gauss-Seidel.
+    """
+    def __init__(self, A: Union[CSRTensor, COOTensor], /, omega: float=1.0):
+        if not (0.0 < omega < 2.0):
+            raise ValueError(f"omega should be in (0, 2), but got {omega}.")
+        row, col, val, _ = _csr_entries(A)
+        n = A.shape[0]
+        self.omega = omega
+        self.scaled_diag = _diagonal(row, col, val, n) / omega
+
+        lower, upper = row > col, row < col
+        self.lower = _TriangularSolver(row[lower], col[lower], val[lower], self.scaled_diag, n)
+        self.upper = _TriangularSolver(row[upper], col[upper], val[upper], self.scaled_diag, n)
+        super().__init__(n, dtype=val.dtype)
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        y = self.lower.solve(r)
+        y = y * _expand(self.scaled_diag, y)
+        z = self.upper.solve(y)
+        return z * ((2.0 - self.omega) / self.omega)
+
+
+class ILU0Preconditioner(Preconditioner):
+    """Incomplete LU factorization without fill-in, ILU(0), A ≈ LU where L is unit
+    lower triangular and U is upper triangular, both on the sparsity pattern of A.
+
+    The factors are computed by the fixed-point sweeps of Chow and Patel, which
+    update all entries at the same time and converge to the exact ILU(0) factors
+    in as many sweeps as the longest chain of dependencies in the pattern, but
+    usually much faster to the rounding. Triangular solves are scheduled by levels.
+
+    Parameters:
+        A (CSRTensor | COOTensor): The matrix, with all the diagonal entries stored.
+        sweeps (int | None, optional): Number of sweeps. If None, sweep until the
+            factors stop changing, at most `MAX_SWEEPS` sweeps, and a warning is
+            logged if they are still changing. Defaults to None.
+
+    Attributes:
+        sweeps (int): Number of the sweeps done.
+        converged (bool): Whether the factors stopped changing. Always True if
+            the number of sweeps is given.
+    """
+    MAX_SWEEPS = 100
+
+    def __init__(self, A: Union[CSRTensor, COOTensor], /, sweeps: Optional[int]=None):
+        row, col, val, keys = _csr_entries(A)
+        n = A.shape[0]
+        kwargs = bm.context(row)
+        diag_keys = bm.arange(n, dtype=bm.int64, device=bm.get_device(keys)) * (n + 1)
+        diag_pos = bm.searchsorted(keys, diag_keys)
+        if bm.any(diag_pos >= keys.shape[0]) or \
+            bm.any(keys[bm.clip(diag_pos, 0, keys.shape[0] - 1)] != diag_keys):
+            raise ValueError("Incomplete factorizations require all the diagonal "
+                             "entries stored in the sparsity pattern.")
+        crow = bm.searchsorted(row, bm.arange(n + 1, **kwargs))
+
+        # Products l_ik * u_kj updating the entry (i, j), where k < min(i, j).
+        lower_pos = bm.nonzero(row > col)[0]
+        # The strict upper part of row k is [diag_pos[k] + 1, crow[k + 1]).
+        upper_ptr = bm.stack([bm.astype(diag_pos + 1, crow.dtype), crow[1:]], axis=1)
+        q, seg = _gather_segments(upper_ptr.reshape(-1), 2 * col[lower_pos])
+        p = lower_pos[seg]
+        target = bm.astype(row[p], bm.int64) * n + bm.astype(col[q], bm.int64)
+        t = bm.clip(bm.searchsorted(keys, target), 0, keys.shape[0] - 1)
+        flag = keys[t] == target
+        p, q, t = p[flag], q[flag], t[flag]
+
+        is_lower = row > col
+        F = bm.where(is_lower, val / val[diag_pos[col]], val)
+        max_sweeps = self.MAX_SWEEPS if sweeps is None else sweeps
+        tol = 1e-12 * float(bm.max(bm.abs(val)))
+        n_sweeps = 0
+        converged = sweeps is not None
+
+        for n_sweeps in range(1, max_sweeps + 1):
+            s = bm.index_add(bm.zeros_like(val), t, F[p] * F[q])
+            new_F = val - s
+            new_F = bm.where(is_lower, new_F / F[diag_pos[col]], new_F)
+            change = float(bm.max(bm.abs(new_F - F)))
+            F = new_F
+            if (sweeps is None) and (change <= tol):
+                converged = True
+                break
+
+        if converged:
+            logger.info(f"{self.__class__.__name__}: factorized in {n_sweeps} sweeps.")
+        else:
+            logger.warning(f"{self.__class__.__name__}: the factors are still changing "
+                           f"by {change:.3e} after {n_sweeps} sweeps, so they are not "
+                           "the exact ILU(0) factors.")
+        self.sweeps = n_sweeps
+        self.converged = converged
+        self.factor = F
+        self._setup_solvers(row, col, F, diag_pos, n)
+        super().__init__(n, dtype=val.dtype)
+
+    def _setup_solvers(self, row, col, F, diag_pos, n):
+        lower, upper = row > col, row < col
+        self.lower = _TriangularSolver(row[lower], col[lower], F[lower], None, n)
+        self.upper = _TriangularSolver(row[upper], col[upper], F[upper], F[diag_pos], n)
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        return self.upper.solve(self.lower.solve(r))
+
+
+class IC0Preconditioner(ILU0Preconditioner):
+    """Incomplete Cholesky factorization without fill-in, IC(0), A ≈ L D L^T
+    for symmetric matrices, where L and D are taken from ILU(0).
+
+    Different from ILU(0), the preconditioner is exactly symmetric, so it is
+    suitable for the preconditioned conjugate gradient method.
+
+    Parameters:
+        A (CSRTensor | COOTensor): The symmetric positive-definite matrix.
+        sweeps (int | None, optional): Number of sweeps of the factorization,
+            see `ILU0Preconditioner`. Defaults to None.
+    """
+    def _setup_solvers(self, row, col, F, diag_pos, n):
+        lower = row > col
+        diag = F[diag_pos]
+        if bm.any(diag <= 0):
+            raise ValueError("IC(0) breaks down with non-positive pivots, "
+                             "the matrix may not be positive-definite.")
+        lrow, lcol, lval = row[lower], col[lower], F[lower]
+        self.lower = _TriangularSolver(lrow, lcol, lval, None, n)
+        # U = D L^T
+        self.upper = _TriangularSolver(lcol, lrow, lval * diag[lcol], diag, n)
+
+
+class AdditiveSchwarzPreconditioner(Preconditioner):
+    """Overlapping additive Schwarz preconditioner, M = Σ R_i^T A_i^{-1} R_i, where
+    A_i = R_i A R_i^T is the restriction of the matrix to the DoFs of the i-th
+    subdomain, factorized exactly.
+
+    Parameters:
+        A (CSRTensor | COOTensor): The matrix.
+        subdomains (Sequence[Tensor]): Global DoFs of each subdomain, overlapping,
+            e.g. by `MeshPartition.subdomain_dofs`. They should cover all the DoFs.
+        restricted (bool, optional): Whether to use the restricted additive Schwarz
+            (RAS) method, adding the local corrections to the owned DoFs only,
+            which converges faster but is not symmetric. Defaults to False.
+        owner (Tensor | None, optional): The subdomain owning each DoF in shape (n,),
+            used by the restricted method. Defaults to None, the last subdomain
+            containing the DoF.
+        coarse (bool, optional): Whether to add the coarse correction of the
+            Nicolaides space Z, spanned by the partition of unity of the subdomains,
+            in the balanced form P = Q + (I - QA) M (I - AQ) with Q = Z A_0^{-1} Z^T
+            and A_0 = Z^T A Z. Defaults to False.
+        solver (str, optional): The direct solver of the subdomain problems,
+            see `factorize`. Defaults to 'scipy'.
+
+    Examples:
+        >>> dofs = MeshPartition(mesh, 8, overlap=1).subdomain_dofs(space)
+        >>> M = AdditiveSchwarzPreconditioner(A, dofs, coarse=True)
+        >>> x = cg(A, b, M=M)
+
+    Note:
+        The symmetric method suits `cg`, and the restricted one `gmres`. Without
+        the coarse space the iterations grow with the number of subdomains.
+    """
+    def __init__(self, A: Union[CSRTensor, COOTensor], /, subdomains, *,
+                 restricted: bool=False, owner: Optional[TensorLike]=None,
+                 coarse: bool=False, solver: str='scipy'):
+        from .direct_solver import factorize
+
+        row, col, val, _ = _csr_entries(A)
+        n = A.shape[0]
+        kwargs = bm.context(row)
+        super().__init__(n, dtype=val.dtype)
+        self.subdomains = [bm.astype(dofs, row.dtype) for dofs in subdomains]
+        NS = len(self.subdomains)
+        if NS == 0:
+            raise ValueError("At least one subdomain should be given.")
+
+        if owner is None:
+            owner = bm.full((n,), -1, **kwargs)
+            for i, dofs in enumerate(self.subdomains):
+                owner = bm.set_at(owner, dofs, i)
+            if bm.any(owner < 0):
+                raise ValueError("The subdomains do not cover all the DoFs.")
+        self.owner = bm.astype(owner, row.dtype)
+        self.restricted = restricted
+
+        self.factors = []
+        self.masks = []
+        g2l = bm.full((n,), -1, **kwargs)
+        for i, dofs in enumerate(self.subdomains):
+            m = dofs.shape[0]
+            g2l = bm.set_at(g2l, dofs, bm.arange(m, **kwargs))
+            lrow, lcol = g2l[row], g2l[col]
+            flag = (lrow >= 0) & (lcol >= 0)
+            local = COOTensor(bm.stack([lrow[flag], lcol[flag]], axis=0), val[flag], (m, m))
+            self.factors.append(factorize(local, solver, cache=False))
+            self.masks.append(self.owner[dofs] == i)
+            g2l = bm.set_at(g2l, dofs, -1)
+
+        self.coarse = None
+        if coarse:
+            # Z[dof, i] = 1 / (number of the subdomains containing dof)
+            zdof = bm.concat(self.subdomains)
+            zsub = bm.concat([bm.full((d.shape[0],), i, **kwargs)
+                              for i, d in enumerate(self.subdomains)])
+            mult = bm.index_add(bm.zeros((n,), **bm.context(val)), zdof,
+                                bm.ones(zdof.shape, **bm.context(val)))
+            self.zdof, self.zsub = zdof, zsub
+            self.zweight = 1.0 / mult[zdof]
+            self.matrix = A if isinstance(A, CSRTensor) else A.tocsr()
+            eye = bm.eye(NS, **bm.context(val))
+            A0 = bm.stack([self._restrict(self.matrix @ self._prolong(eye[i]))
+                           for i in range(NS)], axis=1)
+            self.coarse = bm.linalg.inv(A0)
+
+    def number_of_subdomains(self) -> int:
+        return len(self.subdomains)
+
+    def _restrict(self, r: TensorLike) -> TensorLike:
+        NS = len(self.subdomains)
+        r0 = bm.zeros((NS,) + r.shape[1:], **bm.context(r))
+        return bm.index_add(r0, self.zsub, _expand(self.zweight, r) * r[self.zdof])
+
+    def _prolong(self, r0: TensorLike) -> TensorLike:
+        r = bm.zeros((self.shape[0],) + r0.shape[1:], **bm.context(r0))
+        return bm.index_add(r, self.zdof, _expand(self.zweight, r0) * r0[self.zsub])
+
+    def _local(self, r: TensorLike) -> TensorLike:
+        z = bm.zeros_like(r)
+        for dofs, lu, mask in zip(self.subdomains, self.factors, self.masks):
+            x = bm.astype(lu.solve(r[dofs]), r.dtype)
+            if self.restricted:
+                dofs, x = dofs[mask], x[mask]
+            z = bm.index_add(z, dofs, x)
+        return z
+
+    def apply(self, r: TensorLike) -> TensorLike:
+        if self.coarse is None:
+            return self._local(r)
+        Q = lambda v: self._prolong(self.coarse @ self._restrict(v))
+        q = Q(r)
+        z = self._local(r - self.matrix @ q)
+        return q + z - Q(self.matrix @ z)
@@ -17,97 +17,133 @@ def _shape_check(spshape1: _Size, spshape2: _Size):
                         f"got shape {spshape1} and {spshape2}.")
 
 
-def spspmm_coo(indices1: _DT, values1: _DT, spshape1: _Size,
-               indices2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _Size]:
-    _shape_check(spshape1, spshape2)
+# Maximum number of the intermediate products computed at a time.
+_PRODUCT_BLOCK_SIZE = 1 << 22
+
 
+def _check_structure(values1: _DT, values2: _DT):
     structure = values1.shape[:-1]
     if values2.shape[:-1] != structure:
         raise ValueError(f"the dense shape of matrix2 ({values2.shape[:-1]}) "
                          f"must match that of matrix1 {structure}")
 
-    size = spshape1[1]
-    indices_list = []
-    values_list = []
 
-    for i in range(size):
-        left_col_flag = (indices1[1, :] == i)
+def _row_of_crow(crow: _DT) -> _DT:
+    """Return the row index of each non-zero element from crow."""
+    nrow = crow.shape[0] - 1
+    counts = crow[1:] - crow[:-1]
+    return bm.repeat(bm.arange(nrow, **bm.context(crow)), counts)
+
+
+def _coo_to_csr(indices: _DT, values: _DT, nrow: int):
+    """Sort the COO entries by rows, returning crow, col and values."""
+    order = bm.argsort(indices[0])
+    row = indices[0, order]
+    crow = bm.searchsorted(row, bm.arange(nrow + 1, **bm.context(row)))
+    return bm.astype(crow, indices.dtype), indices[1, order], values[..., order]
+
+
+def _spgemm_block(crow1: _DT, col1: _DT, values1: _DT, row_start: int, row_stop: int,
+                  crow2: _DT, col2: _DT, values2: _DT, ncol: int):
+    """Multiply the rows [row_start, row_stop) of matrix1 with matrix2,
+    by expanding all the products, sorting them by keys and summing up duplicates."""
+    kwargs = bm.context(col1)
+    k0, k1 = int(crow1[row_start]), int(crow1[row_stop])
+    row = _row_of_crow(crow1[row_start:row_stop+1] - k0)
+    mid = col1[k0:k1]
+    counts = crow2[mid + 1] - crow2[mid] # number of products of each non-zero in matrix1
+    nprod = int(bm.sum(counts))
+    nrow = row_stop - row_start
+
+    if nprod == 0:
+        crow = bm.zeros((nrow + 1,), **kwargs)
+        return crow, bm.empty((0,), **kwargs), values1[..., :0]
+
+    # Indices of the left and right factors of each product.
+    left = bm.repeat(bm.arange(k1 - k0, **kwargs), counts)
+    offset = bm.cumsum(counts, axis=0) - counts
+    right = bm.arange(nprod, **kwargs) - bm.repeat(offset, counts) \
+            + bm.repeat(crow2[mid], counts)
+
+    keys = bm.astype(row[left], bm.int64) * ncol + bm.astype(col2[right], bm.int64)
+    prod = values1[..., k0 + left] * values2[..., right]
+
+    order = bm.argsort(keys)
+    keys = keys[order]
+    is_head = bm.concat([bm.ones((1,), dtype=bm.bool, device=bm.get_device(keys)),
+                         keys[1:] != keys[:-1]], axis=0)
+    inverse = bm.cumsum(bm.astype(is_head, bm.int64), axis=0) - 1
+    keys = keys[is_head]
+    values = bm.zeros(prod.shape[:-1] + (keys.shape[0],), **bm.context(prod))
+    values = bm.index_add(values, inverse, prod[..., order], axis=-1)
+
+    row_out = keys // ncol
+    crow = bm.searchsorted(row_out, bm.arange(nrow + 1, dtype=bm.int64,
+                                              device=bm.get_device(keys)))
+    return bm.astype(crow, col1.dtype), bm.astype(keys % ncol, col1.dtype), values
+
+
+def _spgemm_csr(crow1: _DT, col1: _DT, values1: _DT, crow2: _DT, col2: _DT,
+                values2: _DT, nrow: int, ncol: int):
+    """Vectorized sort-based SpGEMM, processing blocks of rows of matrix1 so that
+    the number of intermediate products in each block is bounded."""
+    counts = crow2[col1 + 1] - crow2[col1]
+    cum = bm.concat([bm.zeros((1,), **bm.context(counts)), bm.cumsum(counts, axis=0)], axis=0)
+    row_cum = cum[crow1] # number of products before each row
+    crow_list, col_list, values_list = [], [], []
+    nnz = 0
+    row_start = 0
+
+    while row_start < nrow:
+        target = row_cum[row_start:row_start+1] + _PRODUCT_BLOCK_SIZE
+        row_stop = int(bm.searchsorted(row_cum, target, side='right')[0]) - 1
+        row_stop = min(max(row_stop, row_start + 1), nrow)
+        crow, col, values = _spgemm_block(crow1, col1, values1, row_start, row_stop,
+                                          crow2, col2, values2, ncol)
+        crow_list.append(crow[:-1] + nnz)
+        col_list.append(col)
+        values_list.append(values)
+        nnz += col.shape[0]
+        row_start = row_stop
+
+    if nrow == 0:
+        col_list.append(bm.empty((0,), **bm.context(col1)))
+        values_list.append(values1[..., :0])
+    crow_list.append(bm.tensor([nnz], **bm.context(col1)))
+
+    return (bm.concat(crow_list, axis=0), bm.concat(col_list, axis=0),
+            bm.concat(values_list, axis=-1))
 
-        if not bm.any(left_col_flag, axis=0):
-            continue
 
-        right_row_flag = (indices2[0, :] == i)
-
-        if not bm.any(right_row_flag, axis=0):
-            continue
-
-        row = indices1[0, left_col_flag]
-        col = indices2[1, right_row_flag]
-        nnz = col.shape[0] * row.shape[0]
-        idx = bm.meshgrid(row, col, indexing='ij')
-        idx = bm.reshape(bm.stack(idx, axis=0), (2, nnz))
-        val1 = values1[..., left_col_flag]
-        val2 = values2[..., right_row_flag]
+def spspmm_coo(indices1: _DT, values1: _DT, spshape1: _Size,
+               indices2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _Size]:
+    """Sparse-sparse matrix multiplication of COO matrices, with batch support
+    on the dense dimensions of values. The output indices are coalesced."""
+    _shape_check(spshape1, spshape2)
+    _check_structure(values1, values2)
+    nrow, ncol = spshape1[0], spshape2[1]
 
-        val = bm.einsum('...i, ...j -> ...ij', val1, val2).reshape(*structure, nnz)
-        indices_list.append(idx)
-        values_list.append(val)
+    crow1, col1, v1 = _coo_to_csr(indices1, values1, nrow)
+    crow2, col2, v2 = _coo_to_csr(indices2, values2, spshape2[0])
+    crow, col, values = _spgemm_csr(crow1, col1, v1, crow2, col2, v2, nrow, ncol)
+    row = _row_of_crow(crow)
+    indices = bm.stack([bm.astype(row, col.dtype), col], axis=0)
 
-    indices = bm.concat(indices_list, axis=1)
-    values = bm.concat(values_list, axis=-1)
-    return indices, values, (spshape1[0], spshape2[1])
+    return indices, values, (nrow, ncol)
 
 
 def spspmm_csr(crow1: _DT, col1: _DT, values1: _DT, spshape1: _Size,
                crow2: _DT, col2: _DT, values2: _DT, spshape2: _Size) -> Tuple[_DT, _DT, _Size]:
+    """Sparse-sparse matrix multiplication of CSR matrices, with batch support
+    on the dense dimensions of values. The output columns are sorted in each row."""
     _shape_check(spshape1, spshape2)
-
-    structure = values1.shape[:-1]
-    if values2.shape[:-1] != structure:
-        raise ValueError(f"the dense shape of matrix2 ({values2.shape[:-1]}) "
-                         f"must match that of matrix1 {structure}")
-
-    size = spshape1[1]
-    indices_list = []
-    values_list = []
-    new_crow = bm.zeros(size+1,dtype=bm.int64)
-
-    for i in range(size):
-        row = bm.array([],dtype=bm.int64)
-        left_col_flag = (col1 == i)
-
-        for x in bm.where(left_col_flag == True)[0]+1:
-            flag = ~(x>crow1[:-1])^(x<=crow1[1:])
-            row = bm.concat((row,(bm.where(flag == True))[0]))
-
-        col = col2[crow2[i]:crow2[i+1]]
-
-        if not bm.any(row, axis=0):
-            continue
-
-        if not bm.any(col, axis=0):
-            continue
-
-        idx = bm.meshgrid(row, col, indexing='ij')
-        nnz = col.shape[0] * row.shape[0]
-        idx = bm.reshape(bm.stack(idx, axis=0), (2, nnz))
-        val1 = values1[..., left_col_flag]
-        val2 = values2[..., crow2[i]:crow2[i+1]]
-        val = bm.einsum('...i, ...j -> ...ij', val1, val2).reshape(*structure, nnz)
-
-        indices_list.append(idx)
-        values_list.append(val)
-
-    indices = bm.concat(indices_list, axis=1)
-    values = bm.concat(values_list, axis=-1)
-
-    unique_indices, inverse_indices = bm.unique(indices, return_inverse=True, axis=1)
-    new_values = bm.zeros(unique_indices.shape[1])
-    new_values = bm.index_add(new_values, inverse_indices, values, axis=-1)
-
-    for x in unique_indices[0,:]:
-        new_crow[x+1]+=1
-
-    new_crow=bm.cumsum(new_crow, axis =-1)
-
-    return new_crow, unique_indices[1,:], new_values,(spshape1[0], spshape2[1])
+    _check_structure(values1, values2)
+    nrow, ncol = spshape1[0], spshape2[1]
+    # NOTE: the backend kernel, if any, takes the matrices without batch.
+    if hasattr(bm, 'csr_spspmm') and (values1.ndim == 1):
+        crow, col, values = bm.csr_spspmm(crow1, col1, values1, spshape1,
+                                          crow2, col2, values2, spshape2)
+        return crow, col, values, (nrow, ncol)
+    crow, col, values = _spgemm_csr(crow1, col1, values1, crow2, col2, values2, nrow, ncol)
+
+    return crow, col, values, (nrow, ncol)
@@ -6,7 +6,7 @@ from ..backend import TensorLike, Number, Size
 from ..backend import backend_manager as bm
 from .sparse_tensor import SparseTensor
 from .utils import (
-    flatten_indices, tril_coo,
+    flatten_indices, flat_keys, tril_coo,
     check_shape_match, check_spshape_match
 )
 from ._spspmm import spspmm_coo
@@ -177,11 +177,21 @@ class COOTensor(SparseTensor):
         if self.is_coalesced or self.nnz == 0:
             return self
 
-        order = bm.lexsort(tuple(reversed(self._indices)))
-        sorted_indices = self._indices[:, order]
+        keys = flat_keys(self._indices, self.sparse_shape)
+
+        if keys is None:
+            order = bm.lexsort(tuple(reversed(self._indices)))
+            sorted_indices = self._indices[:, order]
+            is_new = bm.any(sorted_indices[:, 1:] - sorted_indices[:, :-1], axis=0)
+        else: # Sorting the packed keys is much faster than lexsort.
+            order = bm.argsort(keys)
+            sorted_keys = keys[order]
+            sorted_indices = self._indices[:, order]
+            is_new = sorted_keys[1:] != sorted_keys[:-1]
+
         unique_mask = bm.concat([
             bm.ones((1, ), dtype=bm.bool, device=bm.get_device(sorted_indices)),
-            bm.any(sorted_indices[:, 1:] - sorted_indices[:, :-1], axis=0)
+            is_new
         ], axis=0)
         new_indices = bm.copy(sorted_indices[..., unique_mask])
 
@@ -289,6 +299,44 @@ class COOTensor(SparseTensor):
 
         return cls(new_indices, bm.concat(values_list, axis=-1), spshape)
 
+    @classmethod
+    def accumulate(cls, coo_tensors: Sequence['COOTensor'], /, *,
+                   coalesce: bool=True) -> 'COOTensor':
+        """Sum up COO tensors of the same shape, concatenating the indices and values
+        only once, instead of adding them one by one.
+
+        Parameters:
+            coo_tensors (Sequence[COOTensor]): COO tensors to be summed up.
+            coalesce (bool, optional): Whether to coalesce the result. Defaults to True.
+
+        Returns:
+            COOTensor: The sum.
+        """
+        coo_tensors = list(coo_tensors)
+        if len(coo_tensors) == 0:
+            raise ValueError("coo_tensors cannot be empty")
+
+        fcoo = coo_tensors[0]
+        has_values = [coo._values is not None for coo in coo_tensors]
+        if any(has_values) and not all(has_values):
+            raise ValueError("some of the COO tensors have values while others do not")
+
+        for coo in coo_tensors[1:]:
+            check_shape_match(fcoo.shape, coo.shape)
+            check_spshape_match(fcoo.sparse_shape, coo.sparse_shape)
+
+        if len(coo_tensors) == 1:
+            new_coo = fcoo
+        else:
+            new_indices = bm.concat([coo._indices for coo in coo_tensors], axis=1)
+            if all(has_values):
+                new_values = bm.concat([coo._values for coo in coo_tensors], axis=-1)
+            else:
+                new_values = None
+            new_coo = cls(new_indices, new_values, fcoo.sparse_shape)
+
+        return new_coo.coalesce() if coalesce else new_coo
+
     ### 6. Arithmetic Operations ###
     def neg(self) -> 'COOTensor':
         """Negation of the COO tensor. Returns self if values is None."""
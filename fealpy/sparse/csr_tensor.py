@@ -274,28 +274,7 @@ class CSRTensor(SparseTensor):
             elif (not self._values is None) and (other._values is None):
                 raise ValueError("self has value while other does not")
 
-            new_crow = bm.array([0],dtype=bm.int64)
-            new_col = bm.array([],dtype=bm.int64)
-            new_values = bm.array([],dtype=bm.int64)
-
-            for i in range(0, self._crow.shape[0]-1): 
-                indices1 = self._col[self._crow[i]:self._crow[i+1]]
-                indices2 = other._col[other._crow[i]:other._crow[i+1]]
-                col, inverse_indices = bm.unique(bm.concat((indices1,indices2)), return_inverse=True)
-
-                if self._values is None:
-                    new_values = None
-                else:
-                    value1 = self._values[self._crow[i]:self._crow[i+1]]
-                    value2 = other._values[other._crow[i]:other._crow[i+1]]
-                    val =bm.concat((value1,alpha*value2))
-                    values = bm.zeros(col.shape[0],dtype=val.dtype)
-                    values = bm.index_add(values, inverse_indices, val, axis=-1)
-                    new_values = bm.concat((new_values,values))
-                new_crow = bm.concat((new_crow,bm.tensor([len(col)+new_crow[-1]])))
-                new_col = bm.concat((new_col,col))
-
-            return CSRTensor(new_crow, new_col,new_values ,self.sparse_shape)
+            return self._add_csr(other, alpha)
 
         elif isinstance(other, TensorLike):
             check_shape_match(self.shape, other.shape)
@@ -325,6 +304,63 @@ class CSRTensor(SparseTensor):
         else:
             raise TypeError(f"Unsupported type {type(other).__name__} in addition")
 
+    def _keys(self) -> TensorLike:
+        """Pack the (row, col) of non-zeros into int64 keys `row * ncol + col`."""
+        row = bm.astype(self.row(), bm.int64)
+        return row * self._spshape[1] + bm.astype(self._col, bm.int64)
+
+    def _add_csr(self, other: 'CSRTensor', alpha: Number) -> 'CSRTensor':
+        # Case 1: identical patterns, adding the values directly.
+        if (self._crow is other._crow and self._col is other._col) or \
+            (self.nnz == other.nnz and bm.all(self._crow == other._crow)
+             and bm.all(self._col == other._col)):
+            if self._values is None:
+                return CSRTensor(self._crow, self._col, None, self._spshape)
+            return CSRTensor(self._crow, self._col, self._values + alpha * other._values,
+                             self._spshape)
+
+        keys1, keys2 = self._keys(), other._keys()
+
+        # Case 2: nested patterns, adding the smaller into the larger by searching.
+        big, small = (self, other) if self.nnz >= other.nnz else (other, self)
+        big_keys, small_keys = (keys1, keys2) if big is self else (keys2, keys1)
+
+        if bm.all(big_keys[1:] > big_keys[:-1]) and small.nnz > 0:
+            loc = bm.searchsorted(big_keys, small_keys)
+            loc_clip = bm.clip(loc, 0, big.nnz - 1)
+            if bm.all(big_keys[loc_clip] == small_keys):
+                if self._values is None:
+                    return CSRTensor(big._crow, big._col, None, self._spshape)
+                if big is self:
+                    values = bm.index_add(bm.copy(self._values), loc, alpha * other._values, axis=-1)
+                else:
+                    values = bm.index_add(alpha * other._values, loc, self._values, axis=-1)
+                return CSRTensor(big._crow, big._col, values, self._spshape)
+
+        # Case 3: general patterns, merging the sorted keys.
+        # NOTE: A stable sort of two sorted runs runs in linear time for some backends.
+        keys = bm.concat([keys1, keys2], axis=0)
+        order = bm.argsort(keys, stable=True)
+        keys = keys[order]
+        is_head = bm.concat([bm.ones((1,), dtype=bm.bool, device=bm.get_device(keys)),
+                             keys[1:] != keys[:-1]], axis=0)
+        new_keys = keys[is_head]
+        nrow, ncol = self._spshape
+        new_col = bm.astype(new_keys % ncol, self._col.dtype)
+        new_crow = bm.searchsorted(new_keys // ncol,
+                                   bm.arange(nrow + 1, dtype=bm.int64, device=bm.get_device(keys)))
+        new_crow = bm.astype(new_crow, self._crow.dtype)
+
+        if self._values is None:
+            new_values = None
+        else:
+            values = bm.concat([self._values, alpha * other._values], axis=-1)[..., order]
+            inverse = bm.cumsum(bm.astype(is_head, bm.int64), axis=0) - 1
+            new_values = bm.zeros(values.shape[:-1] + (new_keys.shape[0],), **bm.context(values))
+            new_values = bm.index_add(new_values, inverse, values, axis=-1)
+
+        return CSRTensor(new_crow, new_col, new_values, self._spshape)
+
     def mul(self, other: Union[Number, 'CSRTensor', TensorLike]) -> 'CSRTensor':
         """Element-wise multiplication.
         The result CSR tensor will share the same indices with
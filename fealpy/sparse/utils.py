@@ -1,5 +1,6 @@
 
 from typing import Optional
+from math import prod
 
 from ..backend import backend_manager as bm
 from ..backend import TensorLike, Size
@@ -50,6 +51,22 @@ def flatten_indices(indices: TensorLike, shape: Size) -> TensorLike:
     return flatten[None, ...]
 
 
+def flat_keys(indices: TensorLike, shape: Size) -> Optional[TensorLike]:
+    """Pack the sparse indices shaped (D, nnz) into int64 keys shaped (nnz,), which
+    are ordered as the indices in lexicographical order.
+    Returns None if the shape is too large to be packed."""
+    shape = tuple(int(s) for s in shape)
+    if prod(shape) >= 2**63:
+        return None
+    strides = shape_to_strides(shape, 1)
+    keys = bm.astype(indices[-1, :], bm.int64)
+
+    for d in range(len(shape) - 1):
+        keys = keys + bm.astype(indices[d, :], bm.int64) * strides[d]
+
+    return keys
+
+
 def tril_coo(indices: TensorLike, values: TensorLike, k: int=0):
     """Copy the lower triangular portion of a sparse COO matrix in the last two dimensions."""
     tril_pos = (indices[-2] + k) >= indices[-1]
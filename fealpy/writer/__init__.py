@@ -1,2 +1,8 @@
-from .MeshWriter import MeshWriter
-from .VTKMeshWriter import VTKMeshWriter
+from .vtu_series_writer import VTUSeriesWriter
+
+try:
+    from .MeshWriter import MeshWriter
+    from .VTKMeshWriter import VTKMeshWriter
+except ImportError:
+    # NOTE: the writers above require vtk.
+    pass
@@ -0,0 +1,287 @@
+
+import os
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple, Any
+
+import numpy as np
+
+from ..backend import backend_manager as bm
+from ..backend import TensorLike
+
+
+_VTK_TYPES = {
+    np.dtype(np.int8): 'Int8', np.dtype(np.uint8): 'UInt8',
+    np.dtype(np.int16): 'Int16', np.dtype(np.uint16): 'UInt16',
+    np.dtype(np.int32): 'Int32', np.dtype(np.uint32): 'UInt32',
+    np.dtype(np.int64): 'Int64', np.dtype(np.uint64): 'UInt64',
+    np.dtype(np.float32): 'Float32', np.dtype(np.float64): 'Float64',
+}
+VTK_VERTEX = 1
+
+
+def _to_numpy(value: Any) -> np.ndarray:
+    """Copy the tensor or the function to a numpy array, so that it is not changed
+    by the solver while being written."""
+    if hasattr(value, 'space'):
+        value = value.array
+    array = np.array(bm.to_numpy(value), copy=True)
+    if array.dtype == np.bool_:
+        array = array.astype(np.uint8)
+    return array
+
+
+def _encode(array: np.ndarray, level: int, block_size: int) -> bytes:
+    """Encode the array as a block of the appended data with the UInt64 header,
+    compressed by zlib in blocks if level > 0."""
+    data = np.ascontiguousarray(array).tobytes()
+    if level <= 0:
+        return np.uint64(len(data)).tobytes() + data
+    blocks = [zlib.compress(data[i:i+block_size], level)
+              for i in range(0, len(data), block_size)]
+    last = len(data) % block_size
+    header = [len(blocks), block_size, last] + [len(b) for b in blocks]
+    return np.array(header, dtype=np.uint64).tobytes() + b''.join(blocks)
+
+
+class VTUSeriesWriter():
+    """Write a time series of data on a mesh to VTU files and a PVD collection
+    in the background, e.g. in the time loop of a transient simulation.
+
+    Each step is written to `<path>/<name>_<step>.vtu` in the binary appended
+    format, compressed by zlib optionally, and `<path>/<name>.pvd` collects the
+    finished steps with their times. The data is copied when `write` is called,
+    and the encoding and the writing are done by a pool of threads, while the
+    solver goes on.
+
+    Parameters:
+        path (str): The directory of the files.
+        mesh (HomogeneousMesh | None, optional): The mesh of the series, which has
+            the method `to_vtk`. Defaults to None, where the points are given in
+            each step, e.g. for particles.
+        name (str, optional): Prefix of the files. Defaults to 'solution'.
+        compress (int, optional): zlib compression level from 0 (no compression)
+            to 9. Defaults to 1, the fastest.
+        workers (int, optional): Number of the writing threads. Defaults to 1.
+        max_pending (int, optional): Maximum number of steps waiting to be written.
+            `write` blocks when the queue is full, bounding the memory of the
+            copies. Defaults to 4.
+        etype (str, optional): The entities written as the cells. Defaults to 'cell'.
+
+    Examples:
+        >>> with VTUSeriesWriter('results', mesh, name='heat') as writer:
+        ...     for t in timeline:
+        ...         ...
+        ...         writer.write(t, nodedata={'uh': uh})
+
+    Note:
+        The geometry of the mesh is encoded once and reused by all steps, until
+        the mesh is replaced by `write(..., mesh=new_mesh)`. zlib releases the GIL,
+        so the threads overlap the encoding with the computation.
+
+        A VTU file can not refer to the data in other files, so the encoded
+        geometry is still written into every file, and the disk usage grows with
+        the size of the mesh times the number of the steps. For long series on a
+        fixed mesh, `MeshStore` stores the mesh once and appends the steps.
+    """
+    block_size: int = 2**20
+
+    def __init__(self, path: str, mesh=None, *, name: str='solution',
+                 compress: int=1, workers: int=1, max_pending: int=4,
+                 etype: str='cell'):
+        if max_pending < 1:
+            raise ValueError("max_pending should be at least 1.")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.name = name
+        self.level = compress
+        self.etype = etype
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._pending = deque() # (future, time, file name)
+        self._entries: List[Tuple[float, str]] = []
+        self._step = 0
+        self._geometry = None
+        self._closed = False
+        if mesh is not None:
+            self.set_mesh(mesh)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def set_mesh(self, mesh) -> None:
+        """Set the mesh of the following steps, and encode its geometry."""
+        node, cell, cell_type, NC = mesh.to_vtk(etype=self.etype)
+        node = _to_numpy(node)
+        cell = np.reshape(_to_numpy(cell), (NC, -1))[:, 1:]
+        self._geometry = self._encode_geometry(node, cell, cell_type)
+
+    def _encode_geometry(self, node: np.ndarray, cell: np.ndarray,
+                         cell_type: int) -> Dict[str, Any]:
+        NN, NC = node.shape[0], cell.shape[0]
+        if node.shape[1] < 3:
+            node = np.concatenate([node, np.zeros((NN, 3-node.shape[1]), node.dtype)], axis=1)
+        NV = cell.shape[1]
+        offsets = np.arange(1, NC+1, dtype=np.int64) * NV
+        types = np.full((NC,), cell_type, dtype=np.uint8)
+        level, bs = self.level, self.block_size
+        return {
+            'NN': NN, 'NC': NC,
+            'points': (node.dtype, 3, _encode(node, level, bs)),
+            'connectivity': (np.dtype(np.int64), 1, _encode(cell.astype(np.int64), level, bs)),
+            'offsets': (np.dtype(np.int64), 1, _encode(offsets, level, bs)),
+            'types': (np.dtype(np.uint8), 1, _encode(types, level, bs)),
+        }
+
+    def write(self, time: Optional[float]=None, *,
+              nodedata: Optional[Dict[str, Any]]=None,
+              celldata: Optional[Dict[str, Any]]=None,
+              mesh=None, points: Optional[TensorLike]=None) -> str:
+        """Write a step of the series in the background.
+
+        Parameters:
+            time (float | None, optional): Time of the step. Defaults to None,
+                using the number of the step.
+            nodedata (Dict[str, Tensor | Function] | None, optional): Data on the
+                nodes in shape (NN,) or (NN, k). Defaults to None.
+            celldata (Dict[str, Tensor | Function] | None, optional): Data on the
+                cells in shape (NC,) or (NC, k). Defaults to None.
+            mesh (HomogeneousMesh | None, optional): A new mesh of this and the
+                following steps, e.g. after refinement. Defaults to None.
+            points (Tensor | None, optional): Points in shape (NN, GD) written as
+                vertices instead of a mesh, e.g. the particles. Defaults to None.
+
+        Returns:
+            str: The name of the VTU file.
+        """
+        if self._closed:
+            raise RuntimeError("the writer is closed.")
+        if mesh is not None:
+            self.set_mesh(mesh)
+        if points is not None:
+            # NOTE: the moving points are encoded in the background.
+            node = _to_numpy(points)
+            cell = np.arange(node.shape[0], dtype=np.int64)[:, None]
+            geometry = {'NN': node.shape[0], 'NC': node.shape[0], 'raw': (node, cell)}
+        else:
+            geometry = self._geometry
+        if geometry is None:
+            raise RuntimeError("either the mesh or the points should be given.")
+
+        arrays = []
+        for tag, data, N in (('PointData', nodedata, geometry['NN']),
+                             ('CellData', celldata, geometry['NC'])):
+            for key, value in (data or {}).items():
+                array = _to_numpy(value)
+                if array.shape[0] != N:
+                    raise ValueError(f"'{key}' is expected to have {N} rows in "
+                                     f"{tag}, but got shape {array.shape}.")
+                arrays.append((tag, key, array))
+
+        time = float(self._step) if time is None else float(time)
+        fname = f"{self.name}_{self._step:06d}.vtu"
+        self._step += 1
+        while len(self._pending) >= self.max_pending:
+            self._reap(block=True)
+        future = self._executor.submit(self._write_vtu, os.path.join(self.path, fname),
+                                       geometry, arrays)
+        self._pending.append((future, time, fname))
+        self._reap(block=False)
+        return fname
+
+    def _write_vtu(self, fname: str, geometry: Dict[str, Any],
+                   arrays: List[Tuple[str, str, np.ndarray]]) -> None:
+        # NOTE: the encoded geometry is written into every file, as VTU has
+        # no reference to the data in another file.
+        if 'raw' in geometry:
+            geometry = self._encode_geometry(*geometry['raw'], VTK_VERTEX)
+        level, bs = self.level, self.block_size
+        blocks: List[bytes] = []
+        offset = 0
+
+        def element(name: Optional[str], dtype: np.dtype, ncomp: int, data: bytes) -> str:
+            nonlocal offset
+            blocks.append(data)
+            attr = f' Name="{name}"' if name else ''
+            attr += f' NumberOfComponents="{ncomp}"' if ncomp > 1 else ''
+            tag = (f'<DataArray type="{_VTK_TYPES[np.dtype(dtype)]}"{attr} '
+                   f'format="appended" offset="{offset}"/>')
+            offset += len(data)
+            return tag
+
+        sections = {'PointData': [], 'CellData': []}
+        for tag, key, array in arrays:
+            ncomp = 1 if array.ndim == 1 else int(np.prod(array.shape[1:]))
+            array = np.reshape(array, (array.shape[0], -1)) if ncomp > 1 else array
+            if ncomp == 2: # vectors in ParaView have 3 components
+                array = np.concatenate([array, np.zeros_like(array[:, :1])], axis=1)
+                ncomp = 3
+            sections[tag].append(element(key, array.dtype, ncomp, _encode(array, level, bs)))
+
+        points = element(None, *geometry['points'])
+        cells = [element(k, *geometry[k]) for k in ('connectivity', 'offsets', 'types')]
+        compressor = ' compressor="vtkZLibDataCompressor"' if level > 0 else ''
+        lines = [
+            '<?xml version="1.0"?>',
+            f'<VTKFile type="UnstructuredGrid" version="1.0" byte_order="LittleEndian" '
+            f'header_type="UInt64"{compressor}>',
+            '<UnstructuredGrid>',
+            f'<Piece NumberOfPoints="{geometry["NN"]}" NumberOfCells="{geometry["NC"]}">',
+            '<PointData>', *sections['PointData'], '</PointData>',
+            '<CellData>', *sections['CellData'], '</CellData>',
+            '<Points>', points, '</Points>',
+            '<Cells>', *cells, '</Cells>',
+            '</Piece>',
+            '</UnstructuredGrid>',
+            '<AppendedData encoding="raw">',
+        ]
+        tmp = fname + '.part'
+        with open(tmp, 'wb') as fp:
+            fp.write(('\n'.join(lines) + '\n_').encode('ascii'))
+            for b in blocks:
+                fp.write(b)
+            fp.write(b'\n</AppendedData>\n</VTKFile>\n')
+        os.replace(tmp, fname)
+
+    def _reap(self, block: bool) -> None:
+        """Collect the finished steps in order, and update the PVD file."""
+        updated = False
+        while self._pending and (block or self._pending[0][0].done()):
+            future, time, fname = self._pending.popleft()
+            future.result() # raises the errors in writing
+            self._entries.append((time, fname))
+            updated = True
+            block = False
+        if updated:
+            self._write_pvd()
+
+    def _write_pvd(self) -> None:
+        lines = ['<?xml version="1.0"?>',
+                 '<VTKFile type="Collection" version="0.1" byte_order="LittleEndian">',
+                 '<Collection>']
+        lines += [f'<DataSet timestep="{t!r}" group="" part="0" file="{f}"/>'
+                  for t, f in self._entries]
+        lines += ['</Collection>', '</VTKFile>', '']
+        fname = os.path.join(self.path, self.name + '.pvd')
+        with open(fname + '.part', 'w') as fp:
+            fp.write('\n'.join(lines))
+        os.replace(fname + '.part', fname)
+
+    def flush(self) -> None:
+        """Wait for all steps to be written."""
+        while self._pending:
+            self._reap(block=True)
+
+    def close(self) -> None:
+        """Write the remaining steps, and shut down the threads."""
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+            self._closed = True
@@ -0,0 +1,161 @@
+import os
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh
+from fealpy.mesh.mesh_store import _append_rows
+from fealpy.solver import spsolve
+from fealpy.cem import EITDataGenerator, DatasetWriter, generate_dataset
+
+
+def _sample(seed):
+    rng = np.random.default_rng(seed)
+    return {'x': rng.random((3, 4)), 'label': np.array(seed, dtype=np.int64)}
+
+
+def _circle(center, radius):
+    def levelset(p):
+        return (p[..., 0] - center[0])**2 + (p[..., 1] - center[1])**2 - radius**2
+    return levelset
+
+
+def _neumann(p, *args):
+    theta = bm.arctan2(p[..., 1], p[..., 0])
+    freq = bm.tensor([1., 2., 3.], dtype=p.dtype)
+    return bm.sin(bm.tensordot(freq, theta, axes=0))
+
+
+class TestDatasetWriter:
+    def test_append(self, tmp_path):
+        bm.set_backend('numpy')
+        path = str(tmp_path / 'data')
+        with DatasetWriter(path, 'w', chunk_size=4) as writer:
+            for i in range(10):
+                writer.append(**_sample(i))
+            assert len(writer) == 10
+            with pytest.raises(ValueError):
+                writer.append(x=np.zeros((3, 4)))
+        writer = DatasetWriter(path)
+        assert len(writer) == 10
+        x = bm.to_numpy(writer.load('x'))
+        assert x.shape == (10, 3, 4)
+        np.testing.assert_array_equal(x[7], _sample(7)['x'])
+        np.testing.assert_array_equal(bm.to_numpy(writer.load('label')), np.arange(10))
+
+        assert len(DatasetWriter(path, 'w')) == 0
+        assert not os.path.exists(os.path.join(path, 'x.npy'))
+
+    def test_partial_chunk(self, tmp_path):
+        bm.set_backend('numpy')
+        path = str(tmp_path / 'data')
+        with DatasetWriter(path, 'w') as writer:
+            for i in range(5):
+                writer.append(**_sample(i))
+        # a flush interrupted after writing the first array
+        _append_rows(os.path.join(path, 'x.npy'), np.zeros((2, 3, 4)))
+        writer = DatasetWriter(path)
+        assert len(writer) == 5
+        assert bm.to_numpy(writer.load('x')).shape == (5, 3, 4)
+
+    def test_resume_partial_write(self, tmp_path):
+        bm.set_backend('numpy')
+        path = str(tmp_path / 'data')
+        with DatasetWriter(path, 'w') as writer:
+            for i in range(3):
+                writer.append(**_sample(i))
+        # a flush interrupted in the last array, before its header is updated
+        _append_rows(os.path.join(path, 'x.npy'), np.zeros((2, 3, 4)))
+        with open(os.path.join(path, 'label.npy'), 'ab') as fp:
+            fp.write(np.zeros(1, dtype=np.int64).tobytes())
+
+        with DatasetWriter(path) as writer:
+            assert len(writer) == 3
+            for i in range(3, 6):
+                writer.append(**_sample(i))
+        writer = DatasetWriter(path)
+        assert len(writer) == 6
+        np.testing.assert_array_equal(bm.to_numpy(writer.load('label')), np.arange(6))
+        np.testing.assert_array_equal(bm.to_numpy(writer.load('x'))[4], _sample(4)['x'])
+
+
+class TestGenerateDataset:
+    def test_resume(self, tmp_path):
+        bm.set_backend('numpy')
+        path = str(tmp_path / 'data')
+        called = []
+        def task(seed):
+            called.append(seed)
+            return _sample(seed)
+
+        generate_dataset(path, task, range(6), chunk_size=4)
+        writer = generate_dataset(path, task, range(9), chunk_size=4)
+        assert called == list(range(9))
+        assert len(writer) == 9
+        writer = generate_dataset(path, task, range(3), resume=False)
+        assert len(writer) == 3
+        with pytest.raises(ValueError):
+            generate_dataset(path, task, range(2))
+
+    def test_workers(self, tmp_path):
+        bm.set_backend('numpy')
+        mesh = TriangleMesh.from_box([-1, 1, -1, 1], nx=10, ny=10)
+        generator = EITDataGenerator(mesh, p=1)
+        generator.set_boundary(_neumann, batch_size=3)
+
+        def task(radius):
+            generator.set_levelset([10., 1.], _circle([0.1, -0.2], radius))
+            return {'gd': generator.run()}
+
+        radius = [0.2, 0.3, 0.4, 0.5, 0.6]
+        serial = generate_dataset(str(tmp_path / 'serial'), task, radius)
+        parallel = generate_dataset(str(tmp_path / 'parallel'), task, radius,
+                                    num_workers=2, chunk_size=2)
+        np.testing.assert_allclose(bm.to_numpy(parallel.load('gd')),
+                                   bm.to_numpy(serial.load('gd')), atol=1e-14)
+
+
+class TestBatchedGenerators:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_eit_factorization(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box([-1, 1, -1, 1], nx=12, ny=12)
+        generator = EITDataGenerator(mesh, p=1)
+        generator.set_boundary(_neumann, batch_size=3)
+        bd = bm.to_numpy(generator._bd_node_index)
+
+        for center in ([0.2, 0.1], [-0.3, 0.2], [0.0, -0.4]):
+            generator.set_levelset([10., 1.], _circle(center, 0.3))
+            gd = bm.to_numpy(generator.run())
+            ref = bm.to_numpy(spsolve(generator.A_n, generator.b_.T, solver='scipy'))
+            np.testing.assert_allclose(gd, ref.T[:, bd], atol=1e-12)
+        lu = generator.factorization()
+
+        # a new mesh is factorized again
+        generator = EITDataGenerator(TriangleMesh.from_box([-1, 1, -1, 1], nx=8, ny=8))
+        generator.set_boundary(_neumann, batch_size=3)
+        generator.set_levelset([10., 1.], _circle([0.2, 0.1], 0.3))
+        generator._lu = lu
+        assert generator.run().shape == (3, 32)
+        assert generator.factorization() is not lu
+
+    @pytest.mark.parametrize('mesh', ['QuadrangleMesh', 'UniformMesh'])
+    def test_nearfield(self, mesh):
+        from fealpy.ml.generator import NearFieldDataFEMGenerator2d
+        bm.set_backend('numpy')
+        angle = np.linspace(0, 2*np.pi, 6, endpoint=False)
+        receivers = np.stack([4*np.cos(angle), 4*np.sin(angle)], axis=-1)
+        d = [[np.cos(t), np.sin(t)] for t in (0.0, 1.0, 2.5)]
+        generator = NearFieldDataFEMGenerator2d(
+            [-5, 5, -5, 5], mesh, 20, 20, 1, 3, 'exp(1j*k*x*d_0 + 1j*k*y*d_1)',
+            _circle([0.0, 0.0], 0.5), d, [1.0, 2.0], receivers)
+        data = bm.to_numpy(generator.data_for_dsm_batch(2.0))
+        assert data.shape == (3, 6)
+        for j in range(3):
+            np.testing.assert_allclose(data[j], bm.to_numpy(generator.data_for_dsm(2.0, d[j])),
+                                       atol=1e-14)
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_dataset.py", "-q"])
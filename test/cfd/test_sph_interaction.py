@@ -0,0 +1,185 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import NodeMesh
+from fealpy.cfd.sph import (ParticleInteraction, ParticleTimeLine, QuinticKernel,
+                            CubicSplineKernel, QuadraticKernel, WendlandC2Kernel)
+
+EPS = np.finfo(float).eps
+
+
+def _state(NN=200, box=1.0, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "position": rng.random((NN, 2)) * box,
+        "mass": 1.0 + 0.1 * rng.random(NN),
+        "rho": 1.0 + 0.1 * rng.random(NN),
+        "mv": rng.random((NN, 2)) - 0.5,
+        "tv": rng.random((NN, 2)) - 0.5,
+        "eta": 0.01 + 0.01 * rng.random(NN),
+        "T": rng.random(NN),
+        "kappa": 1.0 + rng.random(NN),
+        "Cp": 1.0 + rng.random(NN),
+    }
+
+
+def _reference(state, kernel, box, p, pb):
+    """The right-hand sides by the formulas of SPHSolver over all pairs."""
+    x = state["position"]
+    NN = x.shape[0]
+    dr = x[:, None] - x[None, :]
+    dr -= box * np.floor(dr / box + 0.5)
+    dist = np.sqrt(np.sum(dr**2, axis=-1))
+    flag = dist < kernel.cutoff_radius
+    np.fill_diagonal(flag, False)
+    i, j = np.nonzero(flag)
+    dr, dist = dr[i, j], dist[i, j]
+    w, dw = (bm.to_numpy(v) for v in kernel.value_and_grad(bm.tensor(dist)))
+    w0 = bm.to_numpy(kernel.value_and_grad(bm.zeros((1,)))[0])[0]
+
+    m, rho, mv, tv = state["mass"], state["rho"], state["mv"], state["tv"]
+    rho_sum = m * (np.bincount(i, w, NN) + w0)
+    c = ((m[i]/rho[i])**2 + (m[j]/rho[j])**2) / m[i] * dw / (dist + EPS)
+    eta = state["eta"]
+    eta_ij = 2 * eta[i] * eta[j] / (eta[i] + eta[j] + EPS)
+    p_ij = (rho[j] * p[i] + rho[i] * p[j]) / (rho[i] + rho[j])
+    A = lambda k: np.einsum('ki,kj->kij', rho[k, None] * mv[k], tv[k] - mv[k])
+    b = np.einsum('kij,kj->ki', (A(i) + A(j)) / 2, dr)
+    a = c[:, None] * (-p_ij[:, None] * dr + b + eta_ij[:, None] * (mv[i] - mv[j]))
+    dmvdt = np.stack([np.bincount(i, a[:, d], NN) for d in range(2)], axis=1)
+    a = c[:, None] * pb[i, None] * dr
+    dtvdt = np.stack([np.bincount(i, a[:, d], NN) for d in range(2)], axis=1)
+
+    T, kappa = state["T"], state["kappa"]
+    k = kappa[i] * kappa[j] / (kappa[i] + kappa[j])
+    F = np.sum(dr * (dw / dist)[:, None] * dr, axis=1) / (dist**2 + EPS)
+    dTdt = 4 * m[j] * k * (T[i] - T[j]) * F / (state["Cp"][i] * rho[i] * rho[j])
+    return rho_sum, dmvdt, dtvdt, np.bincount(i, dTdt, NN)
+
+
+class TestKernelFunction:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('Kernel', [QuinticKernel, CubicSplineKernel,
+                                        QuadraticKernel, WendlandC2Kernel])
+    @pytest.mark.parametrize('dim', [1, 2, 3])
+    def test_value_and_grad(self, backend, Kernel, dim):
+        bm.set_backend(backend)
+        kernel = Kernel(0.1, dim=dim)
+        r = bm.linspace(0.001, 1.1 * kernel.cutoff_radius, 301, dtype=bm.float64)
+        w, dw = kernel.value_and_grad(r)
+        assert w.shape == dw.shape == r.shape
+        w1, _ = kernel.value_and_grad(r + 1e-7)
+        w2, _ = kernel.value_and_grad(r - 1e-7)
+        fd = bm.to_numpy((w1 - w2) / 2e-7)
+        dw = bm.to_numpy(dw)
+        np.testing.assert_allclose(fd, dw, atol=1e-5 * np.max(np.abs(dw)))
+        np.testing.assert_array_equal(bm.to_numpy(w)[bm.to_numpy(r) >= kernel.cutoff_radius], 0)
+
+
+
+class TestParticleInteraction:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('skin', [0.0, 0.02])
+    def test_accelerations(self, backend, skin):
+        bm.set_backend(backend)
+        kernel = QuinticKernel(0.03, dim=2)
+        data = _state()
+        p = np.random.default_rng(1).random(200)
+        pb = np.full(200, 5.0)
+        rho, dmvdt, dtvdt, dTdt = _reference(data, kernel, 1.0, p, pb)
+
+        state = {k: bm.tensor(v) for k, v in data.items()}
+        interaction = ParticleInteraction(kernel, 1.0, skin=skin)
+        interaction.update(state["position"])
+        np.testing.assert_allclose(bm.to_numpy(interaction.density(state["mass"])), rho)
+        result = interaction.accelerations(state, bm.tensor(p), pb=bm.tensor(pb))
+        np.testing.assert_allclose(bm.to_numpy(result["dmvdt"]), dmvdt, atol=1e-10)
+        np.testing.assert_allclose(bm.to_numpy(result["dtvdt"]), dtvdt, atol=1e-10)
+        np.testing.assert_allclose(bm.to_numpy(result["dTdt"]), dTdt, atol=1e-10)
+
+        del state["tv"], state["eta"], state["T"]
+        result = interaction.accelerations(state, bm.tensor(p))
+        assert set(result) == {"dmvdt"}
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_verlet_reuse(self, backend):
+        bm.set_backend(backend)
+        kernel = QuinticKernel(0.03, dim=2)
+        data = _state()
+        interaction = ParticleInteraction(kernel, 1.0, skin=0.02)
+        position = bm.tensor(data["position"])
+        velocity = bm.tensor(data["mv"])
+        for _ in range(5):
+            position = position + 1e-3 * velocity
+            interaction.update(position)
+        assert interaction.search.rebuilds == 1
+
+        data["position"] = bm.to_numpy(position)
+        rho, *_ = _reference(data, kernel, 1.0, np.zeros(200), np.zeros(200))
+        rho_h = interaction.density(bm.tensor(data["mass"]))
+        np.testing.assert_allclose(bm.to_numpy(rho_h), rho)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_sort(self, backend):
+        bm.set_backend(backend)
+        data = _state()
+        state = {k: bm.tensor(v) for k, v in data.items()}
+        interaction = ParticleInteraction(QuinticKernel(0.03, dim=2), 1.0)
+        order = bm.to_numpy(interaction.sort(state))
+        assert np.array_equal(np.sort(order), np.arange(200))
+        for k, v in data.items():
+            np.testing.assert_array_equal(bm.to_numpy(state[k]), v[order])
+
+
+class TestParticleTimeLine:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_tgv(self, backend):
+        bm.set_backend(backend)
+        dx = 0.05
+        state = dict(NodeMesh.from_tgv_domain([1.0, 1.0], dx, dx).nodedata)
+        interaction = ParticleInteraction(QuinticKernel(dx, dim=2), 1.0, skin=0.25*dx)
+        timeline = ParticleTimeLine(interaction, c0=10.0, rho0=1.0, transport=True)
+        dt = 0.25 * dx / 11
+        x0, mv0 = bm.to_numpy(state["position"]), bm.to_numpy(state["mv"])
+        state = timeline(dt, state)
+        # the accelerations of the initial state are zero
+        x = (x0 + dt * mv0) % 1.0
+        np.testing.assert_allclose(bm.to_numpy(state["position"]), x, atol=1e-14)
+        interaction.update(state["position"])
+        np.testing.assert_allclose(bm.to_numpy(state["rho"]),
+                                   bm.to_numpy(interaction.density(state["mass"])))
+        assert set(state) >= {"p", "dmvdt", "dtvdt"}
+
+        energy = np.sum(mv0**2)
+        for _ in range(20):
+            state = timeline(dt, state)
+        assert np.sum(bm.to_numpy(state["mv"])**2) < energy
+        assert np.all(np.abs(bm.to_numpy(state["rho"]) - 1) < 0.05)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_walls(self, backend):
+        bm.set_backend(backend)
+        dx = 0.1
+        node = NodeMesh.from_dam_break_domain(dx, dx).node
+        fluid = bm.to_numpy((node[:, 0] > dx/2) & (node[:, 0] < 4 - dx/2) & (node[:, 1] > dx/2))
+        NN = node.shape[0]
+        state = {
+            "position": node,
+            "tag": bm.tensor(np.where(fluid, 0, 1)),
+            "mv": bm.zeros_like(node),
+            "mass": bm.full((NN,), dx * dx, dtype=bm.float64),
+        }
+        interaction = ParticleInteraction(QuinticKernel(dx, dim=2), skin=0.25*dx)
+        timeline = ParticleTimeLine(interaction, c0=20.0, rho0=1.0, gravity=[0.0, -1.0])
+        for _ in range(5):
+            state = timeline(1e-3, state)
+        position = bm.to_numpy(state["position"])
+        np.testing.assert_array_equal(position[~fluid], bm.to_numpy(node)[~fluid])
+        np.testing.assert_array_equal(bm.to_numpy(state["mv"])[~fluid], 0)
+        assert np.any(position[fluid] != bm.to_numpy(node)[fluid])
+        assert "dtvdt" not in state
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_sph_interaction.py", "-q"])
@@ -2,10 +2,14 @@ import numpy as np
 import pytest
 from fealpy.backend import backend_manager as bm
 
-from fealpy.mesh import TriangleMesh
+from fealpy.mesh import TriangleMesh, TetrahedronMesh
+from fealpy.decorator import cartesian
 from fealpy.functionspace import LagrangeFESpace
+from fealpy.solver import cg
 from fealpy.fem import (
-        BilinearForm, ScalarDiffusionIntegrator
+        BilinearForm, LinearForm, PartitionSplitter,
+        ScalarDiffusionIntegrator, ScalarMassIntegrator, ScalarSourceIntegrator,
+        ScalarConvectionIntegrator, ScalarRobinBCIntegrator, ScalarNeumannBCIntegrator
     )
 
 from bilinear_form_data import *
@@ -43,6 +47,258 @@ class TestBilinearFormInterface:
         z = bm.to_numpy(bform @ x)
         assert np.linalg.norm(y-z) < 1e-12 
 
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("p", range(1, 4))
+    def test_keep_pattern(self, backend, p):
+        bm.set_backend(backend)
+
+        mesh = TriangleMesh.from_box(nx=3, ny=3)
+        space = LagrangeFESpace(mesh, p)
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator())
+        mass = ScalarMassIntegrator(coef=1.0)
+        bform.add_integrator(mass)
+        bform.keep_pattern(True)
+
+        A = bform.assembly()
+        pattern = bform._pattern
+        assert pattern is not None
+        mass.coef = 3.0
+        B = bform.assembly()
+        assert bform._pattern is pattern
+
+        bform.keep_pattern(False)
+        expected = bform.assembly()
+        np.testing.assert_allclose(bm.to_numpy(B.to_dense()),
+                                   bm.to_numpy(expected.to_dense()), atol=1e-12)
+        assert B.nnz == expected.nnz
+
+        bform.keep_pattern(True)
+        bform.assembly()
+        mesh.uniform_refine()
+        C = bform.assembly()
+        assert bform._pattern is not pattern
+        assert C.shape == (space.number_of_global_dofs(),) * 2
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_keep_pattern_region(self, backend):
+        bm.set_backend(backend)
+
+        mesh = TriangleMesh.from_box(nx=4, ny=4)
+        NC = mesh.number_of_cells()
+        space = LagrangeFESpace(mesh, 2)
+        mass = ScalarMassIntegrator(region=bm.arange(NC // 2))
+        bform = BilinearForm(space)
+        bform.add_integrator(mass)
+        bform.keep_pattern(True)
+        bform.assembly()
+        pattern = bform._pattern
+
+        mass.set_region(bm.arange(NC // 2, NC))
+        A = bform.assembly()
+        assert bform._pattern is not pattern
+        expected = BilinearForm(space).add_integrator(
+            ScalarMassIntegrator(region=bm.arange(NC // 2, NC))
+        ).assembly()
+        np.testing.assert_allclose(bm.to_numpy(A.to_dense()),
+                                   bm.to_numpy(expected.to_dense()), atol=1e-12)
+
+        bform = BilinearForm(space, num_workers=2)
+        bform.add_integrator(ScalarMassIntegrator())
+        bform.assembly()
+        assert bform._pattern is None
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    def test_keep_pattern_chunked(self, backend):
+        bm.set_backend(backend)
+
+        mesh = TriangleMesh.from_box(nx=4, ny=4)
+        NC = mesh.number_of_cells()
+        space = LagrangeFESpace(mesh, 2)
+        first, second = bm.arange(NC // 2), bm.arange(NC // 2, NC)
+
+        def expected(*regions):
+            bform = BilinearForm(space)
+            for region in regions:
+                bform.add_integrator(ScalarMassIntegrator(region=region))
+            return bm.to_numpy(bform.assembly().to_dense())
+
+        region = bm.arange(NC // 2)
+        bform = BilinearForm(space, chunk_size=5)
+        bform.add_integrator(ScalarMassIntegrator(region=region))
+        bform.keep_pattern(True)
+        bform.assembly()
+
+        # the region is modified in place, unseen by the integrator
+        pattern = bform._pattern
+        region[:] = second
+        A = bform.assembly()
+        assert bform._pattern is not pattern
+        np.testing.assert_allclose(bm.to_numpy(A.to_dense()),
+                                   expected(second), atol=1e-12)
+
+        bform.add_integrator(ScalarMassIntegrator(region=first))
+        B = bform.assembly()
+        np.testing.assert_allclose(bm.to_numpy(B.to_dense()),
+                                   expected(second, first), atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("cache", [True, False])
+    def test_linear_operator(self, backend, cache):
+        bm.set_backend(backend)
+
+        mesh = TriangleMesh.from_box(nx=4, ny=4)
+        space = LagrangeFESpace(mesh, 3)
+        gdof = space.number_of_global_dofs()
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator())
+        bform.add_integrator(ScalarMassIntegrator())
+        op = bform.linear_operator(cache=cache)
+        assert op.shape == (gdof, gdof)
+        A = bform.assembly()
+        Ad = bm.to_numpy(A.to_dense())
+
+        x = bm.from_numpy(np.random.rand(gdof))
+        np.testing.assert_allclose(bm.to_numpy(op @ x), Ad @ bm.to_numpy(x), atol=1e-12)
+        X = bm.from_numpy(np.random.rand(gdof, 2))
+        np.testing.assert_allclose(bm.to_numpy(op @ X), Ad @ bm.to_numpy(X), atol=1e-12)
+        np.testing.assert_allclose(bm.to_numpy(op.diagonal()), np.diag(Ad), atol=1e-12)
+
+        b = A @ x
+        y = cg(op, b, rtol=1e-12)
+        np.testing.assert_allclose(bm.to_numpy(y), bm.to_numpy(x), atol=1e-8)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("mesh_class", [TriangleMesh, TetrahedronMesh])
+    def test_chunk_size(self, backend, mesh_class):
+        bm.set_backend(backend)
+
+        if mesh_class is TriangleMesh:
+            mesh = TriangleMesh.from_box(nx=4, ny=4)
+        else:
+            mesh = TetrahedronMesh.from_box(nx=2, ny=2, nz=2)
+        space = LagrangeFESpace(mesh, 2)
+
+        def make_forms(**kwargs):
+            bform = BilinearForm(space, **kwargs)
+            bform.add_integrator(ScalarDiffusionIntegrator())
+            bform.add_integrator(ScalarMassIntegrator(coef=2.0))
+            lform = LinearForm(space, **kwargs)
+            lform.add_integrator(ScalarSourceIntegrator(cartesian(lambda p: p[..., 0])))
+            return bform, lform
+
+        bform, lform = make_forms()
+        A = bform.assembly()
+        F = lform.assembly()
+        bform, lform = make_forms(chunk_size=7)
+        B = bform.assembly()
+        G = lform.assembly()
+
+        assert B.nnz == A.nnz
+        np.testing.assert_array_equal(bm.to_numpy(B.crow()), bm.to_numpy(A.crow()))
+        np.testing.assert_array_equal(bm.to_numpy(B.col()), bm.to_numpy(A.col()))
+        np.testing.assert_allclose(bm.to_numpy(B.values()), bm.to_numpy(A.values()), atol=1e-12)
+        np.testing.assert_allclose(bm.to_numpy(G), bm.to_numpy(F), atol=1e-12)
+
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
+    @pytest.mark.parametrize("kwargs", [{'chunk_size': 5}, {'num_workers': 2}])
+    def test_split_integrators(self, backend, kwargs):
+        bm.set_backend(backend)
+
+        mesh = TriangleMesh.from_box(nx=4, ny=4)
+        space = LagrangeFESpace(mesh, 2)
+        velocity = cartesian(lambda p: bm.stack([p[..., 1], -p[..., 0]], axis=-1))
+        gn = cartesian(lambda p, n: p[..., 0] + p[..., 1])
+
+        def make_forms(**kwargs):
+            # the Robin and Neumann integrators do not support indices,
+            # and are integrated without splitting
+            bform = BilinearForm(space, **kwargs)
+            bform.add_integrator(ScalarConvectionIntegrator(velocity))
+            bform.add_integrator(ScalarRobinBCIntegrator(coef=2.0))
+            lform = LinearForm(space, **kwargs)
+            lform.add_integrator(ScalarNeumannBCIntegrator(gn))
+            return bform.assembly(), lform.assembly()
+
+        A, F = make_forms()
+        B, G = make_forms(**kwargs)
+        np.testing.assert_allclose(bm.to_numpy(B.to_dense()), bm.to_numpy(A.to_dense()), atol=1e-12)
+        np.testing.assert_allclose(bm.to_numpy(G), bm.to_numpy(F), atol=1e-12)
+
+        convection = ScalarConvectionIntegrator(velocity)
+        assert convection.splittable()
+        assert not ScalarRobinBCIntegrator(coef=2.0).splittable()
+        assert not (convection + ScalarRobinBCIntegrator(coef=2.0)).splittable()
+
+    @pytest.mark.parametrize("backend, pool", [('numpy', 'thread'), ('numpy', 'process'),
+                                               ('pytorch', 'thread')])
+    def test_num_workers(self, backend, pool):
+        bm.set_backend(backend)
+
+        mesh = TriangleMesh.from_box(nx=6, ny=6)
+        space = LagrangeFESpace(mesh, 2)
+        f = cartesian(lambda p: p[..., 0])
+
+        bform = BilinearForm(space)
+        bform.add_integrator(ScalarDiffusionIntegrator())
+        A = bform.assembly()
+        lform = LinearForm(space)
+        lform.add_integrator(ScalarSourceIntegrator(f))
+        F = lform.assembly()
+
+        NC = mesh.number_of_cells()
+        parts = bm.arange(NC, dtype=bm.int64) % 3
+        bform = BilinearForm(space, num_workers=3, pool=pool)
+        bform.add_integrator(ScalarDiffusionIntegrator())
+        bform.add_integrator(ScalarMassIntegrator(coef=0.0),
+                             splitter=PartitionSplitter(3, parts=parts))
+        B = bform.assembly()
+        lform = LinearForm(space, num_workers=4, pool=pool)
+        lform.add_integrator(ScalarSourceIntegrator(f))
+        G = lform.assembly()
+
+        np.testing.assert_array_equal(bm.to_numpy(B.crow()), bm.to_numpy(A.crow()))
+        np.testing.assert_array_equal(bm.to_numpy(B.col()), bm.to_numpy(A.col()))
+        np.testing.assert_allclose(bm.to_numpy(B.values()), bm.to_numpy(A.values()), atol=1e-12)
+        np.testing.assert_allclose(bm.to_numpy(G), bm.to_numpy(F), atol=1e-12)
+
+    @pytest.mark.parametrize("pool", ['thread', 'process', 'executor'])
+    def test_reuse_workers(self, pool):
+        from concurrent.futures import ThreadPoolExecutor
+        bm.set_backend('numpy')
+
+        mesh = TriangleMesh.from_box(nx=6, ny=6)
+        space = LagrangeFESpace(mesh, 2)
+        velocity = cartesian(lambda p: bm.stack([p[..., 1], -p[..., 0]], axis=-1))
+
+        def assemble(coef, **kwargs):
+            bform = BilinearForm(space, **kwargs)
+            bform.add_integrator(ScalarConvectionIntegrator(velocity))
+            bform.add_integrator(ScalarMassIntegrator(coef=coef))
+            bform.add_integrator(ScalarRobinBCIntegrator(coef=1.0))
+            return bform, bm.to_numpy(bform.assembly().to_dense())
+
+        executor = ThreadPoolExecutor(2) if pool == 'executor' else None
+        bform, A = assemble(1.0, num_workers=2, pool=executor or pool)
+        workers = bform._workers._executor
+        np.testing.assert_allclose(A, assemble(1.0)[1], atol=1e-12)
+        np.testing.assert_allclose(bm.to_numpy(bform.assembly().to_dense()), A, atol=1e-12)
+        assert bform._workers._executor is workers
+
+        # the process workers are forked again for the new coefficient
+        bform.integrators['_group_1'].coef = 3.0
+        B = bm.to_numpy(bform.assembly().to_dense())
+        np.testing.assert_allclose(B, assemble(3.0)[1], atol=1e-12)
+        if pool == 'process':
+            assert bform._workers._executor is not workers
+        elif pool == 'thread':
+            assert bform._workers._executor is workers
+        else:
+            assert bform._workers.executor(bform) is executor
+        bform.close()
+        if executor is not None:
+            executor.shutdown()
+
 
 if __name__ == "__main__":
     pytest.main(['./test_bilinear_form.py', '-k', 'test_matmul'])
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+import pytest
+
+
+# The budget of `import fealpy; from fealpy.fem import BilinearForm` in seconds,
+# which is about 0.5 without scipy and sympy, and 1.4 with them.
+IMPORT_BUDGET = 1.0
+
+
+def _run(code: str) -> str:
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                            text=True, check=True)
+    return result.stdout.strip()
+
+
+class TestLazyImport:
+    def test_heavy_modules(self):
+        out = _run(
+            "import sys\n"
+            "import fealpy\n"
+            "from fealpy.fem import BilinearForm\n"
+            "from fealpy.functionspace import LagrangeFESpace\n"
+            "print(' '.join(m for m in ('sympy', 'scipy', 'jax', 'jax_md') if m in sys.modules))"
+        )
+        assert out == ''
+
+    def test_import_time(self):
+        times = [float(_run(
+            "import time\n"
+            "start = time.perf_counter()\n"
+            "import fealpy\n"
+            "from fealpy.fem import BilinearForm\n"
+            "print(time.perf_counter() - start)"
+        )) for _ in range(3)]
+        assert min(times) < IMPORT_BUDGET
+
+    @pytest.mark.parametrize('package, name', [
+        ('fealpy.mesh', 'TriangleMesh'),
+        ('fealpy.mesh', 'UniformMesh2d'),
+        ('fealpy.functionspace', 'BernsteinFESpace'),
+        ('fealpy.functionspace', 'CmConformingFESpace2d'),
+        ('fealpy.fem', 'ScalarInteriorPenaltyIntegrator'),
+    ])
+    def test_lazy_attributes(self, package, name):
+        from importlib import import_module
+        module = import_module(package)
+        assert name in dir(module)
+        value = getattr(module, name)
+        assert value.__name__ == name
+        assert vars(module)[name] is value
+        with pytest.raises(AttributeError):
+            getattr(module, name + 'NotExist')
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_lazy_import.py", "-q"])
@@ -0,0 +1,70 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import TransferOperator
+
+
+def _integral(uh):
+    mesh = uh.space.mesh
+    bcs, ws = mesh.quadrature_formula(5).get_quadrature_points_and_weights()
+    return float(bm.einsum('q, cq, c ->', ws, uh(bcs), mesh.entity_measure('cell')))
+
+
+def _quadratic(p):
+    return p[..., 0]**2 - 2*p[..., 0]*p[..., 1] + p[..., 1]
+
+
+class TestTransferOperator:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('method', ['interpolation', 'projection'])
+    @pytest.mark.parametrize('meshes', [
+        lambda: (TriangleMesh.from_box(nx=5, ny=4), TriangleMesh.from_box(nx=3, ny=7)),
+        lambda: (TetrahedronMesh.from_box(nx=2, ny=3, nz=2),
+                 TetrahedronMesh.from_box(nx=3, ny=2, nz=2)),
+    ])
+    def test_exact(self, backend, method, meshes):
+        bm.set_backend(backend)
+        mesh0, mesh1 = meshes()
+        # quadratic functions are reproduced by both methods
+        s0 = LagrangeFESpace(mesh0, p=2)
+        s1 = LagrangeFESpace(mesh1, p=2)
+        T = TransferOperator(s0, s1, method)
+        assert T.matrix.shape == (s1.number_of_global_dofs(), s0.number_of_global_dofs())
+        u1 = T(s0.interpolate(_quadratic))
+        np.testing.assert_allclose(bm.to_numpy(u1.array),
+                                   bm.to_numpy(s1.interpolate(_quadratic).array), atol=1e-12)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('p', [(1, 1), (2, 1), (1, 2)])
+    @pytest.mark.parametrize('lumped', [False, True])
+    def test_conservative(self, backend, p, lumped):
+        bm.set_backend(backend)
+        if lumped and p[1] != 1:
+            pytest.skip("the lumped projection requires linear target spaces.")
+        mesh0 = TriangleMesh.from_box(nx=6, ny=5)
+        mesh1 = TriangleMesh.from_box(nx=4, ny=7)
+        s0 = LagrangeFESpace(mesh0, p=p[0])
+        s1 = LagrangeFESpace(mesh1, p=p[1])
+        u0 = s0.interpolate(lambda p: bm.sin(3*p[..., 0]) * bm.exp(p[..., 1]))
+        T = TransferOperator(s0, s1, 'projection', lumped=lumped)
+        u1 = T(u0)
+        assert abs(_integral(u1) - _integral(u0)) < 1e-12
+        # the transfer is reused for other functions
+        u0 = u0 + 1.
+        assert abs(_integral(T(u0)) - _integral(u0)) < 1e-12
+
+    def test_lumped_error(self):
+        bm.set_backend('numpy')
+        space = LagrangeFESpace(TriangleMesh.from_box(nx=2, ny=2), p=2)
+        with pytest.raises(ValueError):
+            TransferOperator(space, space, 'projection', lumped=True)
+        with pytest.raises(ValueError):
+            TransferOperator(space, space, 'average')
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_transfer_operator.py"])
@@ -0,0 +1,107 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator
+
+
+def _set_backend(backend):
+    bm.set_backend(backend)
+    if backend == 'pytorch':
+        bm.set_default_device('cpu')
+
+
+def _int64_mesh(Mesh, box):
+    mesh = Mesh.from_box(**box)
+    return Mesh(mesh.entity('node'), bm.astype(mesh.entity('cell'), bm.int64))
+
+
+def _stiffness(mesh):
+    space = LagrangeFESpace(mesh, p=2)
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator(q=3))
+    return bform.assembly(format='coo').to_dense()
+
+
+class TestCompact:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('Mesh, box', [
+        (TriangleMesh, dict(nx=4, ny=3)),
+        (TetrahedronMesh, dict(nx=2, ny=2, nz=3)),
+    ])
+    def test_index(self, backend, Mesh, box):
+        _set_backend(backend)
+        mesh = _int64_mesh(Mesh, box)
+        assert mesh.face2cell.dtype == bm.int64
+        face2cell = bm.to_numpy(mesh.face2cell)
+        cell2edge = bm.to_numpy(mesh.cell2edge)
+        A = bm.to_numpy(_stiffness(mesh))
+        before = mesh.memory_usage()
+
+        after = mesh.compact(pack_local=True)
+        assert mesh.itype == bm.int32
+        for name in ['cell', 'face', 'edge', 'face2cell', 'cell2face', 'cell2edge']:
+            assert getattr(mesh, name).dtype == bm.int32
+        np.testing.assert_array_equal(bm.to_numpy(mesh.face2cell), face2cell)
+        np.testing.assert_array_equal(bm.to_numpy(mesh.face_to_cell()), face2cell)
+        np.testing.assert_array_equal(bm.to_numpy(mesh.cell2edge), cell2edge)
+        assert after['face2cell'] == face2cell.shape[0] * (2*4 + 2)
+        assert after['total'] < 0.6 * before['total']
+        np.testing.assert_allclose(bm.to_numpy(_stiffness(mesh)), A, atol=1e-12)
+
+        report = mesh.memory_report()
+        assert 'face2cell' in report and 'int8' in report
+
+        # a new construction creates the relations in the new itype
+        mesh.construct()
+        assert mesh.face2cell.dtype == bm.int32
+        np.testing.assert_array_equal(bm.to_numpy(mesh.face2cell), face2cell)
+        assert mesh.memory_usage()['face2cell'] == face2cell.size * 4
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_node_dtype(self, backend):
+        _set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=4, ny=4)
+        A = bm.to_numpy(_stiffness(mesh))
+        mesh.compact(node_dtype=bm.float32)
+
+        assert mesh.storage()[0].dtype == bm.float32
+        assert mesh.entity('node').dtype == bm.float64
+        assert mesh.node.dtype == bm.float64
+        assert mesh.entity_measure('cell').dtype == bm.float64
+        # the coordinates of the box mesh are exact in float32
+        np.testing.assert_allclose(bm.to_numpy(_stiffness(mesh)), A, atol=1e-12)
+
+        mesh.bisect(None)
+        assert mesh.storage()[0].dtype == bm.float32
+        assert mesh.node.dtype == bm.float64
+        np.testing.assert_allclose(float(bm.sum(mesh.entity_measure('cell'))), 1.0)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_write_after_compact(self, backend):
+        _set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=4, ny=4)
+        mesh.compact(pack_local=True, node_dtype=bm.float32)
+
+        # writes into the temporary copies are not lost silently
+        with pytest.raises((ValueError, RuntimeError)):
+            mesh.node[:, 0] += 10
+        with pytest.raises((ValueError, RuntimeError)):
+            mesh.node[0] = bm.tensor([0.5, 0.5], dtype=bm.float64)
+        with pytest.raises((ValueError, RuntimeError)):
+            mesh.face2cell[0, 2] = 5
+        assert float(bm.max(mesh.node[:, 0])) == 1.0
+
+        mesh.node = mesh.node + bm.tensor([10.0, 0.0], dtype=bm.float64)
+        assert mesh.storage()[0].dtype == bm.float32
+        np.testing.assert_allclose(float(bm.max(mesh.node[:, 0])), 11.0)
+        mesh.storage()[0][:, 1] *= 2
+        np.testing.assert_allclose(float(bm.max(mesh.node[:, 1])), 2.0)
+        np.testing.assert_allclose(float(bm.sum(mesh.entity_measure('cell'))), 2.0)
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_compact_storage.py"])
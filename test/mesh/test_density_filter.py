@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import UniformMesh2d, UniformMesh3d, TriangleMesh, TetrahedronMesh
+from fealpy.mesh import DensityFilter, filter_stencil
+
+
+def _brute_force(mesh, radius):
+    """The dense filter matrix max(0, r - |c_i - c_j|) of the barycenters."""
+    bc = bm.to_numpy(mesh.entity_barycenter('cell'))
+    dist = np.sqrt(np.sum((bc[:, None] - bc[None, :])**2, axis=-1))
+    return np.maximum(radius - dist, 0.0)
+
+
+def _loops_2d(nx, ny, rmin):
+    """The filter matrix by the loops over the cells, ordered y -> x."""
+    H = np.zeros((nx*ny, nx*ny))
+    r = int(np.ceil(rmin))
+    for i in range(nx):
+        for j in range(ny):
+            for k in range(max(i - (r - 1), 0), min(i + r, nx)):
+                for l in range(max(j - (r - 1), 0), min(j + r, ny)):
+                    H[i*ny + j, k*ny + l] = max(0.0, rmin - np.sqrt((i - k)**2 + (j - l)**2))
+    return H
+
+
+MESHES = {
+    'uniform2d': lambda: UniformMesh2d((0, 12, 0, 7), h=(0.5, 0.25)),
+    'uniform3d': lambda: UniformMesh3d((0, 6, 0, 5, 0, 4), h=(1.0, 0.5, 0.5)),
+    'triangle': lambda: TriangleMesh.from_box([0, 1, 0, 1], nx=8, ny=8),
+    'tetrahedron': lambda: TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], nx=3, ny=3, nz=3),
+}
+
+
+class TestDensityFilter:
+    def test_filter_stencil(self):
+        offset, weight = filter_stencil([1.0, 1.0], 1.5)
+        assert offset.shape == (9, 2)
+        np.testing.assert_allclose(bm.to_numpy(weight)[4], 1.5)
+        offset, weight = filter_stencil([1.0, 1.0, 1.0], 1.5)
+        assert offset.shape == (19, 3)
+        with pytest.raises(ValueError):
+            filter_stencil([1.0, 1.0], 0.0)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_legacy_loops(self, backend):
+        bm.set_backend(backend)
+        mesh = UniformMesh2d((0, 9, 0, 6))
+        filter = DensityFilter(mesh, 2.5, method='matrix')
+        H = bm.to_numpy(filter.matrix().to_dense())
+        np.testing.assert_allclose(H, _loops_2d(9, 6, 2.5), atol=1e-14)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('name', list(MESHES))
+    @pytest.mark.parametrize('method', ['auto', 'matrix', 'stencil', 'fft'])
+    def test_apply(self, backend, name, method):
+        if backend == 'pytorch' and name == 'uniform3d':
+            pytest.skip("UniformMesh3d can not be constructed with pytorch.")
+        bm.set_backend(backend)
+        mesh = MESHES[name]()
+        radius = 1.2 if name.startswith('uniform') else 0.3
+        if (not name.startswith('uniform')) and method in ('stencil', 'fft'):
+            with pytest.raises(ValueError):
+                DensityFilter(mesh, radius, method=method)
+            return
+        filter = DensityFilter(mesh, radius, method=method)
+        H = _brute_force(mesh, radius)
+        NC = mesh.number_of_cells()
+        x = np.random.default_rng(0).random(NC)
+        np.testing.assert_allclose(bm.to_numpy(filter.apply(bm.tensor(x))), H @ x, atol=1e-12)
+        np.testing.assert_allclose(bm.to_numpy(filter.row_sum()), H.sum(axis=1), atol=1e-12)
+        np.testing.assert_allclose(bm.to_numpy(filter.matrix().to_dense()), H, atol=1e-12)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('name', ['uniform2d', 'triangle'])
+    def test_filter_gradient(self, backend, name):
+        bm.set_backend(backend)
+        mesh = MESHES[name]()
+        radius = 1.2 if name.startswith('uniform') else 0.3
+        filter = DensityFilter(mesh, radius)
+        NC = mesh.number_of_cells()
+        rng = np.random.default_rng(0)
+        x, g = bm.tensor(rng.random(NC)), bm.tensor(rng.random(NC))
+        ones = bm.ones((NC,), dtype=bm.float64)
+        np.testing.assert_allclose(bm.to_numpy(filter.filter(ones)), 1.0)
+        # the gradient is the adjoint of the filter
+        np.testing.assert_allclose(float(bm.sum(filter.filter(x) * g)),
+                                   float(bm.sum(x * filter.filter_gradient(g))))
+
+    def test_auto(self):
+        bm.set_backend('numpy')
+        mesh = UniformMesh3d((0, 8, 0, 8, 0, 8))
+        assert DensityFilter(mesh, 1.5).method == 'stencil'
+        assert DensityFilter(mesh, 3.0).method == 'fft'
+        assert DensityFilter(MESHES['triangle'](), 0.2).method == 'matrix'
+        with pytest.raises(ValueError):
+            DensityFilter(mesh, 1.5, method='conv')
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_density_filter.py", "-q"])
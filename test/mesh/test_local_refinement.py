@@ -0,0 +1,150 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh
+
+
+def _set_backend(backend):
+    bm.set_backend(backend)
+    if backend == 'pytorch':
+        bm.set_default_device('cpu')
+
+
+def _assert_same_topology(mesh):
+    """The topology of the mesh is the same as the one constructed from scratch."""
+    other = mesh.__class__(mesh.entity('node'), mesh.entity('cell'))
+    names = ['face', 'face2cell', 'cell2face', 'edge', 'cell2edge']
+    for name in names:
+        a, b = getattr(mesh, name), getattr(other, name)
+        assert a.dtype == b.dtype
+        np.testing.assert_array_equal(bm.to_numpy(a), bm.to_numpy(b), err_msg=name)
+
+
+def _marker(mesh, r=0.3):
+    bc = mesh.entity_barycenter('cell')
+    return bm.sum(bc**2, axis=1) < r**2
+
+
+class TestConstructUpdate:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('Mesh, box', [
+        (TriangleMesh, dict(nx=5, ny=4)),
+        (TetrahedronMesh, dict(nx=3, ny=2, nz=2)),
+    ])
+    def test_changed(self, backend, Mesh, box):
+        _set_backend(backend)
+        mesh = Mesh.from_box(**box)
+        node = bm.to_numpy(mesh.entity('node'))
+        cell = bm.to_numpy(mesh.entity('cell')).copy()
+        NN, NC, TD = node.shape[0], cell.shape[0], mesh.TD
+
+        # split cell 3 at its barycenter
+        c = cell[3].copy()
+        node = np.concatenate([node, node[c].mean(axis=0, keepdims=True)])
+        new = np.repeat(c[None, :], TD, axis=0)
+        new[np.arange(TD), np.arange(1, TD+1)] = NN
+        cell[3, 0] = NN
+        cell = np.concatenate([cell, new])
+        mesh.node = bm.tensor(node)
+        mesh.cell = bm.tensor(cell, dtype=mesh.itype)
+        mesh.construct(changed=bm.tensor([3], dtype=mesh.itype))
+        _assert_same_topology(mesh)
+
+        # merge back and remove the appended cells
+        cell_map = bm.concat([bm.arange(NC, dtype=mesh.itype),
+                              bm.full((TD,), -1, dtype=mesh.itype)])
+        cell = cell[:NC]
+        cell[3] = c
+        mesh.cell = bm.tensor(cell, dtype=mesh.itype)
+        mesh.construct(changed=bm.tensor([3], dtype=mesh.itype), cell_map=cell_map)
+        _assert_same_topology(mesh)
+        assert mesh.number_of_cells() == NC
+
+
+class TestTriangleBisect:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_bisect_coarsen(self, backend):
+        _set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=4, ny=4)
+        NC0 = mesh.number_of_cells()
+
+        for _ in range(4):
+            NN = mesh.number_of_nodes()
+            u = mesh.entity('node')[:, 0] + 2*mesh.entity('node')[:, 1]
+            options = mesh.bisect_options(data={'u': u}, IM=True, HB=True, disp=False)
+            mesh.bisect(_marker(mesh), options=options)
+            _assert_same_topology(mesh)
+
+            node = mesh.entity('node')
+            v = node[:, 0] + 2*node[:, 1]
+            np.testing.assert_allclose(bm.to_numpy(options['data']['u']), bm.to_numpy(v))
+            np.testing.assert_allclose(bm.to_numpy(options['IM'] @ u), bm.to_numpy(v))
+            assert options['IM'].shape == (mesh.number_of_nodes(), NN)
+            assert options['HB'].shape == (mesh.number_of_cells(),)
+
+        np.testing.assert_allclose(float(bm.sum(mesh.entity_measure('cell'))), 1.0)
+        assert bm.all(mesh.entity_measure('cell') > 0)
+
+        for _ in range(4):
+            mesh.coarsen(bm.ones((mesh.number_of_cells(),), dtype=bm.bool))
+            _assert_same_topology(mesh)
+        assert mesh.number_of_cells() < NC0 * 2
+        np.testing.assert_allclose(float(bm.sum(mesh.entity_measure('cell'))), 1.0)
+
+
+class TestTetrahedronBisect:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_bisect(self, backend):
+        _set_backend(backend)
+        mesh = TetrahedronMesh.from_box(nx=3, ny=3, nz=3)
+        NC0 = mesh.number_of_cells()
+
+        for _ in range(3):
+            NN = mesh.number_of_nodes()
+            u = mesh.entity('node') @ bm.tensor([1., 2., 3.], dtype=bm.float64)
+            IM = mesh.bisect(_marker(mesh, 0.5), returnim=True, options={'disp': False})
+            _assert_same_topology(mesh)
+            v = mesh.entity('node') @ bm.tensor([1., 2., 3.], dtype=bm.float64)
+            assert IM.shape == (mesh.number_of_nodes(), NN)
+            np.testing.assert_allclose(bm.to_numpy(IM @ u), bm.to_numpy(v))
+
+        # conforming: every face is shared by two cells or on the boundary
+        face2cell = bm.to_numpy(mesh.face_to_cell())
+        isBdFace = face2cell[:, 0] == face2cell[:, 1]
+        np.testing.assert_allclose(bm.to_numpy(mesh.entity_measure('face'))[isBdFace].sum(), 6.0)
+        np.testing.assert_allclose(float(bm.sum(mesh.entity_measure('cell'))), 1.0)
+        assert bm.all(mesh.entity_measure('cell') > 0)
+        assert mesh.number_of_cells() > NC0
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_hb(self, backend):
+        _set_backend(backend)
+        mesh = TetrahedronMesh.from_box(nx=2, ny=2, nz=2)
+        node0 = mesh.entity('node')
+        cell0 = mesh.entity('cell')
+        u = node0 @ bm.tensor([1., -1., 2.], dtype=bm.float64)
+        H = bm.arange(mesh.number_of_cells(), dtype=bm.float64)
+        options = mesh.bisect_options(data={'nodedata': [u], 'celldata': [H]}, HB=True)
+        options['disp'] = False
+        mesh.bisect(_marker(mesh, 0.6), options=options)
+
+        HB = options['HB']
+        NC = mesh.number_of_cells()
+        np.testing.assert_array_equal(bm.to_numpy(HB[:, 0]), np.arange(NC))
+        np.testing.assert_array_equal(bm.to_numpy(options['data']['celldata'][0]),
+                                      bm.to_numpy(H[HB[:, 1]]))
+        v = mesh.entity('node') @ bm.tensor([1., -1., 2.], dtype=bm.float64)
+        np.testing.assert_allclose(bm.to_numpy(options['data']['nodedata'][0]),
+                                   bm.to_numpy(v), atol=1e-12)
+
+        # the children are in their parents
+        volume = bm.to_numpy(mesh.entity_measure('cell'))
+        parent_volume = np.zeros(cell0.shape[0])
+        np.add.at(parent_volume, bm.to_numpy(HB[:, 1]), volume)
+        np.testing.assert_allclose(parent_volume, 1/48)
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_local_refinement.py"])
@@ -0,0 +1,89 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh, MeshPartition, partition_cells
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator, subdomain_assembly
+
+
+def _build(mesh):
+    space = LagrangeFESpace(mesh, p=2)
+    return BilinearForm(space).add_integrator(ScalarDiffusionIntegrator(q=4))
+
+
+class TestMeshPartition:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_partition_cells(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=16, ny=16)
+        parts = bm.to_numpy(partition_cells(mesh, 6, method='hilbert'))
+        counts = np.bincount(parts, minlength=6)
+        assert counts.sum() == mesh.number_of_cells()
+        assert counts.max() - counts.min() <= 1
+
+        with pytest.raises(ValueError):
+            partition_cells(mesh, 0)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('overlap', [0, 1, 2])
+    def test_subdomain(self, backend, overlap):
+        bm.set_backend(backend)
+        mesh = TetrahedronMesh.from_box([0, 1, 0, 1, 0, 1], nx=4, ny=4, nz=4)
+        partition = MeshPartition(mesh, 4, overlap=overlap, method='hilbert')
+        cell = bm.to_numpy(mesh.entity('cell'))
+        node = bm.to_numpy(mesh.entity('node'))
+        parts = bm.to_numpy(partition.parts)
+        owned = []
+
+        for i in range(4):
+            sub = partition.subdomain(i)
+            cells = bm.to_numpy(sub.cell)
+            assert np.all(parts[cells[:sub.num_owned]] == i)
+            assert np.all(parts[cells[sub.num_owned:]] != i)
+            # the local mesh maps back to the global cells and nodes
+            local = bm.to_numpy(sub.mesh.entity('cell'))
+            l2g = bm.to_numpy(sub.node)
+            np.testing.assert_array_equal(l2g[local], cell[cells])
+            np.testing.assert_allclose(bm.to_numpy(sub.mesh.entity('node')), node[l2g])
+            owned.append(cells[:sub.num_owned])
+
+            if overlap > 0:
+                # every cell sharing a node with the owned cells is a ghost
+                touch = np.isin(cell, cell[parts == i]).any(axis=1)
+                assert np.all(np.isin(np.nonzero(touch)[0], cells))
+
+        np.testing.assert_array_equal(np.sort(np.concatenate(owned)),
+                                      np.arange(mesh.number_of_cells()))
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_dofs(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=8, ny=8)
+        space = LagrangeFESpace(mesh, p=2)
+        partition = MeshPartition(mesh, 4, overlap=1, method='hilbert')
+        dofs = partition.subdomain_dofs(space)
+        owner = bm.to_numpy(partition.dof_owner(space))
+        gdof = space.number_of_global_dofs()
+        assert np.all(np.isin(np.arange(gdof), np.concatenate([bm.to_numpy(d) for d in dofs])))
+        for i, d in enumerate(dofs):
+            assert np.all(np.isin(np.nonzero(owner == i)[0], bm.to_numpy(d)))
+
+        sub = partition.subdomain(1)
+        local_space = LagrangeFESpace(sub.mesh, p=2)
+        l2g = partition.local_to_global_dofs(space, sub, local_space)
+        ipoints = bm.to_numpy(space.interpolation_points())
+        local_ipoints = bm.to_numpy(local_space.interpolation_points())
+        np.testing.assert_allclose(ipoints[bm.to_numpy(l2g)], local_ipoints)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('num_workers', [0, 2])
+    def test_subdomain_assembly(self, backend, num_workers):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=8, ny=8)
+        space = LagrangeFESpace(mesh, p=2)
+        partition = MeshPartition(mesh, 4, method='hilbert')
+        A = subdomain_assembly(partition, space, _build, num_workers=num_workers)
+        B = _build(mesh).assembly()
+        np.testing.assert_allclose(A.to_scipy().toarray(), B.to_scipy().toarray(), atol=1e-12)
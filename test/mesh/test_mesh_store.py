@@ -0,0 +1,101 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import (TriangleMesh, QuadrangleMesh, TetrahedronMesh,
+                         HexahedronMesh, MeshStore)
+from fealpy.mesh.mesh_store import _append_rows
+from fealpy.functionspace import LagrangeFESpace
+
+
+def _set_backend(backend):
+    bm.set_backend(backend)
+    if backend == 'pytorch':
+        bm.set_default_device('cpu')
+
+
+class TestMeshStore:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('Mesh, box', [
+        (TriangleMesh, dict(nx=3, ny=2)),
+        (QuadrangleMesh, dict(nx=3, ny=2)),
+        (TetrahedronMesh, dict(nx=2, ny=1, nz=2)),
+        (HexahedronMesh, dict(nx=2, ny=1, nz=2)),
+    ])
+    @pytest.mark.parametrize('topology', [True, False])
+    def test_mesh(self, tmp_path, backend, Mesh, box, topology):
+        _set_backend(backend)
+        mesh = Mesh.from_box(**box)
+        mesh.nodedata['x'] = mesh.entity('node')[:, 0]
+        mesh.celldata['id'] = bm.arange(mesh.number_of_cells())
+        store = MeshStore(str(tmp_path), 'w')
+        store.save_mesh(mesh, topology=topology)
+
+        other = MeshStore(str(tmp_path)).load_mesh()
+        assert type(other) is Mesh
+        names = ['node', 'cell', 'edge', 'face', 'face2cell', 'cell2face', 'cell2edge']
+        for name in names:
+            a, b = getattr(mesh, name), getattr(other, name)
+            assert a.dtype == b.dtype
+            np.testing.assert_array_equal(bm.to_numpy(a), bm.to_numpy(b), err_msg=name)
+        for group in ['nodedata', 'celldata']:
+            for k, v in getattr(mesh, group).items():
+                np.testing.assert_array_equal(bm.to_numpy(getattr(other, group)[k]), bm.to_numpy(v))
+        np.testing.assert_allclose(bm.to_numpy(other.entity_measure('cell')),
+                                   bm.to_numpy(mesh.entity_measure('cell')))
+        if Mesh is TriangleMesh:
+            # the loaded mesh works with the refinement
+            options = mesh.bisect_options(disp=False)
+            mesh.bisect(None, options=options)
+            other.bisect(None, options=options)
+            np.testing.assert_array_equal(bm.to_numpy(other.face2cell), bm.to_numpy(mesh.face2cell))
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_series(self, tmp_path, backend):
+        _set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=2, ny=2)
+        space = LagrangeFESpace(mesh, p=2)
+        store = MeshStore(str(tmp_path), 'w')
+        store.save_mesh(mesh)
+        for k in range(3):
+            uh = space.interpolate(lambda p: k * p[..., 0] + p[..., 1])
+            assert store.append('uh', uh, time=0.1*k) == k + 1
+            store.append('flux', bm.zeros((2, mesh.number_of_nodes())) + k)
+        with pytest.raises(ValueError):
+            store.append('uh', bm.zeros((3,)))
+
+        store = MeshStore(str(tmp_path), 'a')
+        store.append('uh', space.function())
+        assert store.fields() == ['uh', 'flux']
+        np.testing.assert_allclose(bm.to_numpy(store.times('uh')), [0., 0.1, 0.2, 3.])
+        np.testing.assert_allclose(bm.to_numpy(store.times('flux')), [0., 1., 2.])
+        series = store.load('uh')
+        assert series.shape == (4, space.number_of_global_dofs())
+        uh = space.function(store.load('uh', step=2))
+        ips = space.interpolation_points()
+        np.testing.assert_allclose(bm.to_numpy(uh.array), bm.to_numpy(2*ips[:, 0] + ips[:, 1]))
+        assert store.load('flux', step=slice(1, None), mmap=False).shape == (2, 2, 9)
+
+        store = MeshStore(str(tmp_path), 'r')
+        with pytest.raises(RuntimeError):
+            store.append('uh', uh)
+        store = MeshStore(str(tmp_path), 'w')
+        assert store.fields() == []
+        assert not (tmp_path / 'fields' / 'uh.npy').exists()
+
+    def test_interrupted_append(self, tmp_path):
+        fname = str(tmp_path / 'rows.npy')
+        rows = np.arange(12, dtype=np.float64).reshape(4, 3)
+        assert _append_rows(fname, rows[:2]) == 2
+        # an append interrupted before the header is updated
+        with open(fname, 'ab') as fp:
+            fp.write(np.full(4, -1.0).tobytes())
+        np.testing.assert_array_equal(np.load(fname), rows[:2])
+
+        assert _append_rows(fname, rows[2:]) == 4
+        np.testing.assert_array_equal(np.load(fname), rows)
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_mesh_store.py"])
@@ -0,0 +1,63 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import NeighborSearch, neighbor_pairs
+
+
+def _brute_force(points, cutoff, box=None, include_self=False):
+    dr = points[:, None] - points[None, :]
+    if box is not None:
+        dr -= box * np.floor(dr / box + 0.5)
+    flag = np.sum(dr**2, axis=-1) < cutoff**2
+    if not include_self:
+        np.fill_diagonal(flag, False)
+    return flag
+
+
+def _to_dense(indptr, index, NN):
+    indptr, index = bm.to_numpy(indptr), bm.to_numpy(index)
+    flag = np.zeros((NN, NN), dtype=np.bool_)
+    flag[np.repeat(np.arange(NN), np.diff(indptr)), index] = True
+    return flag
+
+
+class TestNeighborSearch:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('GD', [2, 3])
+    @pytest.mark.parametrize('box', [None, 1.0, 'rect'])
+    @pytest.mark.parametrize('cutoff', [0.08, 0.45])
+    def test_build(self, backend, GD, box, cutoff):
+        bm.set_backend(backend)
+        if box == 'rect':
+            box = np.array([1.0, 0.6, 0.8][:GD])
+        rng = np.random.default_rng(0)
+        points = rng.random((300, GD)) * (1.0 if box is None else box)
+        indptr, index = neighbor_pairs(bm.tensor(points), cutoff, box)
+        assert indptr.shape == (301,)
+        np.testing.assert_array_equal(_to_dense(indptr, index, 300),
+                                      _brute_force(points, cutoff, box))
+        # the neighbors of each point are sorted
+        index = bm.to_numpy(index)
+        row = np.repeat(np.arange(300), np.diff(bm.to_numpy(indptr)))
+        assert np.all((row[1:] > row[:-1]) | (index[1:] > index[:-1]))
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_skin(self, backend):
+        bm.set_backend(backend)
+        rng = np.random.default_rng(1)
+        points = rng.random((500, 2))
+        search = NeighborSearch(0.1, 1.0, skin=0.02, include_self=True)
+        for step in range(10):
+            indptr, index = search.update(bm.tensor(points))
+            np.testing.assert_array_equal(_to_dense(indptr, index, 500),
+                                          _brute_force(points, 0.1, 1.0, True))
+            points = np.mod(points + 0.002 * rng.standard_normal(points.shape), 1.0)
+        assert 1 < search.rebuilds < 10
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            NeighborSearch(0.0)
+        with pytest.raises(ValueError):
+            NeighborSearch(0.1, skin=-1.0)
@@ -1,9 +1,7 @@
 
-import ipdb
 import matplotlib.pyplot as plt
 import pytest
 import numpy as np
-import jax.numpy as jnp
 from fealpy.mesh.node_mesh import NodeMesh
 from fealpy.backend import backend_manager as bm
 from node_mesh_data import *
@@ -36,19 +34,27 @@ class TestNodeMeshInterfaces:
         top = node_mesh.top_dimension()
         assert top == meshdata["top"]
     
-    @pytest.mark.parametrize("backend", ['numpy','jax'])
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch'])
     @pytest.mark.parametrize("meshdata", mesh_data)
     def test_neighbors(self, meshdata, backend):
         bm.set_backend(backend)
-        nodes = bm.from_numpy(meshdata["node_box"])
-        node_mesh = NodeMesh(nodes)
+        node = meshdata["node_box"]
+        node_mesh = NodeMesh(bm.from_numpy(node))
         index, indptr = node_mesh.neighbors(meshdata["box_size"], meshdata["cutoff"])
-        assert jnp.array_equal(index, meshdata["index"])
-        assert np.array_equal(index, meshdata["index"])
-        assert jnp.array_equal(indptr, meshdata["indptr"])
-        assert np.array_equal(indptr, meshdata["indptr"])
+        index, indptr = bm.to_numpy(index), bm.to_numpy(indptr)
+        # the periodic distances, including the particle itself
+        dr = node[:, None] - node[None, :]
+        dr -= meshdata["box_size"] * np.floor(dr / meshdata["box_size"] + 0.5)
+        dist = np.sqrt(np.sum(dr**2, axis=-1))
+        flag = np.zeros_like(dist, dtype=np.bool_)
+        flag[np.repeat(np.arange(node.shape[0]), np.diff(indptr)), index] = True
+        # the pairs at the cutoff distance are up to the rounding
+        tie = np.abs(dist - meshdata["cutoff"]) < 1e-12
+        np.testing.assert_array_equal(flag[~tie], (dist < meshdata["cutoff"])[~tie])
+        for k in range(node.shape[0]):
+            assert np.all(np.diff(index[indptr[k]:indptr[k+1]]) > 0)
 
-    @pytest.mark.parametrize("backend", ['numpy', 'jax'])
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch', 'jax'])
     @pytest.mark.parametrize("meshdata", mesh_data)
     def test_from_tgv_domain(self, meshdata, backend):
         bm.set_backend(backend)
@@ -57,7 +63,7 @@ class TestNodeMeshInterfaces:
         tgv_num = node.number_of_node()
         assert tgv_num == meshdata["tgv_num"]
         
-    @pytest.mark.parametrize("backend", ['numpy', 'jax'])
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch', 'jax'])
     @pytest.mark.parametrize("meshdata", mesh_data)
     def test_from_heat_transfer_domain(self, meshdata, backend):
         bm.set_backend(backend)
@@ -66,7 +72,7 @@ class TestNodeMeshInterfaces:
         ht_num = node.shape[0]
         assert ht_num == meshdata["ht_num"]
 
-    @pytest.mark.parametrize("backend", ['numpy', 'jax'])
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch', 'jax'])
     @pytest.mark.parametrize("meshdata", mesh_data)
     def test_from_four_heat_transfer_domain(self, meshdata, backend):
         bm.set_backend(backend)
@@ -75,7 +81,7 @@ class TestNodeMeshInterfaces:
         fht_num = node.shape[0]
         assert fht_num == meshdata["fht_num"]
     
-    @pytest.mark.parametrize("backend", ['numpy', 'jax'])
+    @pytest.mark.parametrize("backend", ['numpy', 'pytorch', 'jax'])
     @pytest.mark.parametrize("meshdata", mesh_data)
     def test_from_long_rectangular_cavity_domain(self, meshdata, backend):
         bm.set_backend(backend)
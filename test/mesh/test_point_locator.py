@@ -0,0 +1,103 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh, PointLocator
+from fealpy.functionspace import LagrangeFESpace
+
+
+MESHES = [
+    lambda: TriangleMesh.from_box(nx=7, ny=5),
+    lambda: TetrahedronMesh.from_box(nx=3, ny=4, nz=2),
+]
+
+
+def _points(GD, n=500):
+    # some of the points are outside the unit box
+    return bm.astype(bm.tensor(np.random.rand(n, GD) * 1.2 - 0.1), bm.float64)
+
+
+class TestPointLocator:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('mesh', MESHES)
+    @pytest.mark.parametrize('cells_per_bucket', [0.5, 4.])
+    def test_locate(self, backend, mesh, cells_per_bucket):
+        bm.set_backend(backend)
+        mesh = mesh()
+        GD = mesh.geo_dimension()
+        points = _points(GD)
+        locator = PointLocator(mesh, cells_per_bucket=cells_per_bucket)
+        cell, bc = locator.locate(points)
+
+        p = bm.to_numpy(points)
+        expected = np.all((p >= 0) & (p <= 1), axis=1)
+        inside = bm.to_numpy(cell) >= 0
+        np.testing.assert_array_equal(inside, expected)
+        assert np.all(np.isnan(bm.to_numpy(bc)[~inside]))
+
+        bc = bc[cell >= 0]
+        node = mesh.entity('node')[mesh.entity('cell')[cell[cell >= 0]]]
+        x = bm.einsum('pb, pbd -> pd', bc, node)
+        np.testing.assert_allclose(bm.to_numpy(x), p[inside], atol=1e-12)
+        assert np.all(bm.to_numpy(bc) >= -1e-12)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('mesh', MESHES)
+    def test_walk(self, backend, mesh):
+        bm.set_backend(backend)
+        mesh = mesh()
+        points = _points(mesh.geo_dimension())
+        cell = mesh.location(points)
+        # the walk starts from the cells of the points before moving
+        new_points = points + 0.05
+        new_cell, bc = mesh.point_to_bc(new_points, hint=cell)
+
+        inside = np.all((bm.to_numpy(new_points) >= 0) & (bm.to_numpy(new_points) <= 1), axis=1)
+        np.testing.assert_array_equal(bm.to_numpy(new_cell) >= 0, inside)
+        node = mesh.entity('node')[mesh.entity('cell')[new_cell[new_cell >= 0]]]
+        x = bm.einsum('pb, pbd -> pd', bc[new_cell >= 0], node)
+        np.testing.assert_allclose(bm.to_numpy(x), bm.to_numpy(new_points)[inside], atol=1e-12)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_non_convex(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=4, ny=4)
+        # remove the cells in the upper-right quarter to get an L-shaped domain
+        bary = mesh.entity_barycenter('cell')
+        keep = ~((bary[:, 0] > 0.5) & (bary[:, 1] > 0.5))
+        mesh = TriangleMesh(mesh.entity('node'), mesh.entity('cell')[keep])
+        points = bm.tensor([[0.25, 0.75], [0.75, 0.75], [0.75, 0.25]], dtype=bm.float64)
+        # walk from the lower-left cell across the hole
+        hint = bm.zeros((3,), dtype=mesh.itype)
+        cell = bm.to_numpy(mesh.location(points, hint=hint))
+        assert cell[0] >= 0 and cell[1] == -1 and cell[2] >= 0
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('mesh', MESHES)
+    def test_point_value(self, backend, mesh):
+        bm.set_backend(backend)
+        mesh = mesh()
+        space = LagrangeFESpace(mesh, p=2)
+        uh = space.interpolate(lambda p: p[..., 0]**2 - p[..., 0]*p[..., 1])
+        points = _points(mesh.geo_dimension(), 60)
+        val = bm.to_numpy(uh.point_value(bm.reshape(points, (3, 20, -1))))
+        assert val.shape == (3, 20)
+
+        p = bm.to_numpy(points)
+        expected = p[:, 0]**2 - p[:, 0]*p[:, 1]
+        expected[~np.all((p >= 0) & (p <= 1), axis=1)] = np.nan
+        np.testing.assert_allclose(val.reshape(-1), expected, atol=1e-12)
+
+    def test_cache(self):
+        bm.set_backend('numpy')
+        mesh = TriangleMesh.from_box(nx=2, ny=2)
+        mesh.cache_enabled = True
+        locator = mesh.point_locator()
+        assert mesh.point_locator() is locator
+        mesh.uniform_refine()
+        assert mesh.point_locator() is not locator
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_point_locator.py"])
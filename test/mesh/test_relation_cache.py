@@ -0,0 +1,95 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh
+
+
+class TestRelationCache:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_hits(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=2, ny=2)
+        mesh.cache_enabled = True
+        m0 = mesh.entity_measure('cell')
+        m1 = mesh.entity_measure(2)
+        assert mesh.cache_info()['hits'] == 1
+        assert mesh.cache_info()['misses'] == 1
+        np.testing.assert_allclose(bm.to_numpy(m0), bm.to_numpy(m1))
+
+        # modifying the results does not change the cache
+        flag = mesh.boundary_node_flag()
+        flag[:] = False
+        assert bm.any(mesh.boundary_node_flag())
+        assert mesh.cache_info()['entries'] >= 2
+        assert mesh.cache_info()['nbytes'] > 0
+
+        mesh.clear_cache()
+        assert mesh.cache_info()['entries'] == 0
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('mesh', [
+        lambda: TriangleMesh.from_box(nx=2, ny=3),
+        lambda: TetrahedronMesh.from_box(nx=2, ny=1, nz=1)
+    ])
+    def test_index(self, backend, mesh):
+        bm.set_backend(backend)
+        mesh = mesh()
+        NC = mesh.number_of_cells()
+        index = bm.tensor([1, 0, NC-1])
+
+        for idx in [slice(1, 3), index]:
+            mesh.cache_enabled = False
+            expected = [mesh.entity_measure('cell')[idx],
+                        mesh.entity_barycenter('cell')[idx],
+                        mesh.grad_lambda()[idx]]
+            mesh.cache_enabled = True
+            for _ in range(2):
+                results = [mesh.entity_measure('cell', index=idx),
+                           mesh.entity_barycenter('cell', index=idx),
+                           mesh.grad_lambda(index=idx)]
+                for r, e in zip(results, expected):
+                    np.testing.assert_allclose(bm.to_numpy(r), bm.to_numpy(e))
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_invalidation(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=2, ny=2)
+        mesh.cache_enabled = True
+        assert abs(float(bm.sum(mesh.entity_measure('cell'))) - 1) < 1e-12
+
+        mesh.node = 2 * mesh.node
+        assert abs(float(bm.sum(mesh.entity_measure('cell'))) - 4) < 1e-12
+
+        NC = mesh.number_of_cells()
+        mesh.uniform_refine()
+        assert mesh.entity_measure('cell').shape == (4*NC,)
+        assert mesh.cell_to_cell().shape == (4*NC, 3)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_inplace(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=2, ny=2)
+        assert not mesh.cache_enabled
+        assert abs(float(bm.sum(mesh.entity_measure('cell'))) - 1) < 1e-12
+
+        mesh.node[:, 0] *= 2
+        assert abs(float(bm.sum(mesh.entity_measure('cell'))) - 2) < 1e-12
+        assert mesh.cache_info()['entries'] == 0
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_memory_usage(self, backend):
+        bm.set_backend(backend)
+        mesh = TriangleMesh.from_box(nx=2, ny=2)
+        mesh.cache_enabled = True
+        usage = mesh.memory_usage()
+        assert usage['cache'] == 0
+        mesh.entity_measure('edge')
+        usage = mesh.memory_usage()
+        assert usage['cache'] == mesh.cache_info()['nbytes'] > 0
+        assert usage['total'] == sum(v for k, v in usage.items() if k != 'total')
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_relation_cache.py"])
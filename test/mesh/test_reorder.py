@@ -0,0 +1,116 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh, UniformMesh2d
+from fealpy.mesh import morton_order, hilbert_order, rcm_order, reorder_mesh
+from fealpy.mesh.reorder import node_graph
+from fealpy.functionspace import LagrangeFESpace
+
+
+def _set_backend(backend):
+    bm.set_backend(backend)
+    if backend == 'pytorch':
+        bm.set_default_device('cpu')
+
+
+def _shuffled(Mesh, box, seed=0):
+    mesh = Mesh.from_box(**box)
+    rng = np.random.default_rng(seed)
+    NN, NC = mesh.number_of_nodes(), mesh.number_of_cells()
+    node_order = bm.tensor(rng.permutation(NN), dtype=mesh.itype)
+    cell_order = bm.tensor(rng.permutation(NC), dtype=mesh.itype)
+    mesh.renumber(node_order, cell_order)
+    return mesh
+
+
+def _bandwidth(mesh):
+    edge = bm.to_numpy(mesh.entity('edge'))
+    return np.abs(edge[:, 0] - edge[:, 1]).max()
+
+
+class TestOrders:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('order', [morton_order, hilbert_order])
+    @pytest.mark.parametrize('GD', [2, 3])
+    def test_curve(self, backend, order, GD):
+        _set_backend(backend)
+        n = 8
+        grid = np.stack(np.meshgrid(*[np.arange(n)]*GD, indexing='ij'), axis=-1)
+        grid = grid.reshape(-1, GD)
+        perm = np.random.default_rng(1).permutation(grid.shape[0])
+        points = bm.tensor(grid[perm], dtype=bm.float64)
+
+        idx = bm.to_numpy(order(points, bits=3))
+        np.testing.assert_array_equal(np.sort(idx), np.arange(n**GD))
+        step = np.abs(np.diff(grid[perm][idx], axis=0)).sum(axis=1)
+        if order is hilbert_order:
+            # the Hilbert curve visits the grid points by unit steps
+            assert np.all(step == 1)
+        else:
+            assert np.all(step[::2] == 1)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_rcm(self, backend):
+        _set_backend(backend)
+        mesh = _shuffled(TriangleMesh, dict(nx=10, ny=10))
+        order = rcm_order(node_graph(mesh))
+        assert order.shape == (mesh.number_of_nodes(),)
+        bw = _bandwidth(mesh)
+        mesh.renumber(order)
+        assert _bandwidth(mesh) < bw / 4
+
+    def test_bits(self):
+        _set_backend('numpy')
+        with pytest.raises(ValueError):
+            morton_order(bm.zeros((4, 3)), bits=22)
+
+
+class TestReorderMesh:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('Mesh, box', [
+        (TriangleMesh, dict(nx=6, ny=5)),
+        (TetrahedronMesh, dict(nx=3, ny=3, nz=2)),
+    ])
+    @pytest.mark.parametrize('method', ['hilbert', 'morton', 'rcm'])
+    def test_functions(self, backend, Mesh, box, method):
+        _set_backend(backend)
+        mesh = _shuffled(Mesh, box)
+        measure = bm.sum(mesh.entity_measure('cell'))
+        mesh.celldata['measure'] = mesh.entity_measure('cell')
+        space1 = LagrangeFESpace(mesh, p=1)
+        space3 = LagrangeFESpace(mesh, p=3)
+        f = lambda p: bm.sin(3*p[..., 0]) * bm.cos(2*p[..., 1]) + p[..., -1]**2
+        uh1 = space1.interpolate(f)
+        uh3 = space3.interpolate(f)
+        uh3.array = bm.stack([uh3.array, 2*uh3.array])
+        points = bm.tensor(np.random.default_rng(2).random((20, mesh.GD)), dtype=bm.float64)
+        v1 = bm.to_numpy(space1.point_value(uh1.array, points))
+        v3 = bm.to_numpy(space3.point_value(uh3.array, points))
+        bw = _bandwidth(mesh)
+
+        node_order, cell_order = reorder_mesh(mesh, method, functions=[uh1, uh3])
+        assert node_order.shape == (mesh.number_of_nodes(),)
+        assert cell_order.shape == (mesh.number_of_cells(),)
+        assert _bandwidth(mesh) < bw
+        np.testing.assert_allclose(float(bm.sum(mesh.entity_measure('cell'))), float(measure))
+        np.testing.assert_allclose(bm.to_numpy(mesh.celldata['measure']),
+                                   bm.to_numpy(mesh.entity_measure('cell')))
+
+        # the functions are the same after renumbering
+        np.testing.assert_allclose(bm.to_numpy(space1.point_value(uh1.array, points)), v1)
+        np.testing.assert_allclose(bm.to_numpy(space3.point_value(uh3.array, points)), v3)
+        np.testing.assert_allclose(bm.to_numpy(uh1.array), bm.to_numpy(f(space1.interpolation_points())))
+
+    def test_structured(self):
+        _set_backend('numpy')
+        mesh = UniformMesh2d((0, 2, 0, 2), (0.5, 0.5))
+        with pytest.raises(RuntimeError):
+            reorder_mesh(mesh)
+        with pytest.raises(ValueError):
+            reorder_mesh(TriangleMesh.from_box(), 'peano')
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_reorder.py"])
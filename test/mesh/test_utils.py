@@ -3,7 +3,7 @@ import pytest
 
 import numpy as np
 from fealpy.backend import backend_manager as bm
-from fealpy.mesh.utils import inverse_relation
+from fealpy.mesh.utils import inverse_relation, flocc, flocc_keys, pack_sorted_rows, sort_rows
 
 inverse_relation_with_index_data = [
     {
@@ -62,3 +62,49 @@ def test_inverse_relation_with_flag(data, backend):
     assert bm.all(bm.equal(row, bm.from_numpy(data['row'])))
     assert bm.all(bm.equal(col, bm.from_numpy(data['col'])))
     assert spshape == data['spshape']
+
+
+@pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+@pytest.mark.parametrize('width', [2, 3, 4, 5])
+@pytest.mark.parametrize('base', [7, 2**40])
+def test_flocc_keys(backend, width, base):
+    bm.set_backend(backend)
+    rng = np.random.default_rng(0)
+    array = rng.integers(0, 7, size=(200, width)) * (base // 7)
+    array = bm.from_numpy(array)
+
+    sorted_array = sort_rows(array)
+    assert bm.all(sorted_array == bm.sort(array, axis=1))
+    keys = pack_sorted_rows(sorted_array, base)
+    assert len(keys) == (1 if base == 7 else width)
+
+    for a, b in zip(flocc_keys(keys), flocc(sorted_array)):
+        assert bm.all(a == b)
+
+
+@pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+@pytest.mark.parametrize('meshtype', ['tri', 'quad', 'tet', 'hex'])
+def test_construct_methods(backend, meshtype):
+    bm.set_backend(backend)
+    from fealpy.mesh import TriangleMesh, QuadrangleMesh, TetrahedronMesh, HexahedronMesh
+    if meshtype == 'tri':
+        mesh = TriangleMesh.from_box(nx=5, ny=4)
+    elif meshtype == 'quad':
+        mesh = QuadrangleMesh.from_box(nx=5, ny=4)
+    elif meshtype == 'tet':
+        mesh = TetrahedronMesh.from_box(nx=3, ny=2, nz=4)
+    else:
+        mesh = HexahedronMesh.from_box(nx=3, ny=2, nz=4)
+
+    results = []
+    for method in ['lexsort', 'packed']:
+        mesh.construct_chunk_size = 7 # several chunks
+        mesh.construct(method)
+        results.append([bm.to_numpy(getattr(mesh, name)).copy() for name in
+                        ['face', 'edge', 'face2cell', 'cell2face', 'cell2edge']])
+
+    for a, b in zip(*results):
+        np.testing.assert_array_equal(a, b)
+
+    with pytest.raises(ValueError):
+        mesh.construct('unknown')
@@ -0,0 +1,91 @@
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import CSRTensor
+from fealpy.solver import cg, AMGSolver
+from fealpy.solver.amg_solver import classical_strength, pmis_coarsen, mis2_aggregation
+
+
+def _set_backend(backend):
+    bm.set_backend(backend)
+    if backend == 'pytorch':
+        # NOTE: the GPU tests of other solvers may change the default device.
+        bm.set_default_device('cpu')
+
+
+def _laplacian(n: int):
+    T = sp.diags([-1., 2., -1.], [-1, 0, 1], shape=(n, n))
+    return (sp.kron(sp.eye(n), T) + sp.kron(T, sp.eye(n))).tocsr()
+
+
+def _residual(A, x, b):
+    x = bm.to_numpy(x)
+    return np.linalg.norm(A @ x - b) / np.linalg.norm(b)
+
+
+class TestAMGSolver:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_pmis_independent(self, backend):
+        _set_backend(backend)
+        A = CSRTensor.from_scipy(_laplacian(20))
+        strength = classical_strength(A, 0.25)
+        row, col = A.row()[strength], A.col()[strength]
+        is_c = pmis_coarsen(row, col, A.shape[0])
+        assert bm.any(is_c)
+        assert not bm.any(is_c[row] & is_c[col])
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_mis2_aggregation(self, backend):
+        _set_backend(backend)
+        A = CSRTensor.from_scipy(_laplacian(20))
+        off = A.row() != A.col()
+        agg = mis2_aggregation(A.row()[off], A.col()[off], A.shape[0])
+        agg = bm.to_numpy(agg)
+        assert np.all(agg >= 0)
+        sizes = np.bincount(agg)
+        assert np.all(sizes > 0)
+        assert sizes.max() <= 13 # the distance-2 neighborhood of the 5-point stencil
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('method', ['rs', 'sa'])
+    @pytest.mark.parametrize('cycle', ['V', 'W', 'F'])
+    def test_solve(self, backend, method, cycle):
+        _set_backend(backend)
+        A = _laplacian(40)
+        B = np.random.rand(A.shape[0], 2)
+        A_ = CSRTensor.from_scipy(A)
+        amg = AMGSolver(A_, method, cycle=cycle, coarse_size=50)
+        assert len(amg) > 2
+        assert amg.operator_complexity() < 2.5
+
+        x, info = amg.solve(bm.tensor(B), maxiter=200, rtol=1e-8, returninfo=True)
+        assert info['converged']
+        assert _residual(A, x, B) < 1e-7
+
+        x, info_pcg = cg(A_, bm.tensor(B[:, 0]), M=amg, returninfo=True)
+        _, info_cg = cg(A_, bm.tensor(B[:, 0]), returninfo=True)
+        assert info_pcg['converged']
+        assert _residual(A, x, B[:, 0]) < 1e-7
+        assert info_pcg['iters'] < info_cg['iters'] / 2
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_update(self, backend):
+        _set_backend(backend)
+        A = _laplacian(30)
+        amg = AMGSolver(CSRTensor.from_scipy(A), coarse_size=50)
+        P = amg.P[0]
+
+        A = A + sp.eye(A.shape[0]) # e.g. a mass matrix in time-stepping
+        b = np.random.rand(A.shape[0])
+        amg.update(CSRTensor.from_scipy(A.tocsr()))
+        assert amg.P[0] is P
+        x, info = cg(CSRTensor.from_scipy(A.tocsr()), bm.tensor(b), M=amg, returninfo=True)
+        assert info['converged']
+        assert _residual(A, x, b) < 1e-7
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_amg_solver.py", "-k", "test_solve"])
@@ -0,0 +1,114 @@
+import gc
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import COOTensor, CSRTensor
+from fealpy.solver import spsolve, factorize, Factorization, FactorizationCache
+
+
+def _set_backend(backend):
+    bm.set_backend(backend)
+    if backend == 'pytorch':
+        # NOTE: the GPU tests of other solvers may change the default device.
+        bm.set_default_device('cpu')
+
+
+def _matrix(n: int, shift: float=0.0):
+    T = sp.diags([-1., 2., -1.], [-1, 0, 1], shape=(n, n))
+    A = sp.kron(sp.eye(n), T) + sp.kron(T, sp.eye(n))
+    # a non-symmetric perturbation on the same pattern
+    A = A + sp.diags(np.full(n*n-1, 0.3), 1) + shift * sp.eye(n*n)
+    return A.tocsr()
+
+
+class TestFactorization:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('batch_first', [False, True])
+    def test_solve(self, backend, batch_first):
+        _set_backend(backend)
+        A = _matrix(8)
+        B = np.random.rand(A.shape[0], 3)
+        lu = Factorization(COOTensor.from_scipy(A.tocoo()), 'scipy')
+
+        x = lu.solve(bm.tensor(B[:, 0]))
+        np.testing.assert_allclose(A @ bm.to_numpy(x), B[:, 0], atol=1e-12)
+        b = bm.tensor(B.T) if batch_first else bm.tensor(B)
+        x = bm.to_numpy(lu.solve(b, batch_first=batch_first))
+        x = x.T if batch_first else x
+        np.testing.assert_allclose(A @ x, B, atol=1e-12)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_refactorize(self, backend):
+        _set_backend(backend)
+        A = _matrix(8)
+        b = np.random.rand(A.shape[0])
+        lu = Factorization(CSRTensor.from_scipy(A), 'scipy')
+        for shift in [1.0, 2.0]:
+            A1 = _matrix(8, shift)
+            lu.refactorize(CSRTensor.from_scipy(A1))
+            np.testing.assert_allclose(A1 @ bm.to_numpy(lu.solve(bm.tensor(b))), b, atol=1e-12)
+
+        with pytest.raises(ValueError):
+            lu.refactorize(CSRTensor.from_scipy(_matrix(7)))
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_cache(self, backend):
+        _set_backend(backend)
+        cache = FactorizationCache(maxsize=2)
+        A = CSRTensor.from_scipy(_matrix(6))
+        lu = cache.get(A, 'scipy')
+        assert cache.get(A, 'scipy') is lu
+        # same matrix in another object
+        assert cache.get(CSRTensor.from_scipy(_matrix(6)), 'scipy') is lu
+        assert (cache.hits, cache.misses) == (2, 1)
+
+        # same pattern and new values
+        A1 = _matrix(6, 1.0)
+        lu1 = cache.get(CSRTensor.from_scipy(A1), 'scipy')
+        assert lu1 is not lu
+        b = np.random.rand(36)
+        np.testing.assert_allclose(A1 @ bm.to_numpy(lu1.solve(bm.tensor(b))), b, atol=1e-12)
+        np.testing.assert_allclose(_matrix(6) @ bm.to_numpy(lu.solve(bm.tensor(b))), b, atol=1e-12)
+
+        # least recently used is evicted
+        cache.get(A, 'scipy')
+        cache.get(CSRTensor.from_scipy(_matrix(5)), 'scipy')
+        assert len(cache) == 2
+        assert cache.get(A, 'scipy') is lu
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_cache_identity(self):
+        _set_backend('numpy')
+        cache = FactorizationCache(maxsize=2)
+        matrices = [CSRTensor.from_scipy(_matrix(n)) for n in range(3, 8)]
+        for A in matrices:
+            cache.get(A, 'scipy')
+        # the matrices of the evicted factorizations are forgotten
+        assert len(cache._identity) == 2
+        assert set(cache._identity) == {id(A) for A in matrices[-2:]}
+
+        A = CSRTensor.from_scipy(_matrix(7))
+        assert cache.get(A, 'scipy') is cache.get(matrices[-1], 'scipy')
+        assert len(cache._identity) == 2
+        del A, matrices
+        gc.collect()
+        assert len(cache._identity) == 0
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_spsolve_cache(self, backend):
+        _set_backend(backend)
+        A = _matrix(6)
+        b = np.random.rand(36)
+        A_ = CSRTensor.from_scipy(A)
+        x = spsolve(A_, bm.tensor(b), 'scipy', cache=True)
+        np.testing.assert_allclose(A @ bm.to_numpy(x), b, atol=1e-12)
+        assert factorize(A_, 'scipy') is factorize(A_, 'scipy')
+        assert factorize(A_, 'scipy', cache=False) is not factorize(A_, 'scipy')
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_factorization.py"])
@@ -0,0 +1,122 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import (TriangleMesh, TetrahedronMesh, QuadrangleMesh,
+                         UniformMesh2d, UniformMesh3d)
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator, DirichletBC
+from fealpy.solver import cg, GeometricMultigrid, StructuredLaplaceOperator, mesh_hierarchy
+
+
+def _set_backend(backend):
+    bm.set_backend(backend)
+    if backend == 'pytorch':
+        # NOTE: the GPU tests of other solvers may change the default device.
+        bm.set_default_device('cpu')
+
+
+def _assemble(mesh, dirichlet: bool=True):
+    space = LagrangeFESpace(mesh, p=1)
+    bform = BilinearForm(space)
+    bform.add_integrator(ScalarDiffusionIntegrator(q=3))
+    A = bform.assembly()
+    if dirichlet:
+        A = DirichletBC(space, gd=0.).apply_matrix(A)
+    return A
+
+
+def _residual(A, x, b):
+    return float(bm.sqrt(bm.sum((A @ x - b)**2)) / bm.sqrt(bm.sum(b**2)))
+
+
+MESHES = [
+    lambda: TriangleMesh.from_box(nx=2, ny=2),
+    lambda: QuadrangleMesh.from_box(nx=2, ny=2),
+    lambda: TetrahedronMesh.from_box(nx=1, ny=1, nz=1),
+    lambda: UniformMesh2d((0, 2, 0, 3), h=(0.5, 1/3)),
+]
+
+
+class TestGeometricMultigrid:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('mesh', MESHES)
+    def test_prolongation(self, backend, mesh):
+        _set_backend(backend)
+        meshes, P = mesh_hierarchy(mesh(), 2)
+        assert len(meshes) == 3 and len(P) == 2
+
+        def f(p):
+            return 1 + 2*p[:, 0] - p[:, 1]
+
+        for k in range(2):
+            assert P[k].shape == (meshes[k+1].number_of_nodes(), meshes[k].number_of_nodes())
+            err = P[k] @ f(meshes[k].entity('node')) - f(meshes[k+1].entity('node'))
+            assert float(bm.max(bm.abs(err))) < 1e-12
+
+    @pytest.mark.parametrize('backend', ['numpy'])
+    @pytest.mark.parametrize('mesh', [
+        lambda: UniformMesh2d((0, 3, 0, 2), h=(1/3, 0.5)),
+        lambda: UniformMesh3d((0, 2, 0, 3, 0, 2), h=(0.5, 0.3, 0.5))
+    ])
+    @pytest.mark.parametrize('dirichlet', [False, True])
+    def test_structured_operator(self, backend, mesh, dirichlet):
+        _set_backend(backend)
+        mesh = mesh()
+        A = bm.to_numpy(_assemble(mesh, dirichlet).to_dense())
+        L = StructuredLaplaceOperator(mesh, dirichlet=dirichlet)
+        np.testing.assert_allclose(bm.to_numpy(L @ bm.eye(L.shape[0], dtype=bm.float64)),
+                                   A, atol=1e-12)
+        np.testing.assert_allclose(bm.to_numpy(L.diagonal()), np.diag(A), atol=1e-12)
+        assert L.nnz == np.count_nonzero(np.abs(A) > 1e-12)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('mesh', MESHES[:3])
+    @pytest.mark.parametrize('galerkin', [True, False])
+    @pytest.mark.parametrize('cycle', ['V', 'W', 'F'])
+    def test_unstructured(self, backend, mesh, galerkin, cycle):
+        _set_backend(backend)
+        gmg = GeometricMultigrid.from_mesh(mesh(), 3, _assemble, galerkin=galerkin, cycle=cycle)
+        assert len(gmg) == 4
+        A = gmg.A[0]
+        assert A.shape[0] == gmg.meshes[-1].number_of_nodes()
+        b = bm.astype(bm.random.rand(A.shape[0]), bm.float64)
+
+        x, info = gmg.solve(b, rtol=1e-8, returninfo=True)
+        assert info['converged'] and info['iters'] < 40
+        assert _residual(A, x, b) < 1e-7
+
+        x, info = cg(A, b, M=gmg, returninfo=True)
+        assert info['converged'] and info['iters'] < 20
+        assert _residual(A, x, b) < 1e-7
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('smoother', ['jacobi', 'chebyshev'])
+    def test_matrix_free(self, backend, smoother):
+        _set_backend(backend)
+        # NOTE: the spectral radius of the Chebyshev smoother is estimated from
+        # a random vector, which changes the number of iterations by a few.
+        # The seed keeps the test reproducible.
+        if backend == 'pytorch':
+            bm.random.manual_seed(0)
+        else:
+            bm.random.seed(0)
+        iters = []
+        for n in [2, 4]:
+            mesh = UniformMesh2d((0, 4, 0, 4), h=(0.25, 0.25))
+            gmg = GeometricMultigrid.from_mesh(mesh, n, StructuredLaplaceOperator,
+                                               smoother=smoother)
+            A = gmg.A[0]
+            assert isinstance(A, StructuredLaplaceOperator)
+            b = bm.tensor(np.random.default_rng(n).random(A.shape[0]), dtype=bm.float64)
+            x, info = gmg.solve(b, rtol=1e-8, returninfo=True)
+            assert info['converged']
+            assert _residual(A, x, b) < 1e-7
+            iters.append(info['iters'])
+        # the convergence does not depend on the mesh size
+        assert iters[1] <= iters[0] + 3
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_gmg_solver.py", "-k", "test_matrix_free"])
@@ -0,0 +1,136 @@
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from fealpy.backend import backend_manager as bm
+from fealpy.sparse import CSRTensor
+from fealpy.solver import (
+    cg, minres, bicgstab, gmres,
+    JacobiPreconditioner, BlockJacobiPreconditioner, SSORPreconditioner,
+    ILU0Preconditioner, IC0Preconditioner
+)
+
+
+def _set_backend(backend):
+    bm.set_backend(backend)
+    if backend == 'pytorch':
+        # NOTE: the GPU tests of other solvers may change the default device.
+        bm.set_default_device('cpu')
+
+
+def _laplacian(n: int, shift: float=0.0):
+    T = sp.diags([-1., 2., -1.], [-1, 0, 1], shape=(n, n))
+    A = sp.kron(sp.eye(n), T) + sp.kron(T, sp.eye(n))
+    if shift != 0.0:
+        # a non-symmetric perturbation
+        N = A.shape[0]
+        A = A + sp.diags(np.full(N-1, shift), 1)
+    return A.tocsr()
+
+
+def _residual(A, x, b):
+    x = bm.to_numpy(x)
+    return np.linalg.norm(A @ x - b) / np.linalg.norm(b)
+
+
+def _gmres(A, b, **kwargs):
+    return gmres(A, b, solver='fealpy', tol=1e-8, restart=30, **kwargs)
+
+
+class TestPreconditioner:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_ilu0_exact_for_tridiagonal(self, backend):
+        _set_backend(backend)
+        A = sp.diags([-1., 3., -2.], [-1, 0, 1], shape=(20, 20)).tocsr()
+        M = ILU0Preconditioner(CSRTensor.from_scipy(A))
+        r = np.random.rand(20)
+        # ILU(0) is the exact LU factorization of a tridiagonal matrix.
+        np.testing.assert_allclose(bm.to_numpy(M @ bm.tensor(r)),
+                                   np.linalg.solve(A.toarray(), r), atol=1e-10)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_block_jacobi(self, backend):
+        _set_backend(backend)
+        A = _laplacian(4)
+        M = BlockJacobiPreconditioner(CSRTensor.from_scipy(A), 4)
+        r = np.random.rand(16, 2)
+        D = sp.block_diag([A[i:i+4, i:i+4] for i in range(0, 16, 4)]).toarray()
+        np.testing.assert_allclose(bm.to_numpy(M @ bm.tensor(r)),
+                                   np.linalg.solve(D, r), atol=1e-12)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_ic0_symmetric(self, backend):
+        _set_backend(backend)
+        A = _laplacian(6)
+        M = IC0Preconditioner(CSRTensor.from_scipy(A))
+        E = bm.to_numpy(M @ bm.eye(36, dtype=bm.float64))
+        np.testing.assert_allclose(E, E.T, atol=1e-12)
+
+
+class TestKrylovSolvers:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('solver', [cg, minres])
+    @pytest.mark.parametrize('batch_first', [False, True])
+    def test_symmetric(self, backend, solver, batch_first):
+        _set_backend(backend)
+        A = _laplacian(20)
+        B = np.random.rand(A.shape[0], 3)
+        A_ = CSRTensor.from_scipy(A)
+        b = bm.tensor(B.T) if batch_first else bm.tensor(B)
+
+        x, info = solver(A_, b, batch_first=batch_first, returninfo=True)
+        x = bm.swapaxes(x, 0, 1) if batch_first else x
+        assert info['converged']
+        assert len(info['residuals']) == info['iters'] + 1
+        assert _residual(A, x, B) < 1e-7
+
+        for M in [JacobiPreconditioner(A_), SSORPreconditioner(A_), IC0Preconditioner(A_)]:
+            x, info_pre = solver(A_, b[0] if batch_first else b[:, 0], M=M, returninfo=True)
+            assert info_pre['converged']
+            assert _residual(A, x, B[:, 0]) < 1e-7
+        assert info_pre['iters'] < info['iters']
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('solver', [bicgstab, _gmres])
+    def test_nonsymmetric(self, backend, solver):
+        _set_backend(backend)
+        A = _laplacian(20, shift=0.5)
+        B = np.random.rand(A.shape[0], 2)
+        A_ = CSRTensor.from_scipy(A)
+
+        x, info = solver(A_, bm.tensor(B), returninfo=True)
+        assert info['converged']
+        assert _residual(A, x, B) < 1e-7
+
+        M = ILU0Preconditioner(A_)
+        x, info_pre = solver(A_, bm.tensor(B[:, 0]), M=M, returninfo=True)
+        assert info_pre['converged']
+        assert _residual(A, x, B[:, 0]) < 1e-7
+        assert info_pre['iters'] < info['iters']
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_ilu0_sweeps(self, backend, monkeypatch):
+        _set_backend(backend)
+        A_ = CSRTensor.from_scipy(_laplacian(20, shift=0.5))
+        M = ILU0Preconditioner(A_)
+        assert M.converged and M.sweeps < ILU0Preconditioner.MAX_SWEEPS
+        assert ILU0Preconditioner(A_, sweeps=2).converged
+
+        monkeypatch.setattr(ILU0Preconditioner, 'MAX_SWEEPS', 2)
+        M = ILU0Preconditioner(A_)
+        assert (not M.converged) and M.sweeps == 2
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_initial_solution(self, backend):
+        _set_backend(backend)
+        A = _laplacian(5)
+        x = np.random.rand(25)
+        b = bm.tensor(A @ x)
+        sol, info = cg(CSRTensor.from_scipy(A), b, x0=bm.tensor(x), returninfo=True)
+        assert info['iters'] == 0
+        np.testing.assert_allclose(bm.to_numpy(sol), x)
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_krylov_solvers.py", "-k", "test_symmetric"])
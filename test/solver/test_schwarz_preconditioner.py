@@ -0,0 +1,71 @@
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, MeshPartition
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.fem import BilinearForm, ScalarDiffusionIntegrator, DirichletBC
+from fealpy.solver import cg, gmres, AdditiveSchwarzPreconditioner
+
+
+def _set_backend(backend):
+    bm.set_backend(backend)
+    if backend == 'pytorch':
+        bm.set_default_device('cpu')
+
+
+def _problem(n: int, p: int=1):
+    mesh = TriangleMesh.from_box([0, 1, 0, 1], nx=n, ny=n)
+    space = LagrangeFESpace(mesh, p=p)
+    A = BilinearForm(space).add_integrator(ScalarDiffusionIntegrator()).assembly()
+    b = bm.tensor(np.random.default_rng(0).random(A.shape[0]))
+    A, b = DirichletBC(space, gd=0.0).apply(A, b)
+    return mesh, space, A, b
+
+
+def _residual(A, x, b):
+    x, b = bm.to_numpy(x), bm.to_numpy(b)
+    return np.linalg.norm(A.to_scipy() @ x - b) / np.linalg.norm(b)
+
+
+class TestAdditiveSchwarzPreconditioner:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_single_subdomain(self, backend):
+        _set_backend(backend)
+        _, space, A, b = _problem(8, p=2)
+        n = A.shape[0]
+        M = AdditiveSchwarzPreconditioner(A, [bm.arange(n)])
+        np.testing.assert_allclose(bm.to_numpy(A @ (M @ b)), bm.to_numpy(b), atol=1e-10)
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('coarse', [False, True])
+    def test_cg(self, backend, coarse):
+        _set_backend(backend)
+        mesh, space, A, b = _problem(32)
+        dofs = MeshPartition(mesh, 16, overlap=1, method='hilbert').subdomain_dofs(space)
+        M = AdditiveSchwarzPreconditioner(A, dofs, coarse=coarse)
+        x, info = cg(A, b, M=M, atol=1e-12, rtol=1e-10, maxiter=500, returninfo=True)
+        _, plain = cg(A, b, atol=1e-12, rtol=1e-10, maxiter=500, returninfo=True)
+        assert info['converged']
+        assert info['iters'] < plain['iters'] / 2
+        assert _residual(A, x, b) < 1e-8
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_restricted_gmres(self, backend):
+        _set_backend(backend)
+        mesh, space, A, b = _problem(24, p=2)
+        partition = MeshPartition(mesh, 8, overlap=1, method='hilbert')
+        dofs = partition.subdomain_dofs(space)
+        owner = partition.dof_owner(space)
+        M = AdditiveSchwarzPreconditioner(A, dofs, restricted=True, owner=owner)
+        x, info = gmres(A, b, solver='fealpy', M=M, tol=1e-10, atol=1e-12,
+                        maxiter=200, returninfo=True)
+        assert info['converged']
+        assert _residual(A, x, b) < 1e-8
+
+    def test_cover(self):
+        _set_backend('numpy')
+        _, _, A, _ = _problem(4)
+        with pytest.raises(ValueError):
+            AdditiveSchwarzPreconditioner(A, [bm.arange(3)])
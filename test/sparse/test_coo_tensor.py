@@ -348,3 +348,36 @@ class TestCOOTensorConcat:
         assert bm.tolist(result.indices()) == expected_indices
         assert bm.tolist(result.values()) == expected_values
         assert result.sparse_shape == expected_shape
+
+
+class TestCOOTensorAccumulate:
+    @pytest.mark.parametrize("backend", ALL_BACKENDS)
+    def test_accumulate(self, backend):
+        bm.set_backend(backend)
+        coo1 = COOTensor(bm.tensor([[0, 2], [1, 0]]), bm.tensor([[1., 2.], [3., 4.]]), (3, 3))
+        coo2 = COOTensor(bm.tensor([[2, 1, 0], [0, 1, 1]]), bm.tensor([[5., 6., 7.], [8., 9., 10.]]), (3, 3))
+        coo3 = COOTensor(bm.tensor([[1], [2]]), bm.tensor([[11.], [12.]]), (3, 3))
+
+        result = COOTensor.accumulate([coo1, coo2, coo3])
+
+        assert result.is_coalesced
+        assert bm.tolist(result.indices()) == [[0, 1, 1, 2], [1, 1, 2, 0]]
+        assert bm.tolist(result.values()) == [[8., 6., 11., 7.], [13., 9., 12., 12.]]
+
+        result = COOTensor.accumulate([coo1, coo2], coalesce=False)
+        assert result.nnz == 5
+        assert bm.allclose(result.to_dense(), coo1.add(coo2).to_dense())
+
+    @pytest.mark.parametrize("backend", ALL_BACKENDS)
+    def test_accumulate_errors(self, backend):
+        bm.set_backend(backend)
+        coo1 = COOTensor(bm.tensor([[0, 2], [1, 0]]), bm.tensor([1., 2.]), (3, 3))
+        coo2 = COOTensor(bm.tensor([[0, 2], [1, 0]]), None, (3, 3))
+        coo3 = COOTensor(bm.tensor([[0, 2], [1, 0]]), bm.tensor([1., 2.]), (3, 4))
+
+        with pytest.raises(ValueError):
+            COOTensor.accumulate([])
+        with pytest.raises(ValueError):
+            COOTensor.accumulate([coo1, coo2])
+        with pytest.raises(ValueError):
+            COOTensor.accumulate([coo1, coo3])
@@ -122,6 +122,38 @@ class TestCSRTensorAdd:
         assert bm.allclose(result2._col, expected_col2)
         assert result2.values() is None
 
+    @pytest.mark.parametrize("backend", ALL_BACKENDS)
+    def test_add_csr_tensor_same_pattern(self, backend):
+        bm.set_backend(backend)
+        crow = bm.tensor([0, 2, 3, 3])
+        col = bm.tensor([0, 2, 1])
+        csr1 = create_csr_tensor(crow, col, bm.tensor([[1., 2., 3.], [4., 5., 6.]]), (3, 3))
+        csr2 = create_csr_tensor(bm.copy(crow), bm.copy(col),
+                                 bm.tensor([[1., 1., 1.], [2., 2., 2.]]), (3, 3))
+
+        result = csr1.add(csr2, alpha=2)
+
+        assert result.crow() is crow
+        assert result.col() is col
+        assert bm.allclose(result.values(), bm.tensor([[3., 4., 5.], [8., 9., 10.]]))
+
+    @pytest.mark.parametrize("backend", ALL_BACKENDS)
+    def test_add_csr_tensor_nested_pattern(self, backend):
+        bm.set_backend(backend)
+        big = create_csr_tensor(bm.tensor([0, 2, 3, 4]), bm.tensor([0, 2, 1, 0]),
+                                bm.tensor([1., 2., 3., 4.]), (3, 3))
+        small = create_csr_tensor(bm.tensor([0, 1, 1, 2]), bm.tensor([2, 0]),
+                                  bm.tensor([10., 20.]), (3, 3))
+
+        result1 = big.add(small, alpha=2)
+        result2 = small.add(big)
+
+        for result in (result1, result2):
+            assert result.crow() is big.crow()
+            assert result.col() is big.col()
+        assert bm.allclose(result1.values(), bm.tensor([1., 22., 3., 44.]))
+        assert bm.allclose(result2.values(), bm.tensor([1., 12., 3., 24.]))
+
     @pytest.mark.parametrize("backend", ALL_BACKENDS)
     def test_add_tensor(self, backend):
         bm.set_backend(backend)
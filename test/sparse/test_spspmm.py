@@ -1,9 +1,11 @@
 
+import numpy as np
 import pytest
 
 from fealpy.backend import backend_manager as bm
-from fealpy.sparse._spspmm import spspmm_coo
-from fealpy.sparse import COOTensor
+from fealpy.sparse import _spspmm
+from fealpy.sparse._spspmm import spspmm_coo, spspmm_csr
+from fealpy.sparse import COOTensor, CSRTensor
 
 ALL_BACKENDS = ['numpy', 'pytorch']
 
@@ -47,5 +49,56 @@ def test_spspmm_coo_valid_input(backend):
 
     assert bm.allclose(result, expected)
 
+
+def _random_csr(nrow, ncol, row_nnz, batch=(), seed=0, empty_row=None):
+    rng = np.random.default_rng(seed)
+    row = np.repeat(np.arange(nrow), row_nnz)
+    col = rng.integers(0, ncol, size=row.shape[0])
+    key = np.unique(row * ncol + col)
+    if empty_row is not None:
+        key = key[key // ncol != empty_row]
+    row, col = key // ncol, key % ncol
+    crow = np.searchsorted(row, np.arange(nrow + 1))
+    values = rng.random(batch + (key.shape[0],))
+    dense = np.zeros(batch + (nrow, ncol))
+    dense[..., row, col] = values
+    return crow, col, values, dense
+
+
+@pytest.mark.parametrize("backend", ALL_BACKENDS)
+@pytest.mark.parametrize("batch", [(), (3,)])
+@pytest.mark.parametrize("block_size", [1 << 22, 5])
+def test_spspmm_csr(backend, batch, block_size, monkeypatch):
+    bm.set_backend(backend)
+    monkeypatch.setattr(_spspmm, '_PRODUCT_BLOCK_SIZE', block_size)
+    crow1, col1, values1, dense1 = _random_csr(20, 15, 3, batch, seed=1)
+    crow2, col2, values2, dense2 = _random_csr(15, 12, 2, batch, seed=2, empty_row=3)
+
+    A = CSRTensor(bm.from_numpy(crow1), bm.from_numpy(col1), bm.from_numpy(values1), (20, 15))
+    B = CSRTensor(bm.from_numpy(crow2), bm.from_numpy(col2), bm.from_numpy(values2), (15, 12))
+    C = A @ B
+    np.testing.assert_allclose(bm.to_numpy(C.to_dense()), dense1 @ dense2, atol=1e-12)
+
+    crow, col = bm.to_numpy(C.crow()), bm.to_numpy(C.col())
+    for i in range(20): # columns are sorted and unique in each row
+        assert np.all(np.diff(col[crow[i]:crow[i+1]]) > 0)
+
+    # unsorted COO input
+    row1 = np.repeat(np.arange(20), np.diff(crow1))
+    row2 = np.repeat(np.arange(15), np.diff(crow2))
+    indices1 = np.stack([row1, col1])[:, ::-1].copy()
+    values1 = values1[..., ::-1].copy()
+    indices, values, spshape = spspmm_coo(
+        bm.from_numpy(indices1), bm.from_numpy(values1), (20, 15),
+        bm.from_numpy(np.stack([row2, col2])), bm.from_numpy(values2), (15, 12)
+    )
+    result = COOTensor(indices, values, spshape).to_dense()
+    np.testing.assert_allclose(bm.to_numpy(result), dense1 @ dense2, atol=1e-12)
+
+    with pytest.raises(ValueError):
+        spspmm_csr(A.crow(), A.col(), A.values(), (20, 15),
+                   B.crow(), B.col(), B.values()[..., None, :], (15, 12))
+
+
 # Additional tests can be added here to cover more edge cases, different shapes,
 # or to ensure consistency with other matrix multiplication methods under various conditions.
@@ -0,0 +1,115 @@
+
+import re
+import zlib
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from fealpy.backend import backend_manager as bm
+from fealpy.mesh import TriangleMesh, TetrahedronMesh
+from fealpy.functionspace import LagrangeFESpace
+from fealpy.writer import VTUSeriesWriter
+
+
+def _set_backend(backend):
+    bm.set_backend(backend)
+    if backend == 'pytorch':
+        bm.set_default_device('cpu')
+
+
+def _read_vtu(fname):
+    """Read the arrays of a VTU file in the appended raw format."""
+    content = open(fname, 'rb').read()
+    start = content.index(b'<AppendedData encoding="raw">')
+    start = content.index(b'_', start) + 1
+    head = content[:start-1].decode() + '</AppendedData></VTKFile>'
+    root = ET.fromstring(head)
+    compressed = root.get('compressor') is not None
+    types = {'Float64': np.float64, 'Float32': np.float32, 'Int64': np.int64,
+             'Int32': np.int32, 'UInt8': np.uint8}
+    arrays = {}
+    for tag in ['PointData', 'CellData', 'Points', 'Cells']:
+        for e in root.iter(tag):
+            for d in e.iter('DataArray'):
+                pos = start + int(d.get('offset'))
+                if compressed:
+                    nb = int(np.frombuffer(content, np.uint64, 1, pos)[0])
+                    header = np.frombuffer(content, np.uint64, 3 + nb, pos)
+                    pos += 8 * (3 + nb)
+                    data = b''
+                    for size in header[3:]:
+                        data += zlib.decompress(content[pos:pos+int(size)])
+                        pos += int(size)
+                else:
+                    size = int(np.frombuffer(content, np.uint64, 1, pos)[0])
+                    data = content[pos+8:pos+8+size]
+                array = np.frombuffer(data, types[d.get('type')])
+                ncomp = int(d.get('NumberOfComponents', 1))
+                arrays[d.get('Name') or tag] = array.reshape(-1, ncomp) if ncomp > 1 else array
+    piece = next(root.iter('Piece'))
+    return int(piece.get('NumberOfPoints')), int(piece.get('NumberOfCells')), arrays
+
+
+class TestVTUSeriesWriter:
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    @pytest.mark.parametrize('compress', [0, 1])
+    @pytest.mark.parametrize('Mesh, box', [
+        (TriangleMesh, dict(nx=3, ny=2)),
+        (TetrahedronMesh, dict(nx=2, ny=1, nz=1)),
+    ])
+    def test_series(self, tmp_path, backend, compress, Mesh, box):
+        _set_backend(backend)
+        mesh = Mesh.from_box(**box)
+        space = LagrangeFESpace(mesh, p=1)
+        NN, NC, GD = mesh.number_of_nodes(), mesh.number_of_cells(), mesh.GD
+        writer = VTUSeriesWriter(str(tmp_path), mesh, name='heat', compress=compress,
+                                 max_pending=2)
+        writer.block_size = 64 # several compressed blocks
+        uh = space.function()
+        for k in range(5):
+            uh[:] = k * mesh.entity('node')[:, 0]
+            writer.write(0.5*k, nodedata={'uh': uh, 'grad': mesh.entity('node')},
+                         celldata={'flag': mesh.boundary_cell_flag()})
+            uh[:] = -1. # changed while being written
+        writer.close()
+        with pytest.raises(RuntimeError):
+            writer.write(1.)
+
+        pvd = ET.parse(tmp_path / 'heat.pvd').getroot()
+        sets = list(pvd.iter('DataSet'))
+        assert [float(d.get('timestep')) for d in sets] == [0., 0.5, 1., 1.5, 2.]
+
+        node = bm.to_numpy(mesh.entity('node'))
+        cell = bm.to_numpy(mesh.entity('cell'))
+        for k, d in enumerate(sets):
+            nn, nc, arrays = _read_vtu(tmp_path / d.get('file'))
+            assert (nn, nc) == (NN, NC)
+            np.testing.assert_allclose(arrays['uh'], k * node[:, 0])
+            assert arrays['grad'].shape == (NN, 3)
+            np.testing.assert_allclose(arrays['grad'][:, :GD], node)
+            np.testing.assert_array_equal(arrays['flag'], bm.to_numpy(mesh.boundary_cell_flag()))
+            np.testing.assert_allclose(arrays['Points'][:, :GD], node)
+            np.testing.assert_array_equal(arrays['connectivity'].reshape(NC, -1), cell)
+            assert np.all(arrays['types'] == (5 if GD == 2 else 10))
+
+    @pytest.mark.parametrize('backend', ['numpy', 'pytorch'])
+    def test_points(self, tmp_path, backend):
+        _set_backend(backend)
+        with VTUSeriesWriter(str(tmp_path), name='particles') as writer:
+            with pytest.raises(RuntimeError):
+                writer.write(0.)
+            with pytest.raises(ValueError):
+                writer.write(0., points=bm.zeros((3, 2)), nodedata={'u': bm.zeros((4,))})
+            for k in range(3):
+                p = bm.tensor(np.random.default_rng(k).random((10 + k, 2)))
+                fname = writer.write(points=p, nodedata={'rho': p[:, 0]})
+        nn, nc, arrays = _read_vtu(tmp_path / fname)
+        assert nn == nc == 12
+        np.testing.assert_allclose(arrays['rho'], bm.to_numpy(p[:, 0]))
+        assert np.all(arrays['types'] == 1)
+        assert not list(tmp_path.glob('*.part'))
+
+
+if __name__ == "__main__":
+    pytest.main(["./test_vtu_series_writer.py"])